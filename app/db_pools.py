@@ -0,0 +1,61 @@
+from flask import current_app
+from flask_sqlalchemy.session import Session
+
+# Database connection pools
+# The default engine serves interactive requests. Report endpoints and background jobs
+# switch their session to the 'reports' bind (configured in config.py as a second engine
+# on the same database), so long-running work cannot take every connection from the web
+# requests. A session picks its pool once, before its first query.
+REPORTS_POOL = 'reports'
+
+class PoolRoutingSession(Session):
+    """Session that sends unbound tables to the pool named in session.info['db_pool']"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        pool_name = self.info.get('db_pool')
+        if bind is None and pool_name is not None and pool_name in self._db.engines:
+            return self._db.engines[pool_name]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+def use_db_pool(pool_name):
+    """Route the current app context's session to a connection pool
+
+    Args:
+        pool_name: Bind key of the pool, e.g. REPORTS_POOL; None for the interactive pool.
+            Pools that are not configured fall back to the interactive pool.
+    """
+    current_app.extensions['sqlalchemy'].session.info['db_pool'] = pool_name
+
+def get_db_pool():
+    """Return the pool name the current app context's session is routed to"""
+    return current_app.extensions['sqlalchemy'].session.info.get('db_pool')
+
+def get_engine_options(bind_key):
+    """Return the configured engine options for a pool (empty if it was not configured)"""
+    if bind_key is None:
+        return current_app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+    options = current_app.config.get('SQLALCHEMY_BINDS', {}).get(bind_key)
+    return options if isinstance(options, dict) else {}
+
+def get_pool_stats(db):
+    """Describe each engine's connection pool for the health endpoint
+
+    Args:
+        db: The SQLAlchemy extension
+
+    Returns:
+        dict: Pool name -> application_name plus size, checked in/out and overflow counts
+        where the pool type has them
+    """
+    stats = {}
+    for bind_key, engine in db.engines.items():
+        pool = engine.pool
+        pool_stats = {
+            'pool_class': type(pool).__name__,
+            'application_name': get_engine_options(bind_key).get('connect_args', {}).get('application_name')
+        }
+        for counter in ('size', 'checkedin', 'checkedout', 'overflow'):
+            if hasattr(pool, counter):
+                pool_stats[counter] = getattr(pool, counter)()
+        stats[bind_key or 'interactive'] = pool_stats
+    return stats
@@ -1,12 +1,14 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, current_app, jsonify
 from sqlalchemy import text
 from datetime import datetime
 
+from app.db_pools import get_pool_stats
+
 health_bp = Blueprint('health', __name__)
 
 @health_bp.route('/health')
 def health_check():
-    from app.main import db
+    db = current_app.extensions['sqlalchemy']
     
     health_status = {
         'status': 'healthy',
@@ -27,6 +29,12 @@ def health_check():
         health_status['status'] = 'unhealthy'
         health_status['components']['database'] = str(e)
     
+    # Connection pool usage per pool (interactive and reports)
+    try:
+        health_status['database_pools'] = get_pool_stats(db)
+    except Exception as e:
+        health_status['database_pools'] = str(e)
+    
     return jsonify(health_status)
 
 
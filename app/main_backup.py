@@ -1,14 +1,17 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 
 # Centralized Financial Calculation Functions
-def calculate_project_costs_to_date(project_vuid, accounting_period_vuid=None):
+def calculate_project_costs_to_date(project_vuid, accounting_period_vuid=None, include_breakdown=False):
     """
     Centralized function to calculate costs to date for a project.
     This ensures consistent calculations across all endpoints.
+    Totals are read from the project cost rollup; the per-record breakdown needs the
+    source tables and is only built when include_breakdown is set.
     
     Args:
         project_vuid: The project VUID
         accounting_period_vuid: Optional accounting period to filter costs up to and including this period
+        include_breakdown: Scan the source records to list individual costs
     
     Returns:
         dict: {
@@ -16,37 +19,38 @@ def calculate_project_costs_to_date(project_vuid, accounting_period_vuid=None):
             'ap_invoice_costs': float,
             'labor_costs': float,
             'project_expense_costs': float,
-            'breakdown': list of individual costs
+            'breakdown': list of individual costs (empty unless include_breakdown)
         }
     """
+    if not include_breakdown:
+        rollup_totals = get_cost_rollup_totals([project_vuid], accounting_period_vuid)[project_vuid]['to_date']
+        ap_invoice_costs = rollup_totals.get('ap_invoice', 0.0)
+        labor_costs = rollup_totals.get('labor_cost', 0.0)
+        project_expense_costs = rollup_totals.get('project_expense', 0.0)
+        return {
+            'total_costs': ap_invoice_costs + labor_costs + project_expense_costs,
+            'ap_invoice_costs': ap_invoice_costs,
+            'labor_costs': labor_costs,
+            'project_expense_costs': project_expense_costs,
+            'breakdown': []
+        }
+    
     costs_to_date = 0.0
     ap_invoice_costs = 0.0
     labor_costs = 0.0
     project_expense_costs = 0.0
     breakdown = []
     
-    # Get accounting period for period filtering
-    period_vuids = None
-    if accounting_period_vuid:
-        accounting_period = db.session.get(AccountingPeriod, accounting_period_vuid)
-        if accounting_period:
-            # Get all periods up to and including the selected period
-            periods_to_include = AccountingPeriod.query.filter(
-                db.or_(
-                    db.and_(AccountingPeriod.year < accounting_period.year),
-                    db.and_(AccountingPeriod.year == accounting_period.year, 
-                           AccountingPeriod.month <= accounting_period.month)
-                )
-            ).all()
-            period_vuids = [p.vuid for p in periods_to_include]
+    # Get all periods up to and including the selected period (None means no period filtering)
+    periods_to_date = get_periods_to_date_select(accounting_period_vuid)
     
     # AP Invoices - Use GROSS amount (total_amount + retention_held)
     ap_invoices_query = APInvoice.query.filter_by(
         project_vuid=project_vuid,
         status='approved'
     )
-    if period_vuids:
-        ap_invoices_query = ap_invoices_query.filter(APInvoice.accounting_period_vuid.in_(period_vuids))
+    if periods_to_date is not None:
+        ap_invoices_query = ap_invoices_query.filter(APInvoice.accounting_period_vuid.in_(periods_to_date))
     
     ap_invoices = ap_invoices_query.all()
     for invoice in ap_invoices:
@@ -67,8 +71,8 @@ def calculate_project_costs_to_date(project_vuid, accounting_period_vuid=None):
         project_vuid=project_vuid,
         status='active'
     )
-    if period_vuids:
-        labor_costs_query = labor_costs_query.filter(LaborCost.accounting_period_vuid.in_(period_vuids))
+    if periods_to_date is not None:
+        labor_costs_query = labor_costs_query.filter(LaborCost.accounting_period_vuid.in_(periods_to_date))
     
     labor_costs_list = labor_costs_query.all()
     for labor_cost in labor_costs_list:
@@ -87,8 +91,8 @@ def calculate_project_costs_to_date(project_vuid, accounting_period_vuid=None):
         project_vuid=project_vuid,
         status='approved'
     )
-    if period_vuids:
-        project_expenses_query = project_expenses_query.filter(ProjectExpense.accounting_period_vuid.in_(period_vuids))
+    if periods_to_date is not None:
+        project_expenses_query = project_expenses_query.filter(ProjectExpense.accounting_period_vuid.in_(periods_to_date))
     
     project_expenses = project_expenses_query.all()
     for expense in project_expenses:
@@ -110,48 +114,47 @@ def calculate_project_costs_to_date(project_vuid, accounting_period_vuid=None):
         'breakdown': breakdown
     }
 
-def calculate_project_billings_total(project_vuid, accounting_period_vuid=None):
+def calculate_project_billings_total(project_vuid, accounting_period_vuid=None, include_breakdown=False):
     """
     Centralized function to calculate total project billings for a project.
     This ensures consistent calculations across all endpoints.
+    Totals are read from the project cost rollup; the per-billing breakdown needs the
+    source table and is only built when include_breakdown is set.
     
     Args:
         project_vuid: The project VUID
         accounting_period_vuid: Optional accounting period to filter billings up to and including this period
+        include_breakdown: Scan the source billings to list individual billings
     
     Returns:
         dict: {
             'total_billings': float,
             'current_period_billing': float,
-            'breakdown': list of individual billings
+            'breakdown': list of individual billings (empty unless include_breakdown)
         }
     """
+    if not include_breakdown:
+        rollup_totals = get_cost_rollup_totals([project_vuid], accounting_period_vuid)[project_vuid]
+        return {
+            'total_billings': rollup_totals['to_date'].get('project_billing', 0.0),
+            'current_period_billing': rollup_totals['current_period'].get('project_billing', 0.0),
+            'breakdown': []
+        }
+    
     project_billings_total = 0.0
     current_period_billing = 0.0
     breakdown = []
     
-    # Get accounting period for period filtering
-    period_vuids = None
-    if accounting_period_vuid:
-        accounting_period = db.session.get(AccountingPeriod, accounting_period_vuid)
-        if accounting_period:
-            # Get all periods up to and including the selected period
-            periods_to_include = AccountingPeriod.query.filter(
-                db.or_(
-                    db.and_(AccountingPeriod.year < accounting_period.year),
-                    db.and_(AccountingPeriod.year == accounting_period.year, 
-                           AccountingPeriod.month <= accounting_period.month)
-                )
-            ).all()
-            period_vuids = [p.vuid for p in periods_to_include]
+    # Get all periods up to and including the selected period (None means no period filtering)
+    periods_to_date = get_periods_to_date_select(accounting_period_vuid)
     
     # Project Billings - Use gross amount (total_amount + retention_held)
     project_billings_query = ProjectBilling.query.filter_by(
         project_vuid=project_vuid,
         status='approved'
     )
-    if period_vuids:
-        project_billings_query = project_billings_query.filter(ProjectBilling.accounting_period_vuid.in_(period_vuids))
+    if periods_to_date is not None:
+        project_billings_query = project_billings_query.filter(ProjectBilling.accounting_period_vuid.in_(periods_to_date))
     
     project_billings = project_billings_query.all()
     for billing in project_billings:
@@ -179,7 +182,7 @@ def calculate_project_billings_total(project_vuid, accounting_period_vuid=None):
         'breakdown': breakdown
     }
 
-def calculate_revenue_recognized(project_vuid, accounting_period_vuid, eac_enabled=True):
+def calculate_revenue_recognized(project_vuid, accounting_period_vuid, eac_enabled=True, eac_data=None):
     """
     Centralized function to calculate revenue recognized for a project.
     This ensures consistent calculations across all endpoints.
@@ -188,6 +191,8 @@ def calculate_revenue_recognized(project_vuid, accounting_period_vuid, eac_enabl
         project_vuid: The project VUID
         accounting_period_vuid: The accounting period VUID
         eac_enabled: Whether EAC reporting is enabled
+        eac_data: Optional (eac_amount, from_snapshot, message) already loaded with
+            get_wip_eac_data_bulk; looked up for the project when not given
     
     Returns:
         dict: {
@@ -235,7 +240,7 @@ def calculate_revenue_recognized(project_vuid, accounting_period_vuid, eac_enabl
     # Get EAC data if EAC reporting is enabled
     eac_amount = 0.0
     if eac_enabled and accounting_period_vuid:
-        eac_amount, _, _ = get_wip_eac_data(project_vuid, accounting_period_vuid)
+        eac_amount, _, _ = eac_data or get_wip_eac_data(project_vuid, accounting_period_vuid)
     
     # Calculate percent complete
     percent_complete = 0.0
@@ -350,11 +355,30 @@ from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
 from flask_marshmallow import Marshmallow
 from flask_migrate import Migrate
+import base64
+import hashlib
+import json
 import os
+import re
+import socket
+import threading
+import time
 import uuid
-import requests
-from datetime import datetime, timezone
+import zlib
+from collections import namedtuple
+from itertools import chain, islice
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 # Standardized calculation functions for consistent revenue recognition
 def calculate_standardized_revenue_recognized(project_vuid, accounting_period_vuid, eac_enabled=True):
@@ -396,16 +420,9 @@ def calculate_standardized_revenue_recognized(project_vuid, accounting_period_vu
             status='approved'
         )
         if accounting_period:
-            periods_to_include = AccountingPeriod.query.filter(
-                db.or_(
-                    db.and_(AccountingPeriod.year < accounting_period.year),
-                    db.and_(AccountingPeriod.year == accounting_period.year, 
-                           AccountingPeriod.month <= accounting_period.month)
-                )
-            ).all()
-            period_vuids = [p.vuid for p in periods_to_include]
-            ap_invoices_query = ap_invoices_query.filter(APInvoice.accounting_period_vuid.in_(period_vuids))
-            print(f"DEBUG: Filtering AP invoices for {len(period_vuids)} periods")
+            periods_to_date = get_periods_to_date_select(accounting_period_vuid)
+            ap_invoices_query = ap_invoices_query.filter(APInvoice.accounting_period_vuid.in_(periods_to_date))
+            print(f"DEBUG: Filtering AP invoices through period ordinal {get_accounting_period_ordinal(accounting_period_vuid)}")
         
         ap_invoices = ap_invoices_query.all()
         print(f"DEBUG: Found {len(ap_invoices)} AP invoices")
@@ -420,7 +437,7 @@ def calculate_standardized_revenue_recognized(project_vuid, accounting_period_vu
             status='active'
         )
         if accounting_period:
-            labor_costs_query = labor_costs_query.filter(LaborCost.accounting_period_vuid.in_(period_vuids))
+            labor_costs_query = labor_costs_query.filter(LaborCost.accounting_period_vuid.in_(periods_to_date))
         
         labor_costs = labor_costs_query.all()
         print(f"DEBUG: Found {len(labor_costs)} labor costs")
@@ -435,7 +452,7 @@ def calculate_standardized_revenue_recognized(project_vuid, accounting_period_vu
             status='approved'
         )
         if accounting_period:
-            project_expenses_query = project_expenses_query.filter(ProjectExpense.accounting_period_vuid.in_(period_vuids))
+            project_expenses_query = project_expenses_query.filter(ProjectExpense.accounting_period_vuid.in_(periods_to_date))
         
         project_expenses = project_expenses_query.all()
         print(f"DEBUG: Found {len(project_expenses)} project expenses")
@@ -510,9 +527,12 @@ def validate_integration_method_consistency(accounting_period_vuid):
         accounting_period_vuid=accounting_period_vuid,
         status='approved'
     ).all()
+    ap_integration_methods = get_effective_integration_method_map(
+        'ap_invoice_integration_method', (invoice.project_vuid for invoice in ap_invoices)
+    )
     
     for invoice in ap_invoices:
-        integration_method = get_effective_ap_invoice_integration_method(invoice.project_vuid)
+        integration_method = ap_integration_methods[invoice.project_vuid]
         
         # Check if journal entries exist
         net_entry = JournalEntry.query.filter_by(
@@ -549,9 +569,12 @@ def validate_integration_method_consistency(accounting_period_vuid):
         accounting_period_vuid=accounting_period_vuid,
         status='approved'
     ).all()
+    ar_integration_methods = get_effective_integration_method_map(
+        'ar_invoice_integration_method', (billing.project_vuid for billing in project_billings)
+    )
     
     for billing in project_billings:
-        integration_method = get_effective_ar_invoice_integration_method(billing.project_vuid)
+        integration_method = ar_integration_methods[billing.project_vuid]
         
         # Check if journal entries exist
         net_entry = JournalEntry.query.filter_by(
@@ -589,7 +612,7 @@ def validate_integration_method_consistency(accounting_period_vuid):
 # Shared utility functions for journal entry generation
 def get_account_vuid_by_name(account_name, fallback_vuid=None):
     """Get account VUID by name with fallback"""
-    account = ChartOfAccounts.query.filter_by(account_name=account_name).first()
+    account = get_gl_account_by_name(account_name)
     return account.vuid if account else fallback_vuid
 
 def create_journal_entry_from_preview(preview_data, reference_type, reference_vuid, accounting_period_vuid):
@@ -630,68 +653,459 @@ def create_journal_entry_from_preview(preview_data, reference_type, reference_vu
         print(f"Error creating journal entry from preview: {str(e)}")
         return None
 
-def create_ap_invoice_net_entry_preview(invoice):
-    """Create preview for AP invoice net entry"""
-    try:
-        net_amount = float(invoice.total_amount or 0)
-        gross_amount = sum(float(line.total_amount or 0) for line in invoice.line_items)
+# Journal entry preview rules
+# Each preview entry type is a rule: the amounts it is built from, its header fields and
+# its debit/credit lines. JOURNAL_ENTRY_PREVIEW_RULE_SETS maps source type x integration
+# method to the entries produced, so the period preview and the single-document previews
+# build entries the same way.
+PREVIEW_BATCH_SIZE = 500
+
+def get_cost_type_expense_account_vuid(cost_type):
+    """Get the expense account VUID for a cost type, falling back to Construction Costs"""
+    expense_account_vuid = 'b6a4b081-3149-4f16-9ecb-7aa866937abe'  # Default
+    if cost_type and cost_type.expense_account:
+        if len(cost_type.expense_account) == 36:
+            expense_account_vuid = cost_type.expense_account
+        else:
+            account = get_gl_account_by_name(cost_type.expense_account)
+            if account:
+                expense_account_vuid = account.vuid
+    return expense_account_vuid
+
+def find_gl_account_vuid(name_pattern):
+    """Get the VUID of the first GL account matching an ILIKE pattern, or None"""
+    account = find_gl_account(name_pattern)
+    return account.vuid if account else None
+
+def get_labor_cost_employee_name(labor_cost):
+    """Get the employee name shown on labor cost journal entries"""
+    if getattr(labor_cost, 'employee', None):
+        return labor_cost.employee.employee_name
+    if labor_cost.employee_id:
+        return f"Employee {labor_cost.employee_id}"
+    return "Unknown"
+
+def get_project_billing_net_amount(billing):
+    """Net billing amount, using line item retainage when the billing-level retainage is not set"""
+    retainage_held = float(billing.retention_held or 0) if billing.retention_held else sum(float(line.retention_held or 0) for line in billing.line_items)
+    retainage_released = float(billing.retention_released or 0) if billing.retention_released else sum(float(line.retention_released or 0) for line in billing.line_items)
+    return float(billing.total_amount or 0) - retainage_held + retainage_released
+
+def get_wages_payable_account_vuid():
+    """Wages Payable, falling back to Accounts Payable"""
+    return get_account_vuid_by_name('Wages Payable', None) or get_account_vuid_by_name('Accounts Payable', 'g1h2i3j4-k5l6-7890-mnop-qr1234567890')
+
+# Line rules: 'side' is debit or credit; 'amount' names one of the rule's amounts. Lines with
+# 'distribute' are spread over the document's line items in proportion to line total / 'base'
+# and post to each line's cost type expense account. Lines are only produced for positive
+# amounts. A 'required' account that cannot be resolved drops the whole entry.
+JOURNAL_ENTRY_PREVIEW_RULES = {
+    'ap_invoice_net': {
+        'label': 'AP invoice net entry',
+        'amounts': lambda invoice: {
+            'net': float(invoice.total_amount or 0),
+            'lines_total': sum(float(line.total_amount or 0) for line in invoice.line_items)
+        },
+        'total': 'net',
+        'header': lambda invoice: {
+            'type': 'AP Invoice',
+            'reference_number': invoice.invoice_number,
+            'journal_number': f"JE-AP-{invoice.invoice_number}",
+            'description': f"AP Invoice {invoice.invoice_number} (Net)",
+            'reference_type': 'ap_invoice'
+        },
+        'include_project_name': True,
+        'lines': [
+            {'side': 'debit', 'distribute': True, 'amount': 'net', 'base': 'lines_total',
+             'description': lambda invoice, line: f"{line.cost_code.code if line.cost_code else ''} - {line.description or 'AP Invoice Line'}"},
+            {'side': 'credit', 'amount': 'net',
+             'account': lambda: get_account_vuid_by_name('Accounts Payable', 'a1b2c3d4-e5f6-7890-abcd-ef1234567890'),
+             'description': lambda invoice: f'AP Invoice {invoice.invoice_number}'}
+        ]
+    },
+    'ap_invoice_retainage': {
+        'label': 'AP invoice retainage entry',
+        'amounts': lambda invoice: {
+            'retainage': float(invoice.retention_held or 0),
+            'lines_total': sum(float(line.total_amount or 0) for line in invoice.line_items)
+        },
+        'total': 'retainage',
+        'skip_unless_positive': True,
+        'header': lambda invoice: {
+            'type': 'Retainage Entry',
+            'reference_number': f"{invoice.invoice_number}-RET",
+            'journal_number': f"JE-AP-RET-{invoice.invoice_number}",
+            'description': f"AP Invoice {invoice.invoice_number} (Retainage)",
+            'reference_type': 'ap_invoice_retainage'
+        },
+        'include_project_name': True,
+        'lines': [
+            {'side': 'debit', 'distribute': True, 'amount': 'retainage', 'base': 'lines_total',
+             'description': lambda invoice, line: f"{line.cost_code.code if line.cost_code else ''} - Retainage"},
+            {'side': 'credit', 'amount': 'retainage',
+             'account': lambda: get_account_vuid_by_name('Retainage Payable', 'c1d2e3f4-g5h6-7890-ijkl-mn1234567890'),
+             'description': lambda invoice: f'AP Invoice {invoice.invoice_number} Retainage'}
+        ]
+    },
+    'ap_invoice_combined': {
+        'label': 'AP invoice combined entry',
+        'amounts': lambda invoice: {
+            'gross': float(invoice.total_amount or 0) + float(invoice.retention_held or 0),
+            'net': float(invoice.total_amount or 0),
+            'retainage': float(invoice.retention_held or 0)
+        },
+        'total': 'gross',
+        'header': lambda invoice: {
+            'journal_number': f"JE-AP-{invoice.invoice_number}",
+            'description': f"AP Invoice {invoice.invoice_number}",
+            'reference_type': 'ap_invoice'
+        },
+        'include_project_name': False,
+        'lines': [
+            {'side': 'debit', 'distribute': True, 'amount': 'gross', 'base': 'gross',
+             'description': lambda invoice, line: f"{line.cost_code.code if line.cost_code else ''} - {line.description or 'AP Invoice Line'}"},
+            {'side': 'credit', 'amount': 'net',
+             'account': lambda: 'a1b2c3d4-e5f6-7890-abcd-ef1234567890',  # Accounts Payable
+             'description': lambda invoice: f'AP Invoice {invoice.invoice_number} (Net)'},
+            {'side': 'credit', 'amount': 'retainage',
+             'account': lambda: 'c1d2e3f4-g5h6-7890-ijkl-mn1234567890',  # Retainage Payable
+             'description': lambda invoice: f'AP Invoice {invoice.invoice_number} (Retainage)'}
+        ]
+    },
+    'project_billing_net': {
+        'label': 'project billing',
+        'amounts': lambda billing: {'net': get_project_billing_net_amount(billing)},
+        'total': 'net',
+        'header': lambda billing: {
+            'type': 'Project Billing',
+            'reference_number': billing.billing_number,
+            'journal_number': f"JE-PB-{billing.billing_number}",
+            'description': f"Project Billing {billing.billing_number} (Net)",
+            'reference_type': 'project_billing'
+        },
+        'include_project_name': True,
+        'lines': [
+            {'side': 'debit', 'amount': 'net', 'required': True,
+             'account': lambda: find_gl_account_vuid('%receivable%'),
+             'description': lambda billing: f'Project Billing {billing.billing_number} (Net)'},
+            {'side': 'credit', 'amount': 'net', 'required': True,
+             'account': lambda: find_gl_account_vuid('%revenue%'),
+             'description': lambda billing: f'Project Billing {billing.billing_number} (Net)'}
+        ]
+    },
+    'project_billing_retainage': {
+        'label': 'project billing retainage',
+        'amounts': lambda billing: {'retainage': float(billing.retention_held or 0)},
+        'total': 'retainage',
+        'skip_unless_positive': True,
+        'header': lambda billing: {
+            'type': 'Retainage Entry',
+            'reference_number': f"{billing.billing_number}-RET",
+            'journal_number': f"JE-RET-PB-{billing.billing_number}",
+            'description': f"Project Billing {billing.billing_number} (Retainage)",
+            'reference_type': 'project_billing_retainage'
+        },
+        'include_project_name': True,
+        'lines': [
+            {'side': 'debit', 'amount': 'retainage', 'required': True,
+             'account': lambda: find_gl_account_vuid('%receivable%'),
+             'description': lambda billing: f'Project Billing {billing.billing_number} (Retainage)'},
+            {'side': 'credit', 'amount': 'retainage', 'required': True,
+             'account': lambda: find_gl_account_vuid('%retainage%'),
+             'description': lambda billing: f'Project Billing {billing.billing_number} (Retainage)'}
+        ]
+    },
+    'project_billing_combined': {
+        'label': 'project billing combined entry',
+        'amounts': lambda billing: {
+            'gross': float(billing.total_amount or 0) + float(billing.retention_held or 0),
+            'net': float(billing.total_amount or 0),
+            'retainage': float(billing.retention_held or 0)
+        },
+        'total': 'gross',
+        'header': lambda billing: {
+            'journal_number': f"JE-PB-{billing.billing_number}",
+            'description': f"Project Billing {billing.billing_number}",
+            'reference_type': 'project_billing'
+        },
+        'include_project_name': False,
+        'lines': [
+            {'side': 'debit', 'amount': 'gross',
+             'account': lambda: 'd1e2f3g4-h5i6-7890-jklm-no1234567890',  # Accounts Receivable
+             'description': lambda billing: f'Project Billing {billing.billing_number}'},
+            {'side': 'credit', 'amount': 'net',
+             'account': lambda: 'e1f2g3h4-i5j6-7890-klmn-op1234567890',  # Construction Revenue
+             'description': lambda billing: f'Project Billing {billing.billing_number} (Net)'},
+            {'side': 'credit', 'amount': 'retainage',
+             'account': lambda: 'f1g2h3i4-j5k6-7890-lmno-pq1234567890',  # Retainage Receivables
+             'description': lambda billing: f'Project Billing {billing.billing_number} (Retainage)'}
+        ]
+    },
+    'labor_cost': {
+        'label': 'labor cost journal entry',
+        'amounts': lambda labor_cost: {'amount': float(labor_cost.amount or 0)},
+        'total': 'amount',
+        'skip_unless_positive': True,
+        'header': lambda labor_cost: {
+            'type': 'Labor Cost',
+            'reference_number': f"{labor_cost.employee_id or 'UNK'}-{labor_cost.payroll_date or 'UNK'}",
+            'journal_number': f"JE-LC-{labor_cost.employee_id or 'UNK'}-{labor_cost.payroll_date or 'UNK'}",
+            'description': f"Labor Cost - {get_labor_cost_employee_name(labor_cost)}",
+            'reference_type': 'labor_cost'
+        },
+        'include_project_name': True,
+        'include_balance': True,
+        'lines': [
+            {'side': 'debit', 'amount': 'amount',
+             'account': lambda: 'b6a4b081-3149-4f16-9ecb-7aa866937abe',  # Construction Costs
+             'description': lambda labor_cost: f'Labor Cost - {get_labor_cost_employee_name(labor_cost)}'},
+            {'side': 'credit', 'amount': 'amount',
+             'account': get_wages_payable_account_vuid,
+             'description': lambda labor_cost: f'Labor Cost - {get_labor_cost_employee_name(labor_cost)}'}
+        ]
+    },
+    'project_expense': {
+        'label': 'project expense journal entry',
+        'amounts': lambda expense: {'amount': float(expense.amount or 0)},
+        'total': 'amount',
+        'skip_unless_positive': True,
+        'header': lambda expense: {
+            'journal_number': f"JE-PE-{expense.expense_number or 'EXP'}",
+            'description': f"Project Expense - {expense.description or 'Unknown'}",
+            'reference_type': 'project_expense'
+        },
+        'include_project_name': False,
+        'lines': [
+            {'side': 'debit', 'amount': 'amount',
+             'account': lambda: 'b6a4b081-3149-4f16-9ecb-7aa866937abe',  # Construction Costs
+             'description': lambda expense: f'Project Expense - {expense.description or "Unknown"}'},
+            {'side': 'credit', 'amount': 'amount',
+             'account': lambda: get_account_vuid_by_name('Accounts Payable', 'a1b2c3d4-e5f6-7890-abcd-ef1234567890'),
+             'description': lambda expense: f'Project Expense - {expense.description or "Unknown"}'}
+        ]
+    }
+}
+
+# (source type, integration method) -> preview rules; None where the method does not apply
+JOURNAL_ENTRY_PREVIEW_RULE_SETS = {
+    ('ap_invoice', INTEGRATION_METHOD_INVOICE): ['ap_invoice_net', 'ap_invoice_retainage'],
+    ('ap_invoice', INTEGRATION_METHOD_JOURNAL_ENTRIES): ['ap_invoice_combined'],
+    ('project_billing', INTEGRATION_METHOD_INVOICE): ['project_billing_net', 'project_billing_retainage'],
+    ('project_billing', INTEGRATION_METHOD_JOURNAL_ENTRIES): ['project_billing_combined'],
+    ('labor_cost', None): ['labor_cost'],
+    ('project_expense', None): ['project_expense']
+}
+
+def build_preview_entry(rule_key, document):
+    """
+    Build a journal entry preview for a source document from its preview rule.
+    
+    Args:
+        rule_key: Key into JOURNAL_ENTRY_PREVIEW_RULES, e.g. 'ap_invoice_net'
+        document: The source document (AP invoice, project billing, labor cost or project expense)
         
-        line_items = []
+    Returns:
+        dict: The preview entry, or None if the rule produces no entry for this document
+    """
+    rule = JOURNAL_ENTRY_PREVIEW_RULES[rule_key]
+    amounts = rule['amounts'](document)
+    total_amount = amounts[rule['total']]
+    if rule.get('skip_unless_positive') and total_amount <= 0:
+        return None
+    
+    line_accounts = [line_rule['account']() if 'account' in line_rule else None for line_rule in rule['lines']]
+    if any(line_rule.get('required') and not account_vuid for line_rule, account_vuid in zip(rule['lines'], line_accounts)):
+        print(f"Required accounts not found for {rule['label']} preview")
+        return None
+    
+    postings = []
+    for line_rule, account_vuid in zip(rule['lines'], line_accounts):
+        amount = amounts[line_rule['amount']]
+        if line_rule.get('distribute'):
+            base = amounts[line_rule['base']]
+            if base <= 0:
+                continue
+            for line in document.line_items:
+                line_amount = amount * (float(line.total_amount or 0) / base)
+                if line_amount > 0:
+                    postings.append((line_rule['side'], get_cost_type_expense_account_vuid(line.cost_type),
+                                     line_amount, line_rule['description'](document, line)))
+        elif amount > 0:
+            postings.append((line_rule['side'], account_vuid, amount, line_rule['description'](document)))
+    
+    line_items = []
+    total_debits = 0
+    total_credits = 0
+    for side, account_vuid, amount, description in postings:
+        if side == 'debit':
+            line_items.append({'gl_account_vuid': account_vuid, 'description': description, 'debit_amount': amount, 'credit_amount': 0})
+            total_debits += amount
+        else:
+            line_items.append({'gl_account_vuid': account_vuid, 'description': description, 'debit_amount': 0, 'credit_amount': amount})
+            total_credits += amount
+    
+    entry = rule['header'](document)
+    entry.update({
+        'reference_vuid': document.vuid,
+        'project_vuid': document.project_vuid,
+        'project_number': document.project.project_number if document.project else None,
+        'total_amount': total_amount,
+        'total_debits': total_debits,
+        'total_credits': total_credits,
+        'line_items': line_items
+    })
+    if rule['include_project_name']:
+        entry['project_name'] = document.project.project_name if document.project else None
+    if rule.get('include_balance'):
+        entry['is_balanced'] = abs(total_debits - total_credits) < 0.01  # Allow for small rounding differences
+    return entry
+
+def iter_period_preview_entries(accounting_period_vuid):
+    """
+    Yield the journal entry previews for every source document in an accounting period.
+    
+    Each source type is read with one query, streamed in PREVIEW_BATCH_SIZE batches with
+    its project, line items and cost types eager-loaded.
+    """
+    preview_sources = [
+        ('ap_invoice', APInvoice, 'approved', 'ap_invoice_integration_method', [
+            db.joinedload(APInvoice.project),
+            db.selectinload(APInvoice.line_items).joinedload(APInvoiceLineItem.cost_type),
+            db.selectinload(APInvoice.line_items).joinedload(APInvoiceLineItem.cost_code)
+        ]),
+        ('project_billing', ProjectBilling, 'approved', 'ar_invoice_integration_method', [
+            db.joinedload(ProjectBilling.project),
+            db.selectinload(ProjectBilling.line_items)
+        ]),
+        ('labor_cost', LaborCost, 'active', None, [
+            db.joinedload(LaborCost.project),
+            db.joinedload(LaborCost.employee)
+        ]),
+        ('project_expense', ProjectExpense, 'approved', None, [
+            db.joinedload(ProjectExpense.project)
+        ])
+    ]
+    
+    for source_type, model, status, integration_field, options in preview_sources:
+        documents = model.query.options(*options).filter_by(
+            accounting_period_vuid=accounting_period_vuid,
+            status=status
+        ).yield_per(PREVIEW_BATCH_SIZE)
+        
+        for document in documents:
+            integration_method = None
+            if integration_field:
+                if get_effective_integration_method(integration_field, document.project_vuid) == INTEGRATION_METHOD_INVOICE:
+                    integration_method = INTEGRATION_METHOD_INVOICE
+                else:
+                    integration_method = INTEGRATION_METHOD_JOURNAL_ENTRIES
+            
+            for rule_key in JOURNAL_ENTRY_PREVIEW_RULE_SETS[(source_type, integration_method)]:
+                try:
+                    entry = build_preview_entry(rule_key, document)
+                except Exception as e:
+                    print(f"Error creating {JOURNAL_ENTRY_PREVIEW_RULES[rule_key]['label']} preview: {e}")
+                    entry = None
+                if entry:
+                    yield entry
+
+# CSV columns: every key a preview entry can have (build_preview_entry and the over/under
+# billing entries), then its line item keys as flattened by flatten_line_items
+JOURNAL_ENTRY_PREVIEW_EXPORT_COLUMNS = [
+    'type', 'reference_number', 'journal_number', 'description', 'reference_type', 'reference_vuid',
+    'project_vuid', 'project_number', 'project_name', 'total_amount', 'total_debits', 'total_credits',
+    'is_balanced', 'line_gl_account_vuid', 'line_account_name', 'line_description', 'line_debit_amount',
+    'line_credit_amount',
+]
+
+def iter_named_period_preview_entries(accounting_period_vuid, chart_of_accounts):
+    """
+    Yield every preview entry for a period, including over/under billing, with account
+    names filled in on line items that do not have one.
+    """
+    account_lookup = {acc.vuid: f"{acc.account_number} - {acc.account_name}" for acc in chart_of_accounts}
+    
+    def period_entries():
+        yield from iter_period_preview_entries(accounting_period_vuid)
+        # Over/Under Billing (from WIP calculation)
+        wip_data = calculate_wip_data_for_period(accounting_period_vuid)
+        yield from create_over_under_billing_entries_preview(wip_data, accounting_period_vuid)
+    
+    for entry in period_entries():
+        for line_item in entry.get('line_items', []):
+            if not line_item.get('account_name') and line_item.get('gl_account_vuid'):
+                line_item['account_name'] = account_lookup.get(line_item.get('gl_account_vuid'), line_item.get('gl_account_vuid'))
+        yield entry
+
+def start_period_preview_stream(accounting_period_vuid):
+    """
+    Build the first batch of the period journal entry preview and return the stream.
+    
+    The first batch is built before the response starts, so errors reading the period's
+    documents (the usual failures) still raise and the route returns a 500.
+    
+    Returns:
+        generator: JSON document chunks from stream_period_preview
+    """
+    chart_of_accounts = get_gl_account_cache()['accounts']
+    entries = iter_named_period_preview_entries(accounting_period_vuid, chart_of_accounts)
+    first_batch = list(islice(entries, PREVIEW_BATCH_SIZE))
+    return stream_period_preview(chart_of_accounts, chain(first_batch, entries))
+
+def stream_period_preview(chart_of_accounts, entries):
+    """
+    Stream the period journal entry preview as a JSON document.
+    
+    Entries are written in batches as they are built, so memory stays bounded by the batch
+    size rather than the number of entries. The summary follows the entries. Once the
+    response has started its status is already 200: an error after the first batch ends
+    the document with "success": false and the error message, so clients must check
+    success rather than the status code.
+    """
+    yield '{"journal_entries": ['
+    try:
+        entry_count = 0
         total_debits = 0
         total_credits = 0
+        batch = []
+        for entry in entries:
+            total_debits += entry.get('total_debits', 0)
+            total_credits += entry.get('total_credits', 0)
+            batch.append(app.json.dumps(entry))
+            entry_count += 1
+            
+            if len(batch) >= PREVIEW_BATCH_SIZE:
+                yield (',' if entry_count > len(batch) else '') + ','.join(batch)
+                batch = []
         
-        # Debit: Expense accounts (proportional net amounts)
-        for line in invoice.line_items:
-            if gross_amount > 0:
-                line_proportion = float(line.total_amount or 0) / gross_amount
-                line_net_amount = net_amount * line_proportion
-                
-                if line_net_amount > 0:
-                    expense_account_vuid = 'b6a4b081-3149-4f16-9ecb-7aa866937abe'  # Default
-                    if line.cost_type and line.cost_type.expense_account:
-                        if len(line.cost_type.expense_account) == 36:
-                            expense_account_vuid = line.cost_type.expense_account
-                        else:
-                            account = ChartOfAccounts.query.filter_by(account_name=line.cost_type.expense_account).first()
-                            if account:
-                                expense_account_vuid = account.vuid
-                    
-                    line_items.append({
-                        'gl_account_vuid': expense_account_vuid,
-                        'description': f"{line.cost_code.code if line.cost_code else ''} - {line.description or 'AP Invoice Line'}",
-                        'debit_amount': line_net_amount,
-                        'credit_amount': 0
-                    })
-                    total_debits += line_net_amount
+        if batch:
+            yield (',' if entry_count > len(batch) else '') + ','.join(batch)
         
-        # Credit: Accounts Payable (net amount)
-        if net_amount > 0:
-            # Look up Accounts Payable account using shared utility
-            ap_account_vuid = get_account_vuid_by_name('Accounts Payable', 'a1b2c3d4-e5f6-7890-abcd-ef1234567890')
-            
-            line_items.append({
-                'gl_account_vuid': ap_account_vuid,
-                'description': f'AP Invoice {invoice.invoice_number}',
-                'debit_amount': 0,
-                'credit_amount': net_amount
-            })
-            total_credits += net_amount
+        chart_of_accounts_data = [{
+            'vuid': account.vuid,
+            'account_number': account.account_number,
+            'account_name': account.account_name
+        } for account in chart_of_accounts]
         
-        return {
-            'type': 'AP Invoice',
-            'reference_number': invoice.invoice_number,
-            'journal_number': f"JE-AP-{invoice.invoice_number}",
-            'description': f"AP Invoice {invoice.invoice_number} (Net)",
-            'reference_type': 'ap_invoice',
-            'reference_vuid': invoice.vuid,
-            'project_vuid': invoice.project_vuid,
-            'project_number': invoice.project.project_number if invoice.project else None,
-            'project_name': invoice.project.project_name if invoice.project else None,
-            'total_amount': net_amount,
+        preview_summary = {
+            'total_entries': entry_count,
             'total_debits': total_debits,
             'total_credits': total_credits,
-            'line_items': line_items
+            'is_balanced': abs(total_debits - total_credits) < 0.01,
+            'balance_difference': abs(total_debits - total_credits)
         }
+        
+        yield f'], "chart_of_accounts": {app.json.dumps(chart_of_accounts_data)}, "preview_summary": {app.json.dumps(preview_summary)}, "success": true}}'
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error streaming journal entry preview: {e}")
+        yield f'], "success": false, "error": {app.json.dumps(f"Error generating preview: {str(e)}")}}}'
+
+def create_ap_invoice_net_entry_preview(invoice):
+    """Create preview for AP invoice net entry"""
+    try:
+        return build_preview_entry('ap_invoice_net', invoice)
     except Exception as e:
         print(f"Error creating AP invoice net entry preview: {e}")
         return None
@@ -699,68 +1113,7 @@ def create_ap_invoice_net_entry_preview(invoice):
 def create_ap_invoice_retainage_entry_preview(invoice):
     """Create preview for AP invoice retainage entry"""
     try:
-        retainage_amount = float(invoice.retention_held or 0)
-        if retainage_amount <= 0:
-            return None
-            
-        gross_amount = sum(float(line.total_amount or 0) for line in invoice.line_items)
-        
-        line_items = []
-        total_debits = 0
-        total_credits = 0
-        
-        # Debit: Expense accounts (proportional retainage amounts)
-        for line in invoice.line_items:
-            if gross_amount > 0:
-                line_proportion = float(line.total_amount or 0) / gross_amount
-                line_retainage_amount = retainage_amount * line_proportion
-                
-                if line_retainage_amount > 0:
-                    expense_account_vuid = 'b6a4b081-3149-4f16-9ecb-7aa866937abe'  # Default
-                    if line.cost_type and line.cost_type.expense_account:
-                        if len(line.cost_type.expense_account) == 36:
-                            expense_account_vuid = line.cost_type.expense_account
-                        else:
-                            account = ChartOfAccounts.query.filter_by(account_name=line.cost_type.expense_account).first()
-                            if account:
-                                expense_account_vuid = account.vuid
-                    
-                    line_items.append({
-                        'gl_account_vuid': expense_account_vuid,
-                        'description': f"{line.cost_code.code if line.cost_code else ''} - Retainage",
-                        'debit_amount': line_retainage_amount,
-                        'credit_amount': 0
-                    })
-                    total_debits += line_retainage_amount
-        
-        # Credit: Retainage Payable
-        if retainage_amount > 0:
-            # Look up Retainage Payable account using shared utility
-            retainage_account_vuid = get_account_vuid_by_name('Retainage Payable', 'c1d2e3f4-g5h6-7890-ijkl-mn1234567890')
-            
-            line_items.append({
-                'gl_account_vuid': retainage_account_vuid,
-                'description': f'AP Invoice {invoice.invoice_number} Retainage',
-                'debit_amount': 0,
-                'credit_amount': retainage_amount
-            })
-            total_credits += retainage_amount
-        
-        return {
-            'type': 'Retainage Entry',
-            'reference_number': f"{invoice.invoice_number}-RET",
-            'journal_number': f"JE-AP-RET-{invoice.invoice_number}",
-            'description': f"AP Invoice {invoice.invoice_number} (Retainage)",
-            'reference_type': 'ap_invoice_retainage',
-            'reference_vuid': invoice.vuid,
-            'project_vuid': invoice.project_vuid,
-            'project_number': invoice.project.project_number if invoice.project else None,
-            'project_name': invoice.project.project_name if invoice.project else None,
-            'total_amount': retainage_amount,
-            'total_debits': total_debits,
-            'total_credits': total_credits,
-            'line_items': line_items
-        }
+        return build_preview_entry('ap_invoice_retainage', invoice)
     except Exception as e:
         print(f"Error creating AP invoice retainage entry preview: {e}")
         return None
@@ -768,70 +1121,7 @@ def create_ap_invoice_retainage_entry_preview(invoice):
 def create_ap_invoice_combined_entry_preview(invoice):
     """Create preview for AP invoice combined entry (gross amount)"""
     try:
-        gross_amount = float(invoice.total_amount or 0) + float(invoice.retention_held or 0)
-        
-        line_items = []
-        total_debits = 0
-        total_credits = 0
-        
-        # Debit: Expense accounts (proportional gross amounts)
-        for line in invoice.line_items:
-            if gross_amount > 0:
-                line_proportion = float(line.total_amount or 0) / gross_amount
-                line_gross_amount = gross_amount * line_proportion
-                
-                if line_gross_amount > 0:
-                    expense_account_vuid = 'b6a4b081-3149-4f16-9ecb-7aa866937abe'  # Default
-                    if line.cost_type and line.cost_type.expense_account:
-                        if len(line.cost_type.expense_account) == 36:
-                            expense_account_vuid = line.cost_type.expense_account
-                        else:
-                            account = ChartOfAccounts.query.filter_by(account_name=line.cost_type.expense_account).first()
-                            if account:
-                                expense_account_vuid = account.vuid
-                    
-                    line_items.append({
-                        'gl_account_vuid': expense_account_vuid,
-                        'description': f"{line.cost_code.code if line.cost_code else ''} - {line.description or 'AP Invoice Line'}",
-                        'debit_amount': line_gross_amount,
-                        'credit_amount': 0
-                    })
-                    total_debits += line_gross_amount
-        
-        # Credit: Accounts Payable (net) + Retainage Payable (retainage)
-        net_amount = float(invoice.total_amount or 0)
-        retainage_amount = float(invoice.retention_held or 0)
-        
-        if net_amount > 0:
-            line_items.append({
-                'gl_account_vuid': 'a1b2c3d4-e5f6-7890-abcd-ef1234567890',  # Accounts Payable
-                'description': f'AP Invoice {invoice.invoice_number} (Net)',
-                'debit_amount': 0,
-                'credit_amount': net_amount
-            })
-            total_credits += net_amount
-        
-        if retainage_amount > 0:
-            line_items.append({
-                'gl_account_vuid': 'c1d2e3f4-g5h6-7890-ijkl-mn1234567890',  # Retainage Payable
-                'description': f'AP Invoice {invoice.invoice_number} (Retainage)',
-                'debit_amount': 0,
-                'credit_amount': retainage_amount
-            })
-            total_credits += retainage_amount
-        
-        return {
-            'journal_number': f"JE-AP-{invoice.invoice_number}",
-            'description': f"AP Invoice {invoice.invoice_number}",
-            'reference_type': 'ap_invoice',
-            'reference_vuid': invoice.vuid,
-            'project_vuid': invoice.project_vuid,
-            'project_number': invoice.project.project_number if invoice.project else None,
-            'total_amount': gross_amount,
-            'total_debits': total_debits,
-            'total_credits': total_credits,
-            'line_items': line_items
-        }
+        return build_preview_entry('ap_invoice_combined', invoice)
     except Exception as e:
         print(f"Error creating AP invoice combined entry preview: {e}")
         return None
@@ -839,74 +1129,7 @@ def create_ap_invoice_combined_entry_preview(invoice):
 def create_project_billing_net_entry_preview(billing):
     """Create preview for project billing net entry"""
     try:
-        # Calculate retainage from line items (since billing.retention_held might be 0)
-        total_line_retainage_held = sum(float(line.retention_held or 0) for line in billing.line_items)
-        total_line_retainage_released = sum(float(line.retention_released or 0) for line in billing.line_items)
-        
-        # Calculate net amount: total - retainage held + retainage released
-        print(f"DEBUG create_project_billing_net_entry_preview:")
-        print(f"  billing.total_amount = {billing.total_amount}")
-        print(f"  billing.retention_held = {billing.retention_held}")
-        print(f"  billing.retention_released = {billing.retention_released}")
-        print(f"  total_line_retainage_held = {total_line_retainage_held}")
-        print(f"  total_line_retainage_released = {total_line_retainage_released}")
-        
-        # Use line item retainage if billing-level retainage is not set
-        retainage_held = float(billing.retention_held or 0) if billing.retention_held else total_line_retainage_held
-        retainage_released = float(billing.retention_released or 0) if billing.retention_released else total_line_retainage_released
-        
-        net_amount = float(billing.total_amount or 0) - retainage_held + retainage_released
-        print(f"  Final retainage_held = {retainage_held}")
-        print(f"  Final retainage_released = {retainage_released}")
-        print(f"  Calculated net_amount = {net_amount}")
-        
-        line_items = []
-        total_debits = 0
-        total_credits = 0
-        
-        # Get the correct account VUIDs
-        ar_account = ChartOfAccounts.query.filter(ChartOfAccounts.account_name.ilike('%receivable%')).first()
-        revenue_account = ChartOfAccounts.query.filter(ChartOfAccounts.account_name.ilike('%revenue%')).first()
-        
-        if not ar_account or not revenue_account:
-            print("Required accounts not found for project billing preview")
-            return None
-        
-        # Debit: Accounts Receivable (net - excluding new retainage)
-        if net_amount > 0:
-            line_items.append({
-                'gl_account_vuid': ar_account.vuid,
-                'description': f'Project Billing {billing.billing_number} (Net)',
-                'debit_amount': net_amount,
-                'credit_amount': 0
-            })
-            total_debits += net_amount
-        
-        # Credit: Construction Revenue (net - excluding new retainage)
-        if net_amount > 0:
-            line_items.append({
-                'gl_account_vuid': revenue_account.vuid,
-                'description': f'Project Billing {billing.billing_number} (Net)',
-                'debit_amount': 0,
-                'credit_amount': net_amount
-            })
-            total_credits += net_amount
-        
-        return {
-            'type': 'Project Billing',
-            'reference_number': billing.billing_number,
-            'journal_number': f"JE-PB-{billing.billing_number}",
-            'description': f"Project Billing {billing.billing_number} (Net)",
-            'reference_type': 'project_billing',
-            'reference_vuid': billing.vuid,
-            'project_vuid': billing.project_vuid,
-            'project_number': billing.project.project_number if billing.project else None,
-            'project_name': billing.project.project_name if billing.project else None,
-            'total_amount': net_amount,
-            'total_debits': total_debits,
-            'total_credits': total_credits,
-            'line_items': line_items
-        }
+        return build_preview_entry('project_billing_net', billing)
     except Exception as e:
         print(f"Error creating project billing net entry preview: {e}")
         return None
@@ -914,55 +1137,7 @@ def create_project_billing_net_entry_preview(billing):
 def create_project_billing_retainage_entry_preview(billing):
     """Create preview for project billing retainage entry"""
     try:
-        retainage_amount = float(billing.retention_held or 0)
-        if retainage_amount <= 0:
-            return None
-        
-        line_items = []
-        total_debits = 0
-        total_credits = 0
-        
-        # Get the correct account VUIDs
-        ar_account = ChartOfAccounts.query.filter(ChartOfAccounts.account_name.ilike('%receivable%')).first()
-        retainage_account = ChartOfAccounts.query.filter(ChartOfAccounts.account_name.ilike('%retainage%')).first()
-        
-        if not ar_account or not retainage_account:
-            print("Required accounts not found for project billing retainage preview")
-            return None
-        
-        # Debit: Accounts Receivable (retainage)
-        line_items.append({
-            'gl_account_vuid': ar_account.vuid,
-            'description': f'Project Billing {billing.billing_number} (Retainage)',
-            'debit_amount': retainage_amount,
-            'credit_amount': 0
-        })
-        total_debits += retainage_amount
-        
-        # Credit: Retainage Receivables
-        line_items.append({
-            'gl_account_vuid': retainage_account.vuid,
-            'description': f'Project Billing {billing.billing_number} (Retainage)',
-            'debit_amount': 0,
-            'credit_amount': retainage_amount
-        })
-        total_credits += retainage_amount
-        
-        return {
-            'type': 'Retainage Entry',
-            'reference_number': f"{billing.billing_number}-RET",
-            'journal_number': f"JE-RET-PB-{billing.billing_number}",
-            'description': f"Project Billing {billing.billing_number} (Retainage)",
-            'reference_type': 'project_billing_retainage',
-            'reference_vuid': billing.vuid,
-            'project_vuid': billing.project_vuid,
-            'project_number': billing.project.project_number if billing.project else None,
-            'project_name': billing.project.project_name if billing.project else None,
-            'total_amount': retainage_amount,
-            'total_debits': total_debits,
-            'total_credits': total_credits,
-            'line_items': line_items
-        }
+        return build_preview_entry('project_billing_retainage', billing)
     except Exception as e:
         print(f"Error creating project billing retainage entry preview: {e}")
         return None
@@ -970,55 +1145,7 @@ def create_project_billing_retainage_entry_preview(billing):
 def create_project_billing_combined_entry_preview(billing):
     """Create preview for project billing combined entry (gross amount)"""
     try:
-        gross_amount = float(billing.total_amount or 0) + float(billing.retention_held or 0)
-        net_amount = float(billing.total_amount or 0)
-        retainage_amount = float(billing.retention_held or 0)
-        
-        line_items = []
-        total_debits = 0
-        total_credits = 0
-        
-        # Debit: Accounts Receivable (gross)
-        if gross_amount > 0:
-            line_items.append({
-                'gl_account_vuid': 'd1e2f3g4-h5i6-7890-jklm-no1234567890',  # Accounts Receivable
-                'description': f'Project Billing {billing.billing_number}',
-                'debit_amount': gross_amount,
-                'credit_amount': 0
-            })
-            total_debits += gross_amount
-        
-        # Credit: Construction Revenue (net) + Retainage Receivables (retainage)
-        if net_amount > 0:
-            line_items.append({
-                'gl_account_vuid': 'e1f2g3h4-i5j6-7890-klmn-op1234567890',  # Construction Revenue
-                'description': f'Project Billing {billing.billing_number} (Net)',
-                'debit_amount': 0,
-                'credit_amount': net_amount
-            })
-            total_credits += net_amount
-        
-        if retainage_amount > 0:
-            line_items.append({
-                'gl_account_vuid': 'f1g2h3i4-j5k6-7890-lmno-pq1234567890',  # Retainage Receivables
-                'description': f'Project Billing {billing.billing_number} (Retainage)',
-                'debit_amount': 0,
-                'credit_amount': retainage_amount
-            })
-            total_credits += retainage_amount
-        
-        return {
-            'journal_number': f"JE-PB-{billing.billing_number}",
-            'description': f"Project Billing {billing.billing_number}",
-            'reference_type': 'project_billing',
-            'reference_vuid': billing.vuid,
-            'project_vuid': billing.project_vuid,
-            'project_number': billing.project.project_number if billing.project else None,
-            'total_amount': gross_amount,
-            'total_debits': total_debits,
-            'total_credits': total_credits,
-            'line_items': line_items
-        }
+        return build_preview_entry('project_billing_combined', billing)
     except Exception as e:
         print(f"Error creating project billing combined entry preview: {e}")
         return None
@@ -1026,63 +1153,7 @@ def create_project_billing_combined_entry_preview(billing):
 def create_labor_cost_journal_entry_preview(labor_cost):
     """Create preview for labor cost journal entry"""
     try:
-        amount = float(labor_cost.amount or 0)
-        if amount <= 0:
-            return None
-        
-        line_items = []
-        total_debits = 0
-        total_credits = 0
-        
-        # Get employee name
-        employee_name = "Unknown"
-        if hasattr(labor_cost, 'employee') and labor_cost.employee:
-            employee_name = labor_cost.employee.employee_name
-        elif hasattr(labor_cost, 'employee_id') and labor_cost.employee_id:
-            employee_name = f"Employee {labor_cost.employee_id}"
-        
-        # Debit: Construction Costs
-        line_items.append({
-            'gl_account_vuid': 'b6a4b081-3149-4f16-9ecb-7aa866937abe',  # Construction Costs
-            'description': f'Labor Cost - {employee_name}',
-            'debit_amount': amount,
-            'credit_amount': 0
-        })
-        total_debits += amount
-        
-        # Credit: Wages Payable (fallback to Accounts Payable)
-        # Look up Wages Payable account, fallback to Accounts Payable using shared utility
-        wages_account_vuid = get_account_vuid_by_name('Wages Payable', None)
-        if not wages_account_vuid:
-            wages_account_vuid = get_account_vuid_by_name('Accounts Payable', 'g1h2i3j4-k5l6-7890-mnop-qr1234567890')
-        
-        line_items.append({
-            'gl_account_vuid': wages_account_vuid,
-            'description': f'Labor Cost - {employee_name}',
-            'debit_amount': 0,
-            'credit_amount': amount
-        })
-        total_credits += amount
-        
-        # Check if entry is balanced (debits = credits)
-        is_balanced = abs(total_debits - total_credits) < 0.01  # Allow for small rounding differences
-        
-        return {
-            'type': 'Labor Cost',
-            'reference_number': f"{labor_cost.employee_id or 'UNK'}-{labor_cost.payroll_date or 'UNK'}",
-            'journal_number': f"JE-LC-{labor_cost.employee_id or 'UNK'}-{labor_cost.payroll_date or 'UNK'}",
-            'description': f"Labor Cost - {employee_name}",
-            'reference_type': 'labor_cost',
-            'reference_vuid': labor_cost.vuid,
-            'project_vuid': labor_cost.project_vuid,
-            'project_number': labor_cost.project.project_number if labor_cost.project else None,
-            'project_name': labor_cost.project.project_name if labor_cost.project else None,
-            'total_amount': amount,
-            'total_debits': total_debits,
-            'total_credits': total_credits,
-            'is_balanced': is_balanced,
-            'line_items': line_items
-        }
+        return build_preview_entry('labor_cost', labor_cost)
     except Exception as e:
         print(f"Error creating labor cost journal entry preview: {e}")
         return None
@@ -1090,47 +1161,7 @@ def create_labor_cost_journal_entry_preview(labor_cost):
 def create_project_expense_journal_entry_preview(expense):
     """Create preview for project expense journal entry"""
     try:
-        amount = float(expense.amount or 0)
-        if amount <= 0:
-            return None
-        
-        line_items = []
-        total_debits = 0
-        total_credits = 0
-        
-        # Debit: Construction Costs
-        line_items.append({
-            'gl_account_vuid': 'b6a4b081-3149-4f16-9ecb-7aa866937abe',  # Construction Costs
-            'description': f'Project Expense - {expense.description or "Unknown"}',
-            'debit_amount': amount,
-            'credit_amount': 0
-        })
-        total_debits += amount
-        
-        # Credit: Accounts Payable
-        # Look up Accounts Payable account using shared utility
-        ap_account_vuid = get_account_vuid_by_name('Accounts Payable', 'a1b2c3d4-e5f6-7890-abcd-ef1234567890')
-        
-        line_items.append({
-            'gl_account_vuid': ap_account_vuid,
-            'description': f'Project Expense - {expense.description or "Unknown"}',
-            'debit_amount': 0,
-            'credit_amount': amount
-        })
-        total_credits += amount
-        
-        return {
-            'journal_number': f"JE-PE-{expense.expense_number or 'EXP'}",
-            'description': f"Project Expense - {expense.description or 'Unknown'}",
-            'reference_type': 'project_expense',
-            'reference_vuid': expense.vuid,
-            'project_vuid': expense.project_vuid,
-            'project_number': expense.project.project_number if expense.project else None,
-            'total_amount': amount,
-            'total_debits': total_debits,
-            'total_credits': total_credits,
-            'line_items': line_items
-        }
+        return build_preview_entry('project_expense', expense)
     except Exception as e:
         print(f"Error creating project expense journal entry preview: {e}")
         return None
@@ -1141,8 +1172,8 @@ def create_over_under_billing_entries_preview(wip_data, accounting_period_vuid):
     
     try:
         # Get the correct account VUIDs from the database
-        cost_in_excess_account = ChartOfAccounts.query.filter(ChartOfAccounts.account_name.ilike('%costs in excess%')).first()
-        revenue_account = ChartOfAccounts.query.filter(ChartOfAccounts.account_name.ilike('%revenue%')).first()
+        cost_in_excess_account = find_gl_account('%costs in excess%')
+        revenue_account = find_gl_account('%revenue%')
         
         if not cost_in_excess_account or not revenue_account:
             print("Required accounts not found for over/under billing preview")
@@ -1204,6 +1235,11 @@ def get_wip_report_data(accounting_period_vuid):
         wip_settings = WIPReportSetting.query.filter_by(setting_name='use_eac_for_percent_complete').first()
         eac_enabled = wip_settings.setting_value == 'true' if wip_settings else False
         
+        # EAC data for every project at once
+        eac_data_by_project = {}
+        if eac_enabled:
+            eac_data_by_project = get_wip_eac_data_bulk([project.vuid for project in projects], accounting_period_vuid)
+        
         for project in projects:
             # Get contracts for this project
             contracts = ProjectContract.query.filter_by(project_vuid=project.vuid).all()
@@ -1243,18 +1279,10 @@ def get_wip_report_data(accounting_period_vuid):
             # Calculate project billings total using same logic as main WIP endpoint
             project_billings_query = ProjectBilling.query.filter_by(project_vuid=project.vuid, status='approved')
             
-            # Get the accounting period to use the same period filtering logic as main WIP endpoint
-            accounting_period = AccountingPeriod.query.get(accounting_period_vuid)
-            if accounting_period:
-                # Get all periods up to and including the selected period (same logic as main WIP endpoint)
-                periods_to_include = AccountingPeriod.query.filter(
-                    db.or_(
-                        db.and_(AccountingPeriod.year < accounting_period.year),
-                        db.and_(AccountingPeriod.year == accounting_period.year, AccountingPeriod.month <= accounting_period.month)
-                    )
-                ).all()
-                period_vuids = [p.vuid for p in periods_to_include]
-                project_billings_query = project_billings_query.filter(ProjectBilling.accounting_period_vuid.in_(period_vuids))
+            # Get all periods up to and including the selected period (same logic as main WIP endpoint)
+            periods_to_date = get_periods_to_date_select(accounting_period_vuid)
+            if periods_to_date is not None:
+                project_billings_query = project_billings_query.filter(ProjectBilling.accounting_period_vuid.in_(periods_to_date))
             
             project_billings = project_billings_query.all()
             project_billings_total = 0.0
@@ -1270,7 +1298,7 @@ def get_wip_report_data(accounting_period_vuid):
             # Calculate percentage complete and revenue recognized
             if eac_enabled:
                 # Use EAC for percent complete calculation
-                eac_amount, _, _ = get_wip_eac_data(project.vuid, accounting_period_vuid)
+                eac_amount, _, _ = eac_data_by_project[project.vuid]
                 if eac_amount > 0:
                     percent_complete = (costs_to_date / eac_amount) * 100
                 else:
@@ -1477,11 +1505,13 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import config
 
-# Database configuration
-app.config.from_object(config['development'])
+# Database configuration (FLASK_ENV picks the profile, including its connection pools)
+app.config.from_object(config.get(os.environ.get('FLASK_ENV'), config['default']))
+
+from app.db_pools import PoolRoutingSession, REPORTS_POOL, get_db_pool, use_db_pool
 
 # Initialize extensions
-db = SQLAlchemy(app)
+db = SQLAlchemy(app, session_options={'class_': PoolRoutingSession})
 ma = Marshmallow(app)
 migrate = Migrate(app, db)
 
@@ -1496,6 +1526,28 @@ CORS(app,
 from app.health import health_bp
 app.register_blueprint(health_bp, url_prefix='/api')
 
+from app.serializers import compile_schema, dump_fast, fast_jsonify
+
+# Report pool routing
+# Long-running report reads and exports use the reports pool (see app/db_pools.py) so a
+# burst of them at month end cannot take every connection from interactive requests.
+REPORT_ENDPOINTS = {
+    'get_wip_report',
+    'get_wip_report_from_posted_records',
+    'preview_journal_entries_for_period',
+    'preview_journal_entries_from_posted_records',
+    'get_posted_records_for_period',
+    'get_buyout_forecasting_data',
+    'get_project_financial_summary',
+    'validate_all_projects_financial_alignment',
+}
+
+@app.before_request
+def route_report_requests_to_reports_pool():
+    """Send report endpoints and NDJSON/CSV exports to the reports connection pool"""
+    if request.endpoint in REPORT_ENDPOINTS or request.args.get('format') in EXPORT_FORMATS:
+        use_db_pool(REPORTS_POOL)
+
 # Import required modules for CSV processing
 import csv
 import io
@@ -1552,6 +1604,791 @@ def check_record_edit_permission(accounting_period_vuid, record_type, record_vui
     
     return True, "Record can be edited"
 
+# List endpoint pagination
+# Transaction list endpoints take the same query parameters:
+#   sort=<field> or sort=-<field>   sort by a whitelisted field, vuid breaks ties
+#   limit=<n>, cursor=<token>       keyset pagination; the response becomes
+#                                   {'data': [...], 'next_cursor': ..., 'has_more': ...}
+#   include_total=true              add 'total_count' to a paginated response
+#   fields=a,b,c                    only return these keys (vuid is always returned)
+# Without limit or cursor the endpoints return a plain list as before.
+LIST_PAGE_DEFAULT_LIMIT = 100
+LIST_PAGE_MAX_LIMIT = 1000
+
+def get_list_query_args(sort_fields, default_sort='-created_at'):
+    """
+    Read the list endpoint query parameters from the request.
+    
+    Args:
+        sort_fields: Model fields the endpoint allows sorting on
+        default_sort: Sort used when paginating without a sort parameter
+        
+    Returns:
+        dict: Parsed list arguments for get_list_page and make_list_response
+        
+    Raises:
+        ValueError: If a parameter is invalid
+    """
+    sort = request.args.get('sort')
+    cursor = request.args.get('cursor')
+    limit = request.args.get('limit')
+    paginate = limit is not None or cursor is not None
+    
+    sort_spec = sort or (default_sort if paginate else None)
+    if sort_spec and sort_spec.lstrip('-') not in sort_fields:
+        raise ValueError(f"sort must be one of: {', '.join(sort_fields)} (prefix with - for descending)")
+    
+    if limit is None:
+        limit = LIST_PAGE_DEFAULT_LIMIT
+    else:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValueError("limit must be an integer")
+        if limit < 1 or limit > LIST_PAGE_MAX_LIMIT:
+            raise ValueError(f"limit must be between 1 and {LIST_PAGE_MAX_LIMIT}")
+    
+    fields = None
+    if request.args.get('fields'):
+        fields = {field.strip() for field in request.args['fields'].split(',') if field.strip()}
+        fields.add('vuid')
+    
+    return {
+        'paginate': paginate,
+        'sort': sort_spec,
+        'cursor': cursor,
+        'limit': limit,
+        'fields': fields,
+        'include_total': request.args.get('include_total', '').lower() == 'true'
+    }
+
+def encode_list_cursor(sort_spec, sort_value, vuid):
+    """Encode the position after a row as an opaque cursor token"""
+    if hasattr(sort_value, 'isoformat'):
+        sort_value = sort_value.isoformat()
+    elif sort_value is not None and not isinstance(sort_value, (str, int, float, bool)):
+        sort_value = str(sort_value)
+    payload = json.dumps([sort_spec, sort_value, vuid]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+def decode_list_cursor(cursor, sort_spec, sort_column):
+    """Decode a cursor token into (sort_value, vuid) for the current sort"""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        cursor_sort, sort_value, vuid = json.loads(payload)
+    except Exception:
+        raise ValueError("cursor is invalid")
+    
+    if cursor_sort != sort_spec:
+        raise ValueError("cursor was issued for a different sort")
+    
+    if sort_value is not None:
+        python_type = sort_column.type.python_type
+        try:
+            if hasattr(python_type, 'fromisoformat'):
+                sort_value = python_type.fromisoformat(sort_value)
+            else:
+                sort_value = python_type(sort_value)
+        except (TypeError, ValueError):
+            raise ValueError("cursor is invalid")
+    
+    return sort_value, vuid
+
+def get_list_cursor_filter(sort_column, vuid_column, sort_value, vuid, descending):
+    """
+    Build the keyset predicate for the rows after (sort_value, vuid), with NULL sort values
+    last when ascending and first when descending.
+    """
+    key = db.tuple_(sort_column, vuid_column)
+    if descending:
+        if sort_value is None:
+            return db.or_(db.and_(sort_column.is_(None), vuid_column < vuid), sort_column.isnot(None))
+        return db.and_(sort_column.isnot(None), key < (sort_value, vuid))
+    
+    if sort_value is None:
+        return db.and_(sort_column.is_(None), vuid_column > vuid)
+    return db.or_(key > (sort_value, vuid), sort_column.is_(None))
+
+def get_list_page(query, model, list_args, default_order=None):
+    """
+    Sort and paginate a list endpoint query.
+    
+    Pages are read with a keyset predicate on (sort field, vuid), so deep pages cost the
+    same as the first one when the sort is backed by an index. Sort fields may be NULL
+    (e.g. created_at on older rows): NULLs sort last ascending and first descending,
+    PostgreSQL's default, so the (sort field, vuid) indexes still serve the order.
+    
+    Args:
+        query: Filtered query for the endpoint; it may select extra columns after the model,
+            or select columns only, in which case they must include vuid and the sort fields
+        model: Model being listed; must have a vuid column
+        list_args: Result of get_list_query_args
+        default_order: Order used for unpaginated, unsorted requests
+        
+    Returns:
+        tuple: (rows, page) where page is None for unpaginated requests, otherwise a dict
+        with next_cursor, has_more and, when requested, total_count
+        
+    Raises:
+        ValueError: If the cursor is invalid
+    """
+    sort_spec = list_args['sort']
+    if not sort_spec:
+        if default_order is not None:
+            query = query.order_by(*default_order)
+        return query.all(), None
+    
+    descending = sort_spec.startswith('-')
+    sort_column = getattr(model, sort_spec.lstrip('-'))
+    if descending:
+        query = query.order_by(sort_column.desc().nulls_first(), model.vuid.desc())
+    else:
+        query = query.order_by(sort_column.asc().nulls_last(), model.vuid.asc())
+    
+    if not list_args['paginate']:
+        return query.all(), None
+    
+    page = {}
+    if list_args['include_total']:
+        page['total_count'] = query.order_by(None).count()
+    
+    if list_args['cursor']:
+        sort_value, vuid = decode_list_cursor(list_args['cursor'], sort_spec, sort_column)
+        query = query.filter(get_list_cursor_filter(sort_column, model.vuid, sort_value, vuid, descending))
+    
+    rows = query.limit(list_args['limit'] + 1).all()
+    has_more = len(rows) > list_args['limit']
+    rows = rows[:list_args['limit']]
+    
+    # Entity queries may select extra columns after the model (unwrap to the model);
+    # column-projected queries expose the sort field and vuid on the row itself
+    last_row = rows[-1] if has_more else None
+    if isinstance(last_row, Row) and isinstance(last_row[0], model):
+        last_row = last_row[0]
+    page['next_cursor'] = encode_list_cursor(sort_spec, getattr(last_row, sort_column.key), last_row.vuid) if last_row else None
+    page['has_more'] = has_more
+    return rows, page
+
+def make_list_response(data, page, list_args):
+    """Trim serialized rows to the requested fields and wrap paginated results"""
+    if list_args['fields']:
+        data = [{key: value for key, value in item.items() if key in list_args['fields']} for item in data]
+    
+    if page is None:
+        return fast_jsonify(data)
+    
+    return fast_jsonify(dict(page, data=data))
+
+# Streaming exports
+# Large report endpoints take format=ndjson or format=csv to stream rows as a download
+# instead of building one JSON document. Rows are read through server-side cursors
+# (yield_per) and written in chunks, so memory is bounded by EXPORT_BATCH_SIZE rather
+# than the size of the report. CSV exports write one line per row returned by the
+# endpoint's flatten function (e.g. one per journal entry line), under a fixed column list
+# per endpoint: a row with a key outside the list fails the export rather than losing the
+# value. The stream is compressed by compress_response like other large responses. An
+# error part way through ends the file with an error line.
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'csv': ('text/csv', 'csv'),
+}
+EXPORT_BATCH_SIZE = 500
+
+def get_export_format():
+    """
+    Read the export format requested with ?format=.
+    
+    Returns:
+        str: 'ndjson' or 'csv', or None for the endpoint's regular JSON response
+        
+    Raises:
+        ValueError: If the format is not supported
+    """
+    export_format = request.args.get('format')
+    if not export_format or export_format == 'json':
+        return None
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of: json, {', '.join(EXPORT_FORMATS)}")
+    return export_format
+
+def format_csv_value(value):
+    """Convert a row value to a CSV cell; nested values are written as JSON"""
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        return app.json.dumps(value)
+    return value
+
+def iter_export_chunks(rows, export_format, columns=None, flatten=None):
+    """
+    Encode rows as NDJSON lines or CSV text, one chunk per EXPORT_BATCH_SIZE lines.
+    
+    Args:
+        rows: Iterable of row dicts
+        export_format: 'ndjson' or 'csv'
+        columns: For CSV, the header; flat rows may leave columns out, but a key that is
+            not a column raises, ending the file with an error line
+        flatten: For CSV, function returning the flat dicts to write for a row
+    """
+    buffer = io.StringIO()
+    writer = None
+    line_count = 0
+    try:
+        if export_format == 'csv':
+            writer = csv.DictWriter(buffer, fieldnames=columns, restval='', extrasaction='raise')
+            writer.writeheader()
+        
+        for row in rows:
+            if export_format == 'ndjson':
+                buffer.write(app.json.dumps(row))
+                buffer.write('\n')
+                line_count += 1
+            else:
+                for flat_row in (flatten(row) if flatten else [row]):
+                    writer.writerow({key: format_csv_value(value) for key, value in flat_row.items()})
+                    line_count += 1
+            
+            if line_count >= EXPORT_BATCH_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                line_count = 0
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error streaming export: {e}")
+        if export_format == 'ndjson':
+            buffer.write(app.json.dumps({'success': False, 'error': f'Error generating export: {str(e)}'}) + '\n')
+        else:
+            csv.writer(buffer).writerow([f'ERROR: Error generating export: {str(e)}'])
+    
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def make_export_response(rows, export_format, filename, columns, flatten=None):
+    """
+    Build a streaming download response for an export.
+    
+    Args:
+        rows: Iterable of row dicts; it is consumed while the response is sent
+        export_format: 'ndjson' or 'csv'
+        filename: Download file name without extension
+        columns: CSV columns, matching the keys of the (flattened) rows
+        flatten: For CSV, function returning the flat dicts to write for a row
+        
+    Returns:
+        Response: Streaming response with a Content-Disposition attachment header
+    """
+    mimetype, extension = EXPORT_FORMATS[export_format]
+    return Response(
+        stream_with_context(iter_export_chunks(rows, export_format, columns, flatten)),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename="{filename}.{extension}"'}
+    )
+
+def make_line_item_columns(parent_columns, line_columns):
+    """CSV columns for rows flattened with flatten_line_items"""
+    return list(parent_columns) + [f'line_{column}' for column in line_columns]
+
+def get_schema_export_columns(schema, line_items_field='line_items'):
+    """CSV columns for a schema's dumped rows flattened with flatten_line_items"""
+    fields = schema.dump_fields
+    columns = [field.data_key or name for name, field in fields.items() if name != line_items_field]
+    if line_items_field not in fields:
+        return columns
+    line_fields = fields[line_items_field].schema.dump_fields
+    return make_line_item_columns(columns, [field.data_key or name for name, field in line_fields.items()])
+
+def flatten_line_items(row):
+    """CSV flatten function: one line per line item, with the parent fields repeated and line fields prefixed line_"""
+    parent = {key: value for key, value in row.items() if key != 'line_items'}
+    line_items = row.get('line_items') or []
+    if not line_items:
+        return [parent]
+    return [dict(parent, **{f'line_{key}': value for key, value in line_item.items()}) for line_item in line_items]
+
+def iter_query_batches(query, batch_size=EXPORT_BATCH_SIZE):
+    """Read a query through a server-side cursor, yielding lists of up to batch_size rows"""
+    batch = []
+    for row in query.yield_per(batch_size):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+# Response compression
+# JSON, NDJSON and CSV responses are compressed when the client accepts it: brotli if the
+# brotli package is installed and the client prefers it, otherwise gzip. Buffered bodies
+# below COMPRESSION_MIN_SIZE are sent as is; streamed responses are compressed chunk by
+# chunk as they are sent. Strong ETags get the encoding appended so each representation
+# has its own validator. Per-endpoint byte counts and compression CPU time are kept in
+# compression_metrics and served by /api/compression-metrics.
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5
+COMPRESSIBLE_MIMETYPES = {'application/json', 'application/x-ndjson', 'text/csv'}
+ETAG_ENCODING_SUFFIXES = ('', '-gzip', '-br')
+compression_metrics = {}
+compression_metrics_lock = threading.Lock()
+
+def get_response_content_encoding():
+    """Pick the content encoding for the current request, or None to send uncompressed"""
+    accept_encodings = request.accept_encodings
+    gzip_quality = accept_encodings.quality('gzip')
+    if brotli is not None and accept_encodings.quality('br') > 0 and accept_encodings.quality('br') >= gzip_quality:
+        return 'br'
+    if gzip_quality > 0:
+        return 'gzip'
+    return None
+
+def make_compressor(content_encoding):
+    """Get (compress, flush) functions of a streaming compressor for a content encoding"""
+    if content_encoding == 'br':
+        compressor = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+        return compressor.process, compressor.finish
+    compressor = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress, compressor.flush
+
+def record_compression_metrics(endpoint, content_encoding, bytes_in, bytes_out=0, cpu_seconds=0.0):
+    """Add one response to the compression metrics; content_encoding None means it was too small"""
+    with compression_metrics_lock:
+        metrics = compression_metrics.setdefault(endpoint, {
+            'compressed_responses': 0,
+            'skipped_responses': 0,
+            'bytes_in': 0,
+            'bytes_out': 0,
+            'cpu_seconds': 0.0,
+            'encodings': {}
+        })
+        if content_encoding is None:
+            metrics['skipped_responses'] += 1
+            return
+        metrics['compressed_responses'] += 1
+        metrics['bytes_in'] += bytes_in
+        metrics['bytes_out'] += bytes_out
+        metrics['cpu_seconds'] += cpu_seconds
+        metrics['encodings'][content_encoding] = metrics['encodings'].get(content_encoding, 0) + 1
+
+def iter_compressed_chunks(chunks, content_encoding, endpoint):
+    """Compress a streamed response body as it is sent and record its metrics at the end"""
+    compress, flush = make_compressor(content_encoding)
+    bytes_in = 0
+    bytes_out = 0
+    cpu_seconds = 0.0
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            start = time.thread_time()
+            compressed = compress(chunk)
+            cpu_seconds += time.thread_time() - start
+            bytes_in += len(chunk)
+            if compressed:
+                bytes_out += len(compressed)
+                yield compressed
+        
+        start = time.thread_time()
+        compressed = flush()
+        cpu_seconds += time.thread_time() - start
+        bytes_out += len(compressed)
+        yield compressed
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+        record_compression_metrics(endpoint, content_encoding, bytes_in, bytes_out, cpu_seconds)
+
+@app.after_request
+def compress_response(response):
+    """Compress JSON, NDJSON and CSV responses for clients that accept gzip or brotli"""
+    if (request.method == 'HEAD' or response.direct_passthrough
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or 'Content-Encoding' in response.headers):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    content_encoding = get_response_content_encoding()
+    if content_encoding is None:
+        return response
+    
+    endpoint = request.endpoint or request.path
+    if response.is_streamed:
+        response.response = iter_compressed_chunks(response.response, content_encoding, endpoint)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESSION_MIN_SIZE:
+            record_compression_metrics(endpoint, None, len(data))
+            return response
+        
+        start = time.thread_time()
+        compress, flush = make_compressor(content_encoding)
+        compressed = compress(data) + flush()
+        cpu_seconds = time.thread_time() - start
+        
+        response.set_data(compressed)
+        record_compression_metrics(endpoint, content_encoding, len(data), len(compressed), cpu_seconds)
+    
+    response.headers['Content-Encoding'] = content_encoding
+    etag, is_weak = response.get_etag()
+    if etag and not is_weak:
+        response.set_etag(f"{etag}-{content_encoding}")
+    return response
+
+@app.route('/api/compression-metrics', methods=['GET'])
+def get_compression_metrics():
+    """Get per-endpoint response compression metrics for this process"""
+    with compression_metrics_lock:
+        snapshot = {endpoint: dict(metrics, encodings=dict(metrics['encodings']))
+                    for endpoint, metrics in compression_metrics.items()}
+    
+    for metrics in snapshot.values():
+        compressed = metrics['compressed_responses']
+        metrics['compression_ratio'] = round(metrics['bytes_in'] / metrics['bytes_out'], 2) if metrics['bytes_out'] else None
+        metrics['avg_cpu_ms'] = round(metrics['cpu_seconds'] * 1000 / compressed, 3) if compressed else None
+        metrics['cpu_seconds'] = round(metrics['cpu_seconds'], 6)
+    
+    return jsonify({
+        'success': True,
+        'min_size': COMPRESSION_MIN_SIZE,
+        'brotli_available': brotli is not None,
+        'endpoints': snapshot
+    })
+
+# Accounting period ordinal helpers
+# Process-level cache of accounting period VUID -> period ordinal, keyed on the
+# accounting_periods data version so periods created, renumbered or deleted on any worker
+# are picked up. It is also reloaded on a miss and after ACCOUNTING_PERIOD_CACHE_SECONDS.
+ACCOUNTING_PERIOD_CACHE_SECONDS = 300
+accounting_period_ordinal_cache = {'ordinals': {}, 'data_version': None, 'loaded_at': None}
+
+def get_period_ordinal(year, month):
+    """Get the period ordinal (year * 12 + month) used to compare and range-filter periods"""
+    return year * 12 + month
+
+def get_accounting_period_ordinal(accounting_period_vuid):
+    """
+    Get an accounting period's ordinal from the process-level cache.
+    
+    Args:
+        accounting_period_vuid: The accounting period VUID
+    
+    Returns:
+        int: The period ordinal, or None if the period does not exist
+    """
+    if not accounting_period_vuid:
+        return None
+    
+    data_version = get_data_version(AccountingPeriod.__tablename__)
+    loaded_at = accounting_period_ordinal_cache['loaded_at']
+    is_stale = (loaded_at is None or time.monotonic() - loaded_at > ACCOUNTING_PERIOD_CACHE_SECONDS
+                or accounting_period_ordinal_cache['data_version'] != data_version)
+    if is_stale or accounting_period_vuid not in accounting_period_ordinal_cache['ordinals']:
+        accounting_period_ordinal_cache['ordinals'] = {
+            vuid: get_period_ordinal(year, month)
+            for vuid, year, month in db.session.query(AccountingPeriod.vuid, AccountingPeriod.year, AccountingPeriod.month).all()
+        }
+        accounting_period_ordinal_cache['data_version'] = data_version
+        accounting_period_ordinal_cache['loaded_at'] = time.monotonic()
+    
+    return accounting_period_ordinal_cache['ordinals'].get(accounting_period_vuid)
+
+def get_periods_to_date_select(accounting_period_vuid):
+    """
+    Build a subquery of the accounting period VUIDs up to and including a period, selected
+    with an indexed range predicate on period_ordinal. Use it in place of a list of VUIDs:
+    Model.accounting_period_vuid.in_(get_periods_to_date_select(accounting_period_vuid))
+    
+    Args:
+        accounting_period_vuid: The accounting period VUID
+    
+    Returns:
+        Select of AccountingPeriod.vuid, or None if the period does not exist
+    """
+    period_ordinal = get_accounting_period_ordinal(accounting_period_vuid)
+    if period_ordinal is None:
+        return None
+    return db.select(AccountingPeriod.vuid).where(AccountingPeriod.period_ordinal <= period_ordinal)
+
+# Data version counters
+# Version per table in the data_versions table, bumped in the same transaction as any
+# commit that changed the table through the ORM: flushed objects, Query.update()/delete()
+# and db.insert/update/delete statements. Raw text() statements are not tracked. Caches key
+# their entries on the versions of the tables they read, so a write on any worker
+# invalidates every worker's cache as soon as it commits. The versions are read with one
+# query per transaction and kept in session.info until the transaction ends.
+class DataVersion(db.Model):
+    """Change counter for one table, read by the response and lookup caches"""
+    __tablename__ = 'data_versions'
+    
+    table_name = db.Column(db.String(100), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+def get_data_version(*table_names):
+    """Get the current version of each table as a tuple, for use in cache keys"""
+    versions = db.session.info.get('data_versions')
+    if versions is None:
+        # No autoflush: callers may be part way through building objects
+        with db.session.no_autoflush:
+            versions = dict(db.session.query(DataVersion.table_name, DataVersion.version).all())
+        db.session.info['data_versions'] = versions
+    return tuple(versions.get(table_name, 0) for table_name in table_names)
+
+def bump_data_versions(connection, table_names):
+    """Move the version of each table forward on the given connection (in its transaction)"""
+    # Rows are upserted in name order so concurrent commits lock them in the same order
+    statement = pg_insert(DataVersion).values([
+        {'table_name': table_name, 'version': 1} for table_name in sorted(table_names)
+    ])
+    connection.execute(statement.on_conflict_do_update(
+        index_elements=[DataVersion.table_name],
+        set_={'version': DataVersion.version + 1}
+    ))
+
+@event.listens_for(db.session, 'after_flush')
+def record_flushed_tables(session, flush_context):
+    """Remember which tables a flush wrote to until the transaction commits"""
+    changed_tables = session.info.setdefault('changed_tables', set())
+    for instances in (session.new, session.dirty, session.deleted):
+        for instance in instances:
+            table_name = getattr(instance, '__tablename__', None)
+            if table_name:
+                changed_tables.add(table_name)
+
+@event.listens_for(db.session, 'do_orm_execute')
+def record_statement_tables(orm_execute_state):
+    """Remember which table an insert/update/delete statement wrote to"""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, 'table', None)
+        if table is not None and hasattr(table, 'name'):
+            orm_execute_state.session.info.setdefault('changed_tables', set()).add(table.name)
+
+@event.listens_for(db.session, 'before_commit')
+def bump_committed_tables(session):
+    """Bump the versions of the tables written by the committing transaction"""
+    # Flush first so the tables of pending changes are recorded too
+    session.flush()
+    changed_tables = session.info.pop('changed_tables', None)
+    if changed_tables:
+        bump_data_versions(session.connection(), changed_tables)
+
+@event.listens_for(db.session, 'after_rollback')
+def forget_rolled_back_tables(session):
+    """Drop the tables written by a rolled back transaction"""
+    session.info.pop('changed_tables', None)
+
+@event.listens_for(db.session, 'after_transaction_end')
+def forget_data_versions(session, transaction):
+    """Read the data versions again in the next transaction"""
+    session.info.pop('data_versions', None)
+
+# Reference data response cache
+# Rarely changing lists (cost codes, cost types, vendors, customers, chart of accounts,
+# accounting periods, WIP settings) are cached here as serialized JSON with a strong ETag
+# taken from the body. An entry is rebuilt when the data version of a table it reads moves
+# (any committed POST/PUT/DELETE through the ORM, on any worker) or after
+# REFERENCE_DATA_CACHE_SECONDS, which bounds staleness after raw SQL writes. A request whose
+# If-None-Match matches a fresh entry gets a 304 after only the data version query. The
+# ETag depends only on the payload, so it is the same on every worker.
+# Per-project payloads are kept in their own cache, cleared when it reaches
+# PROJECT_REFERENCE_DATA_CACHE_MAX_ENTRIES so the number of projects cannot grow it unbounded.
+REFERENCE_DATA_CACHE_SECONDS = 60
+PROJECT_REFERENCE_DATA_CACHE_MAX_ENTRIES = 256
+reference_data_cache = {}
+project_reference_data_cache = {}
+
+def get_reference_data_entry(cache_key, table_names, build_data, cache=None, max_entries=None):
+    """
+    Get a cached reference data payload, rebuilding it if it is stale.
+    
+    Args:
+        cache_key: Name of the cached payload
+        table_names: Tables the payload is read from
+        build_data: Function returning the JSON-serializable payload
+        cache: Cache dict to use; defaults to reference_data_cache
+        max_entries: Optional size limit; the cache is cleared before a new key would exceed it
+        
+    Returns:
+        dict: Cache entry with the serialized body and its ETag
+    """
+    if cache is None:
+        cache = reference_data_cache
+    
+    data_version = get_data_version(*table_names)
+    entry = cache.get(cache_key)
+    if entry and entry['data_version'] == data_version and time.monotonic() - entry['loaded_at'] <= REFERENCE_DATA_CACHE_SECONDS:
+        return entry
+    
+    body = fast_jsonify(build_data()).get_data()
+    entry = {
+        'data_version': data_version,
+        'loaded_at': time.monotonic(),
+        'body': body,
+        'etag': hashlib.sha256(body).hexdigest()
+    }
+    if max_entries and cache_key not in cache and len(cache) >= max_entries:
+        cache.clear()
+    cache[cache_key] = entry
+    return entry
+
+def make_etag_response(body, etag):
+    """Build a JSON response with a strong ETag, or a 304 if the client already has it"""
+    # Compressed responses carry the ETag with the encoding appended (see compress_response),
+    # so a 304 echoes back whichever representation's ETag the client holds
+    for suffix in ETAG_ENCODING_SUFFIXES:
+        if request.if_none_match.contains_weak(etag + suffix):
+            response = app.response_class(status=304)
+            response.set_etag(etag + suffix)
+            break
+    else:
+        response = app.response_class(body, mimetype=app.json.mimetype)
+        response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response
+
+# GL account resolution helpers
+# Process-level snapshot of the chart of accounts, the GL settings account mappings and
+# the AP/AR integration methods, used by the journal entry and posting builders instead
+# of a ChartOfAccounts/GLSettings query per line. It is keyed on the data versions of the
+# tables it reads, so a committed change on any worker forces a reload on the next lookup;
+# it is also reloaded after GL_ACCOUNT_CACHE_SECONDS to pick up raw SQL writes.
+GL_ACCOUNT_CACHE_SECONDS = 300
+GL_SETTINGS_ACCOUNT_FIELDS = [
+    'ap_invoices_account_vuid',
+    'ap_retainage_account_vuid',
+    'ar_invoices_account_vuid',
+    'ar_retainage_account_vuid',
+    'cost_in_excess_of_billing_account_vuid',
+    'billing_in_excess_of_cost_account_vuid'
+]
+INTEGRATION_METHOD_FIELDS = ['ap_invoice_integration_method', 'ar_invoice_integration_method']
+GLAccount = namedtuple('GLAccount', ['vuid', 'account_number', 'account_name', 'account_type', 'normal_balance', 'status'])
+GL_ACCOUNT_CACHE_TABLES = ('chart_of_accounts', 'gl_settings', 'project_gl_settings')
+gl_account_cache = {
+    'loaded_version': None,
+    'loaded_at': None,
+    'accounts': [],
+    'accounts_by_vuid': {},
+    'accounts_by_name': {},
+    'pattern_matches': {},
+    'gl_settings_accounts': {},
+    'project_gl_settings_accounts': {},
+    'integration_methods': {},
+    'project_integration_methods': {}
+}
+
+def get_gl_account_cache():
+    """
+    Get the GL account snapshot, reloading it if it is out of date or expired.
+    
+    Returns:
+        dict: The gl_account_cache dictionary
+    """
+    version = get_data_version(*GL_ACCOUNT_CACHE_TABLES)
+    loaded_at = gl_account_cache['loaded_at']
+    is_stale = loaded_at is None or time.monotonic() - loaded_at > GL_ACCOUNT_CACHE_SECONDS
+    if not is_stale and gl_account_cache['loaded_version'] == version:
+        return gl_account_cache
+    
+    accounts = [
+        GLAccount(*row) for row in db.session.query(
+            ChartOfAccounts.vuid, ChartOfAccounts.account_number, ChartOfAccounts.account_name,
+            ChartOfAccounts.account_type, ChartOfAccounts.normal_balance, ChartOfAccounts.status
+        ).all()
+    ]
+    
+    accounts_by_name = {}
+    for account in accounts:
+        accounts_by_name.setdefault(account.account_name, account)
+    
+    gl_settings = GLSettings.query.first()
+    gl_settings_accounts = {
+        field: getattr(gl_settings, field) for field in GL_SETTINGS_ACCOUNT_FIELDS
+    } if gl_settings else {}
+    
+    active_gl_settings = GLSettings.query.filter_by(status='active').first()
+    integration_methods = {
+        field: getattr(active_gl_settings, field) for field in INTEGRATION_METHOD_FIELDS
+    } if active_gl_settings else {}
+    
+    project_gl_settings_accounts = {}
+    project_integration_methods = {}
+    for project_settings in ProjectGLSettings.query.filter_by(status='active').all():
+        project_gl_settings_accounts.setdefault(project_settings.project_vuid, {
+            field: getattr(project_settings, field) for field in GL_SETTINGS_ACCOUNT_FIELDS
+        })
+        project_integration_methods.setdefault(project_settings.project_vuid, {
+            field: getattr(project_settings, field) for field in INTEGRATION_METHOD_FIELDS
+        })
+    
+    gl_account_cache.update({
+        'loaded_version': version,
+        'loaded_at': time.monotonic(),
+        'accounts': accounts,
+        'accounts_by_vuid': {account.vuid: account for account in accounts},
+        'accounts_by_name': accounts_by_name,
+        'pattern_matches': {},
+        'gl_settings_accounts': gl_settings_accounts,
+        'project_gl_settings_accounts': project_gl_settings_accounts,
+        'integration_methods': integration_methods,
+        'project_integration_methods': project_integration_methods
+    })
+    return gl_account_cache
+
+def get_gl_account(account_vuid):
+    """Get a GL account by VUID from the GL account snapshot, or None if it does not exist"""
+    if not account_vuid:
+        return None
+    return get_gl_account_cache()['accounts_by_vuid'].get(account_vuid)
+
+def get_gl_account_by_name(account_name):
+    """Get a GL account by exact account name from the GL account snapshot, or None if it does not exist"""
+    if not account_name:
+        return None
+    return get_gl_account_cache()['accounts_by_name'].get(account_name)
+
+def find_gl_account(name_pattern):
+    """
+    Find the first GL account whose name matches a SQL ILIKE pattern, e.g. '%accounts%payable%'.
+    
+    Args:
+        name_pattern: Case-insensitive LIKE pattern ('%' and '_' wildcards)
+    
+    Returns:
+        GLAccount, or None if no account name matches
+    """
+    cache = get_gl_account_cache()
+    if name_pattern not in cache['pattern_matches']:
+        regex = re.compile(
+            '.*'.join(re.escape(part).replace('_', '.') for part in name_pattern.split('%')),
+            re.IGNORECASE | re.DOTALL
+        )
+        cache['pattern_matches'][name_pattern] = next(
+            (account for account in cache['accounts'] if regex.fullmatch(account.account_name or '')),
+            None
+        )
+    return cache['pattern_matches'][name_pattern]
+
+def get_gl_settings_account_vuid(field, project_vuid=None):
+    """
+    Get the GL account VUID mapped to a GL settings field, preferring the project's
+    active project GL settings over the global GL settings.
+    
+    Args:
+        field: One of GL_SETTINGS_ACCOUNT_FIELDS, e.g. 'ar_invoices_account_vuid'
+        project_vuid: Optional project VUID to check for a project-specific override
+    
+    Returns:
+        str: The account VUID, or None if it is not mapped
+    """
+    cache = get_gl_account_cache()
+    if project_vuid:
+        account_vuid = cache['project_gl_settings_accounts'].get(project_vuid, {}).get(field)
+        if account_vuid:
+            return account_vuid
+    return cache['gl_settings_accounts'].get(field)
+
 def recalculate_ap_invoice_totals(invoice_vuid):
     """Recalculate and update an AP invoice's totals based on its line items"""
     try:
@@ -1569,52 +2406,331 @@ def recalculate_ap_invoice_totals(invoice_vuid):
             invoice.retention_held = retention_held
             invoice.retention_released = retention_released
             invoice.total_amount = total_amount
+            refresh_cost_rollup_for_record(invoice)
             
             db.session.commit()
     except Exception as e:
         print(f"Error recalculating AP invoice totals: {e}")
         db.session.rollback()
 
-# Models
-class CostType(db.Model):
-    __tablename__ = 'cost_types'
-    
-    vuid = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    cost_type = db.Column(db.String(100), nullable=False, unique=True)
-    abbreviation = db.Column(db.String(10), nullable=False, unique=True)
-    description = db.Column(db.Text, nullable=False)
-    status = db.Column(db.String(20), nullable=False, default='active')
-    expense_account = db.Column(db.String(50), nullable=False)
-    created_at = db.Column(db.DateTime, server_default=db.func.now())
+# Project cost rollup helpers
+# Source table name -> rollup source_type
+COST_ROLLUP_SOURCE_TYPES = {
+    'ap_invoices': 'ap_invoice',
+    'labor_costs': 'labor_cost',
+    'project_expenses': 'project_expense',
+    'project_billings': 'project_billing'
+}
+# Stored cost code / cost type for header-level sources and records without one
+COST_ROLLUP_NO_DIMENSION = ''
+
+def lock_cost_rollup_projects(project_vuids):
+    """
+    Lock the projects' rows until the transaction ends, so concurrent writes refresh a
+    project's rollup slices one at a time instead of both inserting the same rows.
+    Rows are locked in vuid order to avoid deadlocks between multi-project refreshes.
+    """
+    project_vuids = sorted({project_vuid for project_vuid in project_vuids if project_vuid})
+    if project_vuids:
+        db.session.query(Project.vuid).filter(
+            Project.vuid.in_(project_vuids)
+        ).order_by(Project.vuid).with_for_update().all()
 
-class Vendor(db.Model):
-    __tablename__ = 'vendors'
+def build_cost_rollup_query(source_type, project_vuid=None, accounting_period_vuid=None):
+    """
+    Build the grouped query that produces rollup rows for one source table.
+    Amounts and statuses match calculate_project_costs_to_date and
+    calculate_project_billings_total. AP invoices and project billings carry their
+    amounts on the header, so their rows have no cost code or cost type. A missing cost
+    code or cost type is stored as '' (COST_ROLLUP_NO_DIMENSION) so the unique key
+    applies to every row.
     
-    vuid = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    vendor_name = db.Column(db.String(200), nullable=False, unique=True)
-    vendor_number = db.Column(db.String(50), nullable=False, unique=True)
-    company_name = db.Column(db.String(200), nullable=False)
-    contact_person = db.Column(db.String(100))
-    email = db.Column(db.String(150))
-    phone = db.Column(db.String(20))
-    fax = db.Column(db.String(20))
-    website = db.Column(db.String(200))
+    Args:
+        source_type: 'ap_invoice', 'labor_cost', 'project_expense' or 'project_billing'
+        project_vuid: Optional project to limit the rows to
+        accounting_period_vuid: Optional accounting period to limit the rows to
     
-    # Address Information
-    address_line1 = db.Column(db.String(200))
-    address_line2 = db.Column(db.String(200))
-    city = db.Column(db.String(100))
-    state = db.Column(db.String(50))
-    postal_code = db.Column(db.String(20))
-    country = db.Column(db.String(100))
+    Returns:
+        Query yielding (project_vuid, accounting_period_vuid, cost_code_vuid, cost_type_vuid, amount, record_count)
+    """
+    if source_type == 'ap_invoice':
+        # AP Invoices - Use GROSS amount (total_amount + retention_held)
+        model = APInvoice
+        amount = db.func.coalesce(APInvoice.total_amount, 0) + db.func.coalesce(APInvoice.retention_held, 0)
+        status = 'approved'
+    elif source_type == 'labor_cost':
+        model = LaborCost
+        amount = LaborCost.amount
+        status = 'active'
+    elif source_type == 'project_expense':
+        model = ProjectExpense
+        amount = ProjectExpense.amount
+        status = 'approved'
+    elif source_type == 'project_billing':
+        # Project Billings - gross billed amount (total_amount)
+        model = ProjectBilling
+        amount = ProjectBilling.total_amount
+        status = 'approved'
+    else:
+        raise ValueError(f"Unknown cost rollup source type: {source_type}")
     
-    # Business Information
-    tax_id = db.Column(db.String(50))
-    duns_number = db.Column(db.String(20))
-    business_type = db.Column(db.String(50))
-    industry = db.Column(db.String(100))
+    group_columns = [model.project_vuid, model.accounting_period_vuid]
+    if source_type in ('labor_cost', 'project_expense'):
+        dimension_columns = [
+            db.func.coalesce(model.cost_code_vuid, COST_ROLLUP_NO_DIMENSION),
+            db.func.coalesce(model.cost_type_vuid, COST_ROLLUP_NO_DIMENSION)
+        ]
+        group_columns += dimension_columns
+    else:
+        dimension_columns = [
+            db.literal(COST_ROLLUP_NO_DIMENSION).label('cost_code_vuid'),
+            db.literal(COST_ROLLUP_NO_DIMENSION).label('cost_type_vuid')
+        ]
     
-    # Financial Information
+    query = db.session.query(
+        model.project_vuid,
+        model.accounting_period_vuid,
+        *dimension_columns,
+        db.func.sum(amount),
+        db.func.count(model.vuid)
+    ).filter(
+        model.project_vuid.isnot(None),
+        model.status == status
+    )
+    if project_vuid:
+        query = query.filter(model.project_vuid == project_vuid)
+    if accounting_period_vuid:
+        query = query.filter(model.accounting_period_vuid == accounting_period_vuid)
+    
+    return query.group_by(*group_columns)
+
+def make_cost_rollup_rows(source_type, query):
+    """Turn the rows of a build_cost_rollup_query query into ProjectCostRollup objects"""
+    return [
+        ProjectCostRollup(
+            project_vuid=project_vuid,
+            accounting_period_vuid=accounting_period_vuid,
+            cost_code_vuid=cost_code_vuid,
+            cost_type_vuid=cost_type_vuid,
+            source_type=source_type,
+            amount=amount or 0,
+            record_count=record_count
+        )
+        for project_vuid, accounting_period_vuid, cost_code_vuid, cost_type_vuid, amount, record_count in query.all()
+    ]
+
+def refresh_cost_rollup(source_type, project_vuid, accounting_period_vuid):
+    """
+    Recompute the rollup rows for one (project, period, source type) slice from its source table.
+    Runs in the caller's transaction, so the caller commits together with the source change.
+    The project row is locked first so concurrent refreshes of the slice are serialized.
+    """
+    if not project_vuid or not accounting_period_vuid:
+        return
+    
+    lock_cost_rollup_projects([project_vuid])
+    ProjectCostRollup.query.filter_by(
+        project_vuid=project_vuid,
+        accounting_period_vuid=accounting_period_vuid,
+        source_type=source_type
+    ).delete()
+    db.session.add_all(make_cost_rollup_rows(
+        source_type,
+        build_cost_rollup_query(source_type, project_vuid, accounting_period_vuid)
+    ))
+
+def refresh_cost_rollup_for_record(record, previous_keys=None):
+    """
+    Refresh the project cost rollup after a source record is created, edited, approved,
+    reversed or deleted. Call before committing the change.
+    
+    Args:
+        record: APInvoice, LaborCost, ProjectExpense or ProjectBilling row
+        previous_keys: Optional (project_vuid, accounting_period_vuid) the record had before an edit
+    """
+    source_type = COST_ROLLUP_SOURCE_TYPES[record.__tablename__]
+    slices = {(record.project_vuid, record.accounting_period_vuid)}
+    if previous_keys:
+        slices.add(tuple(previous_keys))
+    lock_cost_rollup_projects(project_vuid for project_vuid, _ in slices)
+    for project_vuid, accounting_period_vuid in sorted(slices, key=lambda key: tuple(value or '' for value in key)):
+        refresh_cost_rollup(source_type, project_vuid, accounting_period_vuid)
+
+def get_cost_rollup_totals(project_vuids, accounting_period_vuid=None):
+    """
+    Sum the project cost rollup by project and source type.
+    "To date" totals are a prefix sum over periods: every rollup row in a period on or
+    before the selected one (all periods when no period is selected, none when the
+    selected period does not exist).
+    
+    Args:
+        project_vuids: Projects to sum
+        accounting_period_vuid: Optional accounting period to sum through
+    
+    Returns:
+        dict: {project_vuid: {'to_date': {source_type: float}, 'current_period': {source_type: float}}}
+    """
+    totals = {project_vuid: {'to_date': {}, 'current_period': {}} for project_vuid in project_vuids}
+    if not totals:
+        return totals
+    
+    query = db.session.query(
+        ProjectCostRollup.project_vuid,
+        ProjectCostRollup.source_type,
+        db.func.sum(ProjectCostRollup.amount),
+        db.func.sum(db.case(
+            (ProjectCostRollup.accounting_period_vuid == accounting_period_vuid, ProjectCostRollup.amount),
+            else_=0
+        ))
+    ).filter(
+        ProjectCostRollup.project_vuid.in_(list(totals))
+    )
+    
+    if accounting_period_vuid:
+        period_ordinal = get_accounting_period_ordinal(accounting_period_vuid)
+        if period_ordinal is None:
+            # Unknown period: nothing is "to date" through it
+            return totals
+        query = query.join(
+            AccountingPeriod, ProjectCostRollup.accounting_period_vuid == AccountingPeriod.vuid
+        ).filter(
+            AccountingPeriod.period_ordinal <= period_ordinal
+        )
+    
+    for project_vuid, source_type, to_date_amount, current_period_amount in query.group_by(
+        ProjectCostRollup.project_vuid, ProjectCostRollup.source_type
+    ).all():
+        totals[project_vuid]['to_date'][source_type] = float(to_date_amount or 0)
+        totals[project_vuid]['current_period'][source_type] = float(current_period_amount or 0)
+    
+    return totals
+
+def rebuild_cost_rollups(project_vuid=None):
+    """
+    Rebuild the project cost rollup from the source tables.
+    
+    Args:
+        project_vuid: Optional project to rebuild; every project is rebuilt when omitted
+    
+    Returns:
+        int: Number of rollup rows written
+    """
+    try:
+        project_query = db.session.query(Project.vuid)
+        if project_vuid:
+            project_query = project_query.filter(Project.vuid == project_vuid)
+        lock_cost_rollup_projects(vuid for (vuid,) in project_query.all())
+        
+        rollup_query = ProjectCostRollup.query
+        if project_vuid:
+            rollup_query = rollup_query.filter_by(project_vuid=project_vuid)
+        rollup_query.delete()
+        
+        rows_written = 0
+        for source_type in COST_ROLLUP_SOURCE_TYPES.values():
+            rollup_rows = make_cost_rollup_rows(source_type, build_cost_rollup_query(source_type, project_vuid))
+            db.session.add_all(rollup_rows)
+            rows_written += len(rollup_rows)
+        
+        db.session.commit()
+        return rows_written
+    except Exception as e:
+        print(f"Error rebuilding project cost rollups: {e}")
+        db.session.rollback()
+        raise
+
+def check_cost_rollup_consistency(project_vuid=None):
+    """
+    Compare the project cost rollup against the source tables.
+    
+    Args:
+        project_vuid: Optional project to check; every project is checked when omitted
+    
+    Returns:
+        list: One dict per rollup key whose amount or record count does not match (empty when consistent)
+    """
+    expected = {}
+    for source_type in COST_ROLLUP_SOURCE_TYPES.values():
+        for row in build_cost_rollup_query(source_type, project_vuid).all():
+            expected[tuple(row[:4]) + (source_type,)] = (float(row[4] or 0), row[5])
+    
+    rollup_query = db.session.query(
+        ProjectCostRollup.project_vuid,
+        ProjectCostRollup.accounting_period_vuid,
+        ProjectCostRollup.cost_code_vuid,
+        ProjectCostRollup.cost_type_vuid,
+        ProjectCostRollup.source_type,
+        ProjectCostRollup.amount,
+        ProjectCostRollup.record_count
+    )
+    if project_vuid:
+        rollup_query = rollup_query.filter(ProjectCostRollup.project_vuid == project_vuid)
+    
+    # Duplicate rows for a key are added together so they show up as a mismatch
+    actual = {}
+    for row in rollup_query.all():
+        amount, record_count = actual.get(tuple(row[:5]), (0.0, 0))
+        actual[tuple(row[:5])] = (amount + float(row[5] or 0), record_count + (row[6] or 0))
+    
+    discrepancies = []
+    for key in sorted(set(expected) | set(actual), key=lambda key: tuple(value or '' for value in key)):
+        expected_amount, expected_count = expected.get(key, (0.0, 0))
+        rollup_amount, rollup_count = actual.get(key, (0.0, 0))
+        if round(expected_amount - rollup_amount, 2) != 0 or expected_count != rollup_count:
+            discrepancies.append({
+                'project_vuid': key[0],
+                'accounting_period_vuid': key[1],
+                'cost_code_vuid': key[2],
+                'cost_type_vuid': key[3],
+                'source_type': key[4],
+                'expected_amount': round(expected_amount, 2),
+                'rollup_amount': round(rollup_amount, 2),
+                'expected_count': expected_count,
+                'rollup_count': rollup_count
+            })
+    
+    return discrepancies
+
+# Models
+class CostType(db.Model):
+    __tablename__ = 'cost_types'
+    
+    vuid = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    cost_type = db.Column(db.String(100), nullable=False, unique=True)
+    abbreviation = db.Column(db.String(10), nullable=False, unique=True)
+    description = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='active')
+    expense_account = db.Column(db.String(50), nullable=False)
+    created_at = db.Column(db.DateTime, server_default=db.func.now())
+
+class Vendor(db.Model):
+    __tablename__ = 'vendors'
+    
+    vuid = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    vendor_name = db.Column(db.String(200), nullable=False, unique=True)
+    vendor_number = db.Column(db.String(50), nullable=False, unique=True)
+    company_name = db.Column(db.String(200), nullable=False)
+    contact_person = db.Column(db.String(100))
+    email = db.Column(db.String(150))
+    phone = db.Column(db.String(20))
+    fax = db.Column(db.String(20))
+    website = db.Column(db.String(200))
+    
+    # Address Information
+    address_line1 = db.Column(db.String(200))
+    address_line2 = db.Column(db.String(200))
+    city = db.Column(db.String(100))
+    state = db.Column(db.String(50))
+    postal_code = db.Column(db.String(20))
+    country = db.Column(db.String(100))
+    
+    # Business Information
+    tax_id = db.Column(db.String(50))
+    duns_number = db.Column(db.String(20))
+    business_type = db.Column(db.String(50))
+    industry = db.Column(db.String(100))
+    
+    # Financial Information
     credit_limit = db.Column(db.Numeric(15, 2))
     payment_terms = db.Column(db.String(100))
     discount_terms = db.Column(db.String(100))
@@ -1700,6 +2816,7 @@ class AccountingPeriod(db.Model):
     vuid = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     month = db.Column(db.Integer, nullable=False)  # 1-12
     year = db.Column(db.Integer, nullable=False)   # e.g., 2024
+    period_ordinal = db.Column(db.Integer, db.Computed('year * 12 + month', persisted=True), nullable=False, index=True)  # Generated, for "to date" range filters
     status = db.Column(db.String(20), nullable=False, default='open')  # 'open' or 'closed'
     description = db.Column(db.String(200))  # Optional description
     created_at = db.Column(db.DateTime, server_default=db.func.now())
@@ -1747,6 +2864,12 @@ class Project(db.Model):
     created_at = db.Column(db.DateTime, server_default=db.func.now())
     updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
     
+    # (sort field, vuid) for each sort field of the keyset-paginated /api/projects list
+    __table_args__ = (
+        db.Index('ix_projects_project_number_vuid', 'project_number', 'vuid'),
+        db.Index('ix_projects_project_name_vuid', 'project_name', 'vuid'),
+        db.Index('ix_projects_created_at_vuid', 'created_at', 'vuid'),
+    )
 
 class ProjectSetting(db.Model):
     __tablename__ = 'project_setting'
@@ -2071,7 +3194,7 @@ class ProjectBudgetLine(db.Model):
     __tablename__ = 'project_budget_lines'
     
     vuid = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    budget_vuid = db.Column(db.String(36), db.ForeignKey('project_budgets.vuid'), nullable=False)
+    budget_vuid = db.Column(db.String(36), db.ForeignKey('project_budgets.vuid'), nullable=False, index=True)
     cost_code_vuid = db.Column(db.String(36), nullable=False)  # Can reference cost_code.vuid or project_cost_codes.vuid
     cost_type_vuid = db.Column(db.String(36), db.ForeignKey('cost_types.vuid'), nullable=False)
     budget_amount = db.Column(db.Numeric(15, 2), nullable=False)
@@ -2116,6 +3239,7 @@ class ProjectBudgetLineBuyout(db.Model):
     # Unique constraint to prevent duplicate buyout records for same budget line and period
     __table_args__ = (
         db.UniqueConstraint('budget_line_vuid', 'accounting_period_vuid', name='unique_budget_line_period_buyout'),
+        db.Index('ix_project_budget_line_buyouts_project_period', 'project_vuid', 'accounting_period_vuid'),
     )
 
 class ProjectBuyoutForecastingSnapshot(db.Model):
@@ -2767,6 +3891,12 @@ class ProjectCommitmentItem(db.Model):
     # Relationships
     cost_code = db.relationship('CostCode')
     cost_type = db.relationship('CostType')
+    
+    # (sort field, vuid) for each sort field of the keyset-paginated list endpoint
+    __table_args__ = (
+        db.Index('ix_project_commitment_items_created_at_vuid', 'created_at', 'vuid'),
+        db.Index('ix_project_commitment_items_total_amount_vuid', 'total_amount', 'vuid'),
+    )
 
 class CommitmentChangeOrder(db.Model):
     __tablename__ = 'commitment_change_orders'
@@ -2808,6 +3938,9 @@ class GLSettings(db.Model):
     ar_invoice_integration_method = db.Column(db.String(50), default='invoice', nullable=False)  # 'invoice' or 'journal_entries'
     labor_cost_integration_method = db.Column(db.String(20), default='actuals', nullable=False)  # 'actuals' or 'charge_rate'
     
+    # Journal numbering - blocks are reserved by reserve_journal_numbers
+    next_journal_number = db.Column(db.Integer, default=1, server_default='1', nullable=False)
+    
     # Metadata
     description = db.Column(db.String(200))
     status = db.Column(db.String(20), default='active')
@@ -2822,34 +3955,57 @@ class GLSettings(db.Model):
     cost_in_excess_of_billing_account = db.relationship('ChartOfAccounts', foreign_keys=[cost_in_excess_of_billing_account_vuid])
     billing_in_excess_of_cost_account = db.relationship('ChartOfAccounts', foreign_keys=[billing_in_excess_of_cost_account_vuid])
 
-def get_effective_ap_invoice_integration_method(project_vuid=None):
+def get_effective_integration_method(field, project_vuid=None):
     """
-    Get the effective AP invoice integration method for a project.
-    Returns project-specific setting if available, otherwise returns global setting.
+    Get the effective integration method for a project from the GL settings snapshot.
+    Returns the project-specific setting if available, otherwise the global setting.
     
     Args:
+        field: 'ap_invoice_integration_method' or 'ar_invoice_integration_method'
         project_vuid (str, optional): Project VUID to check for project-specific settings
         
     Returns:
         str: 'invoice' or 'journal_entries'
     """
+    cache = get_gl_account_cache()
+    
     # First check for project-specific settings
     if project_vuid:
-        project_gl_settings = ProjectGLSettings.query.filter_by(
-            project_vuid=project_vuid, 
-            status='active'
-        ).first()
-        
-        if project_gl_settings and project_gl_settings.ap_invoice_integration_method:
-            return project_gl_settings.ap_invoice_integration_method
+        method = cache['project_integration_methods'].get(project_vuid, {}).get(field)
+        if method:
+            return method
+    
+    # Fall back to global settings, then the default
+    return cache['integration_methods'].get(field) or INTEGRATION_METHOD_INVOICE
+
+def get_effective_integration_method_map(field, project_vuids):
+    """
+    Resolve the effective integration method for every project in a period run at once.
     
-    # Fall back to global settings
-    global_gl_settings = GLSettings.query.filter_by(status='active').first()
-    if global_gl_settings and global_gl_settings.ap_invoice_integration_method:
-        return global_gl_settings.ap_invoice_integration_method
+    Args:
+        field: 'ap_invoice_integration_method' or 'ar_invoice_integration_method'
+        project_vuids: Iterable of project VUIDs (None is allowed for unassigned documents)
+        
+    Returns:
+        dict: {project_vuid: 'invoice' or 'journal_entries'}
+    """
+    return {
+        project_vuid: get_effective_integration_method(field, project_vuid)
+        for project_vuid in set(project_vuids)
+    }
+
+def get_effective_ap_invoice_integration_method(project_vuid=None):
+    """
+    Get the effective AP invoice integration method for a project.
+    Returns project-specific setting if available, otherwise returns global setting.
     
-    # Default fallback
-    return 'invoice'
+    Args:
+        project_vuid (str, optional): Project VUID to check for project-specific settings
+        
+    Returns:
+        str: 'invoice' or 'journal_entries'
+    """
+    return get_effective_integration_method('ap_invoice_integration_method', project_vuid)
 
 def get_effective_ar_invoice_integration_method(project_vuid=None):
     """
@@ -2862,23 +4018,7 @@ def get_effective_ar_invoice_integration_method(project_vuid=None):
     Returns:
         str: 'invoice' or 'journal_entries'
     """
-    # First check for project-specific settings
-    if project_vuid:
-        project_gl_settings = ProjectGLSettings.query.filter_by(
-            project_vuid=project_vuid, 
-            status='active'
-        ).first()
-        
-        if project_gl_settings and project_gl_settings.ar_invoice_integration_method:
-            return project_gl_settings.ar_invoice_integration_method
-    
-    # Fall back to global settings
-    global_gl_settings = GLSettings.query.filter_by(status='active').first()
-    if global_gl_settings and global_gl_settings.ar_invoice_integration_method:
-        return global_gl_settings.ar_invoice_integration_method
-    
-    # Default fallback
-    return 'invoice'
+    return get_effective_integration_method('ar_invoice_integration_method', project_vuid)
 
 class ProjectGLSettings(db.Model):
     __tablename__ = 'project_gl_settings'
@@ -3073,37 +4213,124 @@ def home():
     return jsonify({'message': 'Vermillion API is running. Frontend should be accessed at http://localhost:3001'})
 
 # Project routes
-@app.route('/api/projects', methods=['GET'])
-def get_projects():
-    """Get all projects with financial calculations"""
-    projects = Project.query.all()
-    projects_data = []
+# Project list
+# The list is built from one statement: projects left-joined to per-project sums of
+# commitments, contract values and AP invoices. Serialized responses are cached per set of
+# query parameters and keyed on the data versions of those tables, so a write on any
+# worker invalidates them.
+PROJECT_LIST_CACHE_SECONDS = 30
+PROJECT_LIST_CACHE_MAX_ENTRIES = 256
+project_list_cache = {}
+
+def get_project_list_tables():
+    """Get the tables the project list totals are read from"""
+    return (Project.__tablename__, ProjectCommitment.__tablename__,
+            ProjectContract.__tablename__, APInvoice.__tablename__)
+
+def get_project_list_query(status=None, customer_vuid=None):
+    """
+    Build the project list query with committed, contract and paid totals per project.
     
-    for project in projects:
-        project_dict = project_schema.dump(project)
-        
-        # Calculate total commitment value
-        total_committed = db.session.query(db.func.sum(ProjectCommitment.original_amount))\
-            .filter(ProjectCommitment.project_vuid == project.vuid)\
-            .scalar() or 0
-        
-        # Calculate total contract value (from project contracts)
-        total_contract_value = db.session.query(db.func.sum(ProjectContract.contract_amount))\
-            .filter(ProjectContract.project_vuid == project.vuid)\
-            .scalar() or 0
-        
-        # Calculate total paid (from AP invoices)
-        total_paid = db.session.query(db.func.sum(APInvoice.total_amount))\
-            .filter(APInvoice.project_vuid == project.vuid)\
-            .scalar() or 0
+    Args:
+        status: Only include projects with this status
+        customer_vuid: Only include projects with a contract for this customer
         
+    Returns:
+        Query of (Project, total_committed, total_contract_value, total_paid) rows
+    """
+    committed = db.session.query(
+        ProjectCommitment.project_vuid.label('project_vuid'),
+        db.func.sum(ProjectCommitment.original_amount).label('total')
+    ).group_by(ProjectCommitment.project_vuid).subquery()
+    
+    contracted = db.session.query(
+        ProjectContract.project_vuid.label('project_vuid'),
+        db.func.sum(ProjectContract.contract_amount).label('total')
+    ).group_by(ProjectContract.project_vuid).subquery()
+    
+    paid = db.session.query(
+        APInvoice.project_vuid.label('project_vuid'),
+        db.func.sum(APInvoice.total_amount).label('total')
+    ).group_by(APInvoice.project_vuid).subquery()
+    
+    query = db.session.query(
+        Project,
+        db.func.coalesce(committed.c.total, 0).label('total_committed'),
+        db.func.coalesce(contracted.c.total, 0).label('total_contract_value'),
+        db.func.coalesce(paid.c.total, 0).label('total_paid')
+    ).outerjoin(committed, committed.c.project_vuid == Project.vuid)\
+     .outerjoin(contracted, contracted.c.project_vuid == Project.vuid)\
+     .outerjoin(paid, paid.c.project_vuid == Project.vuid)
+    
+    if status:
+        query = query.filter(Project.status == status)
+    if customer_vuid:
+        query = query.filter(Project.vuid.in_(
+            db.select(ProjectContract.project_vuid).where(ProjectContract.customer_vuid == customer_vuid)
+        ))
+    
+    return query
+
+def build_project_list_response():
+    """Build the project list response for the current request's query parameters"""
+    list_args = get_list_query_args(('project_number', 'project_name', 'created_at'), default_sort='project_number')
+    query = get_project_list_query(
+        status=request.args.get('status'),
+        customer_vuid=request.args.get('customer_vuid')
+    )
+    rows, page = get_list_page(query, Project, list_args)
+    
+    serialize_project = compile_schema(project_schema)
+    projects_data = []
+    for project, total_committed, total_contract_value, total_paid in rows:
+        project_dict = serialize_project(project)
         project_dict['total_committed'] = float(total_committed)
         project_dict['total_contract_value'] = float(total_contract_value)
         project_dict['total_paid'] = float(total_paid)
-        
         projects_data.append(project_dict)
     
-    return jsonify(projects_data)
+    return make_list_response(projects_data, page, list_args)
+
+def get_cached_project_list_response():
+    """
+    Serve the project list from the process-level cache, rebuilding it when the data
+    version of any table it reads has moved (on any worker) or the entry is older than
+    PROJECT_LIST_CACHE_SECONDS.
+    
+    Returns:
+        Response: The project list JSON response
+    """
+    cache_key = tuple(sorted((key, value) for key, value in request.args.items(multi=True) if key != 'refresh'))
+    data_version = get_data_version(*get_project_list_tables())
+    
+    cached = project_list_cache.get(cache_key)
+    if cached and cached['data_version'] == data_version and time.monotonic() - cached['loaded_at'] <= PROJECT_LIST_CACHE_SECONDS:
+        return app.response_class(cached['body'], mimetype=app.json.mimetype)
+    
+    response = build_project_list_response()
+    if len(project_list_cache) >= PROJECT_LIST_CACHE_MAX_ENTRIES:
+        project_list_cache.clear()
+    project_list_cache[cache_key] = {
+        'data_version': data_version,
+        'loaded_at': time.monotonic(),
+        'body': response.get_data()
+    }
+    return response
+
+@app.route('/api/projects', methods=['GET'])
+def get_projects():
+    """
+    Get all projects with committed, contract and paid totals.
+    
+    Query parameters: status, customer_vuid, the list pagination parameters
+    (sort, limit, cursor, include_total, fields) and refresh=true to bypass the cache.
+    """
+    try:
+        if request.args.get('refresh', '').lower() == 'true':
+            return build_project_list_response()
+        return get_cached_project_list_response()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
 @app.route('/api/projects', methods=['POST'])
 def create_project():
@@ -3205,18 +4432,184 @@ def update_project(vuid):
         db.session.rollback()
         return jsonify({'error': f'Error updating project: {str(e)}'}), 500
 
+# Reference data sources
+# Payloads served from the reference data cache: name -> (tables read, build function).
+# The list routes and /api/bootstrap share these entries, so a bootstrap after any list
+# load (or the reverse) is answered without another query.
+def get_cost_type_list_data():
+    """Serialize all cost types"""
+    return dump_fast(cost_types_schema, CostType.query.all())
+
+def get_cost_code_list_data():
+    """Serialize all cost codes"""
+    return dump_fast(cost_codes_schema, CostCode.query.all())
+
+def get_vendor_list_data():
+    """Serialize all vendors for the vendor list"""
+    vendors = Vendor.query.all()
+    return [{
+        'vuid': vendor.vuid,
+        'vendor_name': vendor.vendor_name,
+        'vendor_number': vendor.vendor_number,
+        'address_line1': vendor.address_line1,
+        'address_line2': vendor.address_line2,
+        'city': vendor.city,
+        'state': vendor.state,
+        'postal_code': vendor.postal_code,
+        'phone': vendor.phone,
+        'email': vendor.email,
+        'contact_person': vendor.contact_person,
+        'tax_id': vendor.tax_id,
+        'payment_terms': vendor.payment_terms,
+        'credit_limit': float(vendor.credit_limit) if vendor.credit_limit else 0,
+        'status': vendor.status,
+        'notes': vendor.notes,
+        'created_at': vendor.created_at.isoformat() if vendor.created_at else None,
+        'updated_at': vendor.updated_at.isoformat() if vendor.updated_at else None
+    } for vendor in vendors]
+
+def get_customer_list_data():
+    """Serialize all customers"""
+    return dump_fast(customers_schema, Customer.query.all())
+
+def get_chart_of_accounts_list_data():
+    """Serialize the chart of accounts"""
+    return dump_fast(chart_of_accounts_schemas, ChartOfAccounts.query.all())
+
+def get_accounting_period_list_data():
+    """Serialize all accounting periods, newest first"""
+    periods = AccountingPeriod.query.order_by(AccountingPeriod.year.desc(), AccountingPeriod.month.desc()).all()
+    return dump_fast(accounting_periods_schema, periods)
+
+def get_open_accounting_period_list_data():
+    """Serialize the open accounting periods, newest first"""
+    open_periods = AccountingPeriod.query.filter_by(status='open').order_by(AccountingPeriod.year.desc(), AccountingPeriod.month.desc()).all()
+    return dump_fast(accounting_periods_schema, open_periods)
+
+def get_default_accounting_period_data():
+    """Serialize the default accounting period: the only open period, or None if there are zero or several"""
+    open_periods = AccountingPeriod.query.filter_by(status='open').limit(2).all()
+    if len(open_periods) != 1:
+        return None
+    return dump_fast(accounting_period_schema, open_periods[0])
+
+def get_gl_settings_list_data():
+    """Serialize all GL settings"""
+    return dump_fast(gl_settings_schema_list, GLSettings.query.all())
+
+def get_wip_settings_list_data():
+    """Serialize all WIP report settings"""
+    return dump_fast(wip_report_settings_schema, db.session.query(WIPReportSetting).all())
+
+REFERENCE_DATA_SOURCES = {
+    'cost_types': ((CostType.__tablename__,), get_cost_type_list_data),
+    'cost_codes': ((CostCode.__tablename__,), get_cost_code_list_data),
+    'vendors': ((Vendor.__tablename__,), get_vendor_list_data),
+    'customers': ((Customer.__tablename__,), get_customer_list_data),
+    'chart_of_accounts': ((ChartOfAccounts.__tablename__,), get_chart_of_accounts_list_data),
+    'accounting_periods': ((AccountingPeriod.__tablename__,), get_accounting_period_list_data),
+    'open_accounting_periods': ((AccountingPeriod.__tablename__,), get_open_accounting_period_list_data),
+    'default_accounting_period': ((AccountingPeriod.__tablename__,), get_default_accounting_period_data),
+    'gl_settings': ((GLSettings.__tablename__, ChartOfAccounts.__tablename__), get_gl_settings_list_data),
+    'wip_settings': ((WIPReportSetting.__tablename__,), get_wip_settings_list_data),
+}
+
+# Per-project payloads, built with the project VUID and cached per project in
+# project_reference_data_cache
+PROJECT_REFERENCE_DATA_SOURCES = {
+    'project_cost_codes': (
+        (CostCode.__tablename__, ProjectCostCode.__tablename__),
+        lambda project_vuid: get_project_cost_codes_data(project_vuid)
+    ),
+    'project_cost_type_settings': (
+        (CostType.__tablename__, ProjectCostTypeSetting.__tablename__, ChartOfAccounts.__tablename__),
+        lambda project_vuid: get_project_cost_type_settings_data(project_vuid)
+    ),
+}
+
+# Sections returned by /api/bootstrap, in addition to the project sections
+BOOTSTRAP_SECTIONS = (
+    'chart_of_accounts', 'cost_codes', 'cost_types', 'customers', 'default_accounting_period',
+    'gl_settings', 'open_accounting_periods', 'vendors', 'wip_settings',
+)
+
+def get_cached_reference_response(name):
+    """Serve a reference data source from the cache with ETag/If-None-Match support"""
+    table_names, build_data = REFERENCE_DATA_SOURCES[name]
+    entry = get_reference_data_entry(name, table_names, build_data)
+    return make_etag_response(entry['body'], entry['etag'])
+
+def get_bootstrap_entries(project_vuid=None):
+    """
+    Get the cache entries for every /api/bootstrap section.
+    
+    Args:
+        project_vuid: Also include the project sections for this project
+        
+    Returns:
+        dict: Section name -> reference data cache entry
+    """
+    entries = {}
+    for name in BOOTSTRAP_SECTIONS:
+        table_names, build_data = REFERENCE_DATA_SOURCES[name]
+        entries[name] = get_reference_data_entry(name, table_names, build_data)
+    
+    if project_vuid:
+        for name, (table_names, build_data) in PROJECT_REFERENCE_DATA_SOURCES.items():
+            entries[name] = get_reference_data_entry(
+                f"{name}:{project_vuid}", table_names, lambda build_data=build_data: build_data(project_vuid),
+                cache=project_reference_data_cache, max_entries=PROJECT_REFERENCE_DATA_CACHE_MAX_ENTRIES
+            )
+    
+    return entries
+
+@app.route('/api/bootstrap', methods=['GET'])
+def get_bootstrap():
+    """
+    Get all reference data the frontend loads on startup in one response.
+    
+    The payload is assembled from the cached section bodies without re-encoding them.
+    'version' is a hash of the section ETags and is also the response ETag; 'versions'
+    has each section's own ETag so the client can tell which sections changed.
+    
+    Query parameters: project_vuid adds project_cost_codes and project_cost_type_settings.
+    """
+    try:
+        project_vuid = request.args.get('project_vuid')
+        if project_vuid and not db.session.get(Project, project_vuid):
+            return jsonify({'error': 'Project not found'}), 404
+        
+        entries = get_bootstrap_entries(project_vuid)
+        
+        version = hashlib.sha256(
+            '\n'.join(f"{name}:{entries[name]['etag']}" for name in sorted(entries)).encode()
+        ).hexdigest()
+        
+        sections = {name: entry['body'].rstrip(b'\n') for name, entry in entries.items()}
+        sections['project_vuid'] = json.dumps(project_vuid).encode()
+        sections['version'] = json.dumps(version).encode()
+        sections['versions'] = json.dumps(
+            {name: entries[name]['etag'] for name in sorted(entries)}, separators=(',', ':')
+        ).encode()
+        
+        body = b'{' + b','.join(
+            json.dumps(name).encode() + b':' + sections[name] for name in sorted(sections)
+        ) + b'}\n'
+        return make_etag_response(body, version)
+        
+    except Exception as e:
+        return jsonify({'error': f'Error loading bootstrap data: {str(e)}'}), 500
+
 # Cost Type routes
 @app.route('/api/costtypes', methods=['GET'])
 def get_cost_types():
     """Get all cost types"""
-    cost_types = CostType.query.all()
-    return jsonify(cost_types_schema.dump(cost_types))
+    return get_cached_reference_response('cost_types')
 
 @app.route('/api/cost-types', methods=['GET'])
 def get_cost_types_hyphenated():
     """Get all cost types (hyphenated route for frontend compatibility)"""
-    cost_types = CostType.query.all()
-    return jsonify(cost_types_schema.dump(cost_types))
+    return get_cost_types()
 
 @app.route('/api/commitments-report', methods=['GET'])
 def get_commitments_report():
@@ -3352,14 +4745,12 @@ def update_cost_type(vuid):
 @app.route('/api/costcodes', methods=['GET'])
 def get_cost_codes():
     """Get all cost codes"""
-    cost_codes = CostCode.query.all()
-    return jsonify(cost_codes_schema.dump(cost_codes))
+    return get_cached_reference_response('cost_codes')
 
 @app.route('/api/cost-codes', methods=['GET'])
 def get_cost_codes_hyphenated():
     """Get all cost codes (hyphenated route for frontend compatibility)"""
-    cost_codes = CostCode.query.all()
-    return jsonify(cost_codes_schema.dump(cost_codes))
+    return get_cost_codes()
 
 @app.route('/api/costcodes', methods=['POST'])
 def create_cost_code():
@@ -3390,29 +4781,7 @@ def create_cost_code():
 @app.route('/api/vendors', methods=['GET'])
 def get_vendors():
     """Get all vendors"""
-    vendors = Vendor.query.all()
-    # Temporarily commented out to debug schema conflicts
-    # return jsonify(vendors_schema.dump(vendors))
-    return jsonify([{
-        'vuid': vendor.vuid,
-        'vendor_name': vendor.vendor_name,
-        'vendor_number': vendor.vendor_number,
-        'address_line1': vendor.address_line1,
-        'address_line2': vendor.address_line2,
-        'city': vendor.city,
-        'state': vendor.state,
-        'postal_code': vendor.postal_code,
-        'phone': vendor.phone,
-        'email': vendor.email,
-        'contact_person': vendor.contact_person,
-        'tax_id': vendor.tax_id,
-        'payment_terms': vendor.payment_terms,
-        'credit_limit': float(vendor.credit_limit) if vendor.credit_limit else 0,
-        'status': vendor.status,
-        'notes': vendor.notes,
-        'created_at': vendor.created_at.isoformat() if vendor.created_at else None,
-        'updated_at': vendor.updated_at.isoformat() if vendor.updated_at else None
-    } for vendor in vendors])
+    return get_cached_reference_response('vendors')
 
 @app.route('/api/vendors', methods=['POST'])
 def create_vendor():
@@ -3507,8 +4876,7 @@ def create_vendor():
 @app.route('/api/customers', methods=['GET'])
 def get_customers():
     """Get all customers"""
-    customers = Customer.query.all()
-    return jsonify(customers_schema.dump(customers))
+    return get_cached_reference_response('customers')
 
 @app.route('/api/customers', methods=['POST'])
 def create_customer():
@@ -3683,8 +5051,7 @@ def delete_customer(vuid):
 @app.route('/api/chartofaccounts', methods=['GET'])
 def get_chart_of_accounts():
     """Get all chart of accounts"""
-    accounts = ChartOfAccounts.query.all()
-    return jsonify(chart_of_accounts_schemas.dump(accounts))
+    return get_cached_reference_response('chart_of_accounts')
 
 @app.route('/api/chartofaccounts', methods=['POST'])
 def create_chart_of_account():
@@ -3781,8 +5148,7 @@ def delete_chart_of_account(vuid):
 def get_accounting_periods():
     """Get all accounting periods"""
     try:
-        periods = AccountingPeriod.query.order_by(AccountingPeriod.year.desc(), AccountingPeriod.month.desc()).all()
-        return jsonify(accounting_periods_schema.dump(periods))
+        return get_cached_reference_response('accounting_periods')
     except Exception as e:
         return jsonify({'error': f'Error fetching accounting periods: {str(e)}'}), 500
 
@@ -3935,8 +5301,7 @@ def delete_accounting_period(vuid):
 def get_open_accounting_periods():
     """Get all open accounting periods for selection"""
     try:
-        open_periods = AccountingPeriod.query.filter_by(status='open').order_by(AccountingPeriod.year.desc(), AccountingPeriod.month.desc()).all()
-        return jsonify(accounting_periods_schema.dump(open_periods))
+        return get_cached_reference_response('open_accounting_periods')
     except Exception as e:
         return jsonify({'error': f'Error fetching open accounting periods: {str(e)}'}), 500
 
@@ -4010,48 +5375,51 @@ def get_accounting_periods_with_project_data(project_vuid):
         return jsonify({'error': f'Error fetching accounting periods with project data: {str(e)}'}), 500
 
 # Project Cost Type Settings routes
-@app.route('/api/projects/<project_vuid>/cost-type-settings', methods=['GET'])
-def get_project_cost_type_settings(project_vuid):
-    """Get cost type settings for a specific project"""
-    try:
-        # Get all cost types
-        cost_types = CostType.query.all()
-        
-        # Get existing project settings for this project
-        project_settings = ProjectCostTypeSetting.query.filter_by(project_vuid=project_vuid).all()
-        
-        # Create a mapping of cost_type_vuid to project setting
-        settings_map = {ps.cost_type_vuid: ps for ps in project_settings}
+def get_project_cost_type_settings_data(project_vuid):
+    """Build the cost type list with each cost type's setting for a project"""
+    # Get all cost types
+    cost_types = CostType.query.all()
+    
+    # Get existing project settings for this project
+    project_settings = ProjectCostTypeSetting.query.filter_by(project_vuid=project_vuid).all()
+    
+    # Create a mapping of cost_type_vuid to project setting
+    settings_map = {ps.cost_type_vuid: ps for ps in project_settings}
+    
+    # Build response with all cost types and their project-specific settings
+    result = []
+    for cost_type in cost_types:
+        project_setting = settings_map.get(cost_type.vuid)
         
-        # Build response with all cost types and their project-specific settings
-        result = []
-        for cost_type in cost_types:
-            project_setting = settings_map.get(cost_type.vuid)
-            
-            # Format the default expense account display
-            default_expense_account_display = cost_type.expense_account
-            
-            # If expense_account looks like a VUID (contains hyphens and is long), look up the account details
-            if cost_type.expense_account and len(cost_type.expense_account) > 20 and '-' in cost_type.expense_account:
-                try:
-                    account = ChartOfAccounts.query.filter_by(vuid=cost_type.expense_account).first()
-                    if account:
-                        default_expense_account_display = f"{account.account_number} - {account.account_name}"
-                except Exception as e:
-                    print(f"Error looking up account for VUID {cost_type.expense_account}: {e}")
-                    # Keep original value if lookup fails
-            
-            result.append({
-                'cost_type_vuid': cost_type.vuid,
-                'cost_type': cost_type.cost_type,
-                'abbreviation': cost_type.abbreviation,
-                'description': cost_type.description,
-                'default_expense_account': default_expense_account_display,
-                'project_setting': project_cost_type_setting_schema.dump(project_setting) if project_setting else None
-            })
+        # Format the default expense account display
+        default_expense_account_display = cost_type.expense_account
         
-        return jsonify(result)
+        # If expense_account looks like a VUID (contains hyphens and is long), look up the account details
+        if cost_type.expense_account and len(cost_type.expense_account) > 20 and '-' in cost_type.expense_account:
+            try:
+                account = get_gl_account(cost_type.expense_account)
+                if account:
+                    default_expense_account_display = f"{account.account_number} - {account.account_name}"
+            except Exception as e:
+                print(f"Error looking up account for VUID {cost_type.expense_account}: {e}")
+                # Keep original value if lookup fails
         
+        result.append({
+            'cost_type_vuid': cost_type.vuid,
+            'cost_type': cost_type.cost_type,
+            'abbreviation': cost_type.abbreviation,
+            'description': cost_type.description,
+            'default_expense_account': default_expense_account_display,
+            'project_setting': project_cost_type_setting_schema.dump(project_setting) if project_setting else None
+        })
+    
+    return result
+
+@app.route('/api/projects/<project_vuid>/cost-type-settings', methods=['GET'])
+def get_project_cost_type_settings(project_vuid):
+    """Get cost type settings for a specific project"""
+    try:
+        return jsonify(get_project_cost_type_settings_data(project_vuid))
     except Exception as e:
         return jsonify({'error': f'Error fetching cost type settings: {str(e)}'}), 500
 
@@ -4131,45 +5499,48 @@ def delete_project_cost_type_setting(vuid):
         return jsonify({'error': f'Error deleting project cost type setting: {str(e)}'}), 500
 
 # Project Cost Codes routes
+def get_project_cost_codes_data(project_vuid):
+    """Build the active global and project-specific cost codes for a project"""
+    # Get all global cost codes
+    global_cost_codes = CostCode.query.filter_by(status='active').all()
+    
+    # Get project-specific cost codes
+    project_cost_codes = ProjectCostCode.query.filter_by(
+        project_vuid=project_vuid, 
+        status='active'
+    ).all()
+    
+    # Combine global and project-specific cost codes
+    result = []
+    
+    # Add global cost codes
+    for cost_code in global_cost_codes:
+        result.append({
+            'vuid': cost_code.vuid,
+            'code': cost_code.code,
+            'description': cost_code.description,
+            'is_project_specific': False,
+            'source': 'global'
+        })
+    
+    # Add project-specific cost codes
+    for cost_code in project_cost_codes:
+        result.append({
+            'vuid': cost_code.vuid,
+            'code': cost_code.code,
+            'description': cost_code.description,
+            'is_project_specific': True,
+            'source': 'project',
+            'project_vuid': cost_code.project_vuid
+        })
+    
+    return result
+
 @app.route('/api/projects/<project_vuid>/cost-codes', methods=['GET'])
 def get_project_cost_codes(project_vuid):
     """Get cost codes for a specific project (both global and project-specific)"""
     try:
-        # Get all global cost codes
-        global_cost_codes = CostCode.query.filter_by(status='active').all()
-        
-        # Get project-specific cost codes
-        project_cost_codes = ProjectCostCode.query.filter_by(
-            project_vuid=project_vuid, 
-            status='active'
-        ).all()
-        
-        # Combine global and project-specific cost codes
-        result = []
-        
-        # Add global cost codes
-        for cost_code in global_cost_codes:
-            result.append({
-                'vuid': cost_code.vuid,
-                'code': cost_code.code,
-                'description': cost_code.description,
-                'is_project_specific': False,
-                'source': 'global'
-            })
-        
-        # Add project-specific cost codes
-        for cost_code in project_cost_codes:
-            result.append({
-                'vuid': cost_code.vuid,
-                'code': cost_code.code,
-                'description': cost_code.description,
-                'is_project_specific': True,
-                'source': 'project',
-                'project_vuid': cost_code.project_vuid
-            })
-        
-        return jsonify(result)
-        
+        return jsonify(get_project_cost_codes_data(project_vuid))
     except Exception as e:
         return jsonify({'error': f'Error fetching project cost codes: {str(e)}'}), 500
 
@@ -5202,15 +6573,18 @@ def get_all_commitment_items():
     commitment_vuid = request.args.get('commitment_vuid')
     
     try:
+        list_args = get_list_query_args(('created_at', 'total_amount'))
+        
+        query = ProjectCommitmentItem.query
         if commitment_vuid:
             # Get items for a specific commitment
-            items = ProjectCommitmentItem.query.filter_by(commitment_vuid=commitment_vuid).all()
-        else:
-            # Get all commitment items
-            items = ProjectCommitmentItem.query.all()
+            query = query.filter_by(commitment_vuid=commitment_vuid)
         
-        return jsonify(project_commitment_items_schema.dump(items))
+        items, page = get_list_page(query, ProjectCommitmentItem, list_args)
+        return make_list_response(dump_fast(project_commitment_items_schema, items), page, list_args)
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': f'Error fetching commitment items: {str(e)}'}), 500
 
@@ -5398,40 +6772,62 @@ def get_ap_invoices():
     accounting_period_vuid = request.args.get('accounting_period_vuid')
     
     try:
-        query = APInvoice.query
+        list_args = get_list_query_args(('created_at', 'invoice_date', 'invoice_number', 'total_amount', 'status'))
+        
+        # One query for the invoices and their vendor, project and accounting period,
+        # reading only the columns that go into the response
+        query = db.session.query(
+            APInvoice.vuid,
+            APInvoice.invoice_number,
+            APInvoice.vendor_vuid,
+            APInvoice.project_vuid,
+            APInvoice.commitment_vuid,
+            APInvoice.invoice_date,
+            APInvoice.due_date,
+            APInvoice.subtotal,
+            APInvoice.retention_held,
+            APInvoice.retention_released,
+            APInvoice.total_amount,
+            APInvoice.status,
+            APInvoice.description,
+            APInvoice.accounting_period_vuid,
+            APInvoice.exported_to_accounting,
+            APInvoice.accounting_export_date,
+            APInvoice.created_at,
+            APInvoice.updated_at,
+            Vendor.vuid.label('joined_vendor_vuid'),
+            Vendor.vendor_name,
+            Project.vuid.label('joined_project_vuid'),
+            Project.project_name,
+            AccountingPeriod.vuid.label('joined_accounting_period_vuid'),
+            AccountingPeriod.month,
+            AccountingPeriod.year,
+            AccountingPeriod.status.label('accounting_period_status')
+        ).outerjoin(
+            Vendor, APInvoice.vendor_vuid == Vendor.vuid
+        ).outerjoin(
+            Project, APInvoice.project_vuid == Project.vuid
+        ).outerjoin(
+            AccountingPeriod, APInvoice.accounting_period_vuid == AccountingPeriod.vuid
+        )
         
         if project_vuid:
-            query = query.filter_by(project_vuid=project_vuid)
+            query = query.filter(APInvoice.project_vuid == project_vuid)
         if vendor_vuid:
-            query = query.filter_by(vendor_vuid=vendor_vuid)
+            query = query.filter(APInvoice.vendor_vuid == vendor_vuid)
         if commitment_vuid:
-            query = query.filter_by(commitment_vuid=commitment_vuid)
+            query = query.filter(APInvoice.commitment_vuid == commitment_vuid)
         if status:
-            query = query.filter_by(status=status)
+            query = query.filter(APInvoice.status == status)
         if accounting_period_vuid:
-            query = query.filter_by(accounting_period_vuid=accounting_period_vuid)
+            query = query.filter(APInvoice.accounting_period_vuid == accounting_period_vuid)
         
-        invoices = query.all()
+        invoices, page = get_list_page(query, APInvoice, list_args)
         
-        # Manually construct response with related data
+        # Serialize straight from the row tuples
         result = []
         for invoice in invoices:
-            # Get vendor data
-            vendor = db.session.get(Vendor, invoice.vendor_vuid) if invoice.vendor_vuid else None
-            
-            # Get project data
-            project = db.session.get(Project, invoice.project_vuid) if invoice.project_vuid else None
-            
-            # Get accounting period data
-            accounting_period = db.session.get(AccountingPeriod, invoice.accounting_period_vuid) if invoice.accounting_period_vuid else None
-            
-            # Debug output
-            print(f"DEBUG: Invoice {invoice.vuid}")
-            print(f"DEBUG: Vendor VUID: {invoice.vendor_vuid}, Vendor object: {vendor}")
-            print(f"DEBUG: Project VUID: {invoice.project_vuid}, Project object: {project}")
-            print(f"DEBUG: Accounting Period VUID: {invoice.accounting_period_vuid}, Accounting Period object: {accounting_period}")
-            
-            invoice_data = {
+            result.append({
                 'vuid': invoice.vuid,
                 'invoice_number': invoice.invoice_number,
                 'vendor_vuid': invoice.vendor_vuid,
@@ -5451,24 +6847,25 @@ def get_ap_invoices():
                 'created_at': invoice.created_at.isoformat() if invoice.created_at else None,
                 'updated_at': invoice.updated_at.isoformat() if invoice.updated_at else None,
                 'vendor': {
-                    'vuid': vendor.vuid,
-                    'vendor_name': vendor.vendor_name
-                } if vendor else None,
+                    'vuid': invoice.joined_vendor_vuid,
+                    'vendor_name': invoice.vendor_name
+                } if invoice.joined_vendor_vuid else None,
                 'project': {
-                    'vuid': project.vuid,
-                    'project_name': project.project_name
-                } if project else None,
+                    'vuid': invoice.joined_project_vuid,
+                    'project_name': invoice.project_name
+                } if invoice.joined_project_vuid else None,
                 'accounting_period': {
-                    'vuid': accounting_period.vuid,
-                    'month': accounting_period.month,
-                    'year': accounting_period.year,
-                    'status': accounting_period.status
-                } if accounting_period else None
-            }
-            result.append(invoice_data)
+                    'vuid': invoice.joined_accounting_period_vuid,
+                    'month': invoice.month,
+                    'year': invoice.year,
+                    'status': invoice.accounting_period_status
+                } if invoice.joined_accounting_period_vuid else None
+            })
         
-        return jsonify(result)
+        return make_list_response(result, page, list_args)
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': f'Error fetching AP invoices: {str(e)}'}), 500
 
@@ -5508,6 +6905,7 @@ def create_ap_invoice():
         )
         
         db.session.add(new_invoice)
+        refresh_cost_rollup_for_record(new_invoice)
         db.session.commit()
         
         return jsonify({
@@ -5584,6 +6982,8 @@ def update_ap_invoice(vuid):
     data = request.get_json()
     
     try:
+        rollup_keys = (invoice.project_vuid, invoice.accounting_period_vuid)
+        
         if 'invoice_number' in data:
             invoice.invoice_number = data['invoice_number']
         if 'vendor_vuid' in data:
@@ -5612,6 +7012,7 @@ def update_ap_invoice(vuid):
         if 'description' in data:
             invoice.description = data['description']
         
+        refresh_cost_rollup_for_record(invoice, rollup_keys)
         db.session.commit()
         return jsonify({
             'vuid': invoice.vuid,
@@ -5650,6 +7051,7 @@ def delete_ap_invoice(vuid):
     
     try:
         db.session.delete(invoice)
+        refresh_cost_rollup_for_record(invoice)
         db.session.commit()
         return jsonify({'message': 'AP invoice deleted successfully'})
         
@@ -5823,7 +7225,7 @@ def preview_ap_invoice_journal_entry(vuid):
                 return jsonify({'error': 'Failed to create net entry preview'}), 500
             
             # Get chart of accounts for account names
-            chart_of_accounts = ChartOfAccounts.query.all()
+            chart_of_accounts = get_gl_account_cache()['accounts']
             account_lookup = {acc.vuid: f"{acc.account_number} - {acc.account_name}" for acc in chart_of_accounts}
             
             # Add account names to line items
@@ -5863,7 +7265,7 @@ def preview_ap_invoice_journal_entry(vuid):
                 return jsonify({'error': 'Failed to create combined entry preview'}), 500
             
             # Get chart of accounts for account names
-            chart_of_accounts = ChartOfAccounts.query.all()
+            chart_of_accounts = get_gl_account_cache()['accounts']
             account_lookup = {acc.vuid: f"{acc.account_number} - {acc.account_name}" for acc in chart_of_accounts}
             
             # Add account names to line items
@@ -5884,6 +7286,11 @@ def get_labor_costs():
     employee_id = request.args.get('employee_id')
     status = request.args.get('status', 'active')
     
+    try:
+        list_args = get_list_query_args(('created_at', 'payroll_date', 'employee_id', 'amount'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
     query = db.session.query(LaborCost)
     
     # Apply filters
@@ -5896,12 +7303,15 @@ def get_labor_costs():
     if status:
         query = query.filter_by(status=status)
     
-    # Order by payroll date descending
-    query = query.order_by(LaborCost.payroll_date.desc(), LaborCost.created_at.desc())
+    # Order by payroll date descending unless another sort is requested
+    try:
+        labor_costs, page = get_list_page(query, LaborCost, list_args,
+                                          default_order=[LaborCost.payroll_date.desc(), LaborCost.created_at.desc()])
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    labor_costs = query.all()
     schema = LaborCostSchema(many=True)
-    return jsonify(schema.dump(labor_costs))
+    return make_list_response(dump_fast(schema, labor_costs), page, list_args)
 
 @app.route('/api/labor-costs', methods=['POST'])
 def create_labor_cost():
@@ -5946,6 +7356,7 @@ def create_labor_cost():
         )
         
         db.session.add(labor_cost)
+        refresh_cost_rollup_for_record(labor_cost)
         db.session.commit()
         
         schema = LaborCostSchema()
@@ -5992,6 +7403,8 @@ def update_labor_cost(vuid):
                     if not project_cost_code:
                         return jsonify({'error': 'Cost code not found'}), 404
         
+        rollup_keys = (labor_cost.project_vuid, labor_cost.accounting_period_vuid)
+        
         # Update fields
         if 'employee_id' in data:
             labor_cost.employee_id = data['employee_id']
@@ -6021,6 +7434,7 @@ def update_labor_cost(vuid):
             labor_cost.status = data['status']
         
         labor_cost.updated_at = datetime.utcnow()
+        refresh_cost_rollup_for_record(labor_cost, rollup_keys)
         db.session.commit()
         
         schema = LaborCostSchema()
@@ -6044,6 +7458,7 @@ def delete_labor_cost(vuid):
     
     try:
         db.session.delete(labor_cost)
+        refresh_cost_rollup_for_record(labor_cost)
         db.session.commit()
         return jsonify({'message': 'Labor cost deleted successfully'})
         
@@ -6065,7 +7480,7 @@ def preview_labor_cost_journal_entry(vuid):
             return jsonify({'error': 'Failed to create labor cost entry preview'}), 500
         
         # Get chart of accounts for account names
-        chart_of_accounts = ChartOfAccounts.query.all()
+        chart_of_accounts = get_gl_account_cache()['accounts']
         account_lookup = {acc.vuid: f"{acc.account_number} - {acc.account_name}" for acc in chart_of_accounts}
         
         # Add account names to line items
@@ -6862,248 +8277,496 @@ def download_budget_template(budget_vuid):
         return jsonify({'error': f'Error generating template: {str(e)}'}), 500
 
 # Buyout and Forecasting API Routes
-def calculate_budget_line_eac_data(budget_line, project_vuid, accounting_period_vuid):
-    """Calculate EAC data for a single budget line"""
+def get_budget_line_buyout_records(budget_line_vuids, accounting_period_vuid):
+    """Get the buyout record of each budget line for a period, keyed by budget line VUID"""
+    buyout_records = {}
+    if not budget_line_vuids:
+        return buyout_records
+    
+    for record in db.session.query(ProjectBudgetLineBuyout).filter(
+        ProjectBudgetLineBuyout.budget_line_vuid.in_(budget_line_vuids),
+        ProjectBudgetLineBuyout.accounting_period_vuid == accounting_period_vuid
+    ).all():
+        buyout_records.setdefault(record.budget_line_vuid, record)
+    return buyout_records
+
+def get_default_budget_line_eac_data(budget_line):
+    """EAC data reported for a budget line whose calculation failed"""
+    return {
+        'budgeted_amount': float(budget_line.budget_amount or 0),
+        'committed_amount': 0.0,
+        'commitment_change_orders_amount': 0.0,
+        'total_committed_amount': 0.0,
+        'buyout_savings': None,
+        'actuals_amount': 0.0,
+        'etc_amount': 0.0,
+        'eac_amount': 0.0
+    }
+
+def calculate_budget_lines_eac_data(budget_lines, project_vuid, accounting_period_vuid, buyout_records=None):
+    """
+    Calculate EAC data for many budget lines of a project in one pass.
+    
+    Actuals, commitments, commitment change orders and internal change orders are each read
+    once for all the lines, grouped by cost code or by (cost code, cost type), so the number
+    of queries does not grow with the number of budget lines.
+    
+    Args:
+        budget_lines: Budget lines of the project
+        project_vuid: The project VUID
+        accounting_period_vuid: Accounting period whose actuals and buyout records are used
+        buyout_records: Optional {budget_line_vuid: ProjectBudgetLineBuyout} already loaded for the period
+    
+    Returns:
+        dict: {budget_line_vuid: EAC data}, in the format of calculate_budget_line_eac_data
+    """
+    budget_lines = list(budget_lines)
+    if not budget_lines:
+        return {}
+    
     try:
-        # Calculate actuals amount for this budget line
-        actuals_amount = 0.0
+        cost_code_vuids = {line.cost_code_vuid for line in budget_lines if line.cost_code_vuid}
         
-        if budget_line.cost_code_vuid:
-            # Get AP invoice line items for this budget line
-            ap_invoice_line_items = db.session.query(APInvoiceLineItem).join(APInvoice).filter(
-                APInvoice.project_vuid == project_vuid,
-                APInvoice.accounting_period_vuid == accounting_period_vuid,
-                APInvoiceLineItem.cost_code_vuid == budget_line.cost_code_vuid,
-                APInvoice.status.in_(['approved', 'active'])
-            ).all()
-            
-            for line_item in ap_invoice_line_items:
-                actuals_amount += float(line_item.total_amount or 0)
-            
-            # Get project expenses for this budget line
-            project_expenses = ProjectExpense.query.filter(
-                ProjectExpense.project_vuid == project_vuid,
-                ProjectExpense.accounting_period_vuid == accounting_period_vuid,
-                ProjectExpense.cost_code_vuid == budget_line.cost_code_vuid,
-                ProjectExpense.status.in_(['approved', 'active', 'pending'])
-            ).all()
-            
-            for expense in project_expenses:
-                actuals_amount += float(expense.amount or 0)
-            
-            # Get labor costs for this budget line
-            labor_costs = LaborCost.query.filter(
-                LaborCost.project_vuid == project_vuid,
-                LaborCost.accounting_period_vuid == accounting_period_vuid,
-                LaborCost.cost_code_vuid == budget_line.cost_code_vuid,
-                LaborCost.status.in_(['approved', 'active'])
-            ).all()
-            
-            for labor_cost in labor_costs:
-                actuals_amount += float(labor_cost.amount or 0)
+        # Actuals by cost code for the period, added in the same order as a per-line calculation
+        ap_invoice_rows = db.session.query(APInvoiceLineItem.cost_code_vuid, APInvoiceLineItem.total_amount).join(APInvoice).filter(
+            APInvoice.project_vuid == project_vuid,
+            APInvoice.accounting_period_vuid == accounting_period_vuid,
+            APInvoiceLineItem.cost_code_vuid.in_(cost_code_vuids),
+            APInvoice.status.in_(['approved', 'active'])
+        ).all()
+        
+        project_expense_rows = db.session.query(ProjectExpense.cost_code_vuid, ProjectExpense.amount).filter(
+            ProjectExpense.project_vuid == project_vuid,
+            ProjectExpense.accounting_period_vuid == accounting_period_vuid,
+            ProjectExpense.cost_code_vuid.in_(cost_code_vuids),
+            ProjectExpense.status.in_(['approved', 'active', 'pending'])
+        ).all()
         
-        # Calculate committed amount
-        committed_amount = 0.0
-        commitment_change_orders_amount = 0.0
+        labor_cost_rows = db.session.query(LaborCost.cost_code_vuid, LaborCost.amount).filter(
+            LaborCost.project_vuid == project_vuid,
+            LaborCost.accounting_period_vuid == accounting_period_vuid,
+            LaborCost.cost_code_vuid.in_(cost_code_vuids),
+            LaborCost.status.in_(['approved', 'active'])
+        ).all()
         
-        if budget_line.cost_code_vuid and budget_line.cost_type_vuid:
-            # Get committed amount by cost code/type
-            committed_amount = db.session.query(db.func.coalesce(db.func.sum(ProjectCommitmentItem.amount), 0)).join(
+        actuals_by_cost_code = {}
+        for cost_code_vuid, amount in ap_invoice_rows + project_expense_rows + labor_cost_rows:
+            actuals_by_cost_code[cost_code_vuid] = actuals_by_cost_code.get(cost_code_vuid, 0.0) + float(amount or 0)
+        
+        # Commitments and internal change orders by (cost code, cost type) for the project,
+        # active items on active commitments / ICOs as in the buyout forecasting view; original
+        # items and change order items are summed separately
+        committed_by_key = dict(
+            ((cost_code_vuid, cost_type_vuid), amount) for cost_code_vuid, cost_type_vuid, amount in db.session.query(
+                ProjectCommitmentItem.cost_code_vuid, ProjectCommitmentItem.cost_type_vuid, db.func.sum(ProjectCommitmentItem.total_amount)
+            ).join(
                 ProjectCommitment, ProjectCommitmentItem.commitment_vuid == ProjectCommitment.vuid
             ).filter(
                 ProjectCommitment.project_vuid == project_vuid,
-                ProjectCommitmentItem.cost_code_vuid == budget_line.cost_code_vuid,
-                ProjectCommitmentItem.cost_type_vuid == budget_line.cost_type_vuid
-            ).scalar() or 0.0
-            
-            # Get commitment change orders amount
-            commitment_change_orders_amount = db.session.query(db.func.coalesce(db.func.sum(ProjectCommitmentItem.amount), 0)).join(
+                ProjectCommitment.status == 'active',
+                ProjectCommitmentItem.status == 'active',
+                ProjectCommitmentItem.cost_code_vuid.in_(cost_code_vuids),
+                ProjectCommitmentItem.changeorder == False
+            ).group_by(ProjectCommitmentItem.cost_code_vuid, ProjectCommitmentItem.cost_type_vuid).all()
+        )
+        
+        commitment_change_orders_by_key = dict(
+            ((cost_code_vuid, cost_type_vuid), amount) for cost_code_vuid, cost_type_vuid, amount in db.session.query(
+                ProjectCommitmentItem.cost_code_vuid, ProjectCommitmentItem.cost_type_vuid, db.func.sum(ProjectCommitmentItem.total_amount)
+            ).join(
                 ProjectCommitment, ProjectCommitmentItem.commitment_vuid == ProjectCommitment.vuid
             ).filter(
                 ProjectCommitment.project_vuid == project_vuid,
-                ProjectCommitmentItem.cost_code_vuid == budget_line.cost_code_vuid,
-                ProjectCommitmentItem.cost_type_vuid == budget_line.cost_type_vuid,
+                ProjectCommitment.status == 'active',
+                ProjectCommitmentItem.status == 'active',
+                ProjectCommitmentItem.cost_code_vuid.in_(cost_code_vuids),
                 ProjectCommitmentItem.changeorder == True
-            ).scalar() or 0.0
-        
-        total_committed_amount = float(committed_amount) + float(commitment_change_orders_amount)
-        
-        # Calculate budgeted amount (including change orders)
-        budgeted_amount = float(budget_line.budget_amount)
+            ).group_by(ProjectCommitmentItem.cost_code_vuid, ProjectCommitmentItem.cost_type_vuid).all()
+        )
         
-        # Add internal change order changes
-        if budget_line.cost_code_vuid and budget_line.cost_type_vuid:
-            ico_changes = db.session.query(db.func.coalesce(db.func.sum(InternalChangeOrderLine.change_amount), 0)).join(
-                InternalChangeOrder, InternalChangeOrderLine.change_order_vuid == InternalChangeOrder.vuid
+        ico_changes_by_key = dict(
+            ((cost_code_vuid, cost_type_vuid), amount) for cost_code_vuid, cost_type_vuid, amount in db.session.query(
+                InternalChangeOrderLine.cost_code_vuid, InternalChangeOrderLine.cost_type_vuid, db.func.sum(InternalChangeOrderLine.change_amount)
+            ).join(
+                InternalChangeOrder, InternalChangeOrderLine.internal_change_order_vuid == InternalChangeOrder.vuid
             ).filter(
                 InternalChangeOrder.project_vuid == project_vuid,
-                InternalChangeOrderLine.cost_code_vuid == budget_line.cost_code_vuid,
-                InternalChangeOrderLine.cost_type_vuid == budget_line.cost_type_vuid
-            ).scalar() or 0.0
+                InternalChangeOrder.status == 'active',
+                InternalChangeOrderLine.status == 'active',
+                InternalChangeOrderLine.cost_code_vuid.in_(cost_code_vuids)
+            ).group_by(InternalChangeOrderLine.cost_code_vuid, InternalChangeOrderLine.cost_type_vuid).all()
+        )
+        
+        if buyout_records is None:
+            buyout_records = get_budget_line_buyout_records([line.vuid for line in budget_lines], accounting_period_vuid)
+    
+    except Exception as e:
+        print(f"Error calculating EAC data for project {project_vuid}: {str(e)}")
+        return {line.vuid: get_default_budget_line_eac_data(line) for line in budget_lines}
+    
+    eac_data_by_line = {}
+    for budget_line in budget_lines:
+        try:
+            key = (budget_line.cost_code_vuid, budget_line.cost_type_vuid)
+            has_cost_code_and_type = budget_line.cost_code_vuid and budget_line.cost_type_vuid
+            
+            actuals_amount = actuals_by_cost_code.get(budget_line.cost_code_vuid, 0.0) if budget_line.cost_code_vuid else 0.0
+            
+            # Calculate committed amount
+            committed_amount = 0.0
+            commitment_change_orders_amount = 0.0
+            if has_cost_code_and_type:
+                committed_amount = committed_by_key.get(key) or 0.0
+                commitment_change_orders_amount = commitment_change_orders_by_key.get(key) or 0.0
+            
+            total_committed_amount = float(committed_amount) + float(commitment_change_orders_amount)
+            
+            # Calculate budgeted amount (including internal change orders)
+            budgeted_amount = float(budget_line.budget_amount)
+            if has_cost_code_and_type:
+                budgeted_amount += float(ico_changes_by_key.get(key) or 0.0)
+            
+            buyout_record = buyout_records.get(budget_line.vuid)
+            
+            # Calculate ETC based on the logic from buyout forecasting
+            if total_committed_amount > 0 and buyout_record and buyout_record.is_bought_out:
+                # If there's a commitment and it's bought out, use committed amount - actuals
+                etc_amount = total_committed_amount - actuals_amount
+            else:
+                # Otherwise, use budgeted amount - actuals
+                etc_amount = budgeted_amount - actuals_amount
+            
+            # EAC = Actuals + ETC
+            eac_amount = actuals_amount + etc_amount
+            
+            # Calculate buyout savings if applicable
+            buyout_savings = None
+            if buyout_record and buyout_record.is_bought_out and buyout_record.buyout_amount:
+                buyout_savings = total_committed_amount - float(buyout_record.buyout_amount)
             
-            budgeted_amount += float(ico_changes)
+            eac_data_by_line[budget_line.vuid] = {
+                'budgeted_amount': budgeted_amount,
+                'committed_amount': float(committed_amount),
+                'commitment_change_orders_amount': float(commitment_change_orders_amount),
+                'total_committed_amount': total_committed_amount,
+                'buyout_savings': buyout_savings,
+                'actuals_amount': actuals_amount,
+                'etc_amount': etc_amount,
+                'eac_amount': eac_amount
+            }
+        except Exception as e:
+            print(f"Error calculating EAC data for budget line {budget_line.vuid}: {str(e)}")
+            eac_data_by_line[budget_line.vuid] = get_default_budget_line_eac_data(budget_line)
+    
+    return eac_data_by_line
+
+def calculate_budget_line_eac_data(budget_line, project_vuid, accounting_period_vuid):
+    """Calculate EAC data for a single budget line"""
+    return calculate_budget_lines_eac_data([budget_line], project_vuid, accounting_period_vuid)[budget_line.vuid]
+
+def make_buyout_forecasting_snapshot_rows(project_vuid, accounting_period_vuid):
+    """
+    Build snapshot rows for a project's original budget lines that have no snapshot yet.
+    
+    Args:
+        project_vuid: Project to snapshot
+        accounting_period_vuid: Accounting period being closed
         
-        # Get buyout record for this budget line and period
-        buyout_record = db.session.query(ProjectBudgetLineBuyout).filter_by(
-            budget_line_vuid=budget_line.vuid,
+    Returns:
+        list: Row dicts ready for a bulk insert into project_buyout_forecasting_snapshots,
+        or None if the project has no original budget
+    """
+    # Get the project's original budget
+    original_budget = db.session.query(ProjectBudget).filter_by(
+        project_vuid=project_vuid,
+        budget_type='original'
+    ).first()
+    
+    if not original_budget:
+        return None
+    
+    # Get all budget lines for the original budget
+    budget_lines = db.session.query(ProjectBudgetLine).filter_by(
+        budget_vuid=original_budget.vuid,
+        status='active'
+    ).all()
+    
+    # Skip budget lines that already have a snapshot
+    existing_line_vuids = {
+        budget_line_vuid for (budget_line_vuid,) in db.session.query(ProjectBuyoutForecastingSnapshot.budget_line_vuid).filter_by(
+            project_vuid=project_vuid,
             accounting_period_vuid=accounting_period_vuid
-        ).first()
-        
-        # Calculate ETC based on the logic from buyout forecasting
-        if total_committed_amount > 0 and buyout_record and buyout_record.is_bought_out:
-            # If there's a commitment and it's bought out, use committed amount - actuals
-            etc_amount = total_committed_amount - actuals_amount
-        else:
-            # Otherwise, use budgeted amount - actuals
-            etc_amount = budgeted_amount - actuals_amount
-        
-        # EAC = Actuals + ETC
-        eac_amount = actuals_amount + etc_amount
-        
-        # Calculate buyout savings if applicable
-        buyout_savings = None
-        if buyout_record and buyout_record.is_bought_out and buyout_record.buyout_amount:
-            buyout_savings = total_committed_amount - float(buyout_record.buyout_amount)
-        
-        return {
-            'budgeted_amount': budgeted_amount,
-            'committed_amount': float(committed_amount),
-            'commitment_change_orders_amount': float(commitment_change_orders_amount),
-            'total_committed_amount': total_committed_amount,
-            'buyout_savings': buyout_savings,
-            'actuals_amount': actuals_amount,
-            'etc_amount': etc_amount,
-            'eac_amount': eac_amount
-        }
+        ).all()
+    }
+    budget_lines = [line for line in budget_lines if line.vuid not in existing_line_vuids]
+    
+    # Calculate EAC data for all remaining lines at once
+    buyout_records = get_budget_line_buyout_records([line.vuid for line in budget_lines], accounting_period_vuid)
+    eac_data_by_line = calculate_budget_lines_eac_data(budget_lines, project_vuid, accounting_period_vuid, buyout_records)
+    
+    rows = []
+    for budget_line in budget_lines:
+        eac_data = eac_data_by_line[budget_line.vuid]
+        buyout_record = buyout_records.get(budget_line.vuid)
         
-    except Exception as e:
-        print(f"Error calculating EAC data for budget line {budget_line.vuid}: {str(e)}")
-        return {
-            'budgeted_amount': float(budget_line.budget_amount or 0),
-            'committed_amount': 0.0,
-            'commitment_change_orders_amount': 0.0,
-            'total_committed_amount': 0.0,
-            'buyout_savings': None,
-            'actuals_amount': 0.0,
-            'etc_amount': 0.0,
-            'eac_amount': 0.0
-        }
+        rows.append({
+            'vuid': str(uuid.uuid4()),
+            'project_vuid': project_vuid,
+            'accounting_period_vuid': accounting_period_vuid,
+            'budget_line_vuid': budget_line.vuid,
+            'budget_amount': float(budget_line.budget_amount or 0),
+            'budgeted_amount': eac_data['budgeted_amount'],
+            'committed_amount': eac_data['committed_amount'],
+            'commitment_change_orders_amount': eac_data['commitment_change_orders_amount'],
+            'total_committed_amount': eac_data['total_committed_amount'],
+            'buyout_savings': eac_data['buyout_savings'],
+            'actuals_amount': eac_data['actuals_amount'],
+            'etc_amount': eac_data['etc_amount'],
+            'eac_amount': eac_data['eac_amount'],
+            'is_bought_out': buyout_record.is_bought_out if buyout_record else False,
+            'buyout_date': buyout_record.buyout_date if buyout_record else None,
+            'buyout_amount': buyout_record.buyout_amount if buyout_record else None,
+            'buyout_notes': buyout_record.notes if buyout_record else None,
+            'buyout_created_by': buyout_record.created_by if buyout_record else None
+        })
+    
+    return rows
 
 def create_buyout_forecasting_snapshot(project_vuid, accounting_period_vuid):
     """Create a snapshot of buyout and forecasting data for a closed period"""
     try:
-        # Get the project's original budget
-        original_budget = db.session.query(ProjectBudget).filter_by(
-            project_vuid=project_vuid,
-            budget_type='original'
-        ).first()
-        
-        if not original_budget:
+        rows = make_buyout_forecasting_snapshot_rows(project_vuid, accounting_period_vuid)
+        if rows is None:
             return False, "No original budget found for this project"
         
-        # Get all budget lines for the original budget
-        budget_lines = db.session.query(ProjectBudgetLine).filter_by(
-            budget_vuid=original_budget.vuid,
-            status='active'
-        ).all()
-        
-        snapshots_created = 0
-        
-        for budget_line in budget_lines:
-            # Check if snapshot already exists
-            existing_snapshot = db.session.query(ProjectBuyoutForecastingSnapshot).filter_by(
-                project_vuid=project_vuid,
-                accounting_period_vuid=accounting_period_vuid,
-                budget_line_vuid=budget_line.vuid
-            ).first()
-            
-            if existing_snapshot:
-                continue  # Skip if snapshot already exists
-            
-            # Calculate actual EAC data for this budget line
-            eac_data = calculate_budget_line_eac_data(budget_line, project_vuid, accounting_period_vuid)
-            
-            # Get buyout record for this budget line and period
-            buyout_record = db.session.query(ProjectBudgetLineBuyout).filter_by(
-                budget_line_vuid=budget_line.vuid,
-                accounting_period_vuid=accounting_period_vuid
-            ).first()
-            
-            # Create snapshot with calculated values
-            snapshot = ProjectBuyoutForecastingSnapshot(
-                project_vuid=project_vuid,
-                accounting_period_vuid=accounting_period_vuid,
-                budget_line_vuid=budget_line.vuid,
-                budget_amount=float(budget_line.budget_amount or 0),
-                budgeted_amount=eac_data['budgeted_amount'],
-                committed_amount=eac_data['committed_amount'],
-                commitment_change_orders_amount=eac_data['commitment_change_orders_amount'],
-                total_committed_amount=eac_data['total_committed_amount'],
-                buyout_savings=eac_data['buyout_savings'],
-                actuals_amount=eac_data['actuals_amount'],
-                etc_amount=eac_data['etc_amount'],
-                eac_amount=eac_data['eac_amount'],
-                is_bought_out=buyout_record.is_bought_out if buyout_record else False,
-                buyout_date=buyout_record.buyout_date if buyout_record else None,
-                buyout_amount=buyout_record.buyout_amount if buyout_record else None,
-                buyout_notes=buyout_record.notes if buyout_record else None,
-                buyout_created_by=buyout_record.created_by if buyout_record else None
-            )
-            
-            db.session.add(snapshot)
-            snapshots_created += 1
+        if rows:
+            db.session.execute(db.insert(ProjectBuyoutForecastingSnapshot), rows)
         
         db.session.commit()
-        return True, f"Created {snapshots_created} snapshots with calculated EAC values"
+        return True, f"Created {len(rows)} snapshots with calculated EAC values"
         
     except Exception as e:
         db.session.rollback()
         return False, f"Error creating snapshots: {str(e)}"
 
-@app.route('/api/update-snapshots/<accounting_period_vuid>', methods=['POST'])
-def update_snapshots_for_period(accounting_period_vuid):
-    """Update existing snapshots with calculated EAC values for a specific period"""
-    try:
-        # Get all snapshots for this accounting period
-        snapshots = db.session.query(ProjectBuyoutForecastingSnapshot).filter_by(
-            accounting_period_vuid=accounting_period_vuid
-        ).all()
-        
-        updated_count = 0
+# Period close snapshots: projects are split into chunks and built on a thread pool. Each
+# worker runs in its own app context, so it gets its own session and pooled connection, and
+# writes one chunk per transaction. Progress is stored per period in snapshot_build_progress,
+# so the progress endpoint works from any API process
+SNAPSHOT_BUILD_CHUNK_SIZE = 20
+SNAPSHOT_BUILD_WORKERS = 4
+
+class SnapshotBuildProgress(db.Model):
+    """Progress of the latest period close snapshot build for an accounting period"""
+    __tablename__ = 'snapshot_build_progress'
+    
+    accounting_period_vuid = db.Column(db.String(36), db.ForeignKey('accounting_periods.vuid'), primary_key=True)
+    status = db.Column(db.String(20), nullable=False)  # 'running', 'completed', 'failed'
+    total_projects = db.Column(db.Integer, nullable=False, default=0)
+    completed_projects = db.Column(db.Integer, nullable=False, default=0)
+    snapshots_created = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text, nullable=True)
+    started_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+def start_snapshot_build_progress(accounting_period_vuid, total_projects):
+    """Replace a period's snapshot build progress with a new running build (own connection)"""
+    now = datetime.utcnow()
+    with db.engine.begin() as connection:
+        connection.execute(db.delete(SnapshotBuildProgress).where(
+            SnapshotBuildProgress.accounting_period_vuid == accounting_period_vuid
+        ))
+        connection.execute(db.insert(SnapshotBuildProgress).values(
+            accounting_period_vuid=accounting_period_vuid, status='running', total_projects=total_projects,
+            completed_projects=0, snapshots_created=0, started_at=now, updated_at=now
+        ))
+
+def update_snapshot_build_progress(accounting_period_vuid, **values):
+    """Update a period's snapshot build progress on its own connection, so it is visible immediately"""
+    with db.engine.begin() as connection:
+        connection.execute(db.update(SnapshotBuildProgress).where(
+            SnapshotBuildProgress.accounting_period_vuid == accounting_period_vuid
+        ).values(updated_at=datetime.utcnow(), **values))
+
+def build_buyout_forecasting_snapshot_chunk(project_vuids, accounting_period_vuid, db_pool=None):
+    """
+    Build and insert snapshots for a chunk of projects in one transaction.
+    
+    Runs on a worker thread, so it pushes its own app context and session.
+    
+    Args:
+        project_vuids: Projects in this chunk
+        accounting_period_vuid: Accounting period being closed
+        db_pool: Connection pool of the caller's session, so the chunk uses the same one
         
-        for snapshot in snapshots:
-            # Get the budget line
-            budget_line = db.session.get(ProjectBudgetLine, snapshot.budget_line_vuid)
-            if not budget_line:
-                continue
-            
-            # Calculate actual EAC data for this budget line
-            eac_data = calculate_budget_line_eac_data(budget_line, snapshot.project_vuid, accounting_period_vuid)
-            
-            # Get buyout record for this budget line and period
-            buyout_record = db.session.query(ProjectBudgetLineBuyout).filter_by(
-                budget_line_vuid=budget_line.vuid,
-                accounting_period_vuid=accounting_period_vuid
-            ).first()
+    Returns:
+        list: vuids of the snapshot rows inserted
+    """
+    with app.app_context():
+        use_db_pool(db_pool)
+        try:
+            rows = []
+            for project_vuid in project_vuids:
+                project_rows = make_buyout_forecasting_snapshot_rows(project_vuid, accounting_period_vuid)
+                if project_rows:
+                    rows.extend(project_rows)
+            
+            if rows:
+                db.session.execute(db.insert(ProjectBuyoutForecastingSnapshot), rows)
+            db.session.commit()
+            return [row['vuid'] for row in rows]
             
-            # Update snapshot with calculated values
-            snapshot.budgeted_amount = eac_data['budgeted_amount']
-            snapshot.committed_amount = eac_data['committed_amount']
-            snapshot.commitment_change_orders_amount = eac_data['commitment_change_orders_amount']
-            snapshot.total_committed_amount = eac_data['total_committed_amount']
-            snapshot.buyout_savings = eac_data['buyout_savings']
-            snapshot.actuals_amount = eac_data['actuals_amount']
-            snapshot.etc_amount = eac_data['etc_amount']
-            snapshot.eac_amount = eac_data['eac_amount']
-            snapshot.is_bought_out = buyout_record.is_bought_out if buyout_record else False
-            snapshot.buyout_date = buyout_record.buyout_date if buyout_record else None
-            snapshot.buyout_amount = buyout_record.buyout_amount if buyout_record else None
-            snapshot.buyout_notes = buyout_record.notes if buyout_record else None
-            snapshot.buyout_created_by = buyout_record.created_by if buyout_record else None
-            
-            updated_count += 1
+        except Exception:
+            db.session.rollback()
+            raise
+
+def delete_snapshot_rows(snapshot_vuids, chunk_size=1000):
+    """Delete snapshot rows by vuid, a chunk at a time"""
+    for i in range(0, len(snapshot_vuids), chunk_size):
+        db.session.query(ProjectBuyoutForecastingSnapshot).filter(
+            ProjectBuyoutForecastingSnapshot.vuid.in_(snapshot_vuids[i:i + chunk_size])
+        ).delete(synchronize_session=False)
+    db.session.commit()
+
+def build_period_close_snapshots(accounting_period_vuid, chunk_size=SNAPSHOT_BUILD_CHUNK_SIZE, max_workers=SNAPSHOT_BUILD_WORKERS):
+    """
+    Create buyout forecasting snapshots for every project with buyouts in a period.
+    
+    Project chunks are built in parallel. If any chunk fails, chunks that have not started
+    are cancelled and every snapshot inserted by this run is deleted again, so the period
+    is left as it was before the close.
+    
+    Args:
+        accounting_period_vuid: Accounting period being closed
+        chunk_size: Number of projects per worker transaction
+        max_workers: Number of worker threads (and database connections)
         
-        db.session.commit()
+    Returns:
+        tuple: (success, message, snapshots_created)
+    """
+    project_vuids = [
+        project_vuid for (project_vuid,) in db.session.query(ProjectBudgetLineBuyout.project_vuid).filter_by(
+            accounting_period_vuid=accounting_period_vuid
+        ).distinct().order_by(ProjectBudgetLineBuyout.project_vuid).all()
+    ]
+    # Release this session's connection before the workers check theirs out
+    db.session.commit()
+    
+    chunks = [project_vuids[i:i + chunk_size] for i in range(0, len(project_vuids), chunk_size)]
+    start_snapshot_build_progress(accounting_period_vuid, len(project_vuids))
+    
+    completed_projects = 0
+    inserted_vuids = []
+    errors = []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+        futures = {
+            executor.submit(build_buyout_forecasting_snapshot_chunk, chunk, accounting_period_vuid, get_db_pool()): chunk
+            for chunk in chunks
+        }
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            try:
+                inserted_vuids.extend(future.result())
+            except Exception as e:
+                errors.append(str(e))
+                for pending in futures:
+                    pending.cancel()
+                continue
+            
+            completed_projects += len(futures[future])
+            update_snapshot_build_progress(
+                accounting_period_vuid, completed_projects=completed_projects, snapshots_created=len(inserted_vuids)
+            )
+            print(f"Period close snapshots: {completed_projects}/{len(project_vuids)} projects, "
+                  f"{len(inserted_vuids)} snapshots")
+    
+    if errors:
+        delete_snapshot_rows(inserted_vuids)
+        update_snapshot_build_progress(accounting_period_vuid, status='failed', snapshots_created=0, error=errors[0])
+        return False, f"Error creating snapshots: {errors[0]}", 0
+    
+    update_snapshot_build_progress(accounting_period_vuid, status='completed')
+    return True, f"Created {len(inserted_vuids)} snapshots across {len(project_vuids)} projects", len(inserted_vuids)
+
+def update_period_snapshots(accounting_period_vuid, progress_callback=None):
+    """
+    Recalculate the EAC values on every buyout forecasting snapshot in a period.
+    
+    Args:
+        accounting_period_vuid: Accounting period whose snapshots are updated
+        progress_callback: Optional callable taking (processed_count, total_count)
+        
+    Returns:
+        int: Number of snapshots updated
+    """
+    # Get all snapshots for this accounting period
+    snapshots = db.session.query(ProjectBuyoutForecastingSnapshot).filter_by(
+        accounting_period_vuid=accounting_period_vuid
+    ).all()
+    
+    # Load the snapshots' budget lines and buyout records once
+    budget_line_vuids = list({snapshot.budget_line_vuid for snapshot in snapshots})
+    budget_lines_by_vuid = {
+        line.vuid: line for line in db.session.query(ProjectBudgetLine).filter(
+            ProjectBudgetLine.vuid.in_(budget_line_vuids)
+        ).all()
+    } if budget_line_vuids else {}
+    buyout_records = get_budget_line_buyout_records(budget_line_vuids, accounting_period_vuid)
+    
+    # Calculate EAC data one project at a time
+    budget_lines_by_project = {}
+    for snapshot in snapshots:
+        budget_line = budget_lines_by_vuid.get(snapshot.budget_line_vuid)
+        if budget_line:
+            budget_lines_by_project.setdefault(snapshot.project_vuid, {})[budget_line.vuid] = budget_line
+    
+    eac_data_by_project = {}
+    for project_vuid, project_budget_lines in budget_lines_by_project.items():
+        eac_data_by_project[project_vuid] = calculate_budget_lines_eac_data(
+            project_budget_lines.values(), project_vuid, accounting_period_vuid, buyout_records
+        )
+        if progress_callback:
+            progress_callback(len(eac_data_by_project), len(budget_lines_by_project))
+    
+    updated_count = 0
+    
+    for snapshot in snapshots:
+        budget_line = budget_lines_by_vuid.get(snapshot.budget_line_vuid)
+        if not budget_line:
+            continue
+        
+        eac_data = eac_data_by_project[snapshot.project_vuid][budget_line.vuid]
+        buyout_record = buyout_records.get(budget_line.vuid)
+        
+        # Update snapshot with calculated values
+        snapshot.budgeted_amount = eac_data['budgeted_amount']
+        snapshot.committed_amount = eac_data['committed_amount']
+        snapshot.commitment_change_orders_amount = eac_data['commitment_change_orders_amount']
+        snapshot.total_committed_amount = eac_data['total_committed_amount']
+        snapshot.buyout_savings = eac_data['buyout_savings']
+        snapshot.actuals_amount = eac_data['actuals_amount']
+        snapshot.etc_amount = eac_data['etc_amount']
+        snapshot.eac_amount = eac_data['eac_amount']
+        snapshot.is_bought_out = buyout_record.is_bought_out if buyout_record else False
+        snapshot.buyout_date = buyout_record.buyout_date if buyout_record else None
+        snapshot.buyout_amount = buyout_record.buyout_amount if buyout_record else None
+        snapshot.buyout_notes = buyout_record.notes if buyout_record else None
+        snapshot.buyout_created_by = buyout_record.created_by if buyout_record else None
+        
+        updated_count += 1
+    
+    db.session.commit()
+    return updated_count
+
+@app.route('/api/update-snapshots/<accounting_period_vuid>', methods=['POST'])
+def update_snapshots_for_period(accounting_period_vuid):
+    """Update existing snapshots with calculated EAC values for a specific period"""
+    try:
+        if wants_background_job():
+            return make_enqueue_job_response('update_snapshots', accounting_period_vuid)
+        
+        updated_count = update_period_snapshots(accounting_period_vuid)
         return jsonify({
             'success': True,
             'message': f"Updated {updated_count} snapshots with calculated EAC values",
@@ -7136,25 +8799,20 @@ def handle_accounting_period_status_change(accounting_period_vuid, new_status):
     """Handle accounting period status changes (open/closed)"""
     try:
         if new_status == 'closed':
-            # Period is being closed - create snapshots for all projects
-            # Get all projects that have buyout data for this period
-            projects_with_buyouts = db.session.query(ProjectBudgetLineBuyout.project_vuid).filter_by(
-                accounting_period_vuid=accounting_period_vuid
-            ).distinct().all()
-            
-            total_snapshots = 0
-            for (project_vuid,) in projects_with_buyouts:
-                success, message = create_buyout_forecasting_snapshot(project_vuid, accounting_period_vuid)
-                if success:
-                    # Extract number from message like "Created 5 snapshots"
-                    count = int(message.split()[1])
-                    total_snapshots += count
-            
-            return True, f"Created {total_snapshots} snapshots across {len(projects_with_buyouts)} projects"
+            # Period is being closed - create snapshots for all projects with buyout data,
+            # dropping any left by an earlier attempt that did not finish
+            success, message = delete_buyout_forecasting_snapshots(accounting_period_vuid)
+            if not success:
+                return success, message
+            success, message, snapshots_created = build_period_close_snapshots(accounting_period_vuid)
+            return success, message
             
         elif new_status == 'open':
-            # Period is being re-opened - delete all snapshots
+            # Period is being re-opened - delete all snapshots, and the month close checkpoints
+            # so the next close runs every stage again
             success, message = delete_buyout_forecasting_snapshots(accounting_period_vuid)
+            if success:
+                clear_period_close_checkpoints(accounting_period_vuid)
             return success, message
             
         else:
@@ -7165,82 +8823,89 @@ def handle_accounting_period_status_change(accounting_period_vuid, new_status):
 
 def get_wip_eac_data(project_vuid, accounting_period_vuid):
     """Get EAC (Estimated At Completion) data for a project and period"""
+    return get_wip_eac_data_bulk([project_vuid], accounting_period_vuid)[project_vuid]
+
+def get_wip_eac_data_bulk(project_vuids, accounting_period_vuid, pending_cost_totals=None):
+    """
+    Get EAC (Estimated At Completion) data for several projects and one period.
+    
+    Closed periods use the period close snapshots when a project has any. Otherwise the
+    saved buyout/forecasting EAC amounts are used, plus pending change orders included in
+    the forecast. Each source is read with one grouped SUM for all projects.
+    
+    Args:
+        project_vuids: Projects to get EAC data for
+        accounting_period_vuid: Accounting period the EAC data is for
+        pending_cost_totals: Optional {project_vuid: cost total} of pending change orders in
+            the forecast for the period, when the caller has already loaded them
+        
+    Returns:
+        dict: {project_vuid: (eac_amount, from_snapshot, message)}
+    """
+    project_vuids = list(dict.fromkeys(project_vuids))
+    if not accounting_period_vuid:
+        return {project_vuid: (0.0, False, None) for project_vuid in project_vuids}
+    
     try:
-        print(f"DEBUG: get_wip_eac_data called for project {project_vuid}, period {accounting_period_vuid}")
-        if not accounting_period_vuid:
-            return 0.0, False
-            
-        # Check if period is closed - use snapshot data if available, otherwise fall back to dynamic calculation
+        # Closed periods use snapshot data when available, otherwise fall back to dynamic calculation
+        snapshot_totals = {}
         accounting_period = db.session.get(AccountingPeriod, accounting_period_vuid)
-        if accounting_period and accounting_period.status == 'closed':
-            # Use snapshot data if available
-            snapshots = db.session.query(ProjectBuyoutForecastingSnapshot).filter_by(
-                project_vuid=project_vuid,
-                accounting_period_vuid=accounting_period_vuid
-            ).all()
-            
-            if snapshots:
-                total_eac = sum(float(snapshot.eac_amount) for snapshot in snapshots)
-                return total_eac, True  # True indicates snapshot data
-            else:
-                # No snapshots found for closed period, fall back to dynamic calculation
-                print(f"DEBUG: No snapshots found for closed period {accounting_period_vuid}, falling back to dynamic calculation")
-        
-        # For open periods, check if buyout/forecasting data has been saved
-        # Look for any buyout records for this project and period
-        buyout_records = db.session.query(ProjectBudgetLineBuyout).filter_by(
-            project_vuid=project_vuid,
-            accounting_period_vuid=accounting_period_vuid
-        ).all()
-        
-        if not buyout_records:
-            # No buyout/forecasting data saved yet
-            print(f"DEBUG: No buyout/forecasting data saved for project {project_vuid}, period {accounting_period_vuid}")
-            return 0.0, False, "No buyout/forecasting data saved for this period"
-        
-        # Use saved EAC values from buyout records
-        print(f"DEBUG: Using saved EAC values from buyout records for project {project_vuid}")
-        
-        # Get all buyout records for this project and period
-        buyout_records = db.session.query(ProjectBudgetLineBuyout).filter_by(
-            project_vuid=project_vuid,
-            accounting_period_vuid=accounting_period_vuid
-        ).all()
-        
-        if not buyout_records:
-            print(f"DEBUG: No buyout records found for project {project_vuid}, period {accounting_period_vuid}")
-            return 0.0, False, "No buyout/forecasting data saved for this period"
-        
-        # Sum up the saved EAC amounts
-        total_eac = 0.0
-        for buyout_record in buyout_records:
-            if buyout_record.eac_amount is not None:
-                total_eac += float(buyout_record.eac_amount)
-                print(f"DEBUG: Budget line {buyout_record.budget_line_vuid}: saved EAC = {buyout_record.eac_amount}")
-        
-        # Add pending change orders to EAC calculation
-        pending_change_orders = db.session.query(PendingChangeOrder).filter_by(
-            project_vuid=project_vuid,
-            accounting_period_vuid=accounting_period_vuid,
-            is_included_in_forecast=True
-        ).all()
+        if accounting_period and accounting_period.status == 'closed' and project_vuids:
+            snapshot_totals = {
+                project_vuid: float(eac_total or 0)
+                for project_vuid, eac_total in db.session.query(
+                    ProjectBuyoutForecastingSnapshot.project_vuid,
+                    db.func.sum(ProjectBuyoutForecastingSnapshot.eac_amount)
+                ).filter(
+                    ProjectBuyoutForecastingSnapshot.project_vuid.in_(project_vuids),
+                    ProjectBuyoutForecastingSnapshot.accounting_period_vuid == accounting_period_vuid
+                ).group_by(ProjectBuyoutForecastingSnapshot.project_vuid).all()
+            }
         
-        pending_cost_total = 0.0
-        for pco in pending_change_orders:
-            if pco.cost_amount is not None:
-                pending_cost_total += float(pco.cost_amount)
-                print(f"DEBUG: Pending CO {pco.change_order_number}: cost = {pco.cost_amount}")
+        # Saved EAC amounts from buyout records and pending change order costs for the rest
+        dynamic_project_vuids = [project_vuid for project_vuid in project_vuids if project_vuid not in snapshot_totals]
+        buyout_totals = {}
+        if dynamic_project_vuids:
+            buyout_totals = {
+                project_vuid: float(eac_total or 0)
+                for project_vuid, eac_total in db.session.query(
+                    ProjectBudgetLineBuyout.project_vuid,
+                    db.func.sum(ProjectBudgetLineBuyout.eac_amount)
+                ).filter(
+                    ProjectBudgetLineBuyout.project_vuid.in_(dynamic_project_vuids),
+                    ProjectBudgetLineBuyout.accounting_period_vuid == accounting_period_vuid
+                ).group_by(ProjectBudgetLineBuyout.project_vuid).all()
+            }
+        if pending_cost_totals is None:
+            pending_cost_totals = {}
+            if buyout_totals:
+                pending_cost_totals = {
+                    project_vuid: float(cost_total or 0)
+                    for project_vuid, cost_total in db.session.query(
+                        PendingChangeOrder.project_vuid,
+                        db.func.sum(PendingChangeOrder.cost_amount)
+                    ).filter(
+                        PendingChangeOrder.project_vuid.in_(list(buyout_totals)),
+                        PendingChangeOrder.accounting_period_vuid == accounting_period_vuid,
+                        PendingChangeOrder.is_included_in_forecast == True
+                    ).group_by(PendingChangeOrder.project_vuid).all()
+                }
         
-        total_eac += pending_cost_total
-        print(f"DEBUG: Total EAC from saved records: {total_eac - pending_cost_total}")
-        print(f"DEBUG: Total pending change order costs: {pending_cost_total}")
-        print(f"DEBUG: Total EAC including pending COs: {total_eac}")
+        eac_data = {}
+        for project_vuid in project_vuids:
+            if project_vuid in snapshot_totals:
+                eac_data[project_vuid] = (snapshot_totals[project_vuid], True, "From closed period snapshot")
+            elif project_vuid in buyout_totals:
+                eac_data[project_vuid] = (buyout_totals[project_vuid] + pending_cost_totals.get(project_vuid, 0.0), False,
+                                          "From saved buyout/forecasting data + pending change orders")
+            else:
+                eac_data[project_vuid] = (0.0, False, "No buyout/forecasting data saved for this period")
         
-        return total_eac, False, "From saved buyout/forecasting data + pending change orders"
+        return eac_data
             
     except Exception as e:
         print(f"Error getting EAC data: {str(e)}")
-        return 0.0, False, f"Error: {str(e)}"
+        return {project_vuid: (0.0, False, f"Error: {str(e)}") for project_vuid in project_vuids}
 
 def get_wip_setting(setting_name):
     """Get a WIP report setting value"""
@@ -7315,15 +8980,94 @@ def get_buyout_forecasting_data(project_vuid):
             if record.is_bought_out:
                 persistent_buyout_map[record.budget_line_vuid] = record
         
+        # Preload every dimension and amount the budget lines need, keyed by cost code or
+        # (cost code, cost type), so the number of queries does not depend on the line count
+        cost_code_vuids = {line.cost_code_vuid for line in budget_lines}
+        cost_type_vuids = {line.cost_type_vuid for line in budget_lines}
+        
+        # Global cost codes take precedence over project-specific cost codes
+        global_cost_codes = {
+            cost_code.vuid: cost_code for cost_code in CostCode.query.filter(CostCode.vuid.in_(cost_code_vuids)).all()
+        }
+        project_cost_codes = {
+            cost_code.vuid: cost_code for cost_code in ProjectCostCode.query.filter(ProjectCostCode.vuid.in_(cost_code_vuids)).all()
+        }
+        cost_types = {
+            cost_type.vuid: cost_type for cost_type in CostType.query.filter(CostType.vuid.in_(cost_type_vuids)).all()
+        }
+        
+        # Active commitment items on active commitments, split into original and change order amounts
+        committed_amounts = {}
+        commitment_change_orders_amounts = {}
+        for cost_code_vuid, cost_type_vuid, total_amount, changeorder in db.session.query(
+            ProjectCommitmentItem.cost_code_vuid, ProjectCommitmentItem.cost_type_vuid,
+            ProjectCommitmentItem.total_amount, ProjectCommitmentItem.changeorder
+        ).join(
+            ProjectCommitment, ProjectCommitmentItem.commitment_vuid == ProjectCommitment.vuid
+        ).filter(
+            ProjectCommitment.project_vuid == project_vuid,
+            ProjectCommitment.status == 'active',
+            ProjectCommitmentItem.status == 'active',
+            ProjectCommitmentItem.cost_code_vuid.in_(cost_code_vuids)
+        ).all():
+            key = (cost_code_vuid, cost_type_vuid)
+            if changeorder is True:
+                commitment_change_orders_amounts[key] = commitment_change_orders_amounts.get(key, 0.0) + float(total_amount or 0)
+            elif changeorder is False:
+                committed_amounts[key] = committed_amounts.get(key, 0.0) + float(total_amount or 0)
+        
+        # Active internal change order lines on active internal change orders
+        internal_change_order_amounts = {}
+        for cost_code_vuid, cost_type_vuid, change_amount in db.session.query(
+            InternalChangeOrderLine.cost_code_vuid, InternalChangeOrderLine.cost_type_vuid, InternalChangeOrderLine.change_amount
+        ).join(
+            InternalChangeOrder, InternalChangeOrderLine.internal_change_order_vuid == InternalChangeOrder.vuid
+        ).filter(
+            InternalChangeOrder.project_vuid == project_vuid,
+            InternalChangeOrder.status == 'active',
+            InternalChangeOrderLine.status == 'active',
+            InternalChangeOrderLine.cost_code_vuid.in_(cost_code_vuids)
+        ).all():
+            internal_change_order_amounts.setdefault((cost_code_vuid, cost_type_vuid), []).append(float(change_amount or 0))
+        
+        # Actuals from all cost sources (AP Invoices, Project Expenses, Labor Costs) across all periods
+        actuals_amounts = {}
+        actuals_rows = db.session.query(
+            APInvoiceLineItem.cost_code_vuid, APInvoiceLineItem.cost_type_vuid, APInvoiceLineItem.total_amount
+        ).join(APInvoice).filter(
+            APInvoice.project_vuid == project_vuid,
+            APInvoiceLineItem.cost_code_vuid.in_(cost_code_vuids),
+            APInvoice.status == 'approved'
+        ).all()
+        actuals_rows += db.session.query(
+            ProjectExpense.cost_code_vuid, ProjectExpense.cost_type_vuid, ProjectExpense.amount
+        ).filter(
+            ProjectExpense.project_vuid == project_vuid,
+            ProjectExpense.cost_code_vuid.in_(cost_code_vuids),
+            ProjectExpense.status == 'approved'
+        ).all()
+        actuals_rows += db.session.query(
+            LaborCost.cost_code_vuid, LaborCost.cost_type_vuid, LaborCost.amount
+        ).filter(
+            LaborCost.project_vuid == project_vuid,
+            LaborCost.cost_code_vuid.in_(cost_code_vuids),
+            LaborCost.status == 'approved'
+        ).all()
+        for cost_code_vuid, cost_type_vuid, amount in actuals_rows:
+            key = (cost_code_vuid, cost_type_vuid)
+            actuals_amounts[key] = actuals_amounts.get(key, 0.0) + float(amount or 0)
+        
         result = []
         
         for budget_line in budget_lines:
+            key = (budget_line.cost_code_vuid, budget_line.cost_type_vuid)
+            
             # Get cost code and cost type information
             cost_code_info = None
             cost_type_info = None
             
-            # Try to get cost code from global cost codes first
-            global_cost_code = db.session.get(CostCode, budget_line.cost_code_vuid)
+            global_cost_code = global_cost_codes.get(budget_line.cost_code_vuid)
+            project_cost_code = project_cost_codes.get(budget_line.cost_code_vuid)
             if global_cost_code:
                 cost_code_info = {
                     'vuid': global_cost_code.vuid,
@@ -7331,19 +9075,15 @@ def get_buyout_forecasting_data(project_vuid):
                     'description': global_cost_code.description,
                     'type': 'global'
                 }
-            else:
-                # Try project-specific cost code
-                project_cost_code = ProjectCostCode.query.filter_by(vuid=budget_line.cost_code_vuid).first()
-                if project_cost_code:
-                    cost_code_info = {
-                        'vuid': project_cost_code.vuid,
-                        'code': project_cost_code.code,
-                        'description': project_cost_code.description,
-                        'type': 'project'
-                    }
+            elif project_cost_code:
+                cost_code_info = {
+                    'vuid': project_cost_code.vuid,
+                    'code': project_cost_code.code,
+                    'description': project_cost_code.description,
+                    'type': 'project'
+                }
             
-            # Get cost type
-            cost_type = db.session.get(CostType, budget_line.cost_type_vuid)
+            cost_type = cost_types.get(budget_line.cost_type_vuid)
             if cost_type:
                 cost_type_info = {
                     'vuid': cost_type.vuid,
@@ -7351,101 +9091,16 @@ def get_buyout_forecasting_data(project_vuid):
                     'abbreviation': cost_type.abbreviation
                 }
             
-            # Calculate committed amounts (from commitments and change orders)
-            committed_amount = 0.0
-            commitment_change_orders_amount = 0.0
-            
-            # Get commitments for this cost code/type combination
-            commitments = db.session.query(ProjectCommitment).join(ProjectCommitmentItem).filter(
-                ProjectCommitment.project_vuid == project_vuid,
-                ProjectCommitmentItem.cost_code_vuid == budget_line.cost_code_vuid,
-                ProjectCommitmentItem.cost_type_vuid == budget_line.cost_type_vuid,
-                ProjectCommitment.status == 'active'
-            ).all()
-            
-            for commitment in commitments:
-                # Original commitment amount
-                commitment_items = ProjectCommitmentItem.query.filter_by(
-                    commitment_vuid=commitment.vuid,
-                    cost_code_vuid=budget_line.cost_code_vuid,
-                    cost_type_vuid=budget_line.cost_type_vuid,
-                    status='active',
-                    changeorder=False
-                ).all()
-                
-                for item in commitment_items:
-                    committed_amount += float(item.total_amount or 0)
-                
-                # Change orders for this commitment
-                change_order_items = ProjectCommitmentItem.query.filter_by(
-                    commitment_vuid=commitment.vuid,
-                    cost_code_vuid=budget_line.cost_code_vuid,
-                    cost_type_vuid=budget_line.cost_type_vuid,
-                    status='active',
-                    changeorder=True
-                ).all()
-                
-                for item in change_order_items:
-                    commitment_change_orders_amount += float(item.total_amount or 0)
+            # Committed amounts (from commitments and change orders)
+            committed_amount = committed_amounts.get(key, 0.0)
+            commitment_change_orders_amount = commitment_change_orders_amounts.get(key, 0.0)
             
-            # Calculate budgeted amount including change orders
-            # Start with original budget amount
+            # Budgeted amount: original budget amount plus internal change orders
             budgeted_amount = float(budget_line.budget_amount or 0)
+            for change_amount in internal_change_order_amounts.get(key, []):
+                budgeted_amount += change_amount
             
-            # Add internal change orders for this budget line
-            internal_change_orders = db.session.query(InternalChangeOrder).join(InternalChangeOrderLine).filter(
-                InternalChangeOrder.project_vuid == project_vuid,
-                InternalChangeOrderLine.cost_code_vuid == budget_line.cost_code_vuid,
-                InternalChangeOrderLine.cost_type_vuid == budget_line.cost_type_vuid,
-                InternalChangeOrder.status == 'active'
-            ).all()
-            
-            for change_order in internal_change_orders:
-                change_order_lines = InternalChangeOrderLine.query.filter_by(
-                    internal_change_order_vuid=change_order.vuid,
-                    cost_code_vuid=budget_line.cost_code_vuid,
-                    cost_type_vuid=budget_line.cost_type_vuid,
-                    status='active'
-                ).all()
-                
-                for line in change_order_lines:
-                    budgeted_amount += float(line.change_amount or 0)
-            
-            # Calculate actuals amounts from all cost sources (AP Invoices, Project Expenses, Labor Costs)
-            actuals_amount = 0.0
-            
-            # AP Invoice costs
-            ap_invoice_line_items = db.session.query(APInvoiceLineItem).join(APInvoice).filter(
-                APInvoice.project_vuid == project_vuid,
-                APInvoiceLineItem.cost_code_vuid == budget_line.cost_code_vuid,
-                APInvoiceLineItem.cost_type_vuid == budget_line.cost_type_vuid,
-                APInvoice.status == 'approved'
-            ).all()
-            
-            for line_item in ap_invoice_line_items:
-                actuals_amount += float(line_item.total_amount or 0)
-            
-            # Project Expense costs
-            project_expenses = db.session.query(ProjectExpense).filter(
-                ProjectExpense.project_vuid == project_vuid,
-                ProjectExpense.cost_code_vuid == budget_line.cost_code_vuid,
-                ProjectExpense.cost_type_vuid == budget_line.cost_type_vuid,
-                ProjectExpense.status == 'approved'
-            ).all()
-            
-            for expense in project_expenses:
-                actuals_amount += float(expense.amount or 0)
-            
-            # Labor Cost costs
-            labor_costs = db.session.query(LaborCost).filter(
-                LaborCost.project_vuid == project_vuid,
-                LaborCost.cost_code_vuid == budget_line.cost_code_vuid,
-                LaborCost.cost_type_vuid == budget_line.cost_type_vuid,
-                LaborCost.status == 'approved'
-            ).all()
-            
-            for labor_cost in labor_costs:
-                actuals_amount += float(labor_cost.amount or 0)
+            actuals_amount = actuals_amounts.get(key, 0.0)
             
             # Get buyout record if it exists (current period)
             buyout_record = buyout_map.get(budget_line.vuid)
@@ -7925,12 +9580,20 @@ def update_accounting_period_status(accounting_period_vuid):
         if not accounting_period:
             return jsonify({'error': 'Accounting period not found'}), 404
         
-        # Update the period status
-        accounting_period.status = new_status
-        db.session.commit()
-        
-        # Handle snapshot creation/deletion
-        success, message = handle_accounting_period_status_change(accounting_period_vuid, new_status)
+        if new_status == 'closed':
+            # Build the snapshots before committing the status, so a failed build or a process
+            # that dies part way leaves the period open; the next close starts the build over
+            success, message = handle_accounting_period_status_change(accounting_period_vuid, new_status)
+            if not success:
+                return jsonify({'error': f'Period was not closed because snapshot creation failed: {message}'}), 500
+            
+            accounting_period = db.session.get(AccountingPeriod, accounting_period_vuid)
+            accounting_period.status = new_status
+            db.session.commit()
+        else:
+            accounting_period.status = new_status
+            db.session.commit()
+            success, message = handle_accounting_period_status_change(accounting_period_vuid, new_status)
         
         if success:
             return jsonify({
@@ -7952,12 +9615,62 @@ def update_accounting_period_status(accounting_period_vuid):
         db.session.rollback()
         return jsonify({'error': f'Error updating accounting period status: {str(e)}'}), 500
 
+@app.route('/api/accounting-periods/<accounting_period_vuid>/snapshot-progress', methods=['GET'])
+def get_accounting_period_snapshot_progress(accounting_period_vuid):
+    """Get the progress of the period close snapshot build"""
+    progress = db.session.get(SnapshotBuildProgress, accounting_period_vuid)
+    if not progress:
+        return jsonify({'error': 'No snapshot build has run for this accounting period'}), 404
+    
+    return jsonify({
+        'success': True,
+        'data': {
+            'accounting_period_vuid': accounting_period_vuid,
+            'status': progress.status,
+            'total_projects': progress.total_projects,
+            'completed_projects': progress.completed_projects,
+            'snapshots_created': progress.snapshots_created,
+            'error': progress.error,
+            'started_at': progress.started_at.isoformat(),
+            'updated_at': progress.updated_at.isoformat()
+        }
+    })
+
+@app.route('/api/accounting-periods/<accounting_period_vuid>/close-status', methods=['GET'])
+def get_accounting_period_close_status(accounting_period_vuid):
+    """Get the month close stages completed for an accounting period"""
+    period = db.session.get(AccountingPeriod, accounting_period_vuid)
+    if not period:
+        return jsonify({'error': 'Accounting period not found'}), 404
+    
+    checkpoints = {
+        checkpoint.stage: checkpoint
+        for checkpoint in PeriodCloseCheckpoint.query.filter_by(accounting_period_vuid=accounting_period_vuid).all()
+    }
+    stages = []
+    for stage, run_stage in PERIOD_CLOSE_STAGES:
+        checkpoint = checkpoints.get(stage)
+        stages.append({
+            'stage': stage,
+            'completed': checkpoint is not None,
+            'completed_at': checkpoint.completed_at.isoformat() if checkpoint else None,
+            'result': checkpoint.result if checkpoint else None
+        })
+    
+    return jsonify({
+        'success': True,
+        'data': {
+            'accounting_period_vuid': accounting_period_vuid,
+            'status': period.status,
+            'stages': stages
+        }
+    })
+
 @app.route('/api/wip-settings', methods=['GET'])
 def get_wip_settings():
     """Get all WIP report settings"""
     try:
-        settings = db.session.query(WIPReportSetting).all()
-        return jsonify(wip_report_settings_schema.dump(settings))
+        return get_cached_reference_response('wip_settings')
     except Exception as e:
         return jsonify({'error': f'Error retrieving WIP settings: {str(e)}'}), 500
 
@@ -8872,6 +10585,11 @@ def get_wip_report_from_posted_records():
         projects = Project.query.filter_by(status='active').all()
         wip_data = []
         
+        # EAC data for every project at once
+        eac_data_by_project = {}
+        if eac_enabled and accounting_period_vuid:
+            eac_data_by_project = get_wip_eac_data_bulk([project.vuid for project in projects], accounting_period_vuid)
+        
         for project in projects:
             # Get posted records for this project and period
             posted_records = PostedRecord.query.filter_by(
@@ -8900,7 +10618,8 @@ def get_wip_report_from_posted_records():
                         over_under_billing_amount -= float(record.total_amount or 0)
             
             # Calculate revenue recognized using the same logic as the original function
-            revenue_data = calculate_revenue_recognized(project.vuid, accounting_period_vuid, eac_enabled)
+            revenue_data = calculate_revenue_recognized(project.vuid, accounting_period_vuid, eac_enabled,
+                                                        eac_data_by_project.get(project.vuid))
             revenue_recognized = revenue_data['revenue_recognized']
             percent_complete = revenue_data['percent_complete']
             total_contract_amount = revenue_data['total_contract_amount']
@@ -8947,9 +10666,301 @@ def get_wip_report_from_posted_records():
             'error': f'Error generating WIP report from posted records: {str(e)}'
         }), 500
 
+# Set-based WIP report engine
+def calculate_wip_report_rows(projects, accounting_period_vuid=None, eac_enabled=False):
+    """
+    Calculate WIP report rows for a list of projects.
+    Every column is computed for all projects at once with grouped aggregate queries
+    (GROUP BY project_vuid) and the results are joined in memory, so the number of
+    queries does not grow with the number of projects.
+    
+    Produces the same rows as calling calculate_project_costs_to_date,
+    calculate_project_billings_total, calculate_revenue_recognized and
+    get_wip_eac_data for each project; EAC data comes from get_wip_eac_data_bulk.
+    
+    Args:
+        projects: Project rows to report on, in output order
+        accounting_period_vuid: Optional accounting period; costs and billings are to date through this period
+        eac_enabled: WIP 'use_eac_reporting' flag, echoed on every row
+    
+    Returns:
+        list: WIP report rows, one dict per project
+    """
+    project_vuids = [project.vuid for project in projects]
+    if not project_vuids:
+        return []
+    
+    # Active contracts, kept in query order per project
+    contracts_by_project = {}
+    contract_rows = db.session.query(
+        ProjectContract.vuid,
+        ProjectContract.project_vuid,
+        ProjectContract.contract_number,
+        ProjectContract.contract_name,
+        ProjectContract.contract_amount,
+        ProjectContract.customer_vuid,
+        ProjectContract.status
+    ).filter(
+        ProjectContract.project_vuid.in_(project_vuids),
+        ProjectContract.status == 'active'
+    ).all()
+    for contract in contract_rows:
+        contracts_by_project.setdefault(contract.project_vuid, []).append(contract)
+    
+    customer_vuids = {contract.customer_vuid for contract in contract_rows if contract.customer_vuid}
+    customer_names = {}
+    if customer_vuids:
+        customer_names = dict(db.session.query(Customer.vuid, Customer.customer_name).filter(
+            Customer.vuid.in_(customer_vuids)
+        ).all())
+    
+    # Original budget: the first active original budget per project, summed over its active lines
+    original_budget_by_project = {}
+    for budget_vuid, project_vuid in db.session.query(ProjectBudget.vuid, ProjectBudget.project_vuid).filter(
+        ProjectBudget.project_vuid.in_(project_vuids),
+        ProjectBudget.budget_type == 'original',
+        ProjectBudget.status == 'active'
+    ).all():
+        original_budget_by_project.setdefault(project_vuid, budget_vuid)
+    
+    # original_budget_amount is reported unrounded, so its lines are summed in Python
+    # (float addition in row order) to keep the value exactly as the per-project loop produced it
+    budget_line_amounts = {budget_vuid: [] for budget_vuid in original_budget_by_project.values()}
+    if budget_line_amounts:
+        for budget_vuid, budget_amount in db.session.query(
+            ProjectBudgetLine.budget_vuid,
+            ProjectBudgetLine.budget_amount
+        ).filter(
+            ProjectBudgetLine.budget_vuid.in_(list(budget_line_amounts)),
+            ProjectBudgetLine.status == 'active'
+        ).all():
+            budget_line_amounts[budget_vuid].append(budget_amount)
+    
+    # Approved internal change orders (active lines)
+    ico_totals = dict(db.session.query(
+        InternalChangeOrder.project_vuid,
+        db.func.sum(InternalChangeOrderLine.change_amount)
+    ).join(
+        InternalChangeOrder, InternalChangeOrderLine.internal_change_order_vuid == InternalChangeOrder.vuid
+    ).filter(
+        InternalChangeOrder.project_vuid.in_(project_vuids),
+        InternalChangeOrder.status == 'approved',
+        InternalChangeOrderLine.status == 'active'
+    ).group_by(InternalChangeOrder.project_vuid).all())
+    
+    # Approved external change orders on active contracts
+    eco_budget_totals = dict(db.session.query(
+        ProjectContract.project_vuid,
+        db.func.sum(ExternalChangeOrderLine.budget_amount_change)
+    ).join(
+        ExternalChangeOrder, ExternalChangeOrderLine.external_change_order_vuid == ExternalChangeOrder.vuid
+    ).join(
+        ProjectContract, ExternalChangeOrder.contract_vuid == ProjectContract.vuid
+    ).filter(
+        ProjectContract.project_vuid.in_(project_vuids),
+        ProjectContract.status == 'active',
+        ExternalChangeOrder.status == 'approved',
+        ExternalChangeOrderLine.status == 'active'
+    ).group_by(ProjectContract.project_vuid).all())
+    
+    eco_contract_totals = dict(db.session.query(
+        ProjectContract.project_vuid,
+        db.func.sum(ExternalChangeOrder.total_contract_change_amount)
+    ).join(
+        ProjectContract, ExternalChangeOrder.contract_vuid == ProjectContract.vuid
+    ).filter(
+        ProjectContract.project_vuid.in_(project_vuids),
+        ProjectContract.status == 'active',
+        ExternalChangeOrder.status == 'approved'
+    ).group_by(ProjectContract.project_vuid).all())
+    
+    # Costs and billings to date come from the project cost rollup (prefix sum over periods)
+    rollup_totals = get_cost_rollup_totals(project_vuids, accounting_period_vuid)
+    
+    # Pending change orders included in the forecast (all periods when no period is selected)
+    pending_change_orders_query = db.session.query(
+        PendingChangeOrder.project_vuid,
+        db.func.sum(PendingChangeOrder.cost_amount),
+        db.func.sum(PendingChangeOrder.revenue_amount)
+    ).filter(
+        PendingChangeOrder.project_vuid.in_(project_vuids),
+        PendingChangeOrder.is_included_in_forecast == True
+    )
+    if accounting_period_vuid:
+        pending_change_orders_query = pending_change_orders_query.filter(
+            PendingChangeOrder.accounting_period_vuid == accounting_period_vuid
+        )
+    pending_totals = {
+        project_vuid: (float(cost_total or 0), float(revenue_total or 0))
+        for project_vuid, cost_total, revenue_total in pending_change_orders_query.group_by(PendingChangeOrder.project_vuid).all()
+    }
+    
+    # EAC data
+    eac_data = {}
+    if eac_enabled and accounting_period_vuid:
+        eac_data = get_wip_eac_data_bulk(project_vuids, accounting_period_vuid, {
+            project_vuid: totals[0] for project_vuid, totals in pending_totals.items()
+        })
+    
+    wip_data = []
+    for project in projects:
+        contracts = contracts_by_project.get(project.vuid, [])
+        
+        original_budget_vuid = original_budget_by_project.get(project.vuid)
+        if original_budget_vuid:
+            original_budget_amount = sum(float(amount) for amount in budget_line_amounts[original_budget_vuid])
+        else:
+            original_budget_amount = 0.0
+        total_ico_changes = float(ico_totals.get(project.vuid) or 0)
+        total_eco_budget_changes = float(eco_budget_totals.get(project.vuid) or 0)
+        total_project_change_orders = float(eco_contract_totals.get(project.vuid) or 0)
+        
+        project_rollup = rollup_totals[project.vuid]['to_date']
+        costs_to_date = (project_rollup.get('ap_invoice', 0.0)
+                         + project_rollup.get('labor_cost', 0.0)
+                         + project_rollup.get('project_expense', 0.0))
+        project_billings_total = project_rollup.get('project_billing', 0.0)
+        
+        pending_cost_total, pending_revenue_total = pending_totals.get(project.vuid, (0.0, 0.0))
+        
+        eac_amount_for_project, eac_from_snapshot, eac_message = eac_data.get(project.vuid, (0.0, False, None))
+        
+        # Revenue recognized (same rules as calculate_revenue_recognized)
+        total_original_contract_amount = sum(float(contract.contract_amount) for contract in contracts)
+        if contracts:
+            total_contract_amount = total_original_contract_amount
+            eac_amount = eac_amount_for_project
+            current_budget_amount = original_budget_amount + total_ico_changes + total_project_change_orders + pending_cost_total
+        else:
+            total_contract_amount = 0.0
+            eac_amount = 0.0
+            current_budget_amount = 0.0
+        
+        percent_complete = 0.0
+        if eac_enabled and accounting_period_vuid and eac_amount > 0:
+            percent_complete = (costs_to_date / eac_amount) * 100
+        elif current_budget_amount > 0:
+            percent_complete = (costs_to_date / current_budget_amount) * 100
+        revenue_recognized = (percent_complete / 100) * total_contract_amount
+        
+        if not accounting_period_vuid:
+            pending_cost_total, pending_revenue_total = 0.0, 0.0
+        
+        # Get primary customer and contract identifiers
+        primary_customer_name = None
+        contract_numbers = []
+        contract_names = []
+        for contract in contracts:
+            if not primary_customer_name:
+                primary_customer_name = customer_names.get(contract.customer_vuid)
+            contract_numbers.append(contract.contract_number)
+            contract_names.append(contract.contract_name)
+        
+        # Calculate profit margin percentage
+        profit_margin_percent = 0.0
+        if total_contract_amount > 0:
+            profit = total_contract_amount - current_budget_amount
+            profit_margin_percent = (profit / total_contract_amount) * 100
+        
+        # Overbilling = Billed to Date - Earned Revenue (when positive)
+        # Underbilling = Earned Revenue - Billed to Date (when positive)
+        over_billing = max(0, project_billings_total - revenue_recognized)
+        under_billing = max(0, revenue_recognized - project_billings_total)
+        
+        combined_contract_number = " + ".join(contract_numbers) if len(contract_numbers) > 1 else (contract_numbers[0] if contract_numbers else "")
+        combined_contract_name = " + ".join(contract_names) if len(contract_names) > 1 else (contract_names[0] if contract_names else "")
+        
+        # When EAC reporting is enabled and EAC > 0, display EAC as the current budget
+        display_budget_amount = current_budget_amount
+        if eac_enabled and eac_amount > 0:
+            display_budget_amount = eac_amount
+        
+        wip_data.append({
+            'project_vuid': project.vuid,
+            'project_number': project.project_number,
+            'project_name': project.project_name,
+            'contract_vuid': contracts[0].vuid if contracts else None,  # Use first contract VUID for compatibility
+            'contract_number': combined_contract_number,
+            'contract_name': combined_contract_name,
+            'customer_name': primary_customer_name if primary_customer_name else 'Unknown Customer',
+            'original_contract_amount': total_original_contract_amount,  # Sum of all contract amounts
+            'change_orders': round(total_project_change_orders, 2),  # External change orders for all contracts
+            'total_contract_amount': round(total_contract_amount, 2),  # Original + change orders
+            'previous_billings': 0.0,  # Placeholder - would come from billing system
+            'current_period_billing': 0.0,  # Placeholder - would come from billing system
+            'total_billings': 0.0,  # Placeholder - would come from billing system
+            'percent_complete': round(percent_complete, 1),  # Calculated: (costs_to_date / budget_for_percent_calc) * 100
+            'revenue_recognized': round(revenue_recognized, 2),  # Calculated: (percent_complete / 100) * total_contract_amount
+            'earned_value': round(revenue_recognized, 2),  # Same as revenue_recognized for consistency
+            'over_billing': round(over_billing, 2),  # Calculated: max(0, project_billings_total - revenue_recognized)
+            'under_billing': round(under_billing, 2),  # Calculated: max(0, revenue_recognized - project_billings_total)
+            'status': contracts[0].status if contracts else 'unknown',  # Use first contract status
+            'original_budget_amount': original_budget_amount,
+            'current_budget_amount': round(display_budget_amount, 2),  # Shows EAC when EAC reporting is enabled and EAC > 0
+            'eac_amount': round(eac_amount, 2) if eac_enabled else None,  # EAC amount when EAC reporting is enabled
+            'eac_from_snapshot': eac_from_snapshot if eac_enabled else None,  # Indicates if EAC data is from snapshot
+            'eac_message': eac_message if eac_enabled else None,  # Message about EAC data status
+            'costs_to_date': round(costs_to_date, 2),  # Gross invoice amounts + labor costs + project expenses for this project
+            'project_billings': round(project_billings_total, 2),  # Net project billing amounts (after retainage is deducted)
+            'total_ico_changes': round(total_ico_changes, 2),
+            'total_eco_budget_changes': round(total_eco_budget_changes, 2),  # External change order budget changes
+            'total_project_change_orders': round(total_project_change_orders, 2),  # Total external change orders for entire project
+            'pending_change_orders_revenue': round(pending_revenue_total, 2),  # Revenue from pending change orders
+            'pending_change_orders_budget': round(pending_cost_total, 2),  # Cost impact from pending change orders
+            'profit_margin_percent': round(profit_margin_percent, 2),  # Profit margin as percentage
+            'eac_enabled': eac_enabled  # Indicates if EAC reporting is enabled for this report
+        })
+    
+    return wip_data
+
+def calculate_project_wip_row(project_vuid, accounting_period_vuid=None, eac_enabled=None):
+    """
+    Calculate the WIP report row for a single project in-process.
+    Returns the same row /api/wip produces for the project, but only reads that project's data.
+    
+    Args:
+        project_vuid: The project VUID
+        accounting_period_vuid: Optional accounting period; costs and billings are to date through this period
+        eac_enabled: WIP 'use_eac_reporting' flag; read from the WIP settings when not given
+    
+    Returns:
+        dict: WIP report row, or None if the project does not exist
+    """
+    project = db.session.get(Project, project_vuid)
+    if not project:
+        return None
+    
+    if eac_enabled is None:
+        use_eac_reporting = get_wip_setting('use_eac_reporting')
+        eac_enabled = use_eac_reporting and use_eac_reporting.lower() == 'true'
+    
+    return calculate_wip_report_rows([project], accounting_period_vuid, eac_enabled)[0]
+
+# Keys of a calculate_wip_report_rows row, in report order
+WIP_EXPORT_COLUMNS = [
+    'project_vuid', 'project_number', 'project_name', 'contract_vuid', 'contract_number', 'contract_name',
+    'customer_name', 'original_contract_amount', 'change_orders', 'total_contract_amount', 'previous_billings',
+    'current_period_billing', 'total_billings', 'percent_complete', 'revenue_recognized', 'earned_value',
+    'over_billing', 'under_billing', 'status', 'original_budget_amount', 'current_budget_amount', 'eac_amount',
+    'eac_from_snapshot', 'eac_message', 'costs_to_date', 'project_billings', 'total_ico_changes',
+    'total_eco_budget_changes', 'total_project_change_orders', 'pending_change_orders_revenue',
+    'pending_change_orders_budget', 'profit_margin_percent', 'eac_enabled',
+]
+
+def iter_wip_export_rows(accounting_period_vuid, eac_enabled):
+    """Yield WIP report rows for the active projects, calculated one batch of projects at a time"""
+    projects = Project.query.filter_by(status='active').order_by(Project.project_number, Project.vuid)
+    for batch in iter_query_batches(projects):
+        yield from calculate_wip_report_rows(batch, accounting_period_vuid, eac_enabled)
+
 @app.route('/api/wip', methods=['GET'])
 def get_wip_report():
     """Get WIP (Work in Progress) report data"""
+    try:
+        export_format = get_export_format()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
     try:
         # Get accounting period filter from query parameters
         accounting_period_vuid = request.args.get('accounting_period_vuid')
@@ -8964,184 +10975,15 @@ def get_wip_report():
         use_eac_reporting = get_wip_setting('use_eac_reporting')
         eac_enabled = use_eac_reporting and use_eac_reporting.lower() == 'true'
         
-        # Get all ACTIVE projects with their contracts and budgets
-        projects = Project.query.filter_by(status='active').all()
-        wip_data = []
+        if export_format:
+            filename = f"wip_{selected_period.year}_{selected_period.month:02d}" if selected_period else 'wip'
+            return make_export_response(
+                iter_wip_export_rows(accounting_period_vuid, eac_enabled), export_format, filename, WIP_EXPORT_COLUMNS
+            )
         
-        for project in projects:
-            # Get contracts for this project
-            # This includes only ACTIVE contracts
-            contracts = ProjectContract.query.filter_by(project_vuid=project.vuid, status='active').all()
-            
-            # Get original budget amount for this project
-            # This includes only ACTIVE budgets
-            original_budget = ProjectBudget.query.filter_by(
-                project_vuid=project.vuid, 
-                budget_type='original',
-                status='active'
-            ).first()
-            
-            # Calculate total budget amount from budget lines
-            # This includes only ACTIVE budget lines
-            if original_budget:
-                budget_lines = ProjectBudgetLine.query.filter_by(budget_vuid=original_budget.vuid, status='active').all()
-                original_budget_amount = sum(float(line.budget_amount) for line in budget_lines)
-            else:
-                original_budget_amount = 0.0
-            
-            # Calculate current budget by adding internal change orders
-            # This includes only APPROVED internal change orders
-            internal_change_orders = InternalChangeOrder.query.filter_by(project_vuid=project.vuid, status='approved').all()
-            total_ico_changes = 0.0
-            
-            for ico in internal_change_orders:
-                # Sum up all change amounts from ICO lines
-                # This includes only ACTIVE ICO lines
-                ico_lines = InternalChangeOrderLine.query.filter_by(internal_change_order_vuid=ico.vuid, status='active').all()
-                ico_total = sum(float(line.change_amount) for line in ico_lines)
-                total_ico_changes += ico_total
-            
-            # Calculate external change order budget changes for this project
-            # This includes only APPROVED external change orders
-            total_eco_budget_changes = 0.0
-            
-            for contract in contracts:
-                external_change_orders = ExternalChangeOrder.query.filter_by(contract_vuid=contract.vuid, status='approved').all()
-                for eco in external_change_orders:
-                    # Sum up all budget amount changes from ECO lines
-                    # This includes only ACTIVE ECO lines
-                    eco_lines = ExternalChangeOrderLine.query.filter_by(external_change_order_vuid=eco.vuid, status='active').all()
-                    eco_budget_total = sum(float(line.budget_amount_change) for line in eco_lines)
-                    total_eco_budget_changes += eco_budget_total
-            
-            # Use centralized calculation functions for consistent results
-            try:
-                costs_data = calculate_project_costs_to_date(project.vuid, accounting_period_vuid)
-                costs_to_date = costs_data['total_costs']
-                
-                billings_data = calculate_project_billings_total(project.vuid, accounting_period_vuid)
-                project_billings_total = billings_data['total_billings']
-                
-                revenue_data = calculate_revenue_recognized(project.vuid, accounting_period_vuid, eac_enabled)
-                revenue_recognized = revenue_data['revenue_recognized']
-                percent_complete = revenue_data['percent_complete']
-                total_contract_amount = revenue_data['total_contract_amount']
-                eac_amount = revenue_data['eac_amount']
-                current_budget_amount = revenue_data['current_budget_amount']
-            except Exception as e:
-                print(f"ERROR in centralized functions for project {project.project_number}: {str(e)}")
-                import traceback
-                traceback.print_exc()
-                raise
-            
-            print(f"DEBUG WIP CENTRALIZED: Project {project.project_number}")
-            print(f"  costs_to_date={costs_to_date}")
-            print(f"  project_billings_total={project_billings_total}")
-            print(f"  revenue_recognized={revenue_recognized}")
-            print(f"  percent_complete={percent_complete}")
-            print(f"  total_contract_amount={total_contract_amount}")
-            
-            # Calculate additional variables needed for the response
-            total_original_contract_amount = sum(float(contract.contract_amount) for contract in contracts)
-            total_project_change_orders = 0.0
-            for contract in contracts:
-                external_change_orders = ExternalChangeOrder.query.filter_by(contract_vuid=contract.vuid, status='approved').all()
-                for eco in external_change_orders:
-                    total_project_change_orders += float(eco.total_contract_change_amount)
-            
-            # Calculate pending change order amounts
-            pending_revenue_total = 0.0
-            pending_cost_total = 0.0
-            if accounting_period_vuid:
-                pending_change_orders = db.session.query(PendingChangeOrder).filter_by(
-                    project_vuid=project.vuid,
-                    accounting_period_vuid=accounting_period_vuid,
-                    is_included_in_forecast=True
-                ).all()
-                
-                for pco in pending_change_orders:
-                    if pco.revenue_amount is not None:
-                        pending_revenue_total += float(pco.revenue_amount)
-                    if pco.cost_amount is not None:
-                        pending_cost_total += float(pco.cost_amount)
-            
-            # Get primary customer and contract identifiers
-            primary_customer = None
-            contract_numbers = []
-            contract_names = []
-            
-            for contract in contracts:
-                if not primary_customer:
-                    primary_customer = Customer.query.get(contract.customer_vuid)
-                contract_numbers.append(contract.contract_number)
-                contract_names.append(contract.contract_name)
-            
-            # Get EAC data for additional fields
-            eac_from_snapshot = False
-            eac_message = None
-            if eac_enabled and accounting_period_vuid:
-                _, eac_from_snapshot, eac_message = get_wip_eac_data(project.vuid, accounting_period_vuid)
-            
-            # Calculate profit margin percentage
-            profit_margin_percent = 0.0
-            if total_contract_amount > 0:
-                profit = total_contract_amount - current_budget_amount
-                profit_margin_percent = (profit / total_contract_amount) * 100
-            
-            # Calculate overbilling and underbilling
-            # Overbilling = Billed to Date - Earned Revenue (when positive)
-            # Underbilling = Earned Revenue - Billed to Date (when positive)
-            over_billing = max(0, project_billings_total - revenue_recognized)
-            under_billing = max(0, revenue_recognized - project_billings_total)
-            
-            # Create combined contract identifiers
-            combined_contract_number = " + ".join(contract_numbers) if len(contract_numbers) > 1 else (contract_numbers[0] if contract_numbers else "")
-            combined_contract_name = " + ".join(contract_names) if len(contract_names) > 1 else (contract_names[0] if contract_names else "")
-            
-            # When EAC reporting is enabled and EAC > 0, display EAC as the current budget
-            # Otherwise display the standard current budget
-            display_budget_amount = current_budget_amount
-            if eac_enabled and eac_amount > 0:
-                display_budget_amount = eac_amount
-            
-            wip_item = {
-                'project_vuid': project.vuid,
-                'project_number': project.project_number,
-                'project_name': project.project_name,
-                'contract_vuid': contracts[0].vuid if contracts else None,  # Use first contract VUID for compatibility
-                'contract_number': combined_contract_number,
-                'contract_name': combined_contract_name,
-                'customer_name': primary_customer.customer_name if primary_customer else 'Unknown Customer',
-                'original_contract_amount': total_original_contract_amount,  # Sum of all contract amounts
-                'change_orders': round(total_project_change_orders, 2),  # External change orders for all contracts
-                'total_contract_amount': round(total_contract_amount, 2),  # Original + change orders
-                'previous_billings': 0.0,  # Placeholder - would come from billing system
-                'current_period_billing': 0.0,  # Placeholder - would come from billing system
-                'total_billings': 0.0,  # Placeholder - would come from billing system
-                'percent_complete': round(percent_complete, 1),  # Calculated: (costs_to_date / budget_for_percent_calc) * 100
-                'revenue_recognized': round(revenue_recognized, 2),  # Calculated: (percent_complete / 100) * total_contract_amount
-                'earned_value': round(revenue_recognized, 2),  # Same as revenue_recognized for consistency
-                'over_billing': round(over_billing, 2),  # Calculated: max(0, project_billings_total - revenue_recognized)
-                'under_billing': round(under_billing, 2),  # Calculated: max(0, revenue_recognized - project_billings_total)
-                'status': contracts[0].status if contracts else 'unknown',  # Use first contract status
-                'original_budget_amount': original_budget_amount,
-                'current_budget_amount': round(display_budget_amount, 2),  # Shows EAC when EAC reporting is enabled and EAC > 0
-                'eac_amount': round(eac_amount, 2) if eac_enabled else None,  # EAC amount when EAC reporting is enabled
-                'eac_from_snapshot': eac_from_snapshot if eac_enabled else None,  # Indicates if EAC data is from snapshot
-                'eac_message': eac_message if eac_enabled else None,  # Message about EAC data status
-                'costs_to_date': round(costs_to_date, 2),  # Gross invoice amounts + labor costs + project expenses for this project
-                'project_billings': round(project_billings_total, 2),  # Net project billing amounts (after retainage is deducted)
-                'total_ico_changes': round(total_ico_changes, 2),
-                'total_eco_budget_changes': round(total_eco_budget_changes, 2),  # External change order budget changes
-                'total_project_change_orders': round(total_project_change_orders, 2),  # Total external change orders for entire project
-                'pending_change_orders_revenue': round(pending_revenue_total, 2),  # Revenue from pending change orders
-                'pending_change_orders_budget': round(pending_cost_total, 2),  # Cost impact from pending change orders
-                'profit_margin_percent': round(profit_margin_percent, 2),  # Profit margin as percentage
-                'eac_enabled': eac_enabled  # Indicates if EAC reporting is enabled for this report
-            }
-            wip_data.append(wip_item)
-            
-
+        # Get all ACTIVE projects; every WIP column is computed for all of them at once
+        projects = Project.query.filter_by(status='active').all()
+        wip_data = calculate_wip_report_rows(projects, accounting_period_vuid, eac_enabled)
         
         return jsonify(wip_data)
         
@@ -9216,136 +11058,313 @@ def delete_period_journal_entries(accounting_period_vuid):
 @app.route('/api/journal-entries/preview/<accounting_period_vuid>', methods=['GET'])
 def preview_journal_entries_for_period(accounting_period_vuid):
     """Preview all journal entries that would be created for a specific accounting period"""
+    try:
+        export_format = get_export_format()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
     try:
         # Get the accounting period
         period = AccountingPeriod.query.get(accounting_period_vuid)
         if not period:
             return jsonify({'error': 'Accounting period not found'}), 404
         
-        # Get all transactions that would create journal entries
-        preview_entries = []
-        
-        # 1. AP Invoices
-        ap_invoices = APInvoice.query.options(db.joinedload(APInvoice.project)).filter_by(
-            accounting_period_vuid=accounting_period_vuid,
-            status='approved'
-        ).all()
-        
-        for invoice in ap_invoices:
-            integration_method = get_effective_ap_invoice_integration_method(invoice.project_vuid)
-            
-            if integration_method == INTEGRATION_METHOD_INVOICE:
-                # Net entry
-                net_entry = create_ap_invoice_net_entry_preview(invoice)
-                if net_entry:
-                    preview_entries.append(net_entry)
-                
-                # Retainage entry
-                if float(invoice.retention_held or 0) > 0:
-                    retainage_entry = create_ap_invoice_retainage_entry_preview(invoice)
-                    if retainage_entry:
-                        preview_entries.append(retainage_entry)
-            else:
-                # Combined entry
-                combined_entry = create_ap_invoice_combined_entry_preview(invoice)
-                if combined_entry:
-                    preview_entries.append(combined_entry)
+        if export_format:
+            return make_export_response(
+                iter_named_period_preview_entries(accounting_period_vuid, get_gl_account_cache()['accounts']),
+                export_format, f"journal_entry_preview_{period.year}_{period.month:02d}",
+                JOURNAL_ENTRY_PREVIEW_EXPORT_COLUMNS, flatten=flatten_line_items
+            )
         
-        # 2. Project Billings
-        project_billings = ProjectBilling.query.options(db.joinedload(ProjectBilling.project)).filter_by(
-            accounting_period_vuid=accounting_period_vuid,
-            status='approved'
-        ).all()
+        # Entries are built and written as the source documents are read
+        return Response(stream_with_context(start_period_preview_stream(accounting_period_vuid)), mimetype='application/json')
         
-        for billing in project_billings:
-            integration_method = get_effective_ar_invoice_integration_method(billing.project_vuid)
-            
-            if integration_method == INTEGRATION_METHOD_INVOICE:
-                # Net entry
-                net_entry = create_project_billing_net_entry_preview(billing)
-                if net_entry:
-                    preview_entries.append(net_entry)
-                
-                # Retainage entry
-                retainage_amount = float(billing.retention_held or 0)
-                if retainage_amount > 0:
-                    retainage_entry = create_project_billing_retainage_entry_preview(billing)
-                    if retainage_entry:
-                        preview_entries.append(retainage_entry)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Error generating preview: {str(e)}'
+        }), 500
+
+# Month close pipeline
+# The WIP report month close runs as ordered stages: post transactions, generate journal
+# entries, over/under billing, snapshots and locking the period. Each stage that completes
+# is checkpointed in period_close_checkpoints, so a close that fails or is interrupted
+# resumes at the stage that did not finish. Every stage is also safe to repeat: posting and
+# journal generation skip what already exists, over/under billing skips projects that
+# already have their entry and snapshots are rebuilt from scratch. Re-opening a period
+# clears its checkpoints; pass restart to run every stage again.
+PERIOD_CLOSE_POSTED_BY = 'Month Close'
+
+class PeriodCloseCheckpoint(db.Model):
+    """A completed stage of the month close pipeline for an accounting period"""
+    __tablename__ = 'period_close_checkpoints'
+    
+    vuid = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    accounting_period_vuid = db.Column(db.String(36), db.ForeignKey('accounting_periods.vuid'), nullable=False)
+    stage = db.Column(db.String(50), nullable=False)  # Name from PERIOD_CLOSE_STAGES
+    result = db.Column(db.JSON, nullable=True)
+    completed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.UniqueConstraint('accounting_period_vuid', 'stage', name='unique_period_close_checkpoint'),
+    )
+
+def run_close_post_transactions_stage(period, progress_callback):
+    """Post every unposted transaction in the period; fails if any transaction could not be posted"""
+    result = bulk_post_period_transactions(period.vuid, PERIOD_CLOSE_POSTED_BY, progress_callback=progress_callback)
+    stage_result = {
+        'posted_count': result['posted_count'],
+        'failed_count': result['failed_count'],
+        'failures': result['failures']
+    }
+    if result['failed_count']:
+        # Not checkpointed, so the next attempt retries the failed postings
+        return False, dict(stage_result, error=f"{result['failed_count']} transactions could not be posted")
+    return True, stage_result
+
+def run_close_journal_entries_stage(period, progress_callback):
+    """Generate journal entries for the period's approved transactions"""
+    success, created_entries = generate_period_journal_entries(period.vuid)
+    if not success:
+        return False, {'error': 'Failed to generate journal entries'}
+    return True, {'transaction_entries': len(created_entries)}
+
+def get_period_over_under_billing_totals(accounting_period_vuid):
+    """
+    Sum costs and billings to date through a period for every project.
+    
+    Costs are AP invoice totals plus approved project expenses; billings are gross project
+    billings (total_amount + retention_held), matching the WIP report.
+    
+    Returns:
+        tuple: ({project_vuid: costs_to_date}, {project_vuid: billings_to_date})
+    """
+    periods_to_date = get_periods_to_date_select(accounting_period_vuid)
+    
+    costs_to_date = {}
+    for project_vuid, amount in db.session.query(
+        APInvoice.project_vuid, db.func.sum(APInvoice.total_amount)
+    ).filter(APInvoice.accounting_period_vuid.in_(periods_to_date)).group_by(APInvoice.project_vuid):
+        costs_to_date[project_vuid] = costs_to_date.get(project_vuid, 0.0) + float(amount or 0)
+    
+    for project_vuid, amount in db.session.query(
+        ProjectExpense.project_vuid, db.func.sum(ProjectExpense.amount)
+    ).filter(
+        ProjectExpense.status == 'approved',
+        ProjectExpense.accounting_period_vuid.in_(periods_to_date)
+    ).group_by(ProjectExpense.project_vuid):
+        costs_to_date[project_vuid] = costs_to_date.get(project_vuid, 0.0) + float(amount or 0)
+    
+    billings_to_date = {
+        project_vuid: float(amount or 0)
+        for project_vuid, amount in db.session.query(
+            ProjectBilling.project_vuid,
+            db.func.sum(db.func.coalesce(ProjectBilling.total_amount, 0) + db.func.coalesce(ProjectBilling.retention_held, 0))
+        ).filter(ProjectBilling.accounting_period_vuid.in_(periods_to_date)).group_by(ProjectBilling.project_vuid)
+    }
+    
+    return costs_to_date, billings_to_date
+
+def run_close_over_under_billing_stage(period, progress_callback):
+    """Create an over or under billing journal entry for every project that needs one"""
+    costs_to_date, billings_to_date = get_period_over_under_billing_totals(period.vuid)
+    existing_entries = set(db.session.query(JournalEntry.reference_type, JournalEntry.reference_vuid).filter(
+        JournalEntry.accounting_period_vuid == period.vuid,
+        JournalEntry.reference_type.in_(('over_billing', 'under_billing'))
+    ).all())
+    projects = db.session.query(Project.vuid, Project.project_number).order_by(Project.project_number, Project.vuid).all()
+    
+    over_under_entries = 0
+    created_entries = 0
+    for index, (project_vuid, project_number) in enumerate(projects, start=1):
+        costs = costs_to_date.get(project_vuid, 0.0)
+        billings = billings_to_date.get(project_vuid, 0.0)
+        
+        if billings != costs:
+            reference_type = 'over_billing' if billings > costs else 'under_billing'
+            if (reference_type, project_vuid) in existing_entries:
+                over_under_entries += 1
             else:
-                # Combined entry
-                combined_entry = create_project_billing_combined_entry_preview(billing)
-                if combined_entry:
-                    preview_entries.append(combined_entry)
-        
-        # 3. Labor Costs
-        labor_costs = LaborCost.query.options(db.joinedload(LaborCost.project)).filter_by(
-            accounting_period_vuid=accounting_period_vuid,
-            status='active'
-        ).all()
-        
-        for labor_cost in labor_costs:
-            labor_entry = create_labor_cost_journal_entry_preview(labor_cost)
-            if labor_entry:
-                preview_entries.append(labor_entry)
-        
-        # 4. Project Expenses
-        project_expenses = ProjectExpense.query.filter_by(
-            accounting_period_vuid=accounting_period_vuid,
-            status='approved'
-        ).all()
-        
-        for expense in project_expenses:
-            expense_entry = create_project_expense_journal_entry_preview(expense)
-            if expense_entry:
-                preview_entries.append(expense_entry)
-        
-        # 5. Over/Under Billing (from WIP calculation)
-        # We need to manually calculate WIP data for the preview
-        wip_data = calculate_wip_data_for_period(accounting_period_vuid)
-        over_under_entries = create_over_under_billing_entries_preview(wip_data, accounting_period_vuid)
-        preview_entries.extend(over_under_entries)
-        
-        # Calculate totals
-        total_debits = sum(entry.get('total_debits', 0) for entry in preview_entries)
-        total_credits = sum(entry.get('total_credits', 0) for entry in preview_entries)
-        
-        # Get chart of accounts for display
-        chart_of_accounts = ChartOfAccounts.query.all()
-        chart_of_accounts_data = [{
-            'vuid': account.vuid,
-            'account_number': account.account_number,
-            'account_name': account.account_name
-        } for account in chart_of_accounts]
+                print(f"  Project {project_number}: Costs to Date = ${costs:.2f}, Billings = ${billings:.2f}")
+                over_amount = billings - costs if billings > costs else 0
+                under_amount = costs - billings if costs > billings else 0
+                if create_over_under_billing_journal_entry(project_vuid, period.vuid, over_amount, under_amount):
+                    over_under_entries += 1
+                    created_entries += 1
+        
+        if progress_callback:
+            progress_callback(index, len(projects))
+    
+    print(f"Over/under billing: {created_entries} entries created, {over_under_entries - created_entries} already existed")
+    return True, {'over_under_entries': over_under_entries, 'created_entries': created_entries}
+
+def run_close_snapshots_stage(period, progress_callback):
+    """Rebuild the period's buyout forecasting snapshots"""
+    # Drop anything left by an earlier attempt so the rebuild never duplicates rows
+    success, message = delete_buyout_forecasting_snapshots(period.vuid)
+    if not success:
+        return False, {'error': message}
+    
+    success, message, snapshots_created = build_period_close_snapshots(period.vuid)
+    if not success:
+        return False, {'error': message}
+    return True, {'snapshots_created': snapshots_created}
+
+def run_close_lock_period_stage(period, progress_callback):
+    """Validate the period's journal entries, then close it and open the next period if needed"""
+    print("Validating journal entries...")
+    validation_errors = validate_integration_method_consistency(period.vuid)
+    if validation_errors:
+        print("❌ VALIDATION ERRORS FOUND:")
+        for error in validation_errors:
+            print(f"  - {error}")
+        return False, {'error': 'Journal entry validation failed', 'validation_errors': validation_errors}
+    print("✅ All journal entries validated successfully")
+    
+    next_period_vuid = None
+    # Check if this is the only open period
+    open_periods_count = AccountingPeriod.query.filter_by(status='open').count()
+    if open_periods_count <= 1:
+        next_period = AccountingPeriod.query.filter(
+            AccountingPeriod.period_ordinal > get_period_ordinal(period.year, period.month)
+        ).order_by(AccountingPeriod.period_ordinal).first()
+        
+        if next_period:
+            # Open the next period before closing this one
+            next_period.status = 'open'
+            next_period_vuid = next_period.vuid
+            print(f"Opening next period: {next_period.month}/{next_period.year}")
+        else:
+            # Don't create a new period automatically - let the user decide when to create the next period
+            print(f"No next period found. Allowing closure of last period {period.month}/{period.year}")
+    
+    period.status = 'closed'
+    db.session.commit()
+    print(f"Successfully closed accounting period {period.month}/{period.year}")
+    return True, {'next_period_opened': next_period_vuid}
+
+# (stage, handler(period, progress_callback) returning (success, result)), in run order
+PERIOD_CLOSE_STAGES = [
+    ('post_transactions', run_close_post_transactions_stage),
+    ('generate_journal_entries', run_close_journal_entries_stage),
+    ('over_under_billing', run_close_over_under_billing_stage),
+    ('snapshots', run_close_snapshots_stage),
+    ('lock_period', run_close_lock_period_stage),
+]
+
+def clear_period_close_checkpoints(accounting_period_vuid):
+    """Delete a period's month close checkpoints so the next close runs every stage"""
+    PeriodCloseCheckpoint.query.filter_by(accounting_period_vuid=accounting_period_vuid).delete(synchronize_session=False)
+    db.session.commit()
+
+def run_period_close_pipeline(period, progress_callback=None, restart=False):
+    """
+    Run the month close stages that have not completed yet for a period.
+    
+    Args:
+        period: AccountingPeriod to close
+        progress_callback: Optional callable taking (processed_count, total_count)
+        restart: Clear the period's checkpoints and run every stage
         
-        # Create account lookup for adding account names to line items
-        account_lookup = {acc.vuid: f"{acc.account_number} - {acc.account_name}" for acc in chart_of_accounts}
+    Returns:
+        tuple: (failed stage or None, {stage: result}) - each result has a 'status' of
+        'completed', 'skipped' (checkpointed by an earlier run) or 'failed'
+    """
+    if restart:
+        clear_period_close_checkpoints(period.vuid)
+    
+    checkpoints = {
+        checkpoint.stage: checkpoint
+        for checkpoint in PeriodCloseCheckpoint.query.filter_by(accounting_period_vuid=period.vuid).all()
+    }
+    stage_count = len(PERIOD_CLOSE_STAGES)
+    stages = {}
+    
+    for stage_index, (stage, run_stage) in enumerate(PERIOD_CLOSE_STAGES):
+        if stage in checkpoints:
+            print(f"Month close stage {stage} already completed at {checkpoints[stage].completed_at}, skipping")
+            stages[stage] = dict(checkpoints[stage].result or {}, status='skipped')
+            continue
+        
+        # Report progress as a share of the whole pipeline
+        def report_stage_progress(current, total, stage_index=stage_index):
+            if progress_callback and total:
+                progress_callback(stage_index * 100 + min(current, total) * 100 // total, stage_count * 100)
+        
+        report_stage_progress(0, 1)
+        print(f"Running month close stage {stage} for {period.month}/{period.year}")
+        try:
+            success, result = run_stage(period, report_stage_progress)
+        except Exception as e:
+            db.session.rollback()
+            success, result = False, {'error': f'Error in {stage}: {str(e)}'}
         
-        # Add account names to all line items
-        for entry in preview_entries:
-            for line_item in entry.get('line_items', []):
-                # Only set account_name if it's not already set and we have a gl_account_vuid
-                if not line_item.get('account_name') and line_item.get('gl_account_vuid'):
-                    line_item['account_name'] = account_lookup.get(line_item.get('gl_account_vuid'), line_item.get('gl_account_vuid'))
+        if not success:
+            stages[stage] = dict(result, status='failed')
+            return stage, stages
         
-        return jsonify({
-            'success': True,
-            'journal_entries': preview_entries,
-            'chart_of_accounts': chart_of_accounts_data,
-            'preview_summary': {
-                'total_entries': len(preview_entries),
-                'total_debits': total_debits,
-                'total_credits': total_credits,
-                'is_balanced': abs(total_debits - total_credits) < 0.01,
-                'balance_difference': abs(total_debits - total_credits)
-            }
-        })
+        # Round-trip through the app's encoder so Decimals and dates fit the JSON column
+        result = json.loads(app.json.dumps(result))
+        db.session.add(PeriodCloseCheckpoint(accounting_period_vuid=period.vuid, stage=stage, result=result))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Another close of this period checkpointed the stage first
+            db.session.rollback()
+            stages[stage] = {'status': 'failed', 'error': f'Another month close of this period completed {stage} first'}
+            return stage, stages
+        stages[stage] = dict(result, status='completed')
+    
+    return None, stages
+
+def close_month_from_wip_report(period, progress_callback=None, restart=False):
+    """
+    Close a period through the month close pipeline.
+    
+    Args:
+        period: Open AccountingPeriod to close
+        progress_callback: Optional callable taking (processed_count, total_count)
+        restart: Run every stage again instead of resuming from the checkpoints
         
-    except Exception as e:
-        return jsonify({
+    Returns:
+        tuple: (response data, HTTP status code)
+    """
+    print(f"Closing month {period.month}/{period.year} from WIP report...")
+    failed_stage, stages = run_period_close_pipeline(period, progress_callback, restart)
+    
+    transaction_entries = stages.get('generate_journal_entries', {}).get('transaction_entries', 0)
+    over_under_entries = stages.get('over_under_billing', {}).get('over_under_entries', 0)
+    response_data = {
+        'journal_entries_created': transaction_entries + over_under_entries,
+        'transaction_entries': transaction_entries,
+        'over_under_entries': over_under_entries,
+        'stages': stages
+    }
+    
+    if failed_stage:
+        failure = stages[failed_stage]
+        print(f"Month close stopped at stage {failed_stage}: {failure.get('error')}")
+        response_data.update({
             'success': False,
-            'error': f'Error generating preview: {str(e)}'
-        }), 500
+            'error': failure.get('error'),
+            'failed_stage': failed_stage,
+            'period_closed': False
+        })
+        if failure.get('failures'):
+            response_data['failures'] = failure['failures']
+        if failure.get('validation_errors'):
+            response_data['validation_errors'] = failure['validation_errors']
+            return response_data, 400
+        return response_data, 500
+    
+    print(f"Month close from WIP report complete. Created {response_data['journal_entries_created']} total journal entries.")
+    response_data.update({
+        'success': True,
+        'message': f'Month {period.month}/{period.year} closed successfully',
+        'period_closed': True,
+        'validation_passed': True
+    })
+    return response_data, 200
 
 @app.route('/api/wip/close-month', methods=['POST'])
 def close_month_from_wip():
@@ -9365,160 +11384,23 @@ def close_month_from_wip():
         if period.status == 'closed':
             return jsonify({'error': 'Period is already closed'}), 400
         
-        print(f"Closing month {period.month}/{period.year} from WIP report. Generating journal entries...")
-        
-        # Generate journal entries for all approved transactions in this period
-        success, created_entries = generate_period_journal_entries(period.vuid)
-        
-        if not success:
-            return jsonify({'error': 'Failed to generate journal entries'}), 500
-        
-        # Generate over/under billing journal entries for all projects
-        over_under_entries_created = 0
+        # Completed stages of an earlier attempt are skipped unless restart is set
+        restart = bool(data.get('restart'))
         
-        # Get all projects for this period
-        projects = Project.query.all()
-        
-        for project in projects:
-            print(f"Processing over/under billing for project: {project.project_number} - {project.project_name}")
-            # Calculate over/under billing for this project
-            # Get project billings and costs to date for this period and prior
-            ap_invoices_query = APInvoice.query.filter_by(project_vuid=project.vuid)
-            project_billings_query = ProjectBilling.query.filter_by(project_vuid=project.vuid)
-            
-            # Filter by accounting period (this period and prior)
-            periods_to_include = AccountingPeriod.query.filter(
-                db.or_(
-                    db.and_(AccountingPeriod.year < period.year),
-                    db.and_(AccountingPeriod.year == period.year, AccountingPeriod.month <= period.month)
-                )
-            ).all()
-            period_vuids = [p.vuid for p in periods_to_include]
-            
-            ap_invoices_query = ap_invoices_query.filter(APInvoice.accounting_period_vuid.in_(period_vuids))
-            project_billings_query = project_billings_query.filter(ProjectBilling.accounting_period_vuid.in_(period_vuids))
-            
-            ap_invoices = ap_invoices_query.all()
-            project_billings = project_billings_query.all()
-            
-            # Calculate costs to date (gross invoice amounts + project expenses)
-            costs_to_date = sum(float(invoice.total_amount or 0) for invoice in ap_invoices)
-            
-            # Add project expenses to costs to date
-            project_expenses_query = ProjectExpense.query.filter_by(project_vuid=project.vuid, status='approved')
-            project_expenses_query = project_expenses_query.filter(ProjectExpense.accounting_period_vuid.in_(period_vuids))
-            project_expenses = project_expenses_query.all()
-            costs_to_date += sum(float(expense.amount or 0) for expense in project_expenses)
-            
-            # Calculate project billings (net amounts after retainage is deducted)
-            project_billings_total = 0.0
-            for billing in project_billings:
-                # Use gross amount (total_amount + retention_held) to get the total billed amount
-                # This matches the calculation used in the main WIP endpoint
-                gross_amount = float(billing.total_amount or 0) + float(billing.retention_held or 0)
-                project_billings_total += gross_amount
-            
-            # Calculate over/under billing
-            print(f"  Project {project.project_number}: Costs to Date = ${costs_to_date:.2f}, Billings = ${project_billings_total:.2f}")
-            
-            if project_billings_total > costs_to_date:
-                # Overbilled
-                over_amount = project_billings_total - costs_to_date
-                print(f"  Overbilled by: ${over_amount:.2f}")
-                journal_entry = create_over_under_billing_journal_entry(
-                    project.vuid, 
-                    period.vuid, 
-                    over_amount, 
-                    0
-                )
-                if journal_entry:
-                    over_under_entries_created += 1
-                    print(f"  Created overbilling journal entry for project {project.project_number}")
-            elif costs_to_date > project_billings_total:
-                # Underbilled
-                under_amount = costs_to_date - project_billings_total
-                print(f"  Underbilled by: ${under_amount:.2f}")
-                journal_entry = create_over_under_billing_journal_entry(
-                    project.vuid, 
-                    period.vuid, 
-                    0, 
-                    under_amount
-                )
-                if journal_entry:
-                    over_under_entries_created += 1
-                    print(f"  Created underbilling journal entry for project {project.project_number}")
-            else:
-                print(f"  Project {project.project_number} is balanced")
-        
-        total_entries_created = len(created_entries) + over_under_entries_created
+        if wants_background_job():
+            return make_enqueue_job_response('close_month', period.vuid, {'restart': restart})
         
-        print(f"Month close from WIP report complete. Created {total_entries_created} total journal entries.")
-        
-        # Validate journal entries before closing
-        print("Validating journal entries...")
-        validation_errors = validate_integration_method_consistency(accounting_period_vuid)
-        
-        if validation_errors:
-            print("❌ VALIDATION ERRORS FOUND:")
-            for error in validation_errors:
-                print(f"  - {error}")
+        # Running alongside a queued or running close job would race it through the pipeline
+        active_job = get_active_job('close_month', period.vuid)
+        if active_job:
             return jsonify({
                 'success': False,
-                'error': 'Journal entry validation failed',
-                'validation_errors': validation_errors,
-                'journal_entries_created': total_entries_created,
-                'transaction_entries': len(created_entries),
-                'over_under_entries': over_under_entries_created,
-                'period_closed': False
-            }), 400
-        else:
-            print("✅ All journal entries validated successfully")
+                'error': f"A close_month job is already {active_job.status} for this accounting period",
+                'data': serialize_job(active_job)
+            }), 409
         
-        # Actually close the accounting period
-        try:
-            # Check if this is the only open period
-            open_periods_count = AccountingPeriod.query.filter_by(status='open').count()
-            
-            if open_periods_count <= 1:
-                # Check if there's a next period to open
-                next_period = AccountingPeriod.query.filter(
-                    db.or_(
-                        db.and_(AccountingPeriod.year > period.year),
-                        db.and_(AccountingPeriod.year == period.year, AccountingPeriod.month > period.month)
-                    )
-                ).order_by(AccountingPeriod.year, AccountingPeriod.month).first()
-                
-                if next_period:
-                    # Open the next period before closing this one
-                    next_period.status = 'open'
-                    print(f"Opening next period: {next_period.month}/{next_period.year}")
-                else:
-                    # No next period exists - this means we're closing the last period
-                    # Don't create a new period automatically - let the user decide when to create the next period
-                    print(f"No next period found. Allowing closure of last period {period.month}/{period.year}")
-            
-            # Close the current period
-            period.status = 'closed'
-            db.session.commit()
-            print(f"Successfully closed accounting period {period.month}/{period.year}")
-            
-            return jsonify({
-                'success': True,
-                'message': f'Month {period.month}/{period.year} closed successfully',
-                'journal_entries_created': total_entries_created,
-                'transaction_entries': len(created_entries),
-                'over_under_entries': over_under_entries_created,
-                'period_closed': True,
-                'validation_passed': True
-            })
-            
-        except Exception as e:
-            print(f"Error closing accounting period: {e}")
-            db.session.rollback()
-            return jsonify({
-                'success': False,
-                'error': f'Journal entries created but failed to close period: {str(e)}'
-            }), 500
+        response_data, status_code = close_month_from_wip_report(period, restart=restart)
+        return jsonify(response_data), status_code
         
     except Exception as e:
         print(f"Error closing month from WIP report: {e}")
@@ -11343,8 +13225,7 @@ def get_mock_quickbooks_vendors():
 def get_gl_settings():
     """Get all GL settings"""
     try:
-        settings = GLSettings.query.all()
-        return jsonify(gl_settings_schema_list.dump(settings))
+        return get_cached_reference_response('gl_settings')
     except Exception as e:
         return jsonify({'error': f'Error retrieving GL settings: {str(e)}'}), 500
 
@@ -11614,31 +13495,65 @@ def get_project_billings():
     """Get all project billings"""
     try:
         project_vuid = request.args.get('project_vuid')
-        
+        list_args = get_list_query_args(('created_at', 'billing_date', 'billing_number', 'total_amount'))
+        
+        # One query for the billings and the names of their project, customer, contract and
+        # accounting period, reading only the columns that go into the response
+        query = db.session.query(
+            ProjectBilling.vuid,
+            ProjectBilling.billing_number,
+            ProjectBilling.project_vuid,
+            ProjectBilling.contract_vuid,
+            ProjectBilling.customer_vuid,
+            ProjectBilling.billing_date,
+            ProjectBilling.due_date,
+            ProjectBilling.subtotal,
+            ProjectBilling.retention_held,
+            ProjectBilling.retention_released,
+            ProjectBilling.total_amount,
+            ProjectBilling.status,
+            ProjectBilling.description,
+            ProjectBilling.accounting_period_vuid,
+            ProjectBilling.exported_to_accounting,
+            ProjectBilling.accounting_export_date,
+            ProjectBilling.created_at,
+            ProjectBilling.updated_at,
+            Project.vuid.label('joined_project_vuid'),
+            Project.project_name,
+            Customer.vuid.label('joined_customer_vuid'),
+            Customer.customer_name,
+            ProjectContract.vuid.label('joined_contract_vuid'),
+            ProjectContract.contract_number,
+            AccountingPeriod.vuid.label('joined_accounting_period_vuid'),
+            AccountingPeriod.month,
+            AccountingPeriod.year
+        ).outerjoin(
+            Project, ProjectBilling.project_vuid == Project.vuid
+        ).outerjoin(
+            Customer, ProjectBilling.customer_vuid == Customer.vuid
+        ).outerjoin(
+            ProjectContract, ProjectBilling.contract_vuid == ProjectContract.vuid
+        ).outerjoin(
+            AccountingPeriod, ProjectBilling.accounting_period_vuid == AccountingPeriod.vuid
+        )
         if project_vuid:
-            billings = ProjectBilling.query.filter_by(project_vuid=project_vuid).all()
-        else:
-            billings = ProjectBilling.query.all()
+            query = query.filter(ProjectBilling.project_vuid == project_vuid)
         
-        # Return simple billing data without nested schemas to avoid conflicts
+        billings, page = get_list_page(query, ProjectBilling, list_args)
+        
+        # Return simple billing data without nested schemas, serialized straight from the row tuples
         result = []
         for billing in billings:
-            # Get related data safely
-            project_name = billing.project.project_name if billing.project else 'N/A'
-            customer_name = billing.customer.customer_name if billing.customer else 'N/A'
-            contract_number = billing.contract.contract_number if billing.contract else 'N/A'
-            accounting_period_name = f"{billing.accounting_period.month}/{billing.accounting_period.year}" if billing.accounting_period else 'N/A'
-            
             result.append({
                 'vuid': billing.vuid,
                 'billing_number': billing.billing_number,
                 'project_vuid': billing.project_vuid,
-                'project_name': project_name,
+                'project_name': billing.project_name if billing.joined_project_vuid else 'N/A',
                 'contract_vuid': billing.contract_vuid,
-                'contract_number': contract_number,
+                'contract_number': billing.contract_number if billing.joined_contract_vuid else 'N/A',
                 'customer_vuid': billing.customer_vuid,
-                'customer_name': customer_name,
-                'accounting_period_name': accounting_period_name,
+                'customer_name': billing.customer_name if billing.joined_customer_vuid else 'N/A',
+                'accounting_period_name': f"{billing.month}/{billing.year}" if billing.joined_accounting_period_vuid else 'N/A',
                 'billing_date': billing.billing_date.isoformat() if billing.billing_date else None,
                 'due_date': billing.due_date.isoformat() if billing.due_date else None,
                 'subtotal': str(billing.subtotal),
@@ -11654,7 +13569,9 @@ def get_project_billings():
                 'updated_at': billing.updated_at.isoformat() if billing.updated_at else None
             })
         
-        return jsonify(result)
+        return make_list_response(result, page, list_args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': f'Error retrieving project billings: {str(e)}'}), 500
 
@@ -11687,6 +13604,7 @@ def create_project_billing():
         )
         
         db.session.add(new_billing)
+        refresh_cost_rollup_for_record(new_billing)
         db.session.commit()
         
         return jsonify(project_billing_schema.dump(new_billing)), 201
@@ -11722,6 +13640,7 @@ def delete_project_billing(vuid):
             }), 400
         
         db.session.delete(billing)
+        refresh_cost_rollup_for_record(billing)
         db.session.commit()
         
         return jsonify({'message': 'Project billing deleted successfully'})
@@ -11739,6 +13658,7 @@ def update_project_billing(vuid):
             return jsonify({'error': 'Project billing not found'}), 404
         
         data = request.get_json()
+        rollup_keys = (billing.project_vuid, billing.accounting_period_vuid)
         
         if 'billing_number' in data:
             billing.billing_number = data['billing_number']
@@ -11800,6 +13720,7 @@ def update_project_billing(vuid):
             billing.total_amount = total_from_line_items
         
         billing.updated_at = datetime.now(timezone.utc)
+        refresh_cost_rollup_for_record(billing, rollup_keys)
         db.session.commit()
         
         # Return simple success response to avoid schema conflicts
@@ -11859,6 +13780,7 @@ def create_project_billing_line_item(vuid):
         total_amount = sum(float(item.actual_billing_amount) if item.actual_billing_amount else 0 for item in all_line_items)
         billing.total_amount = total_amount
         billing.updated_at = datetime.utcnow()
+        refresh_cost_rollup_for_record(billing)
         
         db.session.commit()
         
@@ -11948,6 +13870,7 @@ def update_project_billing_line_item(billing_vuid, line_vuid):
         total_amount = sum(float(item.actual_billing_amount) if item.actual_billing_amount else 0 for item in all_line_items)
         billing.total_amount = total_amount
         billing.updated_at = datetime.utcnow()
+        refresh_cost_rollup_for_record(billing)
         
         db.session.commit()
         
@@ -12119,20 +14042,14 @@ def get_prefill_costs_for_billing():
         
         # Calculate revenue recognized this period (new revenue, not cumulative)
         # Get revenue for previous periods
-        accounting_period = db.session.get(AccountingPeriod, accounting_period_vuid)
-        if accounting_period:
-            # Get previous period
-            previous_periods = AccountingPeriod.query.filter(
-                db.or_(
-                    db.and_(AccountingPeriod.year < accounting_period.year),
-                    db.and_(AccountingPeriod.year == accounting_period.year, 
-                           AccountingPeriod.month < accounting_period.month)
-                )
-            ).all()
-            
-            if previous_periods:
-                # Get the most recent previous period
-                previous_period = max(previous_periods, key=lambda p: (p.year, p.month))
+        period_ordinal = get_accounting_period_ordinal(accounting_period_vuid)
+        if period_ordinal is not None:
+            # Get the most recent previous period
+            previous_period = AccountingPeriod.query.filter(
+                AccountingPeriod.period_ordinal < period_ordinal
+            ).order_by(AccountingPeriod.period_ordinal.desc()).first()
+            
+            if previous_period:
                 previous_revenue_data = calculate_revenue_recognized(project_vuid, previous_period.vuid, eac_enabled)
                 previous_revenue_recognized = previous_revenue_data['revenue_recognized']
                 revenue_recognized_this_period_only = revenue_recognized_this_period - previous_revenue_recognized
@@ -13027,6 +14944,7 @@ def recalculate_billing_amounts(billing_vuid):
         billing.retention_released = retention_released
         billing.total_amount = total_amount
         billing.updated_at = datetime.utcnow()
+        refresh_cost_rollup_for_record(billing)
         
         db.session.commit()
         
@@ -13062,7 +14980,7 @@ def preview_project_billing_journal_entry(vuid):
                 return jsonify({'error': 'Failed to create net entry preview'}), 500
             
             # Get chart of accounts for account names
-            chart_of_accounts = ChartOfAccounts.query.all()
+            chart_of_accounts = get_gl_account_cache()['accounts']
             account_lookup = {acc.vuid: f"{acc.account_number} - {acc.account_name}" for acc in chart_of_accounts}
             
             # Add account names to line items
@@ -13102,7 +15020,7 @@ def preview_project_billing_journal_entry(vuid):
                 return jsonify({'error': 'Failed to create combined entry preview'}), 500
             
             # Get chart of accounts for account names
-            chart_of_accounts = ChartOfAccounts.query.all()
+            chart_of_accounts = get_gl_account_cache()['accounts']
             account_lookup = {acc.vuid: f"{acc.account_number} - {acc.account_name}" for acc in chart_of_accounts}
             
             # Add account names to line items
@@ -13378,12 +15296,25 @@ class APInvoice(db.Model):
     commitment = db.relationship('ProjectCommitment', backref='ap_invoices')
     accounting_period = db.relationship('AccountingPeriod', backref='ap_invoices')
     line_items = db.relationship('APInvoiceLineItem', backref='invoice', cascade='all, delete-orphan')
+    
+    # Approved invoices per project and period (calculate_project_costs_to_date), approved
+    # invoices in a period (journal entry previews, bulk posting); (sort field, vuid) for each
+    # sort field of the keyset-paginated /api/ap-invoices list
+    __table_args__ = (
+        db.Index('ix_ap_invoices_project_period_status', 'project_vuid', 'accounting_period_vuid', 'status'),
+        db.Index('ix_ap_invoices_period_status', 'accounting_period_vuid', 'status'),
+        db.Index('ix_ap_invoices_created_at_vuid', 'created_at', 'vuid'),
+        db.Index('ix_ap_invoices_invoice_date_vuid', 'invoice_date', 'vuid'),
+        db.Index('ix_ap_invoices_invoice_number_vuid', 'invoice_number', 'vuid'),
+        db.Index('ix_ap_invoices_total_amount_vuid', 'total_amount', 'vuid'),
+        db.Index('ix_ap_invoices_status_vuid', 'status', 'vuid'),
+    )
 
 class APInvoiceLineItem(db.Model):
     __tablename__ = 'ap_invoice_line_items'
     
     vuid = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    invoice_vuid = db.Column(db.String(36), db.ForeignKey('ap_invoices.vuid'), nullable=False)
+    invoice_vuid = db.Column(db.String(36), db.ForeignKey('ap_invoices.vuid'), nullable=False, index=True)
     description = db.Column(db.Text, nullable=False)
     quantity = db.Column(db.Numeric(15, 4), nullable=False, default=1)
     unit_price = db.Column(db.Numeric(15, 2), nullable=False, default=0)
@@ -13442,6 +15373,18 @@ class LaborCost(db.Model):
     cost_code = db.relationship('CostCode', backref='labor_costs')
     cost_type = db.relationship('CostType', backref='labor_costs')
     accounting_period = db.relationship('AccountingPeriod', backref='labor_costs')
+    
+    # Active labor per project and period (calculate_project_costs_to_date), active labor in
+    # a period (journal entry previews, bulk posting); (sort field, vuid) for each sort field
+    # of the keyset-paginated /api/labor-costs list
+    __table_args__ = (
+        db.Index('ix_labor_costs_project_period_status', 'project_vuid', 'accounting_period_vuid', 'status'),
+        db.Index('ix_labor_costs_period_status', 'accounting_period_vuid', 'status'),
+        db.Index('ix_labor_costs_created_at_vuid', 'created_at', 'vuid'),
+        db.Index('ix_labor_costs_payroll_date_vuid', 'payroll_date', 'vuid'),
+        db.Index('ix_labor_costs_employee_id_vuid', 'employee_id', 'vuid'),
+        db.Index('ix_labor_costs_amount_vuid', 'amount', 'vuid'),
+    )
 
 # Project Billing Models
 class ProjectBilling(db.Model):
@@ -13472,12 +15415,24 @@ class ProjectBilling(db.Model):
     customer = db.relationship('Customer', backref='project_billings')
     accounting_period = db.relationship('AccountingPeriod', backref='project_billings')
     line_items = db.relationship('ProjectBillingLineItem', backref='billing', cascade='all, delete-orphan')
+    
+    # Approved billings per project and period (calculate_project_billings_total), approved
+    # billings in a period (journal entry previews, bulk posting); (sort field, vuid) for each
+    # sort field of the keyset-paginated /api/project-billings list
+    __table_args__ = (
+        db.Index('ix_project_billings_project_period_status', 'project_vuid', 'accounting_period_vuid', 'status'),
+        db.Index('ix_project_billings_period_status', 'accounting_period_vuid', 'status'),
+        db.Index('ix_project_billings_created_at_vuid', 'created_at', 'vuid'),
+        db.Index('ix_project_billings_billing_date_vuid', 'billing_date', 'vuid'),
+        db.Index('ix_project_billings_billing_number_vuid', 'billing_number', 'vuid'),
+        db.Index('ix_project_billings_total_amount_vuid', 'total_amount', 'vuid'),
+    )
 
 class ProjectBillingLineItem(db.Model):
     __tablename__ = 'project_billing_line_items'
     
     vuid = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    billing_vuid = db.Column(db.String(36), db.ForeignKey('project_billings.vuid'), nullable=False)
+    billing_vuid = db.Column(db.String(36), db.ForeignKey('project_billings.vuid'), nullable=False, index=True)
     line_number = db.Column(db.String(50), nullable=False)
     description = db.Column(db.Text, nullable=False)
     cost_code_vuid = db.Column(db.String(36), db.ForeignKey('cost_codes.vuid'), nullable=True)
@@ -13526,6 +15481,38 @@ class ProjectExpense(db.Model):
     vendor = db.relationship('Vendor', backref='project_expenses')
     employee = db.relationship('Employee', backref='project_expenses')
     accounting_period = db.relationship('AccountingPeriod', backref='project_expenses')
+    
+    # Approved expenses per project and period (calculate_project_costs_to_date), approved
+    # expenses in a period (journal entry previews, bulk posting); (sort field, vuid) for each
+    # sort field of the keyset-paginated /api/project-expenses list
+    __table_args__ = (
+        db.Index('ix_project_expenses_project_period_status', 'project_vuid', 'accounting_period_vuid', 'status'),
+        db.Index('ix_project_expenses_period_status', 'accounting_period_vuid', 'status'),
+        db.Index('ix_project_expenses_created_at_vuid', 'created_at', 'vuid'),
+        db.Index('ix_project_expenses_expense_date_vuid', 'expense_date', 'vuid'),
+        db.Index('ix_project_expenses_expense_number_vuid', 'expense_number', 'vuid'),
+        db.Index('ix_project_expenses_amount_vuid', 'amount', 'vuid'),
+    )
+
+# Project Cost Rollup Model
+class ProjectCostRollup(db.Model):
+    """Per-period totals of approved costs and billings, maintained alongside the source transactions"""
+    __tablename__ = 'project_cost_rollups'
+    
+    vuid = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    project_vuid = db.Column(db.String(36), db.ForeignKey('projects.vuid'), nullable=False)
+    accounting_period_vuid = db.Column(db.String(36), db.ForeignKey('accounting_periods.vuid'), nullable=False)
+    cost_code_vuid = db.Column(db.String(36), nullable=False, default='')  # '' for header-level sources (AP invoices, billings)
+    cost_type_vuid = db.Column(db.String(36), nullable=False, default='')  # '' for header-level sources (AP invoices, billings)
+    source_type = db.Column(db.String(50), nullable=False)  # 'ap_invoice', 'labor_cost', 'project_expense', 'project_billing'
+    amount = db.Column(db.Numeric(15, 2), nullable=False, default=0)
+    record_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        db.UniqueConstraint('project_vuid', 'accounting_period_vuid', 'cost_code_vuid', 'cost_type_vuid', 'source_type',
+                            name='unique_project_cost_rollup'),
+    )
 
 # Journal Entry Models
 class JournalEntry(db.Model):
@@ -13549,12 +15536,22 @@ class JournalEntry(db.Model):
     accounting_period = db.relationship('AccountingPeriod', backref='journal_entries')
     project = db.relationship('Project', backref='journal_entries')
     line_items = db.relationship('JournalEntryLine', backref='journal_entry', cascade='all, delete-orphan')
+    
+    # Existing-entry checks look up by source document; period listings filter by period and project;
+    # (sort field, vuid) for each sort field of the keyset-paginated list endpoint
+    __table_args__ = (
+        db.Index('ix_journal_entries_reference', 'reference_type', 'reference_vuid'),
+        db.Index('ix_journal_entries_period_project', 'accounting_period_vuid', 'project_vuid'),
+        db.Index('ix_journal_entries_created_at_vuid', 'created_at', 'vuid'),
+        db.Index('ix_journal_entries_entry_date_vuid', 'entry_date', 'vuid'),
+        db.Index('ix_journal_entries_journal_number_vuid', 'journal_number', 'vuid'),
+    )
 
 class JournalEntryLine(db.Model):
     __tablename__ = 'journal_entry_lines'
     
     vuid = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    journal_entry_vuid = db.Column(db.String(36), db.ForeignKey('journal_entries.vuid'), nullable=False)
+    journal_entry_vuid = db.Column(db.String(36), db.ForeignKey('journal_entries.vuid'), nullable=False, index=True)
     line_number = db.Column(db.Integer, nullable=False)
     gl_account_vuid = db.Column(db.String(36), db.ForeignKey('chart_of_accounts.vuid'), nullable=False)
     description = db.Column(db.Text, nullable=False)
@@ -13822,6 +15819,7 @@ def get_project_expenses():
         project_vuid = request.args.get('project_vuid')
         status = request.args.get('status')
         accounting_period_vuid = request.args.get('accounting_period_vuid')
+        list_args = get_list_query_args(('created_at', 'expense_date', 'expense_number', 'amount'))
         
         # Build query
         query = ProjectExpense.query
@@ -13833,9 +15831,11 @@ def get_project_expenses():
         if accounting_period_vuid:
             query = query.filter_by(accounting_period_vuid=accounting_period_vuid)
         
-        expenses = query.all()
-        return jsonify(project_expenses_schema.dump(expenses))
+        expenses, page = get_list_page(query, ProjectExpense, list_args)
+        return make_list_response(dump_fast(project_expenses_schema, expenses), page, list_args)
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': f'Error retrieving project expenses: {str(e)}'}), 500
 
@@ -13887,6 +15887,7 @@ def create_project_expense():
         )
         
         db.session.add(new_expense)
+        refresh_cost_rollup_for_record(new_expense)
         db.session.commit()
         
         return jsonify(project_expense_schema.dump(new_expense)), 201
@@ -13926,6 +15927,8 @@ def update_project_expense(vuid):
             if not global_cost_code and not project_cost_code:
                 return jsonify({'error': f'Cost code with VUID {cost_code_vuid} not found in global or project-specific cost codes'}), 400
         
+        rollup_keys = (expense.project_vuid, expense.accounting_period_vuid)
+        
         if 'expense_number' in data:
             expense.expense_number = data['expense_number']
         if 'project_vuid' in data:
@@ -13954,6 +15957,7 @@ def update_project_expense(vuid):
             expense.status = data['status']
         
         expense.updated_at = datetime.utcnow()
+        refresh_cost_rollup_for_record(expense, rollup_keys)
         db.session.commit()
         
         return jsonify(project_expense_schema.dump(expense))
@@ -13971,6 +15975,7 @@ def delete_project_expense(vuid):
             return jsonify({'error': 'Project expense not found'}), 404
         
         db.session.delete(expense)
+        refresh_cost_rollup_for_record(expense)
         db.session.commit()
         
         return jsonify({'message': 'Project expense deleted successfully'})
@@ -13993,7 +15998,7 @@ def preview_project_expense_journal_entry(vuid):
             return jsonify({'error': 'Failed to create project expense entry preview'}), 500
         
         # Get chart of accounts for account names
-        chart_of_accounts = ChartOfAccounts.query.all()
+        chart_of_accounts = get_gl_account_cache()['accounts']
         account_lookup = {acc.vuid: f"{acc.account_number} - {acc.account_name}" for acc in chart_of_accounts}
         
         # Add account names to line items
@@ -14015,9 +16020,14 @@ def get_journal_entries():
         accounting_period_vuid = request.args.get('accounting_period_vuid')
         status = request.args.get('status')
         reference_type = request.args.get('reference_type')
+        list_args = get_list_query_args(('created_at', 'entry_date', 'journal_number'))
+        export_format = get_export_format()
         
-        # Build query
-        query = JournalEntry.query
+        # Build query, loading the nested period, lines and line accounts the schema dumps
+        query = JournalEntry.query.options(
+            db.joinedload(JournalEntry.accounting_period),
+            db.selectinload(JournalEntry.line_items).joinedload(JournalEntryLine.gl_account)
+        )
         
         if project_vuid:
             query = query.filter_by(project_vuid=project_vuid)
@@ -14028,11 +16038,22 @@ def get_journal_entries():
         if reference_type:
             query = query.filter_by(reference_type=reference_type)
         
-        # Order by creation date (newest first)
-        journal_entries = query.order_by(JournalEntry.created_at.desc()).all()
+        if export_format:
+            query = query.order_by(JournalEntry.created_at.desc(), JournalEntry.vuid.desc())
+            rows = (dump_fast(journal_entry_schema, entry) for entry in query.yield_per(EXPORT_BATCH_SIZE))
+            return make_export_response(
+                rows, export_format, 'journal_entries', get_schema_export_columns(journal_entry_schema),
+                flatten=flatten_line_items
+            )
+        
+        # Order by creation date (newest first) unless another sort is requested
+        journal_entries, page = get_list_page(query, JournalEntry, list_args,
+                                              default_order=[JournalEntry.created_at.desc()])
         
-        return jsonify(journal_entries_schema.dump(journal_entries))
+        return make_list_response(dump_fast(journal_entries_schema, journal_entries), page, list_args)
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': f'Error fetching journal entries: {str(e)}'}), 500
 
@@ -14357,7 +16378,7 @@ def preview_journal_entries():
                         # Get expense account name
                         expense_account_name = 'Construction Costs'  # Default
                         if line.cost_type and line.cost_type.expense_account:
-                            expense_account = ChartOfAccounts.query.get(line.cost_type.expense_account)
+                            expense_account = get_gl_account(line.cost_type.expense_account)
                             if expense_account:
                                 expense_account_name = expense_account.account_name
                         
@@ -14378,7 +16399,7 @@ def preview_journal_entries():
                         preview_entry['line_items'].append(line_preview)
                     
                     # Credit line (accounts payable) - NET amount only
-                    ap_account = ChartOfAccounts.query.filter_by(account_name='Accounts Payable').first()
+                    ap_account = get_gl_account_by_name('Accounts Payable')
                     ap_account_name = 'Accounts Payable'  # Default
                     if ap_account:
                         ap_account_name = ap_account.account_name
@@ -14405,7 +16426,7 @@ def preview_journal_entries():
                         # Get expense account name
                         expense_account_name = 'Construction Costs'  # Default
                         if line.cost_type and line.cost_type.expense_account:
-                            expense_account = ChartOfAccounts.query.get(line.cost_type.expense_account)
+                            expense_account = get_gl_account(line.cost_type.expense_account)
                             if expense_account:
                                 expense_account_name = expense_account.account_name
                         
@@ -14426,7 +16447,7 @@ def preview_journal_entries():
                         preview_entry['line_items'].append(line_preview)
                     
                     # Credit line (accounts payable) - Net amount only
-                    ap_account = ChartOfAccounts.query.filter_by(account_name='Accounts Payable').first()
+                    ap_account = get_gl_account_by_name('Accounts Payable')
                     ap_account_name = 'Accounts Payable'  # Default
                     if ap_account:
                         ap_account_name = ap_account.account_name
@@ -14445,7 +16466,7 @@ def preview_journal_entries():
                     
                     # Credit line (retainage liability) - if retainage is held
                     if float(invoice.retention_held or 0) > 0:
-                        retainage_account = ChartOfAccounts.query.filter_by(account_name='Retainage Payable').first()
+                        retainage_account = get_gl_account_by_name('Retainage Payable')
                         retainage_account_name = 'Retainage Payable'  # Default
                         if retainage_account:
                             retainage_account_name = retainage_account.account_name
@@ -14489,7 +16510,7 @@ def preview_journal_entries():
                         # Get expense account name
                         expense_account_name = 'Construction Costs'  # Default
                         if line.cost_type and line.cost_type.expense_account:
-                            expense_account = ChartOfAccounts.query.get(line.cost_type.expense_account)
+                            expense_account = get_gl_account(line.cost_type.expense_account)
                             if expense_account:
                                 expense_account_name = expense_account.account_name
                         
@@ -14510,7 +16531,7 @@ def preview_journal_entries():
                         retainage_entry['line_items'].append(line_preview)
                     
                     # Credit: Retainage Payable
-                    retainage_account = ChartOfAccounts.query.filter_by(account_name='Retainage Payable').first()
+                    retainage_account = get_gl_account_by_name('Retainage Payable')
                     retainage_account_name = 'Retainage Payable'  # Default
                     if retainage_account:
                         retainage_account_name = retainage_account.account_name
@@ -14564,7 +16585,7 @@ def preview_journal_entries():
                 
                 # Debit line (accounts receivable)
                 # Get accounts receivable account name
-                ar_account = ChartOfAccounts.query.filter_by(account_name='Accounts Receivable').first()
+                ar_account = get_gl_account_by_name('Accounts Receivable')
                 ar_account_name = 'Accounts Receivable'  # Default
                 if ar_account:
                     ar_account_name = ar_account.account_name
@@ -14584,7 +16605,7 @@ def preview_journal_entries():
                 
                 # Credit line (revenue) - also use net amount
                 # Get construction revenue account name
-                revenue_account = ChartOfAccounts.query.filter_by(account_name='Construction Revenue').first()
+                revenue_account = get_gl_account_by_name('Construction Revenue')
                 revenue_account_name = 'Construction Revenue'  # Default
                 if revenue_account:
                     revenue_account_name = revenue_account.account_name
@@ -14617,7 +16638,7 @@ def preview_journal_entries():
                     }
                     
                     # Debit: Accounts Receivable (retainage)
-                    ar_account = ChartOfAccounts.query.filter_by(account_name='Accounts Receivable').first()
+                    ar_account = get_gl_account_by_name('Accounts Receivable')
                     ar_account_name = 'Accounts Receivable'  # Default
                     if ar_account:
                         ar_account_name = ar_account.account_name
@@ -14633,10 +16654,10 @@ def preview_journal_entries():
                     retainage_entry['line_items'].append(debit_line)
                     
                     # Credit: Retainage Receivable (or Contract Retainage Receivable)
-                    retainage_account = ChartOfAccounts.query.filter(ChartOfAccounts.account_name.ilike('%retainage%receivable%')).first()
+                    retainage_account = find_gl_account('%retainage%receivable%')
                     if not retainage_account:
                         # Fallback to any retainage account
-                        retainage_account = ChartOfAccounts.query.filter(ChartOfAccounts.account_name.ilike('%retainage%')).first()
+                        retainage_account = find_gl_account('%retainage%')
                     
                     retainage_account_name = 'Contract Retainage Receivable'  # Default
                     if retainage_account:
@@ -14691,12 +16712,12 @@ def preview_journal_entries():
                 # Get expense account name
                 expense_account_name = 'Construction Costs'  # Default
                 if labor_cost.cost_type and labor_cost.cost_type.expense_account:
-                    expense_account = ChartOfAccounts.query.get(labor_cost.cost_type.expense_account)
+                    expense_account = get_gl_account(labor_cost.cost_type.expense_account)
                     if expense_account:
                         expense_account_name = expense_account.account_name
                 
                 # Get wages payable account name
-                wages_payable_account = ChartOfAccounts.query.get('a1b2c3d4-e5f6-7890-abcd-ef1234567890')
+                wages_payable_account = get_gl_account('a1b2c3d4-e5f6-7890-abcd-ef1234567890')
                 wages_payable_name = 'Wages Payable'  # Default
                 if wages_payable_account:
                     wages_payable_name = wages_payable_account.account_name
@@ -14763,12 +16784,12 @@ def preview_journal_entries():
                 # Get expense account name
                 expense_account_name = 'Construction Costs'  # Default
                 if expense.cost_type and expense.cost_type.expense_account:
-                    expense_account = ChartOfAccounts.query.get(expense.cost_type.expense_account)
+                    expense_account = get_gl_account(expense.cost_type.expense_account)
                     if expense_account:
                         expense_account_name = expense_account.account_name
                 
                 # Get accounts payable account name
-                ap_account = ChartOfAccounts.query.filter_by(account_name='Accounts Payable').first()
+                ap_account = get_gl_account_by_name('Accounts Payable')
                 ap_account_name = 'Accounts Payable'  # Default
                 if ap_account:
                     ap_account_name = ap_account.account_name
@@ -14857,7 +16878,7 @@ def preview_journal_entries():
             validation_errors.append(f"Total journal entries are unbalanced (Total Debits: ${total_debits:.2f}, Total Credits: ${total_credits:.2f}, Difference: ${total_balance:.2f})")
         
         # Get chart of accounts for display
-        chart_of_accounts = ChartOfAccounts.query.all()
+        chart_of_accounts = get_gl_account_cache()['accounts']
         chart_of_accounts_data = [{
             'vuid': account.vuid,
             'account_number': account.account_number,
@@ -14954,6 +16975,9 @@ def generate_journal_entries_from_posted():
         if not period:
             return jsonify({'error': 'Accounting period not found'}), 404
         
+        if wants_background_job():
+            return make_enqueue_job_response('generate_journal_entries', period.vuid)
+        
         print(f"Generating journal entries from posted records for accounting period {period.month}/{period.year}")
         
         # Generate journal entries from posted records
@@ -15114,7 +17138,7 @@ def generate_period_journal_entries(accounting_period_vuid):
         gl_settings = GLSettings.query.first()
         if not gl_settings:
             print(f"No GL settings found")
-            return False
+            return False, []
         
         # Track created journal entries
         created_entries = []
@@ -15124,12 +17148,15 @@ def generate_period_journal_entries(accounting_period_vuid):
             accounting_period_vuid=accounting_period_vuid,
             status='approved'
         ).all()
+        ap_integration_methods = get_effective_integration_method_map(
+            'ap_invoice_integration_method', (invoice.project_vuid for invoice in ap_invoices)
+        )
         
         for invoice in ap_invoices:
             print(f"Processing approved AP Invoice {invoice.invoice_number}")
             
             # Get the integration method for this project
-            integration_method = get_effective_ap_invoice_integration_method(invoice.project_vuid)
+            integration_method = ap_integration_methods[invoice.project_vuid]
             print(f"  -> Integration method: {integration_method}")
             
             if integration_method == INTEGRATION_METHOD_INVOICE:
@@ -15318,7 +17345,7 @@ def create_ap_invoice_net_entry(invoice):
                     expense_account_vuid = line.cost_type.expense_account
                 else:
                     # If it's an account name, look up the VUID
-                    account = ChartOfAccounts.query.filter_by(account_name=line.cost_type.expense_account).first()
+                    account = get_gl_account_by_name(line.cost_type.expense_account)
                     if account:
                         expense_account_vuid = account.vuid
             
@@ -15341,7 +17368,7 @@ def create_ap_invoice_net_entry(invoice):
                 line_number += 1
         
         # Credit: Accounts Payable (net amount)
-        ap_account_vuid = gl_settings.ap_invoices_account_vuid or 'a1b2c3d4-e5f6-7890-abcd-ef1234567890'
+        ap_account_vuid = get_gl_settings_account_vuid('ap_invoices_account_vuid', invoice.project_vuid) or 'a1b2c3d4-e5f6-7890-abcd-ef1234567890'
         if net_amount > 0:
             credit_line = JournalEntryLine(
                 journal_entry_vuid=journal_entry.vuid,
@@ -15411,7 +17438,7 @@ def create_ap_invoice_retainage_entry(invoice):
                     expense_account_vuid = line.cost_type.expense_account
                 else:
                     # If it's an account name, look up the VUID
-                    account = ChartOfAccounts.query.filter_by(account_name=line.cost_type.expense_account).first()
+                    account = get_gl_account_by_name(line.cost_type.expense_account)
                     if account:
                         expense_account_vuid = account.vuid
             
@@ -15434,7 +17461,7 @@ def create_ap_invoice_retainage_entry(invoice):
                 line_number += 1
         
         # Credit: Retainage Payable
-        retainage_account_vuid = gl_settings.ap_retainage_account_vuid or 'a1b2c3d4-e5f6-7890-abcd-ef1234567890'
+        retainage_account_vuid = get_gl_settings_account_vuid('ap_retainage_account_vuid', invoice.project_vuid) or 'a1b2c3d4-e5f6-7890-abcd-ef1234567890'
         if retainage_amount > 0:
             credit_line = JournalEntryLine(
                 journal_entry_vuid=journal_entry.vuid,
@@ -15595,25 +17622,24 @@ def create_project_billing_journal_entry(billing_vuid):
             print(f"Journal entry already exists for Project Billing {billing.billing_number}. Skipping creation.")
             return existing_journal
         
-        # Get GL settings for project billings
-        gl_settings = GLSettings.query.first()
-        if not gl_settings:
+        # GL settings must exist; the entries read their accounts from the GL account cache
+        if not GLSettings.query.first():
             print(f"No GL settings found")
             return None
         
         if integration_method == INTEGRATION_METHOD_INVOICE:
             # Create separate entries: one for net amount, one for retainage
-            return create_project_billing_net_entry(billing, gl_settings)
+            return create_project_billing_net_entry(billing)
         else:
             # Create single entry with embedded retainage (original logic)
-            return create_project_billing_combined_entry(billing, gl_settings)
+            return create_project_billing_combined_entry(billing)
         
     except Exception as e:
         print(f"Error creating project billing journal entry: {e}")
         db.session.rollback()
         return None
 
-def create_project_billing_net_entry(billing, gl_settings):
+def create_project_billing_net_entry(billing):
     """Create journal entry for net amount of project billing when integration method is 'invoice'"""
     try:
         # Create journal entry with unique journal number
@@ -15643,7 +17669,7 @@ def create_project_billing_net_entry(billing, gl_settings):
         line_number = 1
         
         # Credit: Revenue (using a default revenue account)
-        revenue_account = db.session.get(ChartOfAccounts, 'ff73e2bc-2e1a-4d88-add3-93e5a15280f5')  # Construction Revenue account
+        revenue_account = get_gl_account('ff73e2bc-2e1a-4d88-add3-93e5a15280f5')  # Construction Revenue account
         if not revenue_account:
             print(f"Default revenue account not found")
             return None
@@ -15653,7 +17679,7 @@ def create_project_billing_net_entry(billing, gl_settings):
         debit_line = JournalEntryLine(
             journal_entry_vuid=journal_entry.vuid,
             line_number=line_number,
-            gl_account_vuid=gl_settings.ar_invoices_account_vuid,
+            gl_account_vuid=get_gl_settings_account_vuid('ar_invoices_account_vuid', billing.project_vuid),
             description=f"Project Billing {billing.billing_number}",
             debit_amount=net_amount,
             credit_amount=0
@@ -15678,7 +17704,7 @@ def create_project_billing_net_entry(billing, gl_settings):
         
         # Create separate retainage entry if retainage exists
         if billing.retention_held > 0:
-            create_project_billing_retainage_entry(billing, gl_settings)
+            create_project_billing_retainage_entry(billing)
         
         return journal_entry
         
@@ -15687,7 +17713,7 @@ def create_project_billing_net_entry(billing, gl_settings):
         db.session.rollback()
         return None
 
-def create_project_billing_retainage_entry(billing, gl_settings):
+def create_project_billing_retainage_entry(billing):
     """Create separate journal entry for retainage held on project billing when integration method is 'invoice'"""
     try:
         # Check if retainage journal entry already exists
@@ -15731,7 +17757,7 @@ def create_project_billing_retainage_entry(billing, gl_settings):
         debit_line = JournalEntryLine(
             journal_entry_vuid=journal_entry.vuid,
             line_number=line_number,
-            gl_account_vuid=gl_settings.ar_invoices_account_vuid,
+            gl_account_vuid=get_gl_settings_account_vuid('ar_invoices_account_vuid', billing.project_vuid),
             description=f"Project Billing {billing.billing_number} - Retainage",
             debit_amount=retainage_amount,
             credit_amount=0
@@ -15743,7 +17769,7 @@ def create_project_billing_retainage_entry(billing, gl_settings):
         credit_line = JournalEntryLine(
             journal_entry_vuid=journal_entry.vuid,
             line_number=line_number,
-            gl_account_vuid=gl_settings.ar_retainage_account_vuid,
+            gl_account_vuid=get_gl_settings_account_vuid('ar_retainage_account_vuid', billing.project_vuid),
             description=f"Retainage for Project Billing {billing.billing_number}",
             debit_amount=0,
             credit_amount=retainage_amount
@@ -15759,7 +17785,7 @@ def create_project_billing_retainage_entry(billing, gl_settings):
         db.session.rollback()
         return None
 
-def create_project_billing_combined_entry(billing, gl_settings):
+def create_project_billing_combined_entry(billing):
     """Create single journal entry with embedded retainage (original logic)"""
     try:
         # Create journal entry with unique journal number
@@ -15789,7 +17815,7 @@ def create_project_billing_combined_entry(billing, gl_settings):
         line_number = 1
         
         # Credit: Revenue (using a default revenue account)
-        revenue_account = db.session.get(ChartOfAccounts, 'ff73e2bc-2e1a-4d88-add3-93e5a15280f5')  # Construction Revenue account
+        revenue_account = get_gl_account('ff73e2bc-2e1a-4d88-add3-93e5a15280f5')  # Construction Revenue account
         if not revenue_account:
             print(f"Default revenue account not found")
             return None
@@ -15799,7 +17825,7 @@ def create_project_billing_combined_entry(billing, gl_settings):
         debit_line = JournalEntryLine(
             journal_entry_vuid=journal_entry.vuid,
             line_number=line_number,
-            gl_account_vuid=gl_settings.ar_invoices_account_vuid,
+            gl_account_vuid=get_gl_settings_account_vuid('ar_invoices_account_vuid', billing.project_vuid),
             description=f"Project Billing {billing.billing_number}",
             debit_amount=gross_amount,
             credit_amount=0
@@ -15824,7 +17850,7 @@ def create_project_billing_combined_entry(billing, gl_settings):
             retainage_held_line = JournalEntryLine(
                 journal_entry_vuid=journal_entry.vuid,
                 line_number=line_number,
-                gl_account_vuid=gl_settings.ar_retainage_account_vuid,
+                gl_account_vuid=get_gl_settings_account_vuid('ar_retainage_account_vuid', billing.project_vuid),
                 description=f"Project Billing {billing.billing_number} - Retainage Held",
                 debit_amount=0,
                 credit_amount=billing.retention_held
@@ -15838,7 +17864,7 @@ def create_project_billing_combined_entry(billing, gl_settings):
             retainage_release_debit_line = JournalEntryLine(
                 journal_entry_vuid=journal_entry.vuid,
                 line_number=line_number,
-                gl_account_vuid=gl_settings.ar_invoices_account_vuid,
+                gl_account_vuid=get_gl_settings_account_vuid('ar_invoices_account_vuid', billing.project_vuid),
                 description=f"Project Billing {billing.billing_number} - Retainage Released",
                 debit_amount=billing.retention_released,
                 credit_amount=0
@@ -15850,7 +17876,7 @@ def create_project_billing_combined_entry(billing, gl_settings):
             retainage_release_credit_line = JournalEntryLine(
                 journal_entry_vuid=journal_entry.vuid,
                 line_number=line_number,
-                gl_account_vuid=gl_settings.ar_retainage_account_vuid,
+                gl_account_vuid=get_gl_settings_account_vuid('ar_retainage_account_vuid', billing.project_vuid),
                 description=f"Project Billing {billing.billing_number} - Retainage Released",
                 debit_amount=0,
                 credit_amount=billing.retention_released
@@ -15912,7 +17938,7 @@ def create_over_under_billing_journal_entry(project_vuid, accounting_period_vuid
             debit_line = JournalEntryLine(
                 journal_entry_vuid=over_entry.vuid,
                 line_number=1,
-                gl_account_vuid=gl_settings.ar_invoices_account_vuid,  # Default revenue account
+                gl_account_vuid=get_gl_settings_account_vuid('ar_invoices_account_vuid', project_vuid),  # Default revenue account
                 description="Over Billing Adjustment - Revenue",
                 debit_amount=over_amount,
                 credit_amount=0
@@ -15923,7 +17949,7 @@ def create_over_under_billing_journal_entry(project_vuid, accounting_period_vuid
             credit_line = JournalEntryLine(
                 journal_entry_vuid=over_entry.vuid,
                 line_number=2,
-                gl_account_vuid=gl_settings.billing_in_excess_of_cost_account_vuid,
+                gl_account_vuid=get_gl_settings_account_vuid('billing_in_excess_of_cost_account_vuid', project_vuid),
                 description="Over Billing Adjustment - Billings in Excess",
                 debit_amount=0,
                 credit_amount=over_amount
@@ -15964,7 +17990,7 @@ def create_over_under_billing_journal_entry(project_vuid, accounting_period_vuid
             debit_line = JournalEntryLine(
                 journal_entry_vuid=under_entry.vuid,
                 line_number=1,
-                gl_account_vuid=gl_settings.cost_in_excess_of_billing_account_vuid,
+                gl_account_vuid=get_gl_settings_account_vuid('cost_in_excess_of_billing_account_vuid', project_vuid),
                 description="Under Billing Adjustment - Cost in Excess",
                 debit_amount=under_amount,
                 credit_amount=0
@@ -15975,7 +18001,7 @@ def create_over_under_billing_journal_entry(project_vuid, accounting_period_vuid
             credit_line = JournalEntryLine(
                 journal_entry_vuid=under_entry.vuid,
                 line_number=2,
-                gl_account_vuid=gl_settings.ar_invoices_account_vuid,  # Default revenue account
+                gl_account_vuid=get_gl_settings_account_vuid('ar_invoices_account_vuid', project_vuid),  # Default revenue account
                 description="Under Billing Adjustment - Revenue",
                 debit_amount=0,
                 credit_amount=under_amount
@@ -16077,7 +18103,7 @@ def create_labor_cost_journal_entry(labor_cost_vuid):
             expense_account_vuid = 'b6a4b081-3149-4f16-9ecb-7aa866937abe'  # Construction Costs account
             print(f"Using default labor cost account: {expense_account_vuid}")
         
-        expense_account = db.session.get(ChartOfAccounts, expense_account_vuid)
+        expense_account = get_gl_account(expense_account_vuid)
         if not expense_account:
             print(f"Expense account not found: {expense_account_vuid}")
             return None
@@ -16095,10 +18121,10 @@ def create_labor_cost_journal_entry(labor_cost_vuid):
         
         # Credit: Wages Payable account
         # Try to find Wages Payable account, fallback to Accounts Payable if not found
-        wages_payable_account = db.session.get(ChartOfAccounts, 'a1b2c3d4-e5f6-7890-abcd-ef1234567890')  # Wages Payable account
+        wages_payable_account = get_gl_account('a1b2c3d4-e5f6-7890-abcd-ef1234567890')  # Wages Payable account
         if not wages_payable_account:
             # Fallback to Accounts Payable
-            wages_payable_account = ChartOfAccounts.query.filter_by(account_name='Accounts Payable').first()
+            wages_payable_account = get_gl_account_by_name('Accounts Payable')
             if not wages_payable_account:
                 print(f"Wages Payable and Accounts Payable accounts not found")
                 return None
@@ -16176,7 +18202,7 @@ def create_project_expense_journal_entry(expense_vuid):
             expense_account_vuid = 'b6a4b081-3149-4f16-9ecb-7aa866937abe'  # Construction Costs account
             print(f"Using default expense account: {expense_account_vuid}")
         
-        expense_account = db.session.get(ChartOfAccounts, expense_account_vuid)
+        expense_account = get_gl_account(expense_account_vuid)
         if not expense_account:
             print(f"Expense account not found: {expense_account_vuid}")
             return None
@@ -16193,7 +18219,7 @@ def create_project_expense_journal_entry(expense_vuid):
         line_number += 1
         
         # Credit: Accounts Payable account
-        ap_account = ChartOfAccounts.query.filter_by(account_name='Accounts Payable').first()
+        ap_account = get_gl_account_by_name('Accounts Payable')
         if not ap_account:
             print(f"Accounts Payable account not found")
             return None
@@ -16282,95 +18308,119 @@ def test_qbo_connection():
             'error': f'Connection test failed: {str(e)}'
         }), 500
 
-@app.route('/api/qbo/export-journal-entries-real', methods=['POST'])
-def export_journal_entries_to_qbo_real():
-    """Export journal entries to real QuickBooks Online API"""
-    try:
-        data = request.get_json()
-        accounting_period_vuid = data.get('accounting_period_vuid')
-        project_vuid = data.get('project_vuid')
-        
-        if not accounting_period_vuid:
-            return jsonify({
-                'success': False,
-                'error': 'accounting_period_vuid is required'
-            }), 400
-        
-        from app.qbo_integration import qbo_integration
-        
-        # Test connection first
-        connection_test = qbo_integration.test_connection()
-        if not connection_test.get('success'):
-            return jsonify({
-                'success': False,
-                'error': f'QBO connection failed: {connection_test.get("error", "Unknown error")}'
-            }), 400
-        
-        # Get journal entries to export
-        query = JournalEntry.query.filter_by(
-            accounting_period_vuid=accounting_period_vuid,
-            exported_to_accounting=False
-        )
+def export_period_journal_entries_to_qbo(accounting_period_vuid, project_vuid=None, progress_callback=None):
+    """
+    Export a period's unexported journal entries to the real QuickBooks Online API.
+    
+    Each entry is marked as exported and committed as soon as QuickBooks accepts it, so a
+    cancelled or failed run leaves at most the entry in flight created in QuickBooks but
+    still unexported here. Cancellation is checked between entries.
+    
+    Args:
+        accounting_period_vuid: Accounting period to export
+        project_vuid: Optional project filter
+        progress_callback: Optional callable taking (processed_count, total_count)
         
-        if project_vuid:
-            query = query.filter_by(project_vuid=project_vuid)
+    Returns:
+        tuple: (response data, HTTP status code)
+    """
+    from app.qbo_integration import qbo_integration
+    
+    # Test connection first
+    connection_test = qbo_integration.test_connection()
+    if not connection_test.get('success'):
+        return {
+            'success': False,
+            'error': f'QBO connection failed: {connection_test.get("error", "Unknown error")}'
+        }, 400
+    
+    # Get journal entries to export
+    query = JournalEntry.query.filter_by(
+        accounting_period_vuid=accounting_period_vuid,
+        exported_to_accounting=False
+    )
+    
+    if project_vuid:
+        query = query.filter_by(project_vuid=project_vuid)
+    
+    journal_entries = query.all()
+    
+    if not journal_entries:
+        return {
+            'success': True,
+            'message': 'No journal entries to export',
+            'exported_count': 0
+        }, 200
+    
+    exported_count = 0
+    errors = []
+    
+    for index, entry in enumerate(journal_entries, start=1):
+        try:
+            # Convert to QBO format
+            qbo_data = {
+                'journal_number': entry.journal_number,
+                'entry_date': entry.entry_date.isoformat() if entry.entry_date else None,
+                'line_items': []
+            }
+            
+            # Add line items
+            for line in entry.line_items:
+                qbo_data['line_items'].append({
+                    'vuid': line.vuid,
+                    'description': line.description,
+                    'debit_amount': float(line.debit_amount or 0),
+                    'credit_amount': float(line.credit_amount or 0),
+                    'account_name': line.account_name,
+                    'account_id': line.account_id  # This would need to be mapped to QBO account IDs
+                })
+            
+            # Create journal entry in QBO
+            result = qbo_integration.create_journal_entry(qbo_data)
+            
+            if result:
+                # Mark as exported
+                entry.exported_to_accounting = True
+                entry.accounting_export_date = datetime.utcnow()
+                db.session.commit()
+                exported_count += 1
+            else:
+                errors.append(f"Failed to export journal entry {entry.journal_number}")
+                
+        except Exception as e:
+            db.session.rollback()
+            errors.append(f"Error exporting {entry.journal_number}: {str(e)}")
         
-        journal_entries = query.all()
+        if progress_callback:
+            progress_callback(index, len(journal_entries))
+    
+    return {
+        'success': True,
+        'message': f'Successfully exported {exported_count} journal entries to QuickBooks Online',
+        'exported_count': exported_count,
+        'total_count': len(journal_entries),
+        'errors': errors
+    }, 200
+
+@app.route('/api/qbo/export-journal-entries-real', methods=['POST'])
+def export_journal_entries_to_qbo_real():
+    """Export journal entries to real QuickBooks Online API"""
+    try:
+        data = request.get_json()
+        accounting_period_vuid = data.get('accounting_period_vuid')
+        project_vuid = data.get('project_vuid')
         
-        if not journal_entries:
+        if not accounting_period_vuid:
             return jsonify({
-                'success': True,
-                'message': 'No journal entries to export',
-                'exported_count': 0
-            })
-        
-        exported_count = 0
-        errors = []
-        
-        for entry in journal_entries:
-            try:
-                # Convert to QBO format
-                qbo_data = {
-                    'journal_number': entry.journal_number,
-                    'entry_date': entry.entry_date.isoformat() if entry.entry_date else None,
-                    'line_items': []
-                }
-                
-                # Add line items
-                for line in entry.line_items:
-                    qbo_data['line_items'].append({
-                        'vuid': line.vuid,
-                        'description': line.description,
-                        'debit_amount': float(line.debit_amount or 0),
-                        'credit_amount': float(line.credit_amount or 0),
-                        'account_name': line.account_name,
-                        'account_id': line.account_id  # This would need to be mapped to QBO account IDs
-                    })
-                
-                # Create journal entry in QBO
-                result = qbo_integration.create_journal_entry(qbo_data)
-                
-                if result:
-                    # Mark as exported
-                    entry.exported_to_accounting = True
-                    entry.accounting_export_date = datetime.utcnow()
-                    exported_count += 1
-                else:
-                    errors.append(f"Failed to export journal entry {entry.journal_number}")
-                    
-            except Exception as e:
-                errors.append(f"Error exporting {entry.journal_number}: {str(e)}")
+                'success': False,
+                'error': 'accounting_period_vuid is required'
+            }), 400
         
-        # Commit changes
-        db.session.commit()
+        if wants_background_job():
+            return make_enqueue_job_response('qbo_export_journal_entries', accounting_period_vuid, {'project_vuid': project_vuid})
         
-        return jsonify({
-            'success': True,
-            'message': f'Successfully exported {exported_count} journal entries to QuickBooks Online',
-            'exported_count': exported_count,
-            'total_count': len(journal_entries),
-            'errors': errors
-        })
+        response_data, status_code = export_period_journal_entries_to_qbo(accounting_period_vuid, project_vuid)
+        return jsonify(response_data), status_code
         
     except Exception as e:
         db.session.rollback()
@@ -16423,11 +18473,7 @@ def debug_cost_queries(project_vuid):
         # 4. Get Periods to Include
         if accounting_period:
             periods_to_include = AccountingPeriod.query.filter(
-                db.or_(
-                    db.and_(AccountingPeriod.year < accounting_period.year),
-                    db.and_(AccountingPeriod.year == accounting_period.year, 
-                           AccountingPeriod.month <= accounting_period.month)
-                )
+                AccountingPeriod.period_ordinal <= get_period_ordinal(accounting_period.year, accounting_period.month)
             ).all()
             results['periods_to_include'] = {
                 'count': len(periods_to_include),
@@ -16556,36 +18602,16 @@ def get_project_financial_summary(project_vuid):
         use_eac_reporting = get_wip_setting('use_eac_reporting')
         eac_enabled = use_eac_reporting and use_eac_reporting.lower() == 'true'
         
-        # Instead of using centralized functions, get the data from the WIP endpoint
-        # This ensures 100% consistency between WIP report and financial summary
-        import requests
-        try:
-            wip_response = requests.get(f"http://localhost:5001/api/wip?accounting_period_vuid={accounting_period_vuid}")
-            if wip_response.status_code == 200:
-                wip_data = wip_response.json()
-                project_wip_data = next((item for item in wip_data if item['project_vuid'] == project_vuid), None)
-                if project_wip_data:
-                    costs_to_date = project_wip_data.get('costs_to_date', 0.0)
-                    billings_to_date = project_wip_data.get('project_billings', 0.0)
-                    revenue_recognized = project_wip_data.get('revenue_recognized', 0.0)
-                    percent_complete = project_wip_data.get('percent_complete', 0.0)
-                    total_contract_amount = project_wip_data.get('total_contract_amount', 0.0)
-                    eac_amount = project_wip_data.get('eac_amount', 0.0)
-                    current_budget_amount = project_wip_data.get('current_budget_amount', 0.0)
-                    
-                    print(f"DEBUG FINANCIAL SUMMARY FROM WIP:")
-                    print(f"  costs_to_date={costs_to_date}")
-                    print(f"  billings_to_date={billings_to_date}")
-                    print(f"  revenue_recognized={revenue_recognized}")
-                    print(f"  percent_complete={percent_complete}")
-                    print(f"  total_contract_amount={total_contract_amount}")
-                else:
-                    return jsonify({'error': 'Project not found in WIP data'}), 404
-            else:
-                return jsonify({'error': 'Failed to get WIP data'}), 500
-        except Exception as e:
-            print(f"Error getting WIP data: {e}")
-            return jsonify({'error': f'Error getting WIP data: {str(e)}'}), 500
+        # Get this project's WIP row in-process (same numbers as /api/wip, which only lists active projects)
+        project_wip_data = calculate_project_wip_row(project_vuid, accounting_period_vuid, eac_enabled) if project.status == 'active' else None
+        if not project_wip_data:
+            return jsonify({'error': 'Project not found in WIP data'}), 404
+        
+        costs_to_date = project_wip_data.get('costs_to_date', 0.0)
+        billings_to_date = project_wip_data.get('project_billings', 0.0)
+        revenue_recognized = project_wip_data.get('revenue_recognized', 0.0)
+        percent_complete = project_wip_data.get('percent_complete', 0.0)
+        total_contract_amount = project_wip_data.get('total_contract_amount', 0.0)
         
         # Calculate current period billing separately
         current_period_billing = 0.0
@@ -16744,78 +18770,16 @@ def validate_project_financial_alignment_inline(project_vuid, accounting_period_
                 'journal_calculation': None
             }
         
-        # Get standardized period filter
-        periods_to_include = AccountingPeriod.query.filter(
-            or_(
-                and_(AccountingPeriod.year < accounting_period.year),
-                and_(AccountingPeriod.year == accounting_period.year, 
-                     AccountingPeriod.month <= accounting_period.month)
-            )
-        ).all()
-        period_vuids = [p.vuid for p in periods_to_include]
-        
-        # Calculate standardized costs to date
-        costs_to_date = 0.0
-        ap_invoice_costs = 0.0
-        labor_costs = 0.0
-        project_expense_costs = 0.0
-        
-        # AP Invoices - Use GROSS amount (total_amount + retention_held)
-        ap_invoices_query = APInvoice.query.filter_by(
-            project_vuid=project_vuid,
-            status='approved'
-        )
-        if period_vuids:
-            ap_invoices_query = ap_invoices_query.filter(APInvoice.accounting_period_vuid.in_(period_vuids))
-        
-        ap_invoices = ap_invoices_query.all()
-        for invoice in ap_invoices:
-            gross_amount = float(invoice.total_amount or 0) + float(invoice.retention_held or 0)
-            ap_invoice_costs += gross_amount
-            costs_to_date += gross_amount
-        
-        # Labor Costs
-        labor_costs_query = LaborCost.query.filter_by(
-            project_vuid=project_vuid,
-            status='active'
-        )
-        if period_vuids:
-            labor_costs_query = labor_costs_query.filter(LaborCost.accounting_period_vuid.in_(period_vuids))
-        
-        labor_costs_list = labor_costs_query.all()
-        for labor_cost in labor_costs_list:
-            amount = float(labor_cost.amount or 0)
-            labor_costs += amount
-            costs_to_date += amount
-        
-        # Project Expenses
-        project_expenses_query = ProjectExpense.query.filter_by(
-            project_vuid=project_vuid,
-            status='approved'
-        )
-        if period_vuids:
-            project_expenses_query = project_expenses_query.filter(ProjectExpense.accounting_period_vuid.in_(period_vuids))
-        
-        project_expenses = project_expenses_query.all()
-        for expense in project_expenses:
-            amount = float(expense.amount or 0)
-            project_expense_costs += amount
-            costs_to_date += amount
-        
-        # Calculate standardized project billings
-        project_billings_total = 0.0
-        project_billings_query = ProjectBilling.query.filter_by(
-            project_vuid=project_vuid,
-            status='approved'
-        )
-        if period_vuids:
-            project_billings_query = project_billings_query.filter(ProjectBilling.accounting_period_vuid.in_(period_vuids))
+        # WIP-side figures come from the in-process WIP row (same numbers as /api/wip)
+        wip_row = calculate_project_wip_row(project_vuid, accounting_period_vuid)
+        costs_to_date = wip_row['costs_to_date']
+        project_billings_total = wip_row['project_billings']
         
-        project_billings = project_billings_query.all()
-        for billing in project_billings:
-            # Use only total_amount (net billing amount after retainage is deducted)
-            # retention_held is the amount withheld, not additional billing
-            project_billings_total += float(billing.total_amount or 0)
+        # Cost breakdown by source for the report
+        costs_data = calculate_project_costs_to_date(project_vuid, accounting_period_vuid)
+        ap_invoice_costs = costs_data['ap_invoice_costs']
+        labor_costs = costs_data['labor_costs']
+        project_expense_costs = costs_data['project_expense_costs']
         
         # Check journal entries for consistency
         journal_entries = JournalEntry.query.filter_by(
@@ -17023,6 +18987,9 @@ def comprehensive_backfill_posted_records(accounting_period_vuid):
         data = request.get_json() or {}
         posted_by = data.get('posted_by', 'Comprehensive Backfill')
         
+        if wants_background_job():
+            return make_enqueue_job_response('comprehensive_backfill', accounting_period_vuid, {'posted_by': posted_by})
+        
         result = comprehensive_backfill_all_transactions(accounting_period_vuid, posted_by)
         
         if result['success']:
@@ -17050,10 +19017,67 @@ def backfill_posted_records(accounting_period_vuid):
     except Exception as e:
         return jsonify({'error': f'Error backfilling posted records: {str(e)}'}), 500
 
+# Keys of serialize_posted_record, followed by its line item keys
+POSTED_RECORD_EXPORT_COLUMNS = make_line_item_columns(
+    ['vuid', 'transaction_type', 'transaction_vuid', 'posted_by', 'posted_at', 'project_vuid', 'project_name',
+     'project_number', 'reference_number', 'description', 'total_amount', 'net_amount', 'retainage_amount',
+     'total_debits', 'total_credits'],
+    ['vuid', 'gl_account_vuid', 'account_name', 'debit_amount', 'credit_amount', 'description', 'line_number']
+)
+
+def serialize_posted_record(record):
+    """Serialize a posted record with its line items for the posted records list"""
+    return {
+        'vuid': record.vuid,
+        'transaction_type': record.transaction_type,
+        'transaction_vuid': record.transaction_vuid,
+        'posted_by': record.posted_by,
+        'posted_at': record.posted_at.isoformat(),
+        'project_vuid': record.project_vuid,
+        'project_name': record.project.project_name if record.project else None,
+        'project_number': record.project.project_number if record.project else None,
+        'reference_number': record.reference_number,
+        'description': record.description,
+        'total_amount': float(record.total_amount or 0),
+        'net_amount': float(record.net_amount or 0),
+        'retainage_amount': float(record.retainage_amount or 0),
+        'total_debits': float(record.total_debits or 0),
+        'total_credits': float(record.total_credits or 0),
+        'line_items': [{
+            'vuid': line.vuid,
+            'gl_account_vuid': line.gl_account_vuid,
+            'account_name': line.account_name,
+            'debit_amount': float(line.debit_amount or 0),
+            'credit_amount': float(line.credit_amount or 0),
+            'description': line.description,
+            'line_number': line.line_number
+        } for line in record.line_items]
+    }
+
 @app.route('/api/posted-records/<accounting_period_vuid>', methods=['GET'])
 def get_posted_records_for_period(accounting_period_vuid):
     """Get all posted records for a specific accounting period"""
     try:
+        export_format = get_export_format()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        if export_format:
+            # Collections cannot be joined-eager-loaded with yield_per, so line items are selectin-loaded
+            posted_records = PostedRecord.query.options(
+                db.joinedload(PostedRecord.project),
+                db.selectinload(PostedRecord.line_items)
+            ).filter_by(
+                accounting_period_vuid=accounting_period_vuid,
+                status='posted'
+            ).order_by(PostedRecord.posted_at, PostedRecord.vuid)
+            rows = (serialize_posted_record(record) for record in posted_records.yield_per(EXPORT_BATCH_SIZE))
+            return make_export_response(
+                rows, export_format, f"posted_records_{accounting_period_vuid}", POSTED_RECORD_EXPORT_COLUMNS,
+                flatten=flatten_line_items
+            )
+        
         posted_records = PostedRecord.query.options(
             db.joinedload(PostedRecord.project),
             db.joinedload(PostedRecord.line_items)
@@ -17062,35 +19086,7 @@ def get_posted_records_for_period(accounting_period_vuid):
             status='posted'
         ).order_by(PostedRecord.posted_at).all()
         
-        records_data = []
-        for record in posted_records:
-            record_data = {
-                'vuid': record.vuid,
-                'transaction_type': record.transaction_type,
-                'transaction_vuid': record.transaction_vuid,
-                'posted_by': record.posted_by,
-                'posted_at': record.posted_at.isoformat(),
-                'project_vuid': record.project_vuid,
-                'project_name': record.project.project_name if record.project else None,
-                'project_number': record.project.project_number if record.project else None,
-                'reference_number': record.reference_number,
-                'description': record.description,
-                'total_amount': float(record.total_amount or 0),
-                'net_amount': float(record.net_amount or 0),
-                'retainage_amount': float(record.retainage_amount or 0),
-                'total_debits': float(record.total_debits or 0),
-                'total_credits': float(record.total_credits or 0),
-                'line_items': [{
-                    'vuid': line.vuid,
-                    'gl_account_vuid': line.gl_account_vuid,
-                    'account_name': line.account_name,
-                    'debit_amount': float(line.debit_amount or 0),
-                    'credit_amount': float(line.credit_amount or 0),
-                    'description': line.description,
-                    'line_number': line.line_number
-                } for line in record.line_items]
-            }
-            records_data.append(record_data)
+        records_data = [serialize_posted_record(record) for record in posted_records]
         
         return jsonify({
             'success': True,
@@ -17178,17 +19174,11 @@ def post_ap_invoice(invoice_vuid, posted_by):
         db.session.flush()  # Get the vuid
         
         # Get the correct account VUIDs
-        construction_costs_account = ChartOfAccounts.query.filter(
-            ChartOfAccounts.account_name.ilike('%construction%cost%')
-        ).first()
+        construction_costs_account = find_gl_account('%construction%cost%')
         
-        accounts_payable_account = ChartOfAccounts.query.filter(
-            ChartOfAccounts.account_name.ilike('%accounts%payable%')
-        ).first()
+        accounts_payable_account = find_gl_account('%accounts%payable%')
         
-        retainage_payable_account = ChartOfAccounts.query.filter(
-            ChartOfAccounts.account_name.ilike('%retainage%payable%')
-        ).first()
+        retainage_payable_account = find_gl_account('%retainage%payable%')
         
         if not construction_costs_account or not accounts_payable_account:
             return {'success': False, 'error': 'Required GL accounts not found in chart of accounts'}
@@ -17315,17 +19305,11 @@ def post_project_billing(billing_vuid, posted_by):
         db.session.flush()
         
         # Get the correct account VUIDs
-        accounts_receivable_account = ChartOfAccounts.query.filter(
-            ChartOfAccounts.account_name.ilike('%accounts%receivable%')
-        ).first()
+        accounts_receivable_account = find_gl_account('%accounts%receivable%')
         
-        construction_revenue_account = ChartOfAccounts.query.filter(
-            ChartOfAccounts.account_name.ilike('%construction%revenue%')
-        ).first()
+        construction_revenue_account = find_gl_account('%construction%revenue%')
         
-        retainage_payable_account = ChartOfAccounts.query.filter(
-            ChartOfAccounts.account_name.ilike('%retainage%payable%')
-        ).first()
+        retainage_payable_account = find_gl_account('%retainage%payable%')
         
         if not accounts_receivable_account or not construction_revenue_account:
             return {'success': False, 'error': 'Required GL accounts not found in chart of accounts'}
@@ -17450,13 +19434,9 @@ def post_labor_cost(labor_cost_vuid, posted_by):
         db.session.flush()
         
         # Get the correct account VUIDs
-        construction_costs_account = ChartOfAccounts.query.filter(
-            ChartOfAccounts.account_name.ilike('%construction%cost%')
-        ).first()
+        construction_costs_account = find_gl_account('%construction%cost%')
         
-        accounts_payable_account = ChartOfAccounts.query.filter(
-            ChartOfAccounts.account_name.ilike('%accounts%payable%')
-        ).first()
+        accounts_payable_account = find_gl_account('%accounts%payable%')
         
         if not construction_costs_account or not accounts_payable_account:
             return {'success': False, 'error': 'Required GL accounts not found in chart of accounts'}
@@ -17537,13 +19517,9 @@ def post_project_expense(expense_vuid, posted_by):
         db.session.flush()
         
         # Get the correct account VUIDs
-        construction_costs_account = ChartOfAccounts.query.filter(
-            ChartOfAccounts.account_name.ilike('%construction%cost%')
-        ).first()
+        construction_costs_account = find_gl_account('%construction%cost%')
         
-        accounts_payable_account = ChartOfAccounts.query.filter(
-            ChartOfAccounts.account_name.ilike('%accounts%payable%')
-        ).first()
+        accounts_payable_account = find_gl_account('%accounts%payable%')
         
         if not construction_costs_account or not accounts_payable_account:
             return {'success': False, 'error': 'Required GL accounts not found in chart of accounts'}
@@ -17621,13 +19597,9 @@ def post_over_under_billing(project_vuid, accounting_period_vuid, over_under_amo
         db.session.flush()
         
         # Get the correct account VUIDs
-        costs_in_excess_account = ChartOfAccounts.query.filter(
-            ChartOfAccounts.account_name.ilike('%costs%excess%')
-        ).first()
+        costs_in_excess_account = find_gl_account('%costs%excess%')
         
-        construction_revenue_account = ChartOfAccounts.query.filter(
-            ChartOfAccounts.account_name.ilike('%construction%revenue%')
-        ).first()
+        construction_revenue_account = find_gl_account('%construction%revenue%')
         
         if not costs_in_excess_account or not construction_revenue_account:
             return {'success': False, 'error': 'Required GL accounts not found in chart of accounts'}
@@ -17679,123 +19651,518 @@ def post_over_under_billing(project_vuid, accounting_period_vuid, over_under_amo
         db.session.rollback()
         return {'success': False, 'error': f'Error posting Over/Under Billing: {str(e)}'}
 
-def comprehensive_backfill_all_transactions(accounting_period_vuid, posted_by='Comprehensive Backfill'):
-    """Comprehensive backfill of ALL transactions for ALL projects in a period"""
-    try:
-        backfilled_count = 0
-        
-        print(f"Starting comprehensive backfill for period {accounting_period_vuid}")
-        
-        # 1. Backfill ALL AP Invoices for this period
-        ap_invoices = APInvoice.query.filter_by(
-            accounting_period_vuid=accounting_period_vuid,
-            status='approved'
-        ).all()
-        
-        print(f"Found {len(ap_invoices)} AP invoices to process")
+# Bulk posting: period backfills find unposted transactions with one anti-join per
+# transaction type, resolve GL accounts once and insert posted rows in chunks
+POSTING_CHUNK_SIZE = 500
+
+POSTING_ACCOUNT_PATTERNS = {
+    'construction_costs': '%construction%cost%',
+    'accounts_payable': '%accounts%payable%',
+    'retainage_payable': '%retainage%payable%',
+    'accounts_receivable': '%accounts%receivable%',
+    'construction_revenue': '%construction%revenue%'
+}
+
+def resolve_posting_accounts():
+    """Look up the GL accounts used when posting transactions.
+    
+    Uses the same account name patterns as the single-record posting functions.
+    
+    Returns:
+        Dictionary of account key to GLAccount, or None where no account matches
+    """
+    return {key: find_gl_account(pattern) for key, pattern in POSTING_ACCOUNT_PATTERNS.items()}
+
+def load_unposted_transactions(transaction_type, accounting_period_vuid):
+    """Load the postable transactions of one type in a period that have not been posted.
+    
+    Args:
+        transaction_type: 'ap_invoice', 'project_billing', 'labor_cost' or 'project_expense'
+        accounting_period_vuid: Accounting period to load
         
-        for invoice in ap_invoices:
-            # Check if already posted
-            existing_posted = PostedRecord.query.filter_by(
-                transaction_type='ap_invoice',
-                transaction_vuid=invoice.vuid,
-                status='posted'
-            ).first()
-            
-            if not existing_posted:
-                result = post_ap_invoice(invoice.vuid, posted_by)
-                if result['success']:
-                    backfilled_count += 1
-                    print(f"Backfilled AP Invoice: {invoice.invoice_number} (${invoice.total_amount})")
-                else:
-                    print(f"Failed to backfill AP Invoice {invoice.invoice_number}: {result['error']}")
+    Returns:
+        List of rows holding the columns the posting builders need
+    """
+    if transaction_type == 'ap_invoice':
+        model = APInvoice
+        query = db.session.query(
+            APInvoice.vuid, APInvoice.invoice_number, APInvoice.total_amount, APInvoice.retention_held,
+            APInvoice.accounting_period_vuid, APInvoice.project_vuid
+        ).filter(APInvoice.status == 'approved')
+    elif transaction_type == 'project_billing':
+        model = ProjectBilling
+        query = db.session.query(
+            ProjectBilling.vuid, ProjectBilling.billing_number, ProjectBilling.total_amount,
+            ProjectBilling.retention_held, ProjectBilling.retention_released,
+            ProjectBilling.accounting_period_vuid, ProjectBilling.project_vuid
+        ).filter(ProjectBilling.status == 'approved')
+    elif transaction_type == 'labor_cost':
+        model = LaborCost
+        query = db.session.query(
+            LaborCost.vuid, LaborCost.employee_id, LaborCost.payroll_date, LaborCost.amount,
+            LaborCost.accounting_period_vuid, LaborCost.project_vuid, Employee.employee_name
+        ).outerjoin(Employee, LaborCost.employee_vuid == Employee.vuid).filter(LaborCost.status == 'active')
+    elif transaction_type == 'project_expense':
+        model = ProjectExpense
+        query = db.session.query(
+            ProjectExpense.vuid, ProjectExpense.expense_number, ProjectExpense.expense_date,
+            ProjectExpense.description, ProjectExpense.amount,
+            ProjectExpense.accounting_period_vuid, ProjectExpense.project_vuid
+        ).filter(ProjectExpense.status == 'approved')
+    else:
+        raise ValueError(f"Unsupported transaction type for bulk posting: {transaction_type}")
+    
+    already_posted = db.select(PostedRecord.vuid).where(
+        PostedRecord.transaction_type == transaction_type,
+        PostedRecord.transaction_vuid == model.vuid,
+        PostedRecord.status == 'posted'
+    ).exists()
+    
+    return query.filter(
+        model.accounting_period_vuid == accounting_period_vuid,
+        ~already_posted
+    ).all()
+
+def make_posted_record_row(posted_by, posted_at, **fields):
+    """Build a posted_records row for a bulk insert"""
+    row = {
+        'vuid': str(uuid.uuid4()),
+        'posted_by': posted_by,
+        'posted_at': posted_at,
+        'status': 'posted',
+        'created_at': posted_at,
+        'updated_at': posted_at
+    }
+    row.update(fields)
+    return row
+
+def make_posted_line_row(posted_record_row, account, debit_amount, credit_amount, description, line_number):
+    """Build a posted_record_line_items row for a bulk insert"""
+    return {
+        'vuid': str(uuid.uuid4()),
+        'posted_record_vuid': posted_record_row['vuid'],
+        'gl_account_vuid': account.vuid,
+        'account_name': f"{account.account_number} - {account.account_name}",
+        'debit_amount': debit_amount,
+        'credit_amount': credit_amount,
+        'description': description,
+        'line_number': line_number,
+        'created_at': posted_record_row['posted_at'],
+        'updated_at': posted_record_row['posted_at']
+    }
+
+def build_ap_invoice_posting(invoice, accounts, posted_by, posted_at):
+    """Build the posted rows for an AP invoice, matching post_ap_invoice.
+    
+    Returns:
+        Tuple of (posted record rows, line item rows)
         
-        # 2. Backfill ALL Project Billings for this period
-        project_billings = ProjectBilling.query.filter_by(
-            accounting_period_vuid=accounting_period_vuid,
-            status='approved'
-        ).all()
+    Raises:
+        ValueError: If a required GL account is missing
+    """
+    construction_costs_account = accounts['construction_costs']
+    accounts_payable_account = accounts['accounts_payable']
+    retainage_payable_account = accounts['retainage_payable']
+    
+    if not construction_costs_account or not accounts_payable_account:
+        raise ValueError('Required GL accounts not found in chart of accounts')
+    
+    total_amount = float(invoice.total_amount or 0)
+    retention_held = float(invoice.retention_held or 0)
+    
+    if retention_held > 0 and not retainage_payable_account:
+        raise ValueError('Retainage Payable account not found in chart of accounts')
+    
+    description = f"AP Invoice {invoice.invoice_number}"
+    record = make_posted_record_row(
+        posted_by, posted_at,
+        transaction_type='ap_invoice',
+        transaction_vuid=invoice.vuid,
+        accounting_period_vuid=invoice.accounting_period_vuid,
+        project_vuid=invoice.project_vuid,
+        reference_number=invoice.invoice_number,
+        reference_type='ap_invoice',
+        description=description,
+        total_amount=total_amount,
+        net_amount=total_amount - retention_held,
+        retainage_amount=retention_held,
+        total_debits=total_amount,
+        total_credits=total_amount
+    )
+    records = [record]
+    lines = [
+        make_posted_line_row(record, construction_costs_account, total_amount, 0, description, 1),
+        make_posted_line_row(record, accounts_payable_account, 0, total_amount, description, 2)
+    ]
+    
+    if retention_held > 0:
+        retainage_record = make_posted_record_row(
+            posted_by, posted_at,
+            transaction_type='ap_invoice_retainage',
+            transaction_vuid=invoice.vuid,
+            accounting_period_vuid=invoice.accounting_period_vuid,
+            project_vuid=invoice.project_vuid,
+            reference_number=f"{invoice.invoice_number}-RET",
+            reference_type='ap_invoice_retainage',
+            description=f"AP Invoice {invoice.invoice_number} (Retainage)",
+            total_amount=retention_held,
+            net_amount=0,
+            retainage_amount=retention_held,
+            total_debits=retention_held,
+            total_credits=retention_held
+        )
+        retainage_description = f"AP Invoice {invoice.invoice_number} Retainage"
+        records.append(retainage_record)
+        lines.append(make_posted_line_row(retainage_record, construction_costs_account, retention_held, 0, retainage_description, 1))
+        lines.append(make_posted_line_row(retainage_record, retainage_payable_account, 0, retention_held, retainage_description, 2))
+    
+    return records, lines
+
+def build_project_billing_posting(billing, accounts, posted_by, posted_at):
+    """Build the posted rows for a project billing, matching post_project_billing.
+    
+    Returns:
+        Tuple of (posted record rows, line item rows)
         
-        print(f"Found {len(project_billings)} project billings to process")
+    Raises:
+        ValueError: If a required GL account is missing
+    """
+    accounts_receivable_account = accounts['accounts_receivable']
+    construction_revenue_account = accounts['construction_revenue']
+    retainage_payable_account = accounts['retainage_payable']
+    
+    if not accounts_receivable_account or not construction_revenue_account:
+        raise ValueError('Required GL accounts not found in chart of accounts')
+    
+    retention_held = float(billing.retention_held or 0)
+    
+    if retention_held > 0 and not retainage_payable_account:
+        raise ValueError('Retainage Payable account not found in chart of accounts')
+    
+    net_amount = float(billing.total_amount or 0) - retention_held + float(billing.retention_released or 0)
+    net_description = f"Project Billing {billing.billing_number} (Net)"
+    record = make_posted_record_row(
+        posted_by, posted_at,
+        transaction_type='project_billing',
+        transaction_vuid=billing.vuid,
+        accounting_period_vuid=billing.accounting_period_vuid,
+        project_vuid=billing.project_vuid,
+        reference_number=billing.billing_number,
+        reference_type='project_billing',
+        description=f"Project Billing {billing.billing_number}",
+        total_amount=float(billing.total_amount or 0),
+        net_amount=net_amount,
+        retainage_amount=retention_held,
+        total_debits=net_amount,
+        total_credits=net_amount
+    )
+    records = [record]
+    lines = [
+        make_posted_line_row(record, accounts_receivable_account, net_amount, 0, net_description, 1),
+        make_posted_line_row(record, construction_revenue_account, 0, net_amount, net_description, 2)
+    ]
+    
+    if retention_held > 0:
+        retainage_record = make_posted_record_row(
+            posted_by, posted_at,
+            transaction_type='project_billing_retainage',
+            transaction_vuid=billing.vuid,
+            accounting_period_vuid=billing.accounting_period_vuid,
+            project_vuid=billing.project_vuid,
+            reference_number=f"{billing.billing_number}-RET",
+            reference_type='project_billing_retainage',
+            description=f"Project Billing {billing.billing_number} (Retainage)",
+            total_amount=retention_held,
+            net_amount=0,
+            retainage_amount=retention_held,
+            total_debits=retention_held,
+            total_credits=retention_held
+        )
+        retainage_description = f"Project Billing {billing.billing_number} Retainage"
+        records.append(retainage_record)
+        lines.append(make_posted_line_row(retainage_record, accounts_receivable_account, retention_held, 0, retainage_description, 1))
+        lines.append(make_posted_line_row(retainage_record, retainage_payable_account, 0, retention_held, retainage_description, 2))
+    
+    return records, lines
+
+def build_labor_cost_posting(labor_cost, accounts, posted_by, posted_at):
+    """Build the posted rows for a labor cost, matching post_labor_cost.
+    
+    Returns:
+        Tuple of (posted record rows, line item rows)
         
-        for billing in project_billings:
-            # Check if already posted
-            existing_posted = PostedRecord.query.filter_by(
-                transaction_type='project_billing',
-                transaction_vuid=billing.vuid,
-                status='posted'
-            ).first()
-            
-            if not existing_posted:
-                result = post_project_billing(billing.vuid, posted_by)
-                if result['success']:
-                    backfilled_count += 1
-                    print(f"Backfilled Project Billing: {billing.billing_number} (${billing.total_amount})")
-                else:
-                    print(f"Failed to backfill Project Billing {billing.billing_number}: {result['error']}")
+    Raises:
+        ValueError: If a required GL account is missing
+    """
+    construction_costs_account = accounts['construction_costs']
+    accounts_payable_account = accounts['accounts_payable']
+    
+    if not construction_costs_account or not accounts_payable_account:
+        raise ValueError('Required GL accounts not found in chart of accounts')
+    
+    amount = float(labor_cost.amount or 0)
+    description = f"Labor Cost - {labor_cost.employee_name or 'Unknown'}"
+    record = make_posted_record_row(
+        posted_by, posted_at,
+        transaction_type='labor_cost',
+        transaction_vuid=labor_cost.vuid,
+        accounting_period_vuid=labor_cost.accounting_period_vuid,
+        project_vuid=labor_cost.project_vuid,
+        reference_number=f"{labor_cost.employee_id or 'UNK'}-{labor_cost.payroll_date or 'UNK'}",
+        reference_type='labor_cost',
+        description=description,
+        total_amount=amount,
+        net_amount=amount,
+        retainage_amount=0,
+        total_debits=amount,
+        total_credits=amount
+    )
+    lines = [
+        make_posted_line_row(record, construction_costs_account, amount, 0, description, 1),
+        make_posted_line_row(record, accounts_payable_account, 0, amount, description, 2)
+    ]
+    return [record], lines
+
+def build_project_expense_posting(expense, accounts, posted_by, posted_at):
+    """Build the posted rows for a project expense, matching post_project_expense.
+    
+    Returns:
+        Tuple of (posted record rows, line item rows)
         
-        # 3. Backfill ALL Labor Costs for this period
-        labor_costs = LaborCost.query.filter_by(
-            accounting_period_vuid=accounting_period_vuid,
-            status='active'
-        ).all()
+    Raises:
+        ValueError: If a required GL account is missing
+    """
+    construction_costs_account = accounts['construction_costs']
+    accounts_payable_account = accounts['accounts_payable']
+    
+    if not construction_costs_account or not accounts_payable_account:
+        raise ValueError('Required GL accounts not found in chart of accounts')
+    
+    amount = float(expense.amount or 0)
+    description = f"Project Expense - {expense.description or 'Expense'}"
+    record = make_posted_record_row(
+        posted_by, posted_at,
+        transaction_type='project_expense',
+        transaction_vuid=expense.vuid,
+        accounting_period_vuid=expense.accounting_period_vuid,
+        project_vuid=expense.project_vuid,
+        reference_number=f"EXP-{expense.expense_date or 'UNK'}",
+        reference_type='project_expense',
+        description=description,
+        total_amount=amount,
+        net_amount=amount,
+        retainage_amount=0,
+        total_debits=amount,
+        total_credits=amount
+    )
+    lines = [
+        make_posted_line_row(record, construction_costs_account, amount, 0, description, 1),
+        make_posted_line_row(record, accounts_payable_account, 0, amount, description, 2)
+    ]
+    return [record], lines
+
+# Posted in this order by the period backfills: (transaction type, label, reference column, row builder)
+BULK_POSTING_TYPES = [
+    ('ap_invoice', 'AP invoices', 'invoice_number', build_ap_invoice_posting),
+    ('project_billing', 'project billings', 'billing_number', build_project_billing_posting),
+    ('labor_cost', 'labor costs', 'employee_id', build_labor_cost_posting),
+    ('project_expense', 'project expenses', 'expense_number', build_project_expense_posting)
+]
+
+def insert_posted_rows(prepared):
+    """Insert prepared (records, lines) pairs with one multi-row insert per table"""
+    record_rows = [row for records, _ in prepared for row in records]
+    line_rows = [row for _, lines in prepared for row in lines]
+    
+    if record_rows:
+        db.session.execute(db.insert(PostedRecord), record_rows)
+    if line_rows:
+        db.session.execute(db.insert(PostedRecordLineItem), line_rows)
+
+def bulk_post_period_transactions(accounting_period_vuid, posted_by, chunk_size=POSTING_CHUNK_SIZE, progress_callback=None):
+    """Post every unposted transaction in an accounting period in bulk.
+    
+    Produces the same posted records as post_ap_invoice, post_project_billing,
+    post_labor_cost and post_project_expense. Each chunk of transactions is inserted
+    and committed on its own; if a chunk fails, its transactions are retried one at
+    a time so a single bad record does not block the rest.
+    
+    Args:
+        accounting_period_vuid: Accounting period to post
+        posted_by: Name recorded on the posted records
+        chunk_size: Number of transactions inserted per transaction
+        progress_callback: Optional callable taking (processed_count, total_count)
         
-        print(f"Found {len(labor_costs)} labor costs to process")
+    Returns:
+        Dictionary with total_count, posted_count, failed_count and the failures list
+    """
+    accounts = resolve_posting_accounts()
+    
+    pending = []
+    for transaction_type, label, reference_field, builder in BULK_POSTING_TYPES:
+        transactions = load_unposted_transactions(transaction_type, accounting_period_vuid)
+        print(f"Found {len(transactions)} unposted {label} to process")
+        pending.extend((transaction_type, reference_field, builder, transaction) for transaction in transactions)
+    
+    total_count = len(pending)
+    posted_count = 0
+    failures = []
+    posted_at = datetime.utcnow()
+    
+    def record_failure(transaction_type, reference_field, transaction, error):
+        failures.append({
+            'transaction_type': transaction_type,
+            'transaction_vuid': transaction.vuid,
+            'reference': getattr(transaction, reference_field),
+            'error': error
+        })
+    
+    for start in range(0, total_count, chunk_size):
+        prepared = []
+        for transaction_type, reference_field, builder, transaction in pending[start:start + chunk_size]:
+            try:
+                rows = builder(transaction, accounts, posted_by, posted_at)
+                prepared.append((transaction_type, reference_field, transaction, rows))
+            except ValueError as e:
+                record_failure(transaction_type, reference_field, transaction, str(e))
         
-        for labor_cost in labor_costs:
-            # Check if already posted
-            existing_posted = PostedRecord.query.filter_by(
-                transaction_type='labor_cost',
-                transaction_vuid=labor_cost.vuid,
-                status='posted'
-            ).first()
-            
-            if not existing_posted:
-                result = post_labor_cost(labor_cost.vuid, posted_by)
-                if result['success']:
-                    backfilled_count += 1
-                    print(f"Backfilled Labor Cost: {labor_cost.employee_id} (${labor_cost.amount})")
-                else:
-                    print(f"Failed to backfill Labor Cost {labor_cost.employee_id}: {result['error']}")
+        try:
+            insert_posted_rows([rows for _, _, _, rows in prepared])
+            db.session.commit()
+            posted_count += len(prepared)
+        except Exception as e:
+            db.session.rollback()
+            print(f"Bulk insert failed, retrying {len(prepared)} transactions individually: {str(e)}")
+            for transaction_type, reference_field, transaction, rows in prepared:
+                try:
+                    insert_posted_rows([rows])
+                    db.session.commit()
+                    posted_count += 1
+                except Exception as record_error:
+                    db.session.rollback()
+                    record_failure(transaction_type, reference_field, transaction, str(record_error))
         
-        # 4. Backfill ALL Project Expenses for this period
-        project_expenses = ProjectExpense.query.filter_by(
-            accounting_period_vuid=accounting_period_vuid,
-            status='approved'
-        ).all()
+        processed_count = min(start + chunk_size, total_count)
+        print(f"Posted {posted_count} of {total_count} transactions ({processed_count} processed, {len(failures)} failed)")
+        if progress_callback:
+            progress_callback(processed_count, total_count)
+    
+    for failure in failures:
+        print(f"Failed to post {failure['transaction_type']} {failure['reference']}: {failure['error']}")
+    
+    return {
+        'total_count': total_count,
+        'posted_count': posted_count,
+        'failed_count': len(failures),
+        'failures': failures
+    }
+
+def comprehensive_backfill_all_transactions(accounting_period_vuid, posted_by='Comprehensive Backfill', progress_callback=None):
+    """Comprehensive backfill of ALL transactions for ALL projects in a period"""
+    try:
+        print(f"Starting comprehensive backfill for period {accounting_period_vuid}")
         
-        print(f"Found {len(project_expenses)} project expenses to process")
-        
-        for expense in project_expenses:
-            # Check if already posted
-            existing_posted = PostedRecord.query.filter_by(
-                transaction_type='project_expense',
-                transaction_vuid=expense.vuid,
-                status='posted'
-            ).first()
-            
-            if not existing_posted:
-                result = post_project_expense(expense.vuid, posted_by)
-                if result['success']:
-                    backfilled_count += 1
-                    print(f"Backfilled Project Expense: {expense.description} (${expense.amount})")
-                else:
-                    print(f"Failed to backfill Project Expense {expense.description}: {result['error']}")
+        result = bulk_post_period_transactions(accounting_period_vuid, posted_by, progress_callback=progress_callback)
+        backfilled_count = result['posted_count']
         
         print(f"Comprehensive backfill completed. Backfilled {backfilled_count} transactions.")
         
         return {
             'success': True,
             'message': f'Comprehensive backfill completed. Backfilled {backfilled_count} transactions.',
-            'backfilled_count': backfilled_count
+            'backfilled_count': backfilled_count,
+            'failed_count': result['failed_count'],
+            'failures': result['failures']
         }
         
     except Exception as e:
+        db.session.rollback()
         print(f"Error in comprehensive backfill: {str(e)}")
         return {'success': False, 'error': f'Error in comprehensive backfill: {str(e)}'}
 
-def generate_journal_entries_from_posted_records(accounting_period_vuid):
-    """Generate journal entries from posted records instead of recalculating from transaction tables"""
+# Journal numbering: numbers come from gl_settings.next_journal_number. A block is reserved
+# with a single UPDATE ... RETURNING in the same transaction as the entries that use it, so
+# the row lock serializes concurrent generators and a rollback hands the numbers back
+JOURNAL_GENERATION_CHUNK_SIZE = 500
+
+def reserve_journal_numbers(count):
+    """
+    Reserve a contiguous block of journal numbers in the current transaction.
+    
+    Args:
+        count: Number of journal numbers to reserve
+        
+    Returns:
+        list: Journal numbers in order, e.g. ['JE-000041', 'JE-000042']
+        
+    Raises:
+        ValueError: If there are no GL settings to number journal entries from
+    """
+    gl_settings_vuid = db.select(GLSettings.vuid).order_by(GLSettings.created_at, GLSettings.vuid).limit(1).scalar_subquery()
+    next_number = db.session.execute(
+        db.update(GLSettings)
+        .where(GLSettings.vuid == gl_settings_vuid)
+        .values(next_journal_number=GLSettings.next_journal_number + count, updated_at=GLSettings.updated_at)
+        .returning(GLSettings.next_journal_number)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    
+    if next_number is None:
+        raise ValueError('No GL settings found to number journal entries from')
+    
+    return [f"JE-{number:06d}" for number in range(next_number - count, next_number)]
+
+def make_journal_entry_rows(posted_record, journal_number, created_at):
+    """Build the journal_entries row and journal_entry_lines rows for a posted record"""
+    entry_row = {
+        'vuid': str(uuid.uuid4()),
+        'journal_number': journal_number,
+        'description': posted_record.description or f"{posted_record.transaction_type.replace('_', ' ').title()} - {posted_record.reference_number}",
+        'reference_type': posted_record.transaction_type,
+        'reference_vuid': posted_record.transaction_vuid,
+        'accounting_period_vuid': posted_record.accounting_period_vuid,
+        'project_vuid': posted_record.project_vuid,
+        'entry_date': created_at.date(),
+        'status': 'posted',
+        'exported_to_accounting': False,
+        'created_at': created_at,
+        'updated_at': created_at
+    }
+    
+    line_rows = [
+        {
+            'vuid': str(uuid.uuid4()),
+            'journal_entry_vuid': entry_row['vuid'],
+            'gl_account_vuid': line_item.gl_account_vuid,
+            'debit_amount': line_item.debit_amount,
+            'credit_amount': line_item.credit_amount,
+            'description': line_item.description or '',
+            'line_number': line_item.line_number,
+            'created_at': created_at,
+            'updated_at': created_at
+        }
+        for line_item in posted_record.line_items
+    ]
+    
+    return entry_row, line_rows
+
+def generate_journal_entries_from_posted_records(accounting_period_vuid, chunk_size=JOURNAL_GENERATION_CHUNK_SIZE, progress_callback=None):
+    """
+    Generate journal entries from posted records instead of recalculating from transaction tables.
+    
+    Posted records without a journal entry are processed in chunks. Each chunk locks the
+    accounting period row, reserves one block of journal numbers, inserts its entries and
+    lines in bulk and commits, so a concurrent run for the same period waits and then finds
+    the entries already created.
+    
+    Args:
+        accounting_period_vuid: Accounting period to generate journal entries for
+        chunk_size: Number of journal entries inserted per transaction
+        progress_callback: Optional callable taking (created_count, total_count)
+        
+    Returns:
+        bool: True if generation completed, False otherwise
+    """
     try:
         print(f"Generating journal entries from posted records for accounting period {accounting_period_vuid}")
         
@@ -17805,193 +20172,78 @@ def generate_journal_entries_from_posted_records(accounting_period_vuid):
             print(f"No GL settings found")
             return False
         
-        # Track created journal entries
-        created_entries = []
-        
-        # Get all posted records for this period
-        posted_records = PostedRecord.query.filter_by(
-            accounting_period_vuid=accounting_period_vuid,
-            status='posted'
-        ).options(
-            db.joinedload(PostedRecord.line_items)
-        ).all()
-        
-        print(f"Found {len(posted_records)} posted records to process")
-        
-        for posted_record in posted_records:
-            print(f"Processing posted record: {posted_record.transaction_type} - {posted_record.reference_number}")
-            
-            # Check if journal entry already exists
-            existing_entry = JournalEntry.query.filter_by(
-                reference_type=posted_record.transaction_type,
-                reference_vuid=posted_record.transaction_vuid
-            ).first()
-            
-            if existing_entry:
-                print(f"Journal entry already exists for {posted_record.transaction_type} {posted_record.reference_number}. Skipping creation.")
-                continue
+        has_journal_entry = db.select(JournalEntry.vuid).where(
+            JournalEntry.reference_type == PostedRecord.transaction_type,
+            JournalEntry.reference_vuid == PostedRecord.transaction_vuid
+        ).exists()
+        
+        total_count = PostedRecord.query.filter(
+            PostedRecord.accounting_period_vuid == accounting_period_vuid,
+            PostedRecord.status == 'posted',
+            ~has_journal_entry
+        ).count() if progress_callback else 0
+        
+        created_count = 0
+        while True:
+            # Serialize runs for the same period before checking which records still need entries
+            db.session.query(AccountingPeriod.vuid).filter_by(vuid=accounting_period_vuid).with_for_update().first()
+            
+            posted_records = PostedRecord.query.filter(
+                PostedRecord.accounting_period_vuid == accounting_period_vuid,
+                PostedRecord.status == 'posted',
+                ~has_journal_entry
+            ).options(
+                db.selectinload(PostedRecord.line_items)
+            ).order_by(PostedRecord.posted_at, PostedRecord.vuid).limit(chunk_size).all()
+            
+            if not posted_records:
+                db.session.commit()
+                break
+            
+            journal_numbers = reserve_journal_numbers(len(posted_records))
+            created_at = datetime.utcnow()
+            
+            entry_rows = []
+            line_rows = []
+            for posted_record, journal_number in zip(posted_records, journal_numbers):
+                entry_row, entry_line_rows = make_journal_entry_rows(posted_record, journal_number, created_at)
+                entry_rows.append(entry_row)
+                line_rows.extend(entry_line_rows)
+            
+            db.session.execute(db.insert(JournalEntry), entry_rows)
+            if line_rows:
+                db.session.execute(db.insert(JournalEntryLine), line_rows)
+            db.session.commit()
             
-            # Create journal entry from posted record
-            journal_entry = create_journal_entry_from_posted_record(posted_record)
-            if journal_entry:
-                created_entries.append(f"{posted_record.transaction_type} - {posted_record.reference_number}")
-                print(f"Successfully created journal entry for {posted_record.transaction_type} {posted_record.reference_number}")
-            else:
-                print(f"Failed to create journal entry for {posted_record.transaction_type} {posted_record.reference_number}")
+            created_count += len(entry_rows)
+            print(f"Created journal entries {journal_numbers[0]} to {journal_numbers[-1]} ({created_count} so far)")
+            if progress_callback:
+                progress_callback(created_count, max(total_count, created_count))
         
-        print(f"Journal entry generation completed. Created {len(created_entries)} entries.")
+        print(f"Journal entry generation completed. Created {created_count} entries.")
         return True
         
     except Exception as e:
+        db.session.rollback()
         print(f"Error generating journal entries from posted records: {str(e)}")
         return False
 
-def generate_journal_number():
-    """Generate a unique journal number"""
-    # Get the next journal number from GL settings
-    gl_settings = GLSettings.query.first()
-    if gl_settings and hasattr(gl_settings, 'next_journal_number'):
-        next_number = gl_settings.next_journal_number
-        gl_settings.next_journal_number += 1
-        db.session.commit()
-        return f"JE-{next_number:06d}"
-    else:
-        # Fallback: use timestamp
-        return f"JE-{int(datetime.utcnow().timestamp())}"
-
-def create_journal_entry_from_posted_record(posted_record):
-    """Create a journal entry from a posted record"""
-    try:
-        # Generate journal number
-        journal_number = generate_journal_number()
-        
-        # Create the journal entry
-        journal_entry = JournalEntry(
-            journal_number=journal_number,
-            description=posted_record.description or f"{posted_record.transaction_type.replace('_', ' ').title()} - {posted_record.reference_number}",
-            reference_type=posted_record.transaction_type,
-            reference_vuid=posted_record.transaction_vuid,
-            accounting_period_vuid=posted_record.accounting_period_vuid,
-            project_vuid=posted_record.project_vuid,
-            entry_date=datetime.utcnow().date(),
-            status='posted'
-        )
-        
-        db.session.add(journal_entry)
-        db.session.flush()
-        
-        # Create journal entry lines from posted record line items
-        for line_item in posted_record.line_items:
-            journal_line = JournalEntryLine(
-                journal_entry_vuid=journal_entry.vuid,
-                gl_account_vuid=line_item.gl_account_vuid,
-                debit_amount=line_item.debit_amount,
-                credit_amount=line_item.credit_amount,
-                description=line_item.description or '',
-                line_number=line_item.line_number
-            )
-            db.session.add(journal_line)
-        
-        db.session.commit()
-        return journal_entry
-        
-    except Exception as e:
-        db.session.rollback()
-        print(f"Error creating journal entry from posted record: {str(e)}")
-        return None
-
 def backfill_existing_journal_entries_to_posted_records(accounting_period_vuid, posted_by='System Backfill'):
     """Backfill existing journal entries into posted records system"""
     try:
-        backfilled_count = 0
-        
-        # 1. Backfill AP Invoices
-        ap_invoices = APInvoice.query.filter_by(
-            accounting_period_vuid=accounting_period_vuid,
-            status='approved'
-        ).all()
-        
-        for invoice in ap_invoices:
-            # Check if already posted
-            existing_posted = PostedRecord.query.filter_by(
-                transaction_type='ap_invoice',
-                transaction_vuid=invoice.vuid,
-                status='posted'
-            ).first()
-            
-            if not existing_posted:
-                result = post_ap_invoice(invoice.vuid, posted_by)
-                if result['success']:
-                    backfilled_count += 1
-                    print(f"Backfilled AP Invoice: {invoice.invoice_number}")
-        
-        # 2. Backfill Project Billings
-        project_billings = ProjectBilling.query.filter_by(
-            accounting_period_vuid=accounting_period_vuid,
-            status='approved'
-        ).all()
-        
-        for billing in project_billings:
-            # Check if already posted
-            existing_posted = PostedRecord.query.filter_by(
-                transaction_type='project_billing',
-                transaction_vuid=billing.vuid,
-                status='posted'
-            ).first()
-            
-            if not existing_posted:
-                result = post_project_billing(billing.vuid, posted_by)
-                if result['success']:
-                    backfilled_count += 1
-                    print(f"Backfilled Project Billing: {billing.billing_number}")
-        
-        # 3. Backfill Labor Costs
-        labor_costs = LaborCost.query.filter_by(
-            accounting_period_vuid=accounting_period_vuid,
-            status='active'
-        ).all()
-        
-        for labor_cost in labor_costs:
-            # Check if already posted
-            existing_posted = PostedRecord.query.filter_by(
-                transaction_type='labor_cost',
-                transaction_vuid=labor_cost.vuid,
-                status='posted'
-            ).first()
-            
-            if not existing_posted:
-                result = post_labor_cost(labor_cost.vuid, posted_by)
-                if result['success']:
-                    backfilled_count += 1
-                    print(f"Backfilled Labor Cost: {labor_cost.employee_id}")
-        
-        # 4. Backfill Project Expenses
-        project_expenses = ProjectExpense.query.filter_by(
-            accounting_period_vuid=accounting_period_vuid,
-            status='approved'
-        ).all()
-        
-        for expense in project_expenses:
-            # Check if already posted
-            existing_posted = PostedRecord.query.filter_by(
-                transaction_type='project_expense',
-                transaction_vuid=expense.vuid,
-                status='posted'
-            ).first()
-            
-            if not existing_posted:
-                result = post_project_expense(expense.vuid, posted_by)
-                if result['success']:
-                    backfilled_count += 1
-                    print(f"Backfilled Project Expense: {expense.description}")
+        result = bulk_post_period_transactions(accounting_period_vuid, posted_by)
+        backfilled_count = result['posted_count']
         
         return {
             'success': True,
             'message': f'Backfilled {backfilled_count} existing transactions to posted records',
-            'backfilled_count': backfilled_count
+            'backfilled_count': backfilled_count,
+            'failed_count': result['failed_count'],
+            'failures': result['failures']
         }
         
     except Exception as e:
+        db.session.rollback()
         return {'success': False, 'error': f'Error backfilling journal entries: {str(e)}'}
 
 # Posted Records Models for Journal Entry Posting System
@@ -18024,13 +20276,20 @@ class PostedRecord(db.Model):
     accounting_period = db.relationship('AccountingPeriod', backref='posted_records')
     project = db.relationship('Project', backref='posted_records')
     line_items = db.relationship('PostedRecordLineItem', backref='posted_record', cascade='all, delete-orphan')
+    
+    # Already-posted checks look up by source transaction; previews and WIP filter by period
+    __table_args__ = (
+        db.Index('ix_posted_records_transaction', 'transaction_type', 'transaction_vuid', 'status'),
+        db.Index('ix_posted_records_period_status', 'accounting_period_vuid', 'status'),
+        db.Index('ix_posted_records_project_period_status', 'project_vuid', 'accounting_period_vuid', 'status'),
+    )
 
 class PostedRecordLineItem(db.Model):
     """Stores individual line items for posted records"""
     __tablename__ = 'posted_record_line_items'
     
     vuid = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    posted_record_vuid = db.Column(db.String(36), db.ForeignKey('posted_records.vuid'), nullable=False)
+    posted_record_vuid = db.Column(db.String(36), db.ForeignKey('posted_records.vuid'), nullable=False, index=True)
     gl_account_vuid = db.Column(db.String(36), db.ForeignKey('chart_of_accounts.vuid'), nullable=False)
     account_name = db.Column(db.String(200), nullable=False)
     debit_amount = db.Column(db.Numeric(15, 2), nullable=False, default=0)
@@ -18043,5 +20302,482 @@ class PostedRecordLineItem(db.Model):
     # Relationships
     gl_account = db.relationship('ChartOfAccounts', backref='posted_record_line_items')
 
+# Background jobs
+# Long-running period operations can be queued instead of run in the request thread. Routes
+# that support it enqueue a background_jobs row when called with ?background=true and return
+# 202 with the job; run_job_workers.py processes claim queued jobs with
+# SELECT ... FOR UPDATE SKIP LOCKED, so two workers never pick up the same job. A partial
+# unique index allows one queued or running job per (operation, accounting period).
+# Progress and heartbeats are written on their own connection so they are visible while the
+# operation's transaction is still open; cancellation is picked up at the next progress update
+JOB_ACTIVE_STATUSES = ('queued', 'running')
+JOB_POLL_SECONDS = 2
+JOB_HEARTBEAT_SECONDS = 15
+JOB_STALE_SECONDS = 120
+JOB_PROGRESS_INTERVAL_SECONDS = 1
+JOB_LIST_LIMIT = 50
+JOB_LIST_MAX_LIMIT = 500
+
+class BackgroundJob(db.Model):
+    """A queued, running or finished run of a long-running accounting operation"""
+    __tablename__ = 'background_jobs'
+    
+    vuid = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    operation = db.Column(db.String(50), nullable=False)  # Key of JOB_OPERATIONS, e.g. 'close_month'
+    accounting_period_vuid = db.Column(db.String(36), db.ForeignKey('accounting_periods.vuid'), nullable=False)
+    params = db.Column(db.JSON, nullable=True)
+    status = db.Column(db.String(20), nullable=False, default='queued')  # 'queued', 'running', 'succeeded', 'failed', 'cancelled'
+    progress_current = db.Column(db.Integer, nullable=False, default=0)
+    progress_total = db.Column(db.Integer, nullable=False, default=0)
+    result = db.Column(db.JSON, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    cancel_requested = db.Column(db.Boolean, nullable=False, default=False)
+    worker_id = db.Column(db.String(100), nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Workers claim the oldest queued job; the partial unique index enforces one active job per operation and period
+    __table_args__ = (
+        db.Index('ix_background_jobs_status_created_at', 'status', 'created_at'),
+        db.Index('ux_background_jobs_active_operation_period', 'operation', 'accounting_period_vuid', unique=True,
+                 postgresql_where=db.text("status IN ('queued', 'running')")),
+    )
+
+class JobCancelled(Exception):
+    """Raised from a job's progress callback once cancellation has been requested"""
+
+def serialize_job(job):
+    """Serialize a background job for the jobs endpoints"""
+    if job.status == 'succeeded':
+        percent = 100.0
+    elif job.progress_total:
+        percent = round(min(job.progress_current, job.progress_total) * 100 / job.progress_total, 1)
+    else:
+        percent = 0.0
+    
+    return {
+        'vuid': job.vuid,
+        'operation': job.operation,
+        'accounting_period_vuid': job.accounting_period_vuid,
+        'params': job.params or {},
+        'status': job.status,
+        'progress_current': job.progress_current,
+        'progress_total': job.progress_total,
+        'percent': percent,
+        'result': job.result,
+        'error': job.error,
+        'cancel_requested': job.cancel_requested,
+        'worker_id': job.worker_id,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+        'updated_at': job.updated_at.isoformat() if job.updated_at else None
+    }
+
+def run_close_month_job(accounting_period_vuid, params, progress_callback):
+    """Job handler for the WIP report month close"""
+    period = db.session.get(AccountingPeriod, accounting_period_vuid)
+    if not period:
+        return {'success': False, 'error': 'Accounting period not found'}
+    if period.status == 'closed':
+        return {'success': False, 'error': 'Period is already closed'}
+    
+    response_data, status_code = close_month_from_wip_report(period, progress_callback, bool(params.get('restart')))
+    return response_data
+
+def run_comprehensive_backfill_job(accounting_period_vuid, params, progress_callback):
+    """Job handler for the comprehensive posted records backfill"""
+    posted_by = params.get('posted_by') or 'Comprehensive Backfill'
+    return comprehensive_backfill_all_transactions(accounting_period_vuid, posted_by, progress_callback)
+
+def run_update_snapshots_job(accounting_period_vuid, params, progress_callback):
+    """Job handler for recalculating a period's buyout forecasting snapshots"""
+    updated_count = update_period_snapshots(accounting_period_vuid, progress_callback)
+    return {
+        'success': True,
+        'message': f"Updated {updated_count} snapshots with calculated EAC values",
+        'updated_count': updated_count
+    }
+
+def run_generate_journal_entries_job(accounting_period_vuid, params, progress_callback):
+    """Job handler for generating journal entries from posted records"""
+    if not generate_journal_entries_from_posted_records(accounting_period_vuid, progress_callback=progress_callback):
+        return {'success': False, 'error': 'Failed to generate journal entries from posted records'}
+    return {'success': True, 'message': 'Successfully generated journal entries from posted records'}
+
+def run_qbo_export_journal_entries_job(accounting_period_vuid, params, progress_callback):
+    """Job handler for exporting journal entries to QuickBooks Online"""
+    response_data, status_code = export_period_journal_entries_to_qbo(
+        accounting_period_vuid, params.get('project_vuid'), progress_callback
+    )
+    return response_data
+
+# Operation name -> handler(accounting_period_vuid, params, progress_callback) returning a
+# result dict with 'success' and, on failure, 'error'
+JOB_OPERATIONS = {
+    'close_month': run_close_month_job,
+    'comprehensive_backfill': run_comprehensive_backfill_job,
+    'update_snapshots': run_update_snapshots_job,
+    'generate_journal_entries': run_generate_journal_entries_job,
+    'qbo_export_journal_entries': run_qbo_export_journal_entries_job,
+}
+
+def get_active_job(operation, accounting_period_vuid):
+    """Return the queued or running job for an operation and period, or None"""
+    return BackgroundJob.query.filter(
+        BackgroundJob.operation == operation,
+        BackgroundJob.accounting_period_vuid == accounting_period_vuid,
+        BackgroundJob.status.in_(JOB_ACTIVE_STATUSES)
+    ).first()
+
+def enqueue_job(operation, accounting_period_vuid, params=None):
+    """
+    Queue a background job unless one is already active for the operation and period.
+    
+    Args:
+        operation: Key of JOB_OPERATIONS
+        accounting_period_vuid: Accounting period the job runs for
+        params: Optional JSON-serializable handler parameters
+        
+    Returns:
+        tuple: (job, created) - created is False when the active job was returned instead
+        
+    Raises:
+        ValueError: If the operation is not supported
+    """
+    if operation not in JOB_OPERATIONS:
+        raise ValueError(f"operation must be one of: {', '.join(JOB_OPERATIONS)}")
+    
+    active_job = get_active_job(operation, accounting_period_vuid)
+    if active_job:
+        return active_job, False
+    
+    job = BackgroundJob(operation=operation, accounting_period_vuid=accounting_period_vuid, params=params or {})
+    db.session.add(job)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Another request queued the same job between the check and the insert
+        db.session.rollback()
+        active_job = get_active_job(operation, accounting_period_vuid)
+        if not active_job:
+            raise
+        return active_job, False
+    
+    return job, True
+
+def wants_background_job():
+    """Whether the request asked to run as a background job with ?background=true"""
+    return request.args.get('background', '').lower() == 'true'
+
+def make_enqueue_job_response(operation, accounting_period_vuid, params=None):
+    """Queue a job for a route and return 202 with the job, or 409 with the job already active"""
+    if not db.session.get(AccountingPeriod, accounting_period_vuid):
+        return jsonify({'success': False, 'error': 'Accounting period not found'}), 404
+    
+    job, created = enqueue_job(operation, accounting_period_vuid, params)
+    if not created:
+        return jsonify({
+            'success': False,
+            'error': f"A {operation} job is already {job.status} for this accounting period",
+            'data': serialize_job(job)
+        }), 409
+    
+    return jsonify({
+        'success': True,
+        'message': f"Queued {operation} job",
+        'data': serialize_job(job)
+    }), 202, {'Location': f"/api/jobs/{job.vuid}"}
+
+def fail_stale_jobs():
+    """
+    Fail running jobs whose worker has stopped sending heartbeats.
+    
+    Stale jobs are not requeued: the operations commit as they go, so a rerun is left to
+    the user once they have checked what the interrupted run did.
+    
+    Returns:
+        int: Number of jobs marked as failed
+    """
+    now = datetime.utcnow()
+    stale_jobs = db.session.execute(
+        db.select(BackgroundJob).where(
+            BackgroundJob.status == 'running',
+            BackgroundJob.heartbeat_at < now - timedelta(seconds=JOB_STALE_SECONDS)
+        ).with_for_update(skip_locked=True)
+    ).scalars().all()
+    
+    for job in stale_jobs:
+        job.status = 'failed'
+        job.error = f"Worker {job.worker_id} stopped responding"
+        job.finished_at = now
+    db.session.commit()
+    
+    return len(stale_jobs)
+
+def claim_next_job(worker_id):
+    """
+    Claim the oldest queued job for this worker.
+    
+    Args:
+        worker_id: Identifier recorded on the job, e.g. 'hostname:pid'
+        
+    Returns:
+        str: vuid of the claimed job, or None if the queue is empty
+    """
+    job = db.session.execute(
+        db.select(BackgroundJob).where(
+            BackgroundJob.status == 'queued'
+        ).order_by(BackgroundJob.created_at, BackgroundJob.vuid).limit(1).with_for_update(skip_locked=True)
+    ).scalar_one_or_none()
+    
+    if job is None:
+        db.session.commit()
+        return None
+    
+    now = datetime.utcnow()
+    job.status = 'running'
+    job.worker_id = worker_id
+    job.started_at = now
+    job.heartbeat_at = now
+    db.session.commit()
+    
+    return job.vuid
+
+def update_job_row(job_vuid, **values):
+    """Update a job on its own connection and return its cancel_requested flag"""
+    now = datetime.utcnow()
+    with db.engine.begin() as connection:
+        return connection.execute(
+            db.update(BackgroundJob)
+            .where(BackgroundJob.vuid == job_vuid)
+            .values(heartbeat_at=now, updated_at=now, **values)
+            .returning(BackgroundJob.cancel_requested)
+        ).scalar()
+
+def make_job_progress_callback(job_vuid, state):
+    """
+    Build the progress_callback passed to a job handler.
+    
+    Writes are throttled to one every JOB_PROGRESS_INTERVAL_SECONDS (the final update is
+    always written). Raises JobCancelled, and sets state['cancelled'], once the job has
+    been cancelled.
+    """
+    def report_progress(current, total):
+        now = time.monotonic()
+        if current < total and now - state['reported_at'] < JOB_PROGRESS_INTERVAL_SECONDS:
+            return
+        state['reported_at'] = now
+        
+        if update_job_row(job_vuid, progress_current=current, progress_total=total):
+            state['cancelled'] = True
+            raise JobCancelled(f"Job {job_vuid} was cancelled")
+    
+    return report_progress
+
+def run_job_heartbeat(job_vuid, stop_event):
+    """Refresh a running job's heartbeat until stop_event is set (runs on its own thread)"""
+    with app.app_context():
+        while not stop_event.wait(JOB_HEARTBEAT_SECONDS):
+            try:
+                update_job_row(job_vuid)
+            except Exception as e:
+                print(f"Error updating heartbeat for job {job_vuid}: {str(e)}")
+
+def run_job(job_vuid):
+    """
+    Run a claimed job and record its outcome.
+    
+    Args:
+        job_vuid: Job claimed by claim_next_job
+        
+    Returns:
+        str: Final job status
+    """
+    job = db.session.get(BackgroundJob, job_vuid)
+    handler = JOB_OPERATIONS.get(job.operation)
+    accounting_period_vuid = job.accounting_period_vuid
+    params = dict(job.params or {})
+    # Release the row before the handler opens its own transactions
+    db.session.commit()
+    
+    state = {'cancelled': False, 'reported_at': 0.0}
+    stop_event = threading.Event()
+    heartbeat = threading.Thread(target=run_job_heartbeat, args=(job_vuid, stop_event), daemon=True)
+    heartbeat.start()
+    
+    result = None
+    error = None
+    print(f"Running {job.operation} job {job_vuid} for accounting period {accounting_period_vuid}")
+    try:
+        if handler is None:
+            raise ValueError(f"Unsupported job operation: {job.operation}")
+        result = handler(accounting_period_vuid, params, make_job_progress_callback(job_vuid, state))
+        # Round-trip through the app's encoder so Decimals and dates fit the JSON column
+        result = json.loads(app.json.dumps(result))
+        error = None if result.get('success') else result.get('error', 'Job failed')
+    except JobCancelled:
+        db.session.rollback()
+    except Exception as e:
+        db.session.rollback()
+        error = str(e)
+    finally:
+        stop_event.set()
+        heartbeat.join()
+    
+    # Handlers that catch their own errors report cancellation as a failed result
+    if state['cancelled']:
+        status = 'cancelled'
+    else:
+        status = 'failed' if error else 'succeeded'
+    
+    job = db.session.get(BackgroundJob, job_vuid)
+    job.status = status
+    job.result = result
+    job.error = error
+    job.finished_at = datetime.utcnow()
+    db.session.commit()
+    
+    print(f"Job {job_vuid} {status}" + (f": {error}" if error and status == 'failed' else ""))
+    return status
+
+def run_next_job(worker_id):
+    """Claim and run the oldest queued job; returns False if the queue was empty"""
+    with app.app_context():
+        # Jobs are long-running, so they draw from the reports pool
+        use_db_pool(REPORTS_POOL)
+        fail_stale_jobs()
+        job_vuid = claim_next_job(worker_id)
+        if not job_vuid:
+            return False
+        run_job(job_vuid)
+        return True
+
+def run_job_worker(worker_id=None, poll_interval=JOB_POLL_SECONDS, stop_event=None):
+    """
+    Run queued jobs one at a time until stop_event is set.
+    
+    Args:
+        worker_id: Identifier recorded on claimed jobs; defaults to 'hostname:pid'
+        poll_interval: Seconds to wait when the queue is empty
+        stop_event: Optional threading/multiprocessing Event that stops the loop
+    """
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    print(f"Job worker {worker_id} started")
+    
+    while not (stop_event and stop_event.is_set()):
+        try:
+            if run_next_job(worker_id):
+                continue
+        except Exception as e:
+            print(f"Job worker {worker_id} error: {str(e)}")
+        
+        if stop_event:
+            stop_event.wait(poll_interval)
+        else:
+            time.sleep(poll_interval)
+    
+    print(f"Job worker {worker_id} stopped")
+
+@app.route('/api/jobs', methods=['GET'])
+def get_jobs():
+    """List background jobs, newest first, filtered by status, operation or accounting period"""
+    try:
+        limit = min(int(request.args.get('limit', JOB_LIST_LIMIT)), JOB_LIST_MAX_LIMIT)
+        if limit < 1:
+            raise ValueError('limit must be a positive integer')
+        
+        query = BackgroundJob.query
+        for filter_name in ('status', 'operation', 'accounting_period_vuid'):
+            if request.args.get(filter_name):
+                query = query.filter(getattr(BackgroundJob, filter_name) == request.args[filter_name])
+        
+        jobs = query.order_by(BackgroundJob.created_at.desc(), BackgroundJob.vuid).limit(limit).all()
+        return jsonify({
+            'success': True,
+            'data': [serialize_job(job) for job in jobs]
+        })
+        
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': f'Error retrieving jobs: {str(e)}'}), 500
+
+@app.route('/api/jobs', methods=['POST'])
+def create_job():
+    """Queue a background job for an operation and accounting period"""
+    try:
+        data = request.get_json() or {}
+        operation = data.get('operation')
+        accounting_period_vuid = data.get('accounting_period_vuid')
+        
+        if not operation or not accounting_period_vuid:
+            return jsonify({'success': False, 'error': 'operation and accounting_period_vuid are required'}), 400
+        
+        return make_enqueue_job_response(operation, accounting_period_vuid, data.get('params'))
+        
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': f'Error queueing job: {str(e)}'}), 500
+
+@app.route('/api/jobs/<job_vuid>', methods=['GET'])
+def get_job(job_vuid):
+    """Get a background job's status, progress and result"""
+    job = db.session.get(BackgroundJob, job_vuid)
+    if not job:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    
+    return jsonify({
+        'success': True,
+        'data': serialize_job(job)
+    })
+
+@app.route('/api/jobs/<job_vuid>/cancel', methods=['POST'])
+def cancel_job(job_vuid):
+    """Cancel a queued job, or ask a running job to stop at its next progress update"""
+    try:
+        job = db.session.get(BackgroundJob, job_vuid)
+        if not job:
+            return jsonify({'success': False, 'error': 'Job not found'}), 404
+        
+        if job.status not in JOB_ACTIVE_STATUSES:
+            return jsonify({
+                'success': False,
+                'error': f'Job has already {job.status}',
+                'data': serialize_job(job)
+            }), 409
+        
+        # Conditional updates, so a worker claiming the job at the same time sees the request
+        now = datetime.utcnow()
+        db.session.execute(
+            db.update(BackgroundJob)
+            .where(BackgroundJob.vuid == job_vuid, BackgroundJob.status == 'queued')
+            .values(status='cancelled', cancel_requested=True, finished_at=now, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.execute(
+            db.update(BackgroundJob)
+            .where(BackgroundJob.vuid == job_vuid, BackgroundJob.status == 'running')
+            .values(cancel_requested=True, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        db.session.refresh(job)
+        
+        return jsonify({
+            'success': True,
+            'message': 'Job cancelled' if job.status == 'cancelled' else 'Cancellation requested',
+            'data': serialize_job(job)
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': f'Error cancelling job: {str(e)}'}), 500
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5001, use_reloader=False)
@@ -0,0 +1,234 @@
+import decimal
+from weakref import WeakKeyDictionary
+
+from flask import current_app
+from marshmallow import fields, missing
+from marshmallow.decorators import POST_DUMP, PRE_DUMP
+from marshmallow.utils import ensure_text_type
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Precompiled schema serializers
+# schema.dump() walks every field through Field.serialize, the accessor and the type
+# checks on each row. compile_schema() resolves all of that once per schema instance
+# into a list of (key, attribute, converter) entries, so dumping a row is a getattr and
+# a direct conversion per field. The output is the same as schema.dump(); fields this
+# module does not know how to convert fall back to field.serialize.
+compiled_serializers = WeakKeyDictionary()
+
+def make_decimal_converter(field):
+    """Build the converter for a fields.Decimal, matching Decimal._format_num"""
+    places = field.places
+    rounding = field.rounding
+    allow_nan = field.allow_nan
+    as_string = field.as_string
+    Decimal = decimal.Decimal
+
+    def convert(value):
+        if value is None:
+            return None
+        num = Decimal(str(value))
+        if allow_nan and num.is_nan():
+            num = Decimal('NaN')
+        if places is not None and num.is_finite():
+            num = num.quantize(places, rounding=rounding)
+        return str(num) if as_string else num
+
+    return convert
+
+def make_number_converter(field):
+    """Build the converter for fields.Integer and fields.Float"""
+    num_type = field.num_type
+    as_string = field.as_string
+
+    def convert(value):
+        if value is None:
+            return None
+        num = num_type(value)
+        return str(num) if as_string else num
+
+    return convert
+
+def make_string_converter(field):
+    """Build the converter for a fields.String"""
+    def convert(value):
+        if value is None or type(value) is str:
+            return value
+        return ensure_text_type(value)
+
+    return convert
+
+def make_boolean_converter(field):
+    """Build the converter for a fields.Boolean using the field's truthy/falsy sets"""
+    truthy = field.truthy
+    falsy = field.falsy
+
+    def convert(value):
+        if value is None or value is True or value is False:
+            return value
+        try:
+            if value in truthy:
+                return True
+            if value in falsy:
+                return False
+        except TypeError:
+            pass
+        return bool(value)
+
+    return convert
+
+def make_temporal_converter(field):
+    """Build the converter for fields.DateTime and fields.Date"""
+    data_format = field.format or field.DEFAULT_FORMAT
+    format_func = field.SERIALIZATION_FUNCS.get(data_format)
+
+    def convert(value):
+        if value is None:
+            return None
+        if format_func:
+            return format_func(value)
+        return value.strftime(data_format)
+
+    return convert
+
+def make_nested_converter(field):
+    """Build the converter for a fields.Nested; the nested schema is compiled on first use"""
+    def convert(value):
+        if value is None:
+            return None
+        schema = field.schema
+        return dump_fast(schema, value, many=schema.many or field.many)
+
+    return convert
+
+# Exact field classes with a direct converter. Subclasses may override _serialize, so
+# they are matched by type() rather than isinstance() and fall back to field.serialize.
+FIELD_CONVERTERS = {
+    fields.Decimal: make_decimal_converter,
+    fields.Integer: make_number_converter,
+    fields.Float: make_number_converter,
+    fields.String: make_string_converter,
+    fields.Boolean: make_boolean_converter,
+    fields.DateTime: make_temporal_converter,
+    fields.Date: make_temporal_converter,
+    fields.Raw: lambda field: None,
+    fields.Nested: make_nested_converter,
+}
+
+def compile_schema(schema):
+    """Compile a marshmallow schema instance into a row -> dict function
+
+    Args:
+        schema: Bound schema instance (only/exclude are taken from its dump_fields)
+
+    Returns:
+        function: Takes one object and returns the same dict as schema.dump(obj, many=False)
+    """
+    compiled = compiled_serializers.get(schema)
+    if compiled is not None:
+        return compiled
+
+    # Dump hooks can reshape the result, so those schemas keep using dump()
+    if schema._has_processors(PRE_DUMP) or schema._has_processors(POST_DUMP):
+        def serialize_row(obj):
+            return schema.dump(obj, many=False)
+
+        compiled_serializers[schema] = serialize_row
+        return serialize_row
+
+    direct_fields = []
+    fallback_fields = {}
+    for field_name, field in schema.dump_fields.items():
+        key = field.data_key if field.data_key is not None else field_name
+        make_converter = FIELD_CONVERTERS.get(type(field))
+        if make_converter is None or field.dump_default is not missing or field.attribute is not None:
+            fallback_fields[field_name] = field
+            direct_fields.append((key, field_name, None))
+        else:
+            direct_fields.append((key, field_name, make_converter(field)))
+
+    if fallback_fields:
+        get_attribute = schema.get_attribute
+
+        def serialize_row(obj):
+            row = {}
+            for key, attr, convert in direct_fields:
+                if attr in fallback_fields:
+                    value = fallback_fields[attr].serialize(attr, obj, accessor=get_attribute)
+                    if value is missing:
+                        continue
+                    row[key] = value
+                    continue
+                value = getattr(obj, attr, missing)
+                if value is missing:
+                    continue
+                row[key] = value if convert is None else convert(value)
+            return row
+    else:
+        def serialize_row(obj):
+            row = {}
+            for key, attr, convert in direct_fields:
+                value = getattr(obj, attr, missing)
+                if value is missing:
+                    continue
+                row[key] = value if convert is None else convert(value)
+            return row
+
+    compiled_serializers[schema] = serialize_row
+    return serialize_row
+
+def dump_fast(schema, obj, many=None):
+    """Drop-in replacement for schema.dump() using the compiled serializer
+
+    Args:
+        schema: Marshmallow schema instance
+        obj: Object, or iterable of objects when many is set
+        many: Whether to serialize a collection; defaults to schema.many
+
+    Returns:
+        dict or list: Same data as schema.dump(obj, many=many)
+    """
+    serialize_row = compile_schema(schema)
+    many = schema.many if many is None else bool(many)
+
+    if many and obj is not None:
+        return [serialize_row(item) for item in obj]
+    return serialize_row(obj)
+
+def fast_jsonify(data, status=200):
+    """Build a JSON response like flask.jsonify(data), encoded with orjson when available
+
+    Keys are sorted and dates and Decimals go through the app's JSON provider default,
+    so the body parses to the same value jsonify() would produce.
+
+    Args:
+        data: JSON-serializable data (dicts, lists, Decimals, dates)
+        status: HTTP status code
+
+    Returns:
+        Response: JSON response with the app's JSON mimetype
+    """
+    provider = current_app.json
+    indent = (provider.compact is None and current_app.debug) or provider.compact is False
+
+    body = None
+    if orjson is not None:
+        options = orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        try:
+            body = orjson.dumps(data, default=provider.default, option=options) + b"\n"
+        except TypeError:
+            # Non-string keys, integers over 64 bits and similar: use the standard encoder
+            body = None
+
+    if body is None:
+        if indent:
+            body = provider.dumps(data, indent=2, separators=(", ", ": ")) + "\n"
+        else:
+            body = provider.dumps(data, separators=(",", ":")) + "\n"
+
+    return current_app.response_class(body, status=status, mimetype=provider.mimetype)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Before/after micro-benchmark for the precompiled serializers.
+
+Builds unsaved model instances in memory (no database connection is made) and reports
+rows/sec for the journal entry, project and accounting period list payloads, first with
+schema.dump() + jsonify() and then with the compiled serializer + fast_jsonify(). The two
+responses are parsed and compared so a speedup can never come from different output.
+
+Usage:
+    python benchmark_serializers.py
+    python benchmark_serializers.py --rows 5000 --runs 7
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import os
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Only used to satisfy the config check on import; nothing connects to it
+os.environ.setdefault('DATABASE_URL', 'postgresql://localhost/vermillion_benchmark')
+
+def build_rows(m, row_count):
+    """Build unsaved journal entries (with lines), projects and accounting periods"""
+    periods = [
+        m.AccountingPeriod(vuid=f"period-{i}", month=i % 12 + 1, year=2020 + i // 12, status='closed',
+                           created_at=datetime(2020, 1, 1), updated_at=datetime(2020, 1, 1))
+        for i in range(min(row_count, 120))
+    ]
+    account = m.ChartOfAccounts(vuid="account-1", account_number='5000', account_name='Construction Costs',
+                                account_type='Expense', normal_balance='Debit')
+
+    journal_entries = []
+    for i in range(row_count):
+        created_at = datetime(2024, 1, 1) + timedelta(minutes=i)
+        entry = m.JournalEntry(
+            vuid=f"je-{i}", journal_number=f"JE-{i:06d}", accounting_period_vuid=periods[i % len(periods)].vuid,
+            project_vuid=f"project-{i % 50}", entry_date=date(2024, 1, 1) + timedelta(days=i % 365),
+            description=f"Journal entry {i}", reference_type='ap_invoice', reference_vuid=f"invoice-{i}",
+            status='draft', exported_to_accounting=False, created_at=created_at, updated_at=created_at
+        )
+        entry.accounting_period = periods[i % len(periods)]
+        entry.line_items = [
+            m.JournalEntryLine(
+                vuid=f"je-{i}-{line}", journal_entry_vuid=entry.vuid, line_number=line + 1,
+                gl_account_vuid=account.vuid, gl_account=account, description=f"Line {line + 1}",
+                debit_amount=Decimal('1250.10') if line == 0 else Decimal('0'),
+                credit_amount=Decimal('0') if line == 0 else Decimal('625.05'),
+                created_at=created_at, updated_at=created_at
+            )
+            for line in range(3)
+        ]
+        journal_entries.append(entry)
+
+    projects = [
+        m.Project(vuid=f"project-{i}", project_number=f"P-{i:05d}", project_name=f"Project {i}",
+                  start_date=date(2024, 1, 1), end_date=date(2025, 12, 31), status='active',
+                  created_at=datetime(2024, 1, 1), updated_at=datetime(2024, 1, 1))
+        for i in range(row_count)
+    ]
+
+    return {
+        'journal entries': (m.journal_entries_schema, journal_entries),
+        'projects': (m.projects_schema, projects),
+        'accounting periods': (m.accounting_periods_schema, periods),
+    }
+
+def time_serializer(serialize, rows, runs):
+    """Return (median rows/sec, response body) for a serialize(rows) -> Response callable"""
+    timings = []
+    body = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        body = serialize(rows).get_data()
+        timings.append(time.perf_counter() - start)
+    return len(rows) / statistics.median(timings), body
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark schema.dump() against the precompiled serializers")
+    parser.add_argument('--rows', type=int, default=2000, help="Rows per payload")
+    parser.add_argument('--runs', type=int, default=5, help="Timed runs per serializer (median is reported)")
+    args = parser.parse_args()
+
+    import app.main_backup as m
+    from flask import jsonify
+    from app.serializers import dump_fast, fast_jsonify
+
+    results = {}
+    with m.app.test_request_context():
+        try:
+            for label, (schema, rows) in build_rows(m, args.rows).items():
+                before, before_body = time_serializer(lambda rows: jsonify(schema.dump(rows)), rows, args.runs)
+                after, after_body = time_serializer(lambda rows: fast_jsonify(dump_fast(schema, rows)), rows, args.runs)
+
+                if json.loads(before_body) != json.loads(after_body):
+                    print(f"❌ Compiled serializer output differs for {label}")
+                    return False
+                results[label] = (len(rows), before, after)
+        except Exception as e:
+            print(f"❌ Error running benchmark: {e}")
+            return False
+
+    print(f"\n{'Payload':<22} {'Rows':>6} {'Before (rows/s)':>16} {'After (rows/s)':>16} {'Speedup':>9}")
+    for label, (row_count, before, after) in results.items():
+        print(f"{label:<22} {row_count:>6} {before:>16,.0f} {after:>16,.0f} {after / before:>8.2f}x")
+
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    if not success:
+        sys.exit(1)
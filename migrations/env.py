@@ -97,6 +97,11 @@ def run_migrations_online():
     connectable = get_engine()
 
     with connectable.connect() as connection:
+        # The app's engine sets a per-connection statement_timeout (see config.py); index
+        # builds and backfills on a large database can run longer, so lift it here
+        connection.exec_driver_sql("SET statement_timeout = 0")
+        connection.commit()
+
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
@@ -0,0 +1,36 @@
+"""Add snapshot build progress
+
+Revision ID: a6d3f8b1c5e2
+Revises: f2c9a4e7b3d6
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6d3f8b1c5e2'
+down_revision = 'f2c9a4e7b3d6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'snapshot_build_progress',
+        sa.Column('accounting_period_vuid', sa.String(length=36), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('total_projects', sa.Integer(), nullable=False),
+        sa.Column('completed_projects', sa.Integer(), nullable=False),
+        sa.Column('snapshots_created', sa.Integer(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['accounting_period_vuid'], ['accounting_periods.vuid'], ),
+        sa.PrimaryKeyConstraint('accounting_period_vuid')
+    )
+
+
+def downgrade():
+    op.drop_table('snapshot_build_progress')
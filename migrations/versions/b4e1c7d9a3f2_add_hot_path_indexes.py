@@ -0,0 +1,60 @@
+"""Add hot-path indexes
+
+Revision ID: b4e1c7d9a3f2
+Revises: dacf32aa942b
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4e1c7d9a3f2'
+down_revision = 'dacf32aa942b'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns) - kept in step with the indexes declared on the models
+HOT_PATH_INDEXES = [
+    # Costs/billings to date per project (WIP, revenue recognition, financial summary)
+    ('ix_ap_invoices_project_period_status', 'ap_invoices', ['project_vuid', 'accounting_period_vuid', 'status']),
+    ('ix_labor_costs_project_period_status', 'labor_costs', ['project_vuid', 'accounting_period_vuid', 'status']),
+    ('ix_project_expenses_project_period_status', 'project_expenses', ['project_vuid', 'accounting_period_vuid', 'status']),
+    ('ix_project_billings_project_period_status', 'project_billings', ['project_vuid', 'accounting_period_vuid', 'status']),
+
+    # Period-wide scans (journal entry previews, posting backfill, month close)
+    ('ix_ap_invoices_period_status', 'ap_invoices', ['accounting_period_vuid', 'status']),
+    ('ix_labor_costs_period_status', 'labor_costs', ['accounting_period_vuid', 'status']),
+    ('ix_project_expenses_period_status', 'project_expenses', ['accounting_period_vuid', 'status']),
+    ('ix_project_billings_period_status', 'project_billings', ['accounting_period_vuid', 'status']),
+
+    # Line items loaded per parent document
+    ('ix_ap_invoice_line_items_invoice_vuid', 'ap_invoice_line_items', ['invoice_vuid']),
+    ('ix_project_billing_line_items_billing_vuid', 'project_billing_line_items', ['billing_vuid']),
+    ('ix_journal_entry_lines_journal_entry_vuid', 'journal_entry_lines', ['journal_entry_vuid']),
+    ('ix_posted_record_line_items_posted_record_vuid', 'posted_record_line_items', ['posted_record_vuid']),
+
+    # Posted records: already-posted checks, period previews, project WIP from posted records
+    ('ix_posted_records_transaction', 'posted_records', ['transaction_type', 'transaction_vuid', 'status']),
+    ('ix_posted_records_period_status', 'posted_records', ['accounting_period_vuid', 'status']),
+    ('ix_posted_records_project_period_status', 'posted_records', ['project_vuid', 'accounting_period_vuid', 'status']),
+
+    # Journal entries: existing-entry checks by source document, period listings and exports
+    ('ix_journal_entries_reference', 'journal_entries', ['reference_type', 'reference_vuid']),
+    ('ix_journal_entries_period_project', 'journal_entries', ['accounting_period_vuid', 'project_vuid']),
+
+    # Budget and buyout/EAC lookups
+    ('ix_project_budget_lines_budget_vuid', 'project_budget_lines', ['budget_vuid']),
+    ('ix_project_budget_line_buyouts_project_period', 'project_budget_line_buyouts', ['project_vuid', 'accounting_period_vuid']),
+]
+
+
+def upgrade():
+    for index_name, table_name, columns in HOT_PATH_INDEXES:
+        op.create_index(index_name, table_name, columns, unique=False, if_not_exists=True)
+
+
+def downgrade():
+    for index_name, table_name, columns in reversed(HOT_PATH_INDEXES):
+        op.drop_index(index_name, table_name=table_name, if_exists=True)
@@ -0,0 +1,36 @@
+"""Add accounting period ordinal
+
+Revision ID: b8f4e2a7c9d3
+Revises: a6d3f8b1c5e2
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8f4e2a7c9d3'
+down_revision = 'a6d3f8b1c5e2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # period_ordinal (year * 12 + month) is generated by the database, so periods created
+    # through any model, route or raw SQL have it. A column added earlier by
+    # add_accounting_period_ordinal.py is a plain nullable integer and is replaced
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('accounting_periods')}
+    if 'period_ordinal' in columns:
+        op.execute("DROP INDEX IF EXISTS ix_accounting_periods_period_ordinal")
+        op.drop_column('accounting_periods', 'period_ordinal')
+
+    op.add_column('accounting_periods', sa.Column(
+        'period_ordinal', sa.Integer(), sa.Computed('year * 12 + month', persisted=True), nullable=False
+    ))
+    op.create_index('ix_accounting_periods_period_ordinal', 'accounting_periods', ['period_ordinal'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_accounting_periods_period_ordinal', table_name='accounting_periods')
+    op.drop_column('accounting_periods', 'period_ordinal')
@@ -0,0 +1,40 @@
+"""Add GL settings next journal number
+
+Revision ID: c3a9d5f2e8b4
+Revises: b8f4e2a7c9d3
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3a9d5f2e8b4'
+down_revision = 'b8f4e2a7c9d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases that ran add_gl_settings_next_journal_number.py already have the column
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('gl_settings')}
+    if 'next_journal_number' not in columns:
+        op.add_column('gl_settings', sa.Column('next_journal_number', sa.Integer(), nullable=False, server_default='1'))
+
+    # Start the counter above every JE-000001 style number already used; timestamp
+    # fallback numbers (JE- followed by 10 digits) are left out
+    op.execute("""
+        UPDATE gl_settings
+        SET next_journal_number = numbered.next_number
+        FROM (
+            SELECT COALESCE(MAX(CAST(SUBSTRING(journal_number FROM 4) AS INTEGER)), 0) + 1 AS next_number
+            FROM journal_entries
+            WHERE journal_number ~ '^JE-[0-9]{6,9}$'
+        ) AS numbered
+        WHERE gl_settings.next_journal_number < numbered.next_number
+    """)
+
+
+def downgrade():
+    op.drop_column('gl_settings', 'next_journal_number')
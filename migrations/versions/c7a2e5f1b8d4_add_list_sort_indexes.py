@@ -0,0 +1,37 @@
+"""Add list sort indexes
+
+Revision ID: c7a2e5f1b8d4
+Revises: b4e1c7d9a3f2
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7a2e5f1b8d4'
+down_revision = 'b4e1c7d9a3f2'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns) - kept in step with the indexes declared on the models
+LIST_SORT_INDEXES = [
+    # Keyset pagination on (created_at, vuid) for the transaction list endpoints
+    ('ix_ap_invoices_created_at_vuid', 'ap_invoices', ['created_at', 'vuid']),
+    ('ix_labor_costs_created_at_vuid', 'labor_costs', ['created_at', 'vuid']),
+    ('ix_project_expenses_created_at_vuid', 'project_expenses', ['created_at', 'vuid']),
+    ('ix_project_billings_created_at_vuid', 'project_billings', ['created_at', 'vuid']),
+    ('ix_journal_entries_created_at_vuid', 'journal_entries', ['created_at', 'vuid']),
+    ('ix_project_commitment_items_created_at_vuid', 'project_commitment_items', ['created_at', 'vuid']),
+]
+
+
+def upgrade():
+    for index_name, table_name, columns in LIST_SORT_INDEXES:
+        op.create_index(index_name, table_name, columns, unique=False, if_not_exists=True)
+
+
+def downgrade():
+    for index_name, table_name, columns in reversed(LIST_SORT_INDEXES):
+        op.drop_index(index_name, table_name=table_name, if_exists=True)
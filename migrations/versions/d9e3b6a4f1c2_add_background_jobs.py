@@ -0,0 +1,50 @@
+"""Add background jobs
+
+Revision ID: d9e3b6a4f1c2
+Revises: c7a2e5f1b8d4
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9e3b6a4f1c2'
+down_revision = 'c7a2e5f1b8d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'background_jobs',
+        sa.Column('vuid', sa.String(length=36), nullable=False),
+        sa.Column('operation', sa.String(length=50), nullable=False),
+        sa.Column('accounting_period_vuid', sa.String(length=36), nullable=False),
+        sa.Column('params', sa.JSON(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('progress_current', sa.Integer(), nullable=False),
+        sa.Column('progress_total', sa.Integer(), nullable=False),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('cancel_requested', sa.Boolean(), nullable=False),
+        sa.Column('worker_id', sa.String(length=100), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['accounting_period_vuid'], ['accounting_periods.vuid'], ),
+        sa.PrimaryKeyConstraint('vuid')
+    )
+    op.create_index('ix_background_jobs_status_created_at', 'background_jobs', ['status', 'created_at'], unique=False)
+    # One queued or running job per operation and accounting period
+    op.create_index('ux_background_jobs_active_operation_period', 'background_jobs', ['operation', 'accounting_period_vuid'],
+                    unique=True, postgresql_where=sa.text("status IN ('queued', 'running')"))
+
+
+def downgrade():
+    op.drop_index('ux_background_jobs_active_operation_period', table_name='background_jobs')
+    op.drop_index('ix_background_jobs_status_created_at', table_name='background_jobs')
+    op.drop_table('background_jobs')
@@ -0,0 +1,34 @@
+"""Add period close checkpoints
+
+Revision ID: e4b7c2d8f5a1
+Revises: d9e3b6a4f1c2
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b7c2d8f5a1'
+down_revision = 'd9e3b6a4f1c2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'period_close_checkpoints',
+        sa.Column('vuid', sa.String(length=36), nullable=False),
+        sa.Column('accounting_period_vuid', sa.String(length=36), nullable=False),
+        sa.Column('stage', sa.String(length=50), nullable=False),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['accounting_period_vuid'], ['accounting_periods.vuid'], ),
+        sa.PrimaryKeyConstraint('vuid'),
+        sa.UniqueConstraint('accounting_period_vuid', 'stage', name='unique_period_close_checkpoint')
+    )
+
+
+def downgrade():
+    op.drop_table('period_close_checkpoints')
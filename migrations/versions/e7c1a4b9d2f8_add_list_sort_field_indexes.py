@@ -0,0 +1,51 @@
+"""Add list sort field indexes
+
+Revision ID: e7c1a4b9d2f8
+Revises: d5b8e3f1a7c6
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7c1a4b9d2f8'
+down_revision = 'd5b8e3f1a7c6'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns) - kept in step with the indexes declared on the models.
+# Keyset pagination on (sort field, vuid) for the sort fields other than created_at, which
+# c7a2e5f1b8d4 covers, plus every project list sort field
+LIST_SORT_INDEXES = [
+    ('ix_ap_invoices_invoice_date_vuid', 'ap_invoices', ['invoice_date', 'vuid']),
+    ('ix_ap_invoices_invoice_number_vuid', 'ap_invoices', ['invoice_number', 'vuid']),
+    ('ix_ap_invoices_total_amount_vuid', 'ap_invoices', ['total_amount', 'vuid']),
+    ('ix_ap_invoices_status_vuid', 'ap_invoices', ['status', 'vuid']),
+    ('ix_labor_costs_payroll_date_vuid', 'labor_costs', ['payroll_date', 'vuid']),
+    ('ix_labor_costs_employee_id_vuid', 'labor_costs', ['employee_id', 'vuid']),
+    ('ix_labor_costs_amount_vuid', 'labor_costs', ['amount', 'vuid']),
+    ('ix_project_expenses_expense_date_vuid', 'project_expenses', ['expense_date', 'vuid']),
+    ('ix_project_expenses_expense_number_vuid', 'project_expenses', ['expense_number', 'vuid']),
+    ('ix_project_expenses_amount_vuid', 'project_expenses', ['amount', 'vuid']),
+    ('ix_project_billings_billing_date_vuid', 'project_billings', ['billing_date', 'vuid']),
+    ('ix_project_billings_billing_number_vuid', 'project_billings', ['billing_number', 'vuid']),
+    ('ix_project_billings_total_amount_vuid', 'project_billings', ['total_amount', 'vuid']),
+    ('ix_journal_entries_entry_date_vuid', 'journal_entries', ['entry_date', 'vuid']),
+    ('ix_journal_entries_journal_number_vuid', 'journal_entries', ['journal_number', 'vuid']),
+    ('ix_project_commitment_items_total_amount_vuid', 'project_commitment_items', ['total_amount', 'vuid']),
+    ('ix_projects_project_number_vuid', 'projects', ['project_number', 'vuid']),
+    ('ix_projects_project_name_vuid', 'projects', ['project_name', 'vuid']),
+    ('ix_projects_created_at_vuid', 'projects', ['created_at', 'vuid']),
+]
+
+
+def upgrade():
+    for index_name, table_name, columns in LIST_SORT_INDEXES:
+        op.create_index(index_name, table_name, columns, unique=False, if_not_exists=True)
+
+
+def downgrade():
+    for index_name, table_name, columns in reversed(LIST_SORT_INDEXES):
+        op.drop_index(index_name, table_name=table_name, if_exists=True)
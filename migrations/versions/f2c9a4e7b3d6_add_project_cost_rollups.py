@@ -0,0 +1,109 @@
+"""Add project cost rollups
+
+Revision ID: f2c9a4e7b3d6
+Revises: e4b7c2d8f5a1
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from datetime import datetime
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c9a4e7b3d6'
+down_revision = 'e4b7c2d8f5a1'
+branch_labels = None
+depends_on = None
+
+# Grouped source rows per rollup source type, matching build_cost_rollup_query in
+# app/main_backup.py: approved AP invoices (gross of retention) and billings on the
+# header, active labor and approved expenses by cost code / cost type ('' when missing)
+ROLLUP_SOURCE_QUERIES = {
+    'ap_invoice': """
+        SELECT project_vuid, accounting_period_vuid, '' AS cost_code_vuid, '' AS cost_type_vuid,
+               SUM(COALESCE(total_amount, 0) + COALESCE(retention_held, 0)) AS amount, COUNT(vuid) AS record_count
+        FROM ap_invoices
+        WHERE project_vuid IS NOT NULL AND status = 'approved'
+        GROUP BY project_vuid, accounting_period_vuid
+    """,
+    'labor_cost': """
+        SELECT project_vuid, accounting_period_vuid, COALESCE(cost_code_vuid, '') AS cost_code_vuid,
+               COALESCE(cost_type_vuid, '') AS cost_type_vuid, SUM(amount) AS amount, COUNT(vuid) AS record_count
+        FROM labor_costs
+        WHERE project_vuid IS NOT NULL AND status = 'active'
+        GROUP BY project_vuid, accounting_period_vuid, COALESCE(cost_code_vuid, ''), COALESCE(cost_type_vuid, '')
+    """,
+    'project_expense': """
+        SELECT project_vuid, accounting_period_vuid, COALESCE(cost_code_vuid, '') AS cost_code_vuid,
+               COALESCE(cost_type_vuid, '') AS cost_type_vuid, SUM(amount) AS amount, COUNT(vuid) AS record_count
+        FROM project_expenses
+        WHERE project_vuid IS NOT NULL AND status = 'approved'
+        GROUP BY project_vuid, accounting_period_vuid, COALESCE(cost_code_vuid, ''), COALESCE(cost_type_vuid, '')
+    """,
+    'project_billing': """
+        SELECT project_vuid, accounting_period_vuid, '' AS cost_code_vuid, '' AS cost_type_vuid,
+               SUM(total_amount) AS amount, COUNT(vuid) AS record_count
+        FROM project_billings
+        WHERE project_vuid IS NOT NULL AND status = 'approved'
+        GROUP BY project_vuid, accounting_period_vuid
+    """,
+}
+
+
+def populate_rollups():
+    """Build the rollup from the source tables, so costs and billings to date read correctly as soon as the upgrade finishes"""
+    bind = op.get_bind()
+    rollups = sa.table(
+        'project_cost_rollups',
+        sa.column('vuid', sa.String), sa.column('project_vuid', sa.String),
+        sa.column('accounting_period_vuid', sa.String), sa.column('cost_code_vuid', sa.String),
+        sa.column('cost_type_vuid', sa.String), sa.column('source_type', sa.String),
+        sa.column('amount', sa.Numeric), sa.column('record_count', sa.Integer), sa.column('updated_at', sa.DateTime)
+    )
+    now = datetime.utcnow()
+    for source_type, query in ROLLUP_SOURCE_QUERIES.items():
+        rows = [
+            dict(row._mapping, vuid=str(uuid.uuid4()), source_type=source_type, amount=row.amount or 0, updated_at=now)
+            for row in bind.execute(sa.text(query))
+        ]
+        if rows:
+            op.bulk_insert(rollups, rows)
+
+
+def upgrade():
+    # Databases set up with db.create_all() already have the table, with nullable
+    # cost code / cost type columns; make those NOT NULL so the unique key covers every row.
+    # Existing rows may hold duplicates, so they are cleared and rebuilt
+    if sa.inspect(op.get_bind()).has_table('project_cost_rollups'):
+        op.execute("DELETE FROM project_cost_rollups")
+        with op.batch_alter_table('project_cost_rollups') as batch_op:
+            batch_op.alter_column('cost_code_vuid', existing_type=sa.String(length=36), nullable=False, server_default='')
+            batch_op.alter_column('cost_type_vuid', existing_type=sa.String(length=36), nullable=False, server_default='')
+        populate_rollups()
+        return
+
+    op.create_table(
+        'project_cost_rollups',
+        sa.Column('vuid', sa.String(length=36), nullable=False),
+        sa.Column('project_vuid', sa.String(length=36), nullable=False),
+        sa.Column('accounting_period_vuid', sa.String(length=36), nullable=False),
+        sa.Column('cost_code_vuid', sa.String(length=36), nullable=False, server_default=''),
+        sa.Column('cost_type_vuid', sa.String(length=36), nullable=False, server_default=''),
+        sa.Column('source_type', sa.String(length=50), nullable=False),
+        sa.Column('amount', sa.Numeric(precision=15, scale=2), nullable=False),
+        sa.Column('record_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['accounting_period_vuid'], ['accounting_periods.vuid'], ),
+        sa.ForeignKeyConstraint(['project_vuid'], ['projects.vuid'], ),
+        sa.PrimaryKeyConstraint('vuid'),
+        sa.UniqueConstraint('project_vuid', 'accounting_period_vuid', 'cost_code_vuid', 'cost_type_vuid', 'source_type',
+                            name='unique_project_cost_rollup')
+    )
+    populate_rollups()
+
+
+def downgrade():
+    op.drop_table('project_cost_rollups')
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Script to rebuild and check the project cost rollup table.
+
+The rollup holds per-period totals of approved AP invoices, labor costs, project
+expenses and project billings, and is kept current by the API as those records are
+created, edited and deleted. The migration that adds the table builds it; run a
+rebuild after any change made directly in the database.
+
+Usage:
+    python rebuild_cost_rollups.py                  # rebuild every project
+    python rebuild_cost_rollups.py --project VUID   # rebuild one project
+    python rebuild_cost_rollups.py --check          # compare the rollup with the source tables
+"""
+
+import argparse
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+from app.main_backup import app, db, rebuild_cost_rollups, check_cost_rollup_consistency
+
+def lift_statement_timeout():
+    """Disable the app's statement_timeout for the rest of the current transaction; a full rebuild can take longer"""
+    db.session.execute(text("SET LOCAL statement_timeout = 0"))
+
+def rebuild(project_vuid=None):
+    """Create the rollup table if needed and rebuild it from the source tables"""
+    with app.app_context():
+        try:
+            db.create_all()
+            lift_statement_timeout()
+            rows_written = rebuild_cost_rollups(project_vuid)
+            print(f"✅ Rebuilt project cost rollup: {rows_written} rows written")
+        except Exception as e:
+            print(f"❌ Error rebuilding project cost rollup: {e}")
+            return False
+
+    return True
+
+def check(project_vuid=None):
+    """Report rollup rows that do not match the source tables"""
+    with app.app_context():
+        try:
+            lift_statement_timeout()
+            discrepancies = check_cost_rollup_consistency(project_vuid)
+        except Exception as e:
+            print(f"❌ Error checking project cost rollup: {e}")
+            return False
+
+    if not discrepancies:
+        print("✅ Project cost rollup matches the source tables")
+        return True
+
+    print(f"❌ Found {len(discrepancies)} mismatched rollup keys:")
+    for item in discrepancies:
+        print(f"  {item['source_type']} project={item['project_vuid']} period={item['accounting_period_vuid']} "
+              f"cost_code={item['cost_code_vuid']} cost_type={item['cost_type_vuid']}: "
+              f"expected {item['expected_amount']} ({item['expected_count']} records), "
+              f"rollup {item['rollup_amount']} ({item['rollup_count']} records)")
+    print("\nRun this script without --check to rebuild the rollup")
+    return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild or check the project cost rollup")
+    parser.add_argument('--project', help="Only rebuild/check this project VUID")
+    parser.add_argument('--check', action='store_true', help="Check the rollup against the source tables instead of rebuilding")
+    args = parser.parse_args()
+
+    if args.check:
+        success = check(args.project)
+    else:
+        success = rebuild(args.project)
+
+    if not success:
+        sys.exit(1)
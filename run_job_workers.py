@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Run a pool of background job worker processes.
+
+Each process imports the app on its own (spawn start method, so no database connections
+are shared across a fork) and runs run_job_worker(), claiming queued jobs from the
+background_jobs table with SELECT ... FOR UPDATE SKIP LOCKED. Workers that exit
+unexpectedly are restarted. Ctrl+C / SIGTERM lets running jobs finish before exiting.
+
+Usage:
+    python run_job_workers.py
+    python run_job_workers.py --processes 4 --poll-interval 5
+"""
+
+import argparse
+import multiprocessing
+import signal
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+def run_worker_process(stop_event, poll_interval):
+    """Worker process entry point"""
+    # The parent handles Ctrl+C and sets stop_event, so a running job is not interrupted
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+    from app.main_backup import run_job_worker
+    run_job_worker(poll_interval=poll_interval, stop_event=stop_event)
+
+def start_worker(context, stop_event, poll_interval):
+    """Start one worker process"""
+    process = context.Process(target=run_worker_process, args=(stop_event, poll_interval), daemon=False)
+    process.start()
+    return process
+
+def main():
+    parser = argparse.ArgumentParser(description="Run background job worker processes")
+    parser.add_argument('--processes', type=int, default=2, help="Number of worker processes")
+    parser.add_argument('--poll-interval', type=float, default=2, help="Seconds between polls when the queue is empty")
+    args = parser.parse_args()
+
+    # Tags the workers' database connections (application_name) as worker connections
+    os.environ.setdefault('VERMILLION_WORKER_TYPE', 'worker')
+    context = multiprocessing.get_context('spawn')
+    stop_event = context.Event()
+
+    def request_stop(signum, frame):
+        print("Stopping job workers after their current jobs...")
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    processes = [start_worker(context, stop_event, args.poll_interval) for _ in range(max(1, args.processes))]
+    print(f"✅ Started {len(processes)} job workers")
+
+    try:
+        while not stop_event.is_set():
+            for index, process in enumerate(processes):
+                if not process.is_alive() and not stop_event.is_set():
+                    print(f"❌ Job worker {process.pid} exited with code {process.exitcode}, restarting")
+                    processes[index] = start_worker(context, stop_event, args.poll_interval)
+            time.sleep(1)
+    finally:
+        stop_event.set()
+        for process in processes:
+            process.join()
+
+    print("✅ Job workers stopped")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    if not success:
+        sys.exit(1)
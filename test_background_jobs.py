@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test the background job queue: one active job per (operation, period), claiming,
+running, progress and cancellation.
+Run with: python3 test_background_jobs.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.main_backup import (
+    app, db, AccountingPeriod, BackgroundJob, enqueue_job, run_job
+)
+
+def test_background_jobs():
+    """Test enqueueing, running and cancelling background jobs"""
+    with app.app_context():
+        period = AccountingPeriod(month=12, year=2099, status='open')
+        db.session.add(period)
+        db.session.commit()
+        client = app.test_client()
+
+        try:
+            print("Queueing a snapshot update job...")
+            response = client.post(f'/api/update-snapshots/{period.vuid}?background=true')
+            assert response.status_code == 202, f"Expected 202, got {response.status_code}"
+            job_vuid = response.get_json()['data']['vuid']
+            assert response.headers['Location'] == f'/api/jobs/{job_vuid}', "Expected a Location header for the job"
+
+            response = client.post(f'/api/update-snapshots/{period.vuid}?background=true')
+            assert response.status_code == 409, f"Expected 409 for a second active job, got {response.status_code}"
+            assert response.get_json()['data']['vuid'] == job_vuid, "Expected the active job to be returned"
+            print("✓ One active job per operation and period")
+
+            # Run it here rather than through claim_next_job, which may pick up other queued jobs
+            db.session.query(BackgroundJob).filter_by(vuid=job_vuid).update({'status': 'running', 'worker_id': 'test-worker'})
+            db.session.commit()
+
+            assert run_job(job_vuid) == 'succeeded', "Expected the snapshot update job to succeed"
+            data = client.get(f'/api/jobs/{job_vuid}').get_json()['data']
+            assert data['percent'] == 100.0, f"Expected 100 percent, got {data['percent']}"
+            assert data['result']['updated_count'] == 0, f"Expected no snapshots updated, got {data['result']}"
+            print("✓ Job ran and recorded its result")
+
+            job, created = enqueue_job('update_snapshots', period.vuid)
+            assert created, "Expected a new job once the previous one finished"
+            response = client.post(f'/api/jobs/{job.vuid}/cancel')
+            assert response.get_json()['data']['status'] == 'cancelled', "Expected the queued job to be cancelled"
+            assert client.post(f'/api/jobs/{job.vuid}/cancel').status_code == 409, "Expected 409 for a finished job"
+            print("✓ Queued jobs can be cancelled")
+
+        finally:
+            db.session.rollback()
+            BackgroundJob.query.filter_by(accounting_period_vuid=period.vuid).delete()
+            db.session.delete(period)
+            db.session.commit()
+
+if __name__ == "__main__":
+    print("Running background job tests...")
+
+    try:
+        test_background_jobs()
+        print("\n🎉 All background job tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
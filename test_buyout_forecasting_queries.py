@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Query count test for the buyout forecasting endpoint.
+The endpoint preloads cost codes, cost types, commitments, change orders and actuals
+for the whole budget, so the number of statements must not grow with the line count.
+Run with: python3 test_buyout_forecasting_queries.py
+"""
+
+import sys
+import os
+import json
+from datetime import date
+from decimal import Decimal
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import event
+from app.main_backup import (
+    app, db, get_buyout_forecasting_data, AccountingPeriod, Project, CostCode, CostType,
+    Vendor, ProjectBudget, ProjectBudgetLine, ProjectCommitment, ProjectCommitmentItem
+)
+
+# The endpoint runs a fixed set of preload queries; this leaves room for small changes
+MAX_BUYOUT_FORECASTING_QUERIES = 20
+
+def seed_buyout_project(line_count, month):
+    """Flush a project with an original budget of line_count lines and one commitment"""
+    period = AccountingPeriod(month=month, year=2099, status='open')
+    project = Project(project_number=f"QC-{line_count:04d}", project_name="Query count project", status='active')
+    vendor = Vendor(vendor_name=f"Query count vendor {month}", vendor_number=f"QCV{month:04d}", company_name="Query count vendor")
+    cost_type = CostType(cost_type=f"Query count {month}", abbreviation=f"QC{month}", description="Query count", expense_account='5000')
+    db.session.add_all([period, project, vendor, cost_type])
+    db.session.flush()
+
+    budget = ProjectBudget(
+        project_vuid=project.vuid, accounting_period_vuid=period.vuid, description="Original budget",
+        budget_type='original', budget_amount=0, budget_date=date(2099, month, 1)
+    )
+    commitment = ProjectCommitment(
+        project_vuid=project.vuid, accounting_period_vuid=period.vuid, commitment_number=f"QC-{line_count}",
+        commitment_name="Query count commitment", vendor_vuid=vendor.vuid, commitment_date=date(2099, month, 1),
+        original_amount=0, status='active'
+    )
+    db.session.add_all([budget, commitment])
+    db.session.flush()
+
+    for i in range(line_count):
+        cost_code = CostCode(code=f"QC{line_count:04d}-{i:04d}", description=f"Query count {i}")
+        db.session.add(cost_code)
+        db.session.flush()
+        db.session.add(ProjectBudgetLine(
+            budget_vuid=budget.vuid, cost_code_vuid=cost_code.vuid, cost_type_vuid=cost_type.vuid,
+            budget_amount=Decimal('1000.00')
+        ))
+        db.session.add(ProjectCommitmentItem(
+            commitment_vuid=commitment.vuid, description=f"Item {i}", total_amount=Decimal('250.00'),
+            cost_code_vuid=cost_code.vuid, cost_type_vuid=cost_type.vuid, changeorder=i % 2 == 0, status='active'
+        ))
+    db.session.flush()
+
+    return project.vuid, period.vuid
+
+def count_buyout_forecasting_queries(line_count, month):
+    """Return (statement count, response data) for a budget with line_count lines"""
+    project_vuid, period_vuid = seed_buyout_project(line_count, month)
+    statements = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.test_request_context(query_string={'accounting_period_vuid': period_vuid}):
+        event.listen(db.engine, 'before_cursor_execute', record_statement)
+        try:
+            response = get_buyout_forecasting_data(project_vuid)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record_statement)
+
+    return len(statements), json.loads(response.get_data(as_text=True))
+
+def test_buyout_forecasting_query_count():
+    """Test that the statement count is the same for small and large budgets"""
+    with app.app_context():
+        try:
+            print("Counting buyout forecasting queries...")
+            small_count, small_data = count_buyout_forecasting_queries(5, 1)
+            large_count, large_data = count_buyout_forecasting_queries(50, 2)
+
+            assert small_data['success'], f"Small budget failed: {small_data}"
+            assert large_data['success'], f"Large budget failed: {large_data}"
+            assert len(large_data['data']['budget_lines']) == 50, "Expected 50 budget lines"
+
+            line = large_data['data']['budget_lines'][0]
+            assert line['committed_amount'] + line['commitment_change_orders_amount'] == 250.0, \
+                f"Expected 250.0 committed, got {line['committed_amount']} + {line['commitment_change_orders_amount']}"
+            print(f"✓ Buyout forecasting amounts are loaded ({small_count} / {large_count} statements)")
+
+            assert small_count == large_count, \
+                f"Statement count grew with budget lines: {small_count} for 5 lines, {large_count} for 50 lines"
+            assert large_count <= MAX_BUYOUT_FORECASTING_QUERIES, \
+                f"Expected at most {MAX_BUYOUT_FORECASTING_QUERIES} statements, got {large_count}"
+            print("✓ Buyout forecasting runs a constant number of statements")
+        finally:
+            db.session.rollback()
+
+if __name__ == "__main__":
+    print("Running buyout forecasting query count tests...")
+
+    try:
+        test_buyout_forecasting_query_count()
+        print("\n🎉 All buyout forecasting tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
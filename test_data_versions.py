@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test that the reference data, project list and GL account caches follow the data_versions
+table: a commit bumps the versions of the tables it wrote in the database, and a change
+committed by another worker (simulated here with its own connection, which leaves this
+process's caches untouched) is served on the next request instead of a stale copy or a 304.
+Run with: python3 test_data_versions.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.main_backup import (
+    app, db, bump_data_versions, get_gl_account, AccountingPeriod, ChartOfAccounts, DataVersion
+)
+
+def get_stored_version(table_name):
+    """Read a table's version from the database"""
+    return db.session.query(DataVersion.version).filter_by(table_name=table_name).scalar() or 0
+
+def commit_as_other_worker(statement, table_name):
+    """Run a write and bump its table's version on a separate connection, like another worker would"""
+    with db.engine.begin() as connection:
+        connection.execute(statement)
+        bump_data_versions(connection, [table_name])
+
+def find_period(response, vuid):
+    """Find a period in the /api/accounting-periods response"""
+    return next(period for period in response.get_json() if period['vuid'] == vuid)
+
+def test_data_versions():
+    """Test cache invalidation across workers through data_versions"""
+    with app.app_context():
+        client = app.test_client()
+        version = get_stored_version(AccountingPeriod.__tablename__)
+        period = AccountingPeriod(month=8, year=2099, status='open')
+        account = ChartOfAccounts(account_number='9999-DV', account_name='Data version test', account_type='Expense',
+                                  normal_balance='Debit', status='active')
+        db.session.add_all([period, account])
+        db.session.commit()
+
+        try:
+            print("Committing a new accounting period...")
+            assert get_stored_version(AccountingPeriod.__tablename__) == version + 1, "Expected the commit to bump the stored version"
+            response = client.get('/api/accounting-periods')
+            assert find_period(response, period.vuid)['status'] == 'open', "Expected the new period in the list"
+            etag = response.headers['ETag']
+            print("✓ Commit bumped the stored version")
+
+            print("Closing the period from another worker...")
+            commit_as_other_worker(
+                db.update(AccountingPeriod).where(AccountingPeriod.vuid == period.vuid).values(status='closed'),
+                AccountingPeriod.__tablename__
+            )
+            # Requests share this app context's session, so end its transaction as a request would
+            db.session.commit()
+            response = client.get('/api/accounting-periods', headers={'If-None-Match': etag})
+            assert response.status_code == 200, f"Expected the changed list instead of {response.status_code}"
+            assert find_period(response, period.vuid)['status'] == 'closed', "Expected the period to show as closed"
+            print("✓ Cached list rebuilt after another worker's change")
+
+            print("Renaming a GL account from another worker...")
+            assert get_gl_account(account.vuid).account_name == 'Data version test', "Expected the account in the GL cache"
+            commit_as_other_worker(
+                db.update(ChartOfAccounts).where(ChartOfAccounts.vuid == account.vuid).values(account_name='Renamed'),
+                ChartOfAccounts.__tablename__
+            )
+            db.session.commit()
+            assert get_gl_account(account.vuid).account_name == 'Renamed', "Expected the GL cache to reload"
+            print("✓ GL account cache reloaded after another worker's change")
+
+        finally:
+            db.session.rollback()
+            db.session.delete(db.session.merge(period))
+            db.session.delete(db.session.merge(account))
+            db.session.commit()
+
+if __name__ == "__main__":
+    print("Running data version tests...")
+
+    try:
+        test_data_versions()
+        print("\n🎉 All data version tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test keyset pagination on the column-projected list endpoints (AP invoices and project
+billings): every page carries a cursor built from the row columns, and walking the pages
+returns each row exactly once.
+Run with: python3 test_list_pagination.py
+"""
+
+import sys
+import os
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.main_backup import (
+    app, db, AccountingPeriod, Project, Vendor, APInvoice, ProjectBilling
+)
+
+def read_all_pages(client, url, project_vuid, sort, limit):
+    """Follow next_cursor until has_more is false and return the vuids in page order"""
+    vuids = []
+    cursor = None
+    while True:
+        params = {'project_vuid': project_vuid, 'sort': sort, 'limit': limit}
+        if cursor:
+            params['cursor'] = cursor
+        response = client.get(url, query_string=params)
+        assert response.status_code == 200, f"Expected 200 from {url}, got {response.status_code}: {response.get_data(as_text=True)}"
+        page = response.get_json()
+        vuids.extend(item['vuid'] for item in page['data'])
+        if not page['has_more']:
+            return vuids
+        cursor = page['next_cursor']
+        assert cursor, f"Expected a cursor when has_more is true: {page}"
+
+def test_list_pagination():
+    """Test paging through AP invoices and project billings"""
+    with app.app_context():
+        period = AccountingPeriod(month=9, year=2099, status='open')
+        vendor = Vendor(vendor_name="Pagination test vendor", vendor_number="PAG-0001", company_name="Pagination test")
+        project = Project(project_number="PAG-0001", project_name="Pagination test project", status='active')
+        db.session.add_all([period, vendor, project])
+        db.session.flush()
+
+        created_at = datetime(2099, 9, 1)
+        invoice_vuids = []
+        billing_vuids = []
+        for i in range(5):
+            # Two rows per amount, so the vuid tie-breaker is exercised too
+            amount = Decimal(100 * (i // 2))
+            invoice = APInvoice(
+                invoice_number=f"PAG-{i:04d}", vendor_vuid=vendor.vuid, project_vuid=project.vuid,
+                invoice_date=date(2099, 9, 1), total_amount=amount, accounting_period_vuid=period.vuid,
+                created_at=created_at + timedelta(minutes=i)
+            )
+            billing = ProjectBilling(
+                billing_number=f"PAG-{i:04d}", project_vuid=project.vuid, billing_date=date(2099, 9, 1),
+                total_amount=amount, accounting_period_vuid=period.vuid, created_at=created_at + timedelta(minutes=i)
+            )
+            db.session.add_all([invoice, billing])
+            db.session.flush()
+            invoice_vuids.append(invoice.vuid)
+            billing_vuids.append(billing.vuid)
+        db.session.commit()
+        client = app.test_client()
+
+        try:
+            for url, expected in (('/api/ap-invoices', invoice_vuids), ('/api/project-billings', billing_vuids)):
+                print(f"Paging through {url}...")
+                vuids = read_all_pages(client, url, project.vuid, 'created_at', 2)
+                assert vuids == expected, f"Expected the rows in created_at order, got {vuids}"
+
+                vuids = read_all_pages(client, url, project.vuid, '-total_amount', 2)
+                assert sorted(vuids) == sorted(expected), f"Expected each row exactly once, got {vuids}"
+                print("✓ Every page returned a cursor and each row appeared once")
+
+        finally:
+            db.session.rollback()
+            APInvoice.query.filter(APInvoice.vuid.in_(invoice_vuids)).delete(synchronize_session=False)
+            ProjectBilling.query.filter(ProjectBilling.vuid.in_(billing_vuids)).delete(synchronize_session=False)
+            db.session.delete(project)
+            db.session.delete(vendor)
+            db.session.delete(period)
+            db.session.commit()
+
+if __name__ == "__main__":
+    print("Running list pagination tests...")
+
+    try:
+        test_list_pagination()
+        print("\n🎉 All list pagination tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test the month close pipeline: completed stages are checkpointed and skipped when a
+failed close is resumed, restart runs every stage again, a posting stage with failures
+is not checkpointed, and a synchronous close is refused while a close job is active.
+The stage functions are replaced with recorders, so no transactions are posted.
+Run with: python3 test_period_close_pipeline.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import app.main_backup as main
+from app.main_backup import (
+    app, db, enqueue_job, run_period_close_pipeline, run_close_post_transactions_stage,
+    AccountingPeriod, BackgroundJob, PeriodCloseCheckpoint
+)
+
+def make_recording_stages(calls, failing_stages):
+    """Build a PERIOD_CLOSE_STAGES list with the real stage names whose functions record their calls"""
+    def make_stage(stage):
+        def run_stage(period, progress_callback):
+            calls.append(stage)
+            if stage in failing_stages:
+                failing_stages.discard(stage)
+                raise RuntimeError(f"Simulated {stage} failure")
+            progress_callback(1, 1)
+            return True, {'stage': stage}
+        return run_stage
+
+    return [(stage, make_stage(stage)) for stage, _ in main.PERIOD_CLOSE_STAGES]
+
+def test_period_close_pipeline():
+    """Test resuming, restarting and guarding the month close pipeline"""
+    with app.app_context():
+        period = AccountingPeriod(month=10, year=2099, status='open')
+        db.session.add(period)
+        db.session.commit()
+        client = app.test_client()
+        stages = main.PERIOD_CLOSE_STAGES
+        stage_names = [stage for stage, _ in stages]
+        calls = []
+
+        try:
+            print("Running a close that fails at the snapshots stage...")
+            main.PERIOD_CLOSE_STAGES = make_recording_stages(calls, {'snapshots'})
+            failed_stage, results = run_period_close_pipeline(period)
+            assert failed_stage == 'snapshots', f"Expected the snapshots stage to fail, got {failed_stage}"
+            assert 'Simulated snapshots failure' in results['snapshots']['error'], f"Unexpected result: {results['snapshots']}"
+            checkpointed = {checkpoint.stage for checkpoint in PeriodCloseCheckpoint.query.filter_by(accounting_period_vuid=period.vuid)}
+            assert checkpointed == set(stage_names[:3]), f"Expected the first three stages checkpointed, got {checkpointed}"
+            print("✓ Stages before the failure were checkpointed")
+
+            print("Resuming the close...")
+            calls.clear()
+            failed_stage, results = run_period_close_pipeline(period)
+            assert failed_stage is None, f"Expected the resumed close to finish, failed at {failed_stage}"
+            assert calls == stage_names[3:], f"Expected only the remaining stages to run, ran {calls}"
+            assert [results[stage]['status'] for stage in stage_names[:3]] == ['skipped'] * 3, f"Unexpected results: {results}"
+            data = client.get(f'/api/accounting-periods/{period.vuid}/close-status').get_json()
+            assert data['success'], f"Expected the close status, got {data}"
+            print("✓ Resume skipped the completed stages")
+
+            print("Restarting the close...")
+            calls.clear()
+            failed_stage, results = run_period_close_pipeline(period, restart=True)
+            assert failed_stage is None and calls == stage_names, f"Expected every stage to run again, ran {calls}"
+            print("✓ Restart ran every stage")
+
+            print("Posting with a failed transaction...")
+            main.PERIOD_CLOSE_STAGES = stages
+            bulk_post = main.bulk_post_period_transactions
+            main.bulk_post_period_transactions = lambda *args, **kwargs: {
+                'posted_count': 2, 'failed_count': 1, 'failures': [{'error': 'Simulated posting failure'}]
+            }
+            try:
+                success, result = run_close_post_transactions_stage(period, lambda current, total: None)
+            finally:
+                main.bulk_post_period_transactions = bulk_post
+            assert not success, "Expected the posting stage to fail when a transaction was not posted"
+            assert result['failed_count'] == 1 and result['failures'], f"Expected the failures in the result, got {result}"
+            print("✓ Posting failures stop the close")
+
+            print("Closing synchronously while a close job is queued...")
+            job, created = enqueue_job('close_month', period.vuid)
+            assert created, "Expected a new close_month job"
+            response = client.post('/api/wip/close-month', json={'accounting_period_vuid': period.vuid})
+            assert response.status_code == 409, f"Expected 409, got {response.status_code}"
+            assert response.get_json()['data']['vuid'] == job.vuid, "Expected the active job to be returned"
+            print("✓ Synchronous close refused while a job is active")
+
+        finally:
+            main.PERIOD_CLOSE_STAGES = stages
+            db.session.rollback()
+            BackgroundJob.query.filter_by(accounting_period_vuid=period.vuid).delete()
+            PeriodCloseCheckpoint.query.filter_by(accounting_period_vuid=period.vuid).delete()
+            db.session.delete(period)
+            db.session.commit()
+
+if __name__ == "__main__":
+    print("Running month close pipeline tests...")
+
+    try:
+        test_period_close_pipeline()
+        print("\n🎉 All month close pipeline tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test the parallel period close snapshot build: snapshots are created per project chunk,
+progress is stored in the database for the progress endpoint, a failed build removes
+every snapshot it inserted, and closing a period commits its status only after the build.
+Run with: python3 test_period_close_snapshots.py
+"""
+
+import sys
+import os
+from datetime import date
+from decimal import Decimal
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import app.main_backup as main
+from app.main_backup import (
+    app, db, build_period_close_snapshots, AccountingPeriod, Project, CostCode, CostType,
+    ProjectBudget, ProjectBudgetLine, ProjectBudgetLineBuyout, ProjectBuyoutForecastingSnapshot, SnapshotBuildProgress
+)
+
+def seed_snapshot_projects(period, project_count):
+    """Commit projects with one bought out original budget line each"""
+    cost_type = CostType(cost_type="Snapshot test", abbreviation="SNP", description="Snapshot test", expense_account='5000')
+    cost_code = CostCode(code="SNP-0001", description="Snapshot test")
+    db.session.add_all([cost_type, cost_code])
+    db.session.flush()
+
+    project_vuids = []
+    for i in range(project_count):
+        project = Project(project_number=f"SNP-{i:04d}", project_name=f"Snapshot project {i}", status='active')
+        db.session.add(project)
+        db.session.flush()
+        budget = ProjectBudget(
+            project_vuid=project.vuid, accounting_period_vuid=period.vuid, description="Original budget",
+            budget_type='original', budget_amount=Decimal('1000.00'), budget_date=date(2099, 11, 1)
+        )
+        db.session.add(budget)
+        db.session.flush()
+        line = ProjectBudgetLine(
+            budget_vuid=budget.vuid, cost_code_vuid=cost_code.vuid, cost_type_vuid=cost_type.vuid,
+            budget_amount=Decimal('1000.00')
+        )
+        db.session.add(line)
+        db.session.flush()
+        db.session.add(ProjectBudgetLineBuyout(
+            budget_line_vuid=line.vuid, project_vuid=project.vuid, accounting_period_vuid=period.vuid,
+            is_bought_out=True, buyout_date=date(2099, 11, 15)
+        ))
+        project_vuids.append(project.vuid)
+
+    # The build runs on worker threads with their own sessions, so the data must be committed
+    db.session.commit()
+    return project_vuids, cost_type, cost_code
+
+def delete_snapshot_projects(period, project_vuids, cost_type, cost_code):
+    """Delete everything seed_snapshot_projects created"""
+    db.session.rollback()
+    SnapshotBuildProgress.query.filter_by(accounting_period_vuid=period.vuid).delete()
+    ProjectBuyoutForecastingSnapshot.query.filter_by(accounting_period_vuid=period.vuid).delete()
+    ProjectBudgetLineBuyout.query.filter_by(accounting_period_vuid=period.vuid).delete()
+    budget_vuids = [budget.vuid for budget in ProjectBudget.query.filter(ProjectBudget.project_vuid.in_(project_vuids)).all()]
+    ProjectBudgetLine.query.filter(ProjectBudgetLine.budget_vuid.in_(budget_vuids)).delete(synchronize_session=False)
+    ProjectBudget.query.filter(ProjectBudget.vuid.in_(budget_vuids)).delete(synchronize_session=False)
+    Project.query.filter(Project.vuid.in_(project_vuids)).delete(synchronize_session=False)
+    db.session.delete(cost_type)
+    db.session.delete(cost_code)
+    db.session.delete(period)
+    db.session.commit()
+
+def test_period_close_snapshots():
+    """Test building snapshots in chunks, stored progress and cleanup after a failure"""
+    with app.app_context():
+        period = AccountingPeriod(month=11, year=2099, status='open')
+        db.session.add(period)
+        db.session.commit()
+        project_vuids, cost_type, cost_code = seed_snapshot_projects(period, 5)
+        client = app.test_client()
+
+        try:
+            print("Building snapshots for 5 projects in chunks of 2...")
+            success, message, snapshots_created = build_period_close_snapshots(period.vuid, chunk_size=2, max_workers=2)
+            assert success, f"Expected the snapshot build to succeed: {message}"
+            assert snapshots_created == 5, f"Expected 5 snapshots, got {snapshots_created}"
+
+            data = client.get(f'/api/accounting-periods/{period.vuid}/snapshot-progress').get_json()['data']
+            assert data['status'] == 'completed', f"Expected completed, got {data['status']}"
+            assert data['completed_projects'] == data['total_projects'] == 5, f"Unexpected progress: {data}"
+            assert data['snapshots_created'] == 5, f"Expected 5 snapshots in the progress, got {data['snapshots_created']}"
+            print("✓ Snapshots built and progress stored")
+
+            print("Rebuilding with a failing chunk...")
+            ProjectBuyoutForecastingSnapshot.query.filter_by(accounting_period_vuid=period.vuid).delete()
+            db.session.commit()
+
+            build_rows = main.make_buyout_forecasting_snapshot_rows
+
+            def fail_last_project(project_vuid, accounting_period_vuid):
+                if project_vuid == max(project_vuids):
+                    raise RuntimeError("Simulated snapshot failure")
+                return build_rows(project_vuid, accounting_period_vuid)
+
+            main.make_buyout_forecasting_snapshot_rows = fail_last_project
+            try:
+                success, message, snapshots_created = build_period_close_snapshots(period.vuid, chunk_size=2, max_workers=1)
+            finally:
+                main.make_buyout_forecasting_snapshot_rows = build_rows
+
+            assert not success and snapshots_created == 0, f"Expected the build to fail: {message}"
+            remaining = ProjectBuyoutForecastingSnapshot.query.filter_by(accounting_period_vuid=period.vuid).count()
+            assert remaining == 0, f"Expected the failed build's snapshots to be deleted, found {remaining}"
+            data = client.get(f'/api/accounting-periods/{period.vuid}/snapshot-progress').get_json()['data']
+            assert data['status'] == 'failed', f"Expected failed, got {data['status']}"
+            assert 'Simulated snapshot failure' in data['error'], f"Expected the chunk error, got {data['error']}"
+            print("✓ Failed build removed its snapshots and recorded the error")
+
+            print("Closing the period through the status endpoint...")
+            statuses = []
+
+            def record_period_status(project_vuid, accounting_period_vuid):
+                statuses.append(db.session.query(AccountingPeriod.status).filter_by(vuid=accounting_period_vuid).scalar())
+                return build_rows(project_vuid, accounting_period_vuid)
+
+            main.make_buyout_forecasting_snapshot_rows = record_period_status
+            try:
+                response = client.post(f'/api/accounting-periods/{period.vuid}/status', json={'status': 'closed'})
+            finally:
+                main.make_buyout_forecasting_snapshot_rows = build_rows
+
+            assert response.status_code == 200, f"Expected the close to succeed, got {response.status_code}"
+            assert statuses and set(statuses) == {'open'}, f"Expected the period to stay open during the build, saw {statuses}"
+            assert period.status == 'closed', f"Expected the period to be closed, got {period.status}"
+            created = ProjectBuyoutForecastingSnapshot.query.filter_by(accounting_period_vuid=period.vuid).count()
+            assert created == 5, f"Expected 5 snapshots, found {created}"
+            print("✓ Period closed only after its snapshots were built")
+
+        finally:
+            delete_snapshot_projects(period, project_vuids, cost_type, cost_code)
+
+if __name__ == "__main__":
+    print("Running period close snapshot tests...")
+
+    try:
+        test_period_close_snapshots()
+        print("\n🎉 All period close snapshot tests passed!")
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        sys.exit(1)